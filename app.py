@@ -1,14 +1,22 @@
 """app.py — BANDEIRANTE DIGITAL COM DEBUG"""
 
 import streamlit as st
-import asyncio
-import json
+import os
+import subprocess
+import sys
 from datetime import datetime
 import time
 
 from services.gemini_service import GeminiService
-from services.orchestrator import BandeiranteOrchestrator
+from services.async_runtime import obter_runtime
+from services.investigation_events import EventoInvestigacao, TipoEvento
+from services.job_queue import JobQueue, STATUS_FINAIS
+from services.execution_profiles import PERFIS
 from services.dossie_generator import DossieGenerator
+from services.result_models import ResultadoInvestigacao
+
+WORKERS_APP = 2           # processos worker iniciados pela UI quando não há nenhum no ar
+INTERVALO_POLL_UI = 1.0   # segundos entre leituras de eventos do job
 
 st.set_page_config(
     page_title="Bandeirante Digital",
@@ -16,6 +24,12 @@ st.set_page_config(
     layout="wide"
 )
 
+
+@st.cache_resource
+def obter_fila():
+    return JobQueue()
+
+
 st.title("🎯 BANDEIRANTE DIGITAL")
 st.markdown("**MODO DEUS COMPLETO** - Inteligência de Mercado Ultra-Avançada")
 st.markdown("---")
@@ -34,12 +48,15 @@ with st.sidebar:
     if api_key and st.button("🧪 Testar API Key", use_container_width=True):
         with st.spinner("🔍 Testando conexão com Gemini..."):
             try:
-                gemini = GeminiService(api_key=api_key)
-                test_result = asyncio.run(
+                # Loop e cliente persistentes: conexões reaproveitadas entre cliques
+                runtime = obter_runtime()
+                gemini = runtime.recurso(("gemini", api_key), lambda: GeminiService(api_key=api_key))
+                test_result = runtime.executar(
                     gemini.call_with_retry(
                         "Diga apenas: 'API funcionando!'",
                         use_search=False
-                    )
+                    ),
+                    timeout=120
                 )
                 if test_result:
                     st.success(f"✅ API FUNCIONANDO! Resposta: {test_result[:100]}")
@@ -48,6 +65,15 @@ with st.sidebar:
             except Exception as e:
                 st.error(f"❌ Erro na API: {str(e)}")
     
+    st.markdown("---")
+    st.markdown("### 📋 INVESTIGAÇÕES RECENTES")
+    for job_recente in obter_fila().listar(limite=8):
+        icone = {"concluido": "✅", "erro": "❌", "cancelado": "⛔", "executando": "🔄"}.get(job_recente["status"], "⏳")
+        if st.button(f"{icone} {job_recente['empresa'][:28]}", key=f"job_{job_recente['job_id']}",
+                     use_container_width=True):
+            st.query_params["job"] = job_recente["job_id"]
+            st.rerun()
+    
     st.markdown("---")
     st.info("""
     **Versão:** 3.0 MODO DEUS  
@@ -56,136 +82,169 @@ with st.sidebar:
     **Localidade:** Cuiabá, MT
     """)
 
-# Função para executar com status visual
-async def executar_com_status_visual(orch, empresa_nome, empresa_cnpj, empresa_uf):
-    """Executa investigação com status visual e resumo de achados."""
-    
-    start_time = time.time()
-    results = {
-        "metadata": {
-            "empresa": empresa_nome,
-            "cnpj": empresa_cnpj,
-            "uf": empresa_uf,
-            "timestamp_inicio": datetime.now().isoformat(),
-            "versao": "3.0-MODO-DEUS"
-        },
-        "fases": {}
-    }
-    
-    # FASE -1: REPUTATION
-    with st.status("🔍 **FASE -1:** Shadow Reputation", expanded=True) as status:
-        st.write("🔍 Buscando registros públicos...")
-        st.write("📊 Analisando histórico...")
-        try:
-            st.write("🛠️ [DEBUG] Chamando reputation_layer.checagem_completa()...")
-            reputation = await orch.reputation_layer.checagem_completa(empresa_nome, empresa_cnpj)
-            st.write(f"🛠️ [DEBUG] Resposta recebida: {len(str(reputation))} caracteres")
-            results["fases"]["fase_-1_reputation"] = reputation
-            
-            # RESUMO DE ACHADOS
-            st.write("")
-            st.write("✅ **Reputation verificada!**")
-            st.write("📊 **Principais achados:**")
-            flag = reputation.get("flag_risco", "N/D")
-            processos = reputation.get("processos_judiciais", {}).get("total", 0)
-            st.write(f"  • Flag de risco: **{flag}**")
-            st.write(f"  • Processos judiciais: **{processos}**")
-            
-            status.update(label="✅ FASE -1 COMPLETA", state="complete")
-        except Exception as e:
-            st.write(f"❌ [ERRO] {str(e)}")
-            st.write(f"🛠️ [DEBUG] Exception type: {type(e).__name__}")
-            results["fases"]["fase_-1_reputation"] = {"flag_risco": "ERRO", "erro": str(e)}
-            status.update(label="⚠️ FASE -1 com erro", state="error")
-    
-    # FASE 1: INCENTIVOS
-    with st.status("💰 **FASE 1:** Incentivos Fiscais", expanded=True) as status:
-        st.write("🔍 Mapeando incentivos estaduais...")
-        try:
-            st.write("🛠️ [DEBUG] Chamando tax_layer.mapeamento_completo()...")
-            incentivos = await orch.tax_layer.mapeamento_completo(empresa_nome, empresa_cnpj, empresa_uf)
-            st.write(f"🛠️ [DEBUG] Resposta recebida: {len(str(incentivos))} caracteres")
-            results["fases"]["fase_1_incentivos"] = incentivos
-            
-            # RESUMO DE ACHADOS
-            st.write("")
-            total_inc = incentivos.get("incentivos_estaduais", {}).get("total_incentivos", 0)
-            valor_anual = incentivos.get("incentivos_estaduais", {}).get("valor_beneficio_anual_estimado", "N/D")
-            multas = incentivos.get("sancoes_multas", {}).get("total_multas_quantidade", 0)
-            
-            st.write("✅ **Incentivos mapeados!**")
-            st.write("📊 **Principais achados:**")
-            st.write(f"  • Incentivos fiscais: **{total_inc}**")
-            st.write(f"  • Benefício anual estimado: **{valor_anual}**")
-            st.write(f"  • Multas fiscais: **{multas}**")
-            
-            status.update(label="✅ FASE 1 COMPLETA", state="complete")
-        except Exception as e:
-            st.write(f"❌ [ERRO] {str(e)}")
-            results["fases"]["fase_1_incentivos"] = {"incentivos_estaduais": {"total_incentivos": 0}, "erro": str(e)}
-            status.update(label="⚠️ FASE 1 com erro", state="error")
-    
-    # FASE 2: TERRITORIAL
-    with st.status("🗺️ **FASE 2:** Inteligência Territorial", expanded=True) as status:
-        st.write("🔍 Buscando dados fundiários no INCRA...")
-        try:
-            st.write("🛠️ [DEBUG] Chamando territorial_layer.mapeamento_territorial_completo()...")
-            territorial = await orch.territorial_layer.mapeamento_territorial_completo(empresa_nome, empresa_cnpj)
-            st.write(f"🛠️ [DEBUG] Resposta recebida: {len(str(territorial))} caracteres")
-            results["fases"]["fase_2_territorial"] = territorial
-            
-            # RESUMO DE ACHADOS
-            st.write("")
-            fundiario = territorial.get("dados_fundiarios", {})
-            area = fundiario.get("area_total_ha", 0)
-            total_imoveis = fundiario.get("total_imoveis", 0)
-            estados = fundiario.get("estados_presenca", [])
-            licencas_total = territorial.get("licencas_ambientais", {}).get("total_licencas", 0)
-            
-            st.write("✅ **Dados territoriais obtidos!**")
-            st.write("📊 **Principais achados:**")
-            st.write(f"  • Área total: **{area:,.0f} hectares**")
-            st.write(f"  • Total de imóveis: **{total_imoveis}**")
-            st.write(f"  • Estados: **{', '.join(estados) if estados else 'N/D'}**")
-            st.write(f"  • Licenças: **{licencas_total}**")
-            
-            status.update(label="✅ FASE 2 COMPLETA", state="complete")
-        except Exception as e:
-            st.write(f"❌ [ERRO] {str(e)}")
-            results["fases"]["fase_2_territorial"] = {"dados_fundiarios": {"area_total_ha": 0}, "erro": str(e)}
-            status.update(label="⚠️ FASE 2 com erro", state="error")
-    
-    # PULA FASES 3, 4, 5 POR ENQUANTO PARA TESTAR
-    results["fases"]["fase_3_logistica"] = {"armazenagem": {"capacidade_total_toneladas": 0}}
-    results["fases"]["fase_4_societario"] = {"estrutura": {"grupo_economico": {}}}
-    results["fases"]["fase_5_executivos"] = {"hierarquia": {}}
+# Rótulo, nome curto e se abre expandido, para cada fase emitida pelo stream do orchestrator
+FASES_UI = {
+    "fase_0_cadastro": ("🧾 **FASE 0:** Cadastro na Receita", "FASE 0", False),
+    "fase_-1_reputation": ("🔍 **FASE -1:** Shadow Reputation", "FASE -1", True),
+    "fase_1_incentivos": ("💰 **FASE 1:** Incentivos Fiscais", "FASE 1", True),
+    "fase_2_territorial": ("🗺️ **FASE 2:** Inteligência Territorial", "FASE 2", True),
+    "fase_3_logistica": ("🚛 **FASE 3:** Logística & Supply Chain", "FASE 3", True),
+    "fase_4_societario": ("🏛️ **FASE 4:** Estrutura Societária", "FASE 4", True),
+    "fase_5_executivos": ("👔 **FASE 5:** Executivos", "FASE 5", True),
+    "fase_6_triggers": ("⏰ **FASE 6:** Triggers", "FASE 6", False),
+    "fase_7_psicologia": ("🧠 **FASE 7:** Psicologia", "FASE 7", False),
+    "fase_10_matriz": ("🎯 **FASE 10:** Matriz", "FASE 10", False),
+}
+
+
+def resumo_achados(fase, dados):
+    """Linhas de 'principais achados' exibidas ao concluir cada fase."""
+    if fase == "fase_0_cadastro":
+        return [f"Situação cadastral: **{dados.get('situacao_cadastral') or 'N/D'}**"]
+    if fase == "fase_-1_reputation":
+        return [
+            f"Flag de risco: **{dados.get('flag_risco', 'N/D')}**",
+            f"Processos judiciais: **{dados.get('processos_judiciais', {}).get('total', 0)}**",
+        ]
+    if fase == "fase_1_incentivos":
+        estaduais = dados.get("incentivos_estaduais", {})
+        return [
+            f"Incentivos fiscais: **{estaduais.get('total_incentivos', 0)}**",
+            f"Benefício anual estimado: **{estaduais.get('valor_beneficio_anual_estimado', 'N/D')}**",
+            f"Multas fiscais: **{dados.get('sancoes_multas', {}).get('total_multas_quantidade', 0)}**",
+        ]
+    if fase == "fase_2_territorial":
+        fundiario = dados.get("dados_fundiarios", {})
+        estados = fundiario.get("estados_presenca", [])
+        return [
+            f"Área total: **{fundiario.get('area_total_ha', 0):,.0f} hectares**",
+            f"Total de imóveis: **{fundiario.get('total_imoveis', 0)}**",
+            f"Estados: **{', '.join(estados) if estados else 'N/D'}**",
+            f"Licenças: **{dados.get('licencas_ambientais', {}).get('total_licencas', 0)}**",
+        ]
+    if fase == "fase_3_logistica":
+        cap = dados.get("armazenagem", {}).get("capacidade_total_toneladas", 0)
+        return [f"Capacidade de armazenagem: **{cap:,.0f} t**"]
+    if fase == "fase_4_societario":
+        grupo = dados.get("estrutura", {}).get("grupo_economico", {})
+        return [
+            f"Empresas no grupo: **{grupo.get('total_empresas_grupo', 0)}**",
+            f"Risco societário: **{dados.get('risco_societario', 'N/D')}**",
+        ]
+    if fase == "fase_5_executivos":
+        return [f"Decisores mapeados: **{len(dados.get('matriz_receptividade', []))}**"]
+    return []
+
+
+class PainelProgresso:
+    """Renderiza o progresso de uma investigação a partir dos seus eventos."""
     
-    # FASE 6: TRIGGERS
-    with st.status("⏰ **FASE 6:** Triggers", expanded=False) as status:
-        triggers = await orch._identificar_triggers(results)
-        results["fases"]["fase_6_triggers"] = triggers
-        status.update(label="✅ FASE 6 COMPLETA", state="complete")
+    def __init__(self):
+        self.placar_parcial = st.empty()
+        self.caixas, self.com_erro = {}, set()
     
-    # FASE 7: PSICOLOGIA
-    with st.status("🧠 **FASE 7:** Psicologia", expanded=False) as status:
-        psicologia = await orch._mapear_psicologia(results)
-        results["fases"]["fase_7_psicologia"] = psicologia
-        status.update(label="✅ FASE 7 COMPLETA", state="complete")
+    def processar(self, evento):
+        caixa = self.caixas.get(evento.fase)
+        
+        if evento.tipo == TipoEvento.FASE_INICIADA:
+            label, _, expandido = FASES_UI.get(evento.fase, (evento.fase, evento.fase, False))
+            self.caixas[evento.fase] = st.status(label, expanded=expandido)
+        
+        elif evento.tipo == TipoEvento.SUBCONSULTA_CONCLUIDA and caixa:
+            origem = "checkpoint" if evento.dados["restaurada"] else f"{evento.dados['duracao_segundos']:.1f}s"
+            caixa.write(f"🛠️ [DEBUG] Sub-consulta recebida: {evento.dados['caracteres']} caracteres ({origem})")
+        
+        elif evento.tipo == TipoEvento.ERRO:
+            if caixa:
+                caixa.write(f"❌ [ERRO] {evento.dados['mensagem']}")
+                self.com_erro.add(evento.fase)
+            else:
+                st.error(f"❌ Erro: {evento.dados['mensagem']}")
+        
+        elif evento.tipo == TipoEvento.FASE_CONCLUIDA and caixa:
+            achados = resumo_achados(evento.fase, evento.dados["resultado"])
+            if achados:
+                caixa.write("📊 **Principais achados:**")
+                for linha in achados:
+                    caixa.write(f"  • {linha}")
+            numero = FASES_UI.get(evento.fase, (None, evento.fase))[1]
+            if evento.fase in self.com_erro:
+                caixa.update(label=f"⚠️ {numero} com erro", state="error")
+            else:
+                caixa.update(label=f"✅ {numero} COMPLETA", state="complete")
+        
+        elif evento.tipo == TipoEvento.GATE_ACIONADO:
+            st.warning(
+                f"⛔ **Gate '{evento.dados['regra']}':** {evento.dados['descricao']} — "
+                f"{len(evento.dados['fases_puladas'])} fase(s) puladas, "
+                f"{evento.dados['chamadas_economizadas']} chamadas LLM economizadas"
+            )
+        
+        elif evento.tipo == TipoEvento.RESULTADO_PARCIAL:
+            parcial = evento.dados["matriz_priorizacao"]
+            self.placar_parcial.info(
+                f"📈 Score parcial: **{parcial.get('score_final', 0)}/100** — {parcial.get('classificacao', '')}"
+            )
     
-    # FASE 10: MATRIZ
-    with st.status("🎯 **FASE 10:** Matriz", expanded=False) as status:
-        matriz = orch._calcular_matriz_priorizacao(results)
-        results["matriz_priorizacao"] = matriz
-        results["recomendacoes"] = orch._gerar_recomendacoes(results)
-        status.update(label="✅ FASE 10 COMPLETA", state="complete")
+    def encerrar(self):
+        self.placar_parcial.empty()
+
+
+@st.cache_resource
+def _subir_workers(api_key):
+    """Um pool de workers por chave, fora do processo do Streamlit (sobrevive a reruns/reloads)."""
+    return subprocess.Popen(
+        [sys.executable, "-m", "services.job_worker", "-w", str(WORKERS_APP)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env={**os.environ, "GEMINI_API_KEY": api_key},
+        start_new_session=True,
+    )
+
+
+def _chave_pool(api_key):
+    """
+    O pool é compartilhado por todas as sessões: usa a chave do servidor
+    (GEMINI_API_KEY no ambiente do Streamlit) quando houver. Sem ela, vale a
+    chave da sessão que subir o pool, e os jobs de TODOS os usuários rodam
+    (e são cobrados) nessa chave até o pool cair. Um pool subido pela CLI
+    usa a chave do seu próprio ambiente.
+    """
+    return os.environ.get("GEMINI_API_KEY") or api_key
+
+
+def garantir_workers(fila, api_key):
+    if fila.workers_ativos():
+        return
+    chave = _chave_pool(api_key)
+    processo = _subir_workers(chave)
+    if processo.poll() is not None:  # pool anterior morreu: sobe outro
+        _subir_workers.clear()
+        _subir_workers(chave)
+
+
+def acompanhar_job(fila, job_id):
+    """Reconstrói o progresso do job pelos eventos gravados e acompanha até terminar."""
+    job = fila.obter(job_id)
+    if not job:
+        st.error(f"❌ Job {job_id} não encontrado")
+        return None
     
-    # Finaliza
-    end_time = time.time()
-    duracao = end_time - start_time
-    results["metadata"]["timestamp_fim"] = datetime.now().isoformat()
-    results["metadata"]["duracao_segundos"] = duracao
+    st.markdown(f"## 🔄 INVESTIGAÇÃO: {job['empresa']}")
+    st.caption(f"Job `{job_id}` — acompanhe de qualquer sessão com `?job={job_id}`")
+    if job["status"] not in STATUS_FINAIS and st.button("⛔ Cancelar investigação"):
+        fila.cancelar(job_id)
     
-    return results, duracao
+    painel, seq = PainelProgresso(), 0
+    while True:
+        status = fila.status(job_id)  # lido antes dos eventos: o worker grava eventos antes de finalizar
+        for dados in fila.eventos(job_id, seq):
+            seq = dados["seq"]
+            painel.processar(EventoInvestigacao.from_dict(dados))
+        if status in STATUS_FINAIS:
+            break
+        time.sleep(INTERVALO_POLL_UI)
+    painel.encerrar()
+    return fila.obter(job_id)
 
 # Input
 st.header("🔍 Nova Investigação")
@@ -201,75 +260,93 @@ with col1:
 with col2:
     empresa_uf = st.selectbox("🌎 Estado", ["", "MT", "MS", "GO", "BA", "TO"])
 
+modo = st.radio(
+    "⚡ Modo",
+    list(PERFIS),
+    format_func=lambda m: {"rapido": "Rápido", "completo": "Completo", "profundo": "Profundo"}[m],
+    horizontal=True,
+    help=" | ".join(f"{p.nome}: {p.descricao}" for p in PERFIS.values())
+)
+
+fila = obter_fila()
+
 if st.button("🔥 EXECUTAR MODO DEUS", type="primary", use_container_width=True):
     if not empresa_nome:
         st.error("❌ Digite o nome da empresa!")
     elif not api_key:
         st.error("❌ Configure a API Key na sidebar!")
     else:
-        try:
-            st.markdown("---")
-            st.markdown("## 🔄 EXECUTANDO INVESTIGAÇÃO...")
-            
-            gemini = GeminiService(api_key=api_key)
-            orch = BandeiranteOrchestrator(gemini)
-            
-            # Executa com status visual
-            results, duracao = asyncio.run(
-                executar_com_status_visual(
-                    orch,
-                    empresa_nome,
-                    empresa_cnpj,
-                    empresa_uf or "MT"
-                )
-            )
-            
+        garantir_workers(fila, api_key)
+        job_id = fila.enfileirar(empresa_nome, empresa_cnpj, empresa_uf or "MT", modo=modo)
+        st.query_params["job"] = job_id
+
+job_id = st.query_params.get("job")
+if job_id:
+    try:
+        st.markdown("---")
+        ja_carregado = st.session_state.get("job_resultado") == job_id
+        job = fila.obter(job_id) if ja_carregado else acompanhar_job(fila, job_id)
+        
+        if job and job["status"] == "concluido" and not ja_carregado:
+            results = job["results"]
+            duracao = results.get("metadata", {}).get("duracao_segundos", 0)
             st.markdown("---")
             st.success(f"✅ **INVESTIGAÇÃO COMPLETA EM {duracao:.1f} SEGUNDOS!**")
+            custo = results.get("metadata", {}).get("custo", {})
+            if custo:
+                st.caption(
+                    f"Modo {results['metadata'].get('modo')} — {custo['chamadas_llm']} chamadas LLM, "
+                    f"~{custo['tokens_entrada_estimados'] + custo['tokens_saida_estimados']:,} tokens estimados"
+                )
             st.balloons()
             
-            st.session_state["results"] = results
-            st.session_state["empresa"] = empresa_nome
+            # guardado tipado (~4x menos memoria que o dict por sessao)
+            st.session_state["results"] = ResultadoInvestigacao.from_dict(results)
+            st.session_state["empresa"] = job["empresa"]
+            st.session_state["job_resultado"] = job_id
+            st.session_state.pop("dossie", None)
+        elif job and job["status"] in ("erro", "cancelado"):
+            st.error(f"❌ Job {job['status']}: {job.get('erro') or ''}")
             
-        except Exception as e:
-            st.error(f"❌ Erro: {str(e)}")
-            st.exception(e)
+    except Exception as e:
+        st.error(f"❌ Erro: {str(e)}")
+        st.exception(e)
 
 st.markdown("---")
 
 # Resultados
 if "results" in st.session_state:
-    results = st.session_state["results"]
+    inv = st.session_state["results"]
     
     st.markdown("## 📊 RESULTADOS DA INVESTIGAÇÃO")
     
-    matriz = results.get("matriz_priorizacao", {})
+    matriz = inv.matriz_priorizacao
     
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("SCORE", f"{matriz.get('score_final', 0)}/100")
+        st.metric("SCORE", f"{matriz.score_final}/100")
     
     with col2:
-        st.metric("STATUS", matriz.get('status', 'N/D'))
+        st.metric("STATUS", matriz.status or 'N/D')
     
     with col3:
-        area = matriz.get('area_total_ha', 0)
+        area = matriz.area_total_ha
         st.metric("ÁREA", f"{area:,.0f} ha")
     
     with col4:
-        st.metric("CLASSIFICAÇÃO", matriz.get('classificacao', 'N/D')[:15])
+        st.metric("CLASSIFICAÇÃO", (matriz.classificacao or 'N/D')[:15])
     
     st.markdown("---")
     
     # Recomendações
-    rec = results.get("recomendacoes", {})
+    rec = inv.recomendacoes
     
     st.markdown("### 🚀 RECOMENDAÇÕES DE AÇÃO")
-    st.markdown(f"**{rec.get('acao_recomendada', 'N/D')}**")
+    st.markdown(f"**{rec.acao_recomendada or 'N/D'}**")
     
     st.markdown("**Próximos Passos:**")
-    for passo in rec.get("proximos_passos", []):
+    for passo in rec.proximos_passos:
         st.markdown(f"- {passo}")
     
     st.markdown("---")
@@ -281,12 +358,12 @@ if "results" in st.session_state:
         if st.button("📄 GERAR DOSSIÊ COMPLETO", use_container_width=True):
             with st.spinner("📝 Gerando dossiê..."):
                 gen = DossieGenerator()
-                dossie = gen.gerar_dossie_completo(results)
+                dossie = gen.gerar_dossie_completo(inv)
                 st.session_state["dossie"] = dossie
                 st.success("✅ Dossiê gerado!")
     
     with col2:
-        json_str = json.dumps(results, ensure_ascii=False, indent=2)
+        json_str = inv.to_json(indent=2)
         st.download_button(
             label="💾 Download JSON",
             data=json_str,
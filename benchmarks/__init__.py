@@ -0,0 +1,6 @@
+"""
+benchmarks/ — MICROBENCHMARKS (fora das bibliotecas)
+Só medem tempo; a equivalência com o escalar é verificada em tests/.
+
+    python -m benchmarks.sas_batch
+"""
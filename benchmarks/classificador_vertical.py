@@ -0,0 +1,71 @@
+"""
+benchmarks/classificador_vertical.py — CLASSIFICADOR DE VERTICAL x VARREDURA POR SUBSTRING
+    python -m benchmarks.classificador_vertical
+"""
+import random
+import time
+
+from scout_types import (
+    CNAE_ALGODAO, KEYWORDS_ALGODAO, DadosCNPJ, DadosOperacionais, DossieCompleto, Verticalizacao,
+)
+from utils.classificador_vertical import CLASSIFICADOR_VERTICAL, MatcherPalavras
+
+
+def _varredura(dossie: DossieCompleto) -> str:
+    # detectar_vertical antes do classificador, como referência de tempo
+    op, cnae = dossie.dados_operacionais, dossie.dados_cnpj.cnae_principal
+    culturas_str = " ".join(op.culturas).lower()
+    if cnae.startswith(CNAE_ALGODAO) or any(k in culturas_str for k in KEYWORDS_ALGODAO) \
+            or op.verticalizacao.algodoeira:
+        return 'Algodão'
+    if op.verticalizacao.usina_acucar_etanol or op.verticalizacao.destilaria \
+            or any(k in culturas_str for k in ('cana', 'etanol', 'acucar')):
+        return 'Bioenergia'
+    if cnae.startswith('0119') or op.verticalizacao.sementeira or op.verticalizacao.ubs \
+            or 'semente' in culturas_str:
+        return 'Sementes'
+    return 'Grãos'
+
+
+def main(total: int = 50_000) -> None:
+    rng = random.Random(42)
+    culturas = ['Soja', 'Milho', 'Algodão', 'Cana-de-açúcar', 'Café', 'Trigo', 'Feijão',
+                'Sementes de soja', 'Sorgo', 'Eucalipto', 'Pluma', 'Etanol', 'Arroz', 'Citros']
+    campos = ['algodoeira', 'usina_acucar_etanol', 'destilaria', 'sementeira', 'ubs', 'silos']
+    cnaes = ['0115-6/00', '0112-1/01', '0119-9/99', '1311-1/00', '0111-3/01', '']
+    dossies = [
+        DossieCompleto(
+            dados_cnpj=DadosCNPJ(cnae_principal=rng.choice(cnaes)),
+            dados_operacionais=DadosOperacionais(
+                culturas=rng.sample(culturas, rng.randint(0, 5)),
+                verticalizacao=Verticalizacao(**{c: True for c in campos if rng.random() < 0.04})),
+        )
+        for _ in range(total)
+    ]
+
+    for nome, func in (
+        ("varredura", lambda: [_varredura(d) for d in dossies]),
+        ("classificar_dossie", lambda: [CLASSIFICADOR_VERTICAL.classificar_dossie(d) for d in dossies]),
+        ("classificar_lote", lambda: CLASSIFICADOR_VERTICAL.classificar_lote(dossies)),
+    ):
+        inicio = time.perf_counter()
+        func()
+        print(f"{nome:<20} {total:,} dossiês: {(time.perf_counter() - inicio) * 1000:7.1f} ms")
+
+    # com muitos termos (ex.: outras camadas) a alternância em trie não cresce com a lista
+    letras = "abcdefghijklmnopqrstuvwxyz"
+    termos = [''.join(rng.choice(letras) for _ in range(rng.randint(5, 10))) for _ in range(300)]
+    textos = [' '.join(''.join(rng.choice(letras) for _ in range(rng.randint(3, 9))) for _ in range(6))
+              for _ in range(20_000)]
+    matcher = MatcherPalavras({'termo': termos})
+    inicio = time.perf_counter()
+    [[t for t in termos if t in texto] for texto in textos]
+    meio = time.perf_counter()
+    matcher.termos_lote(textos)
+    fim = time.perf_counter()
+    print(f"300 termos x {len(textos):,} textos: `in` {(meio - inicio) * 1000:.0f} ms, "
+          f"regex {(fim - meio) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
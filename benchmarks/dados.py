@@ -0,0 +1,30 @@
+"""benchmarks/dados.py — CARTEIRA SINTÉTICA (features já extraídas)"""
+import numpy as np
+import pandas as pd
+
+from scout_types import VERTICALS_CORE
+from utils.sas_batch import COLUNAS_FEATURES
+
+
+def tabela_sintetica(total: int, semente: int = 42) -> pd.DataFrame:
+    """Carteira aleatória no formato de `tabela_features`."""
+    rng = np.random.default_rng(semente)
+    colunas = {
+        'capital': np.round(rng.lognormal(16, 2, total), 2),
+        'hectares': rng.integers(0, 150_000, total).astype(np.float64),
+        'area_irrigada_ha': rng.integers(0, 8_000, total).astype(np.float64),
+        'vertical': rng.choice(list(VERTICALS_CORE), total),
+        'funcionarios': rng.integers(0, 1_500, total).astype(np.float64),
+        'qsa': rng.integers(0, 8, total),
+        'vagas_ti': rng.integers(0, 7, total),
+        'tecnologias': rng.integers(0, 5, total),
+        'certificacoes': rng.integers(0, 4, total),
+        'movimentos_financeiros': rng.integers(0, 3, total),
+        'conf_operacional': rng.random(total),
+        'conf_financeiro': rng.random(total),
+        'conf_cadeia': rng.random(total),
+    }
+    for nome, tipo in COLUNAS_FEATURES.items():
+        if tipo == 'bool':
+            colunas[nome] = rng.random(total) < 0.3
+    return pd.DataFrame(colunas, columns=list(COLUNAS_FEATURES))
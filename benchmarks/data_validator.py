@@ -0,0 +1,46 @@
+"""
+benchmarks/data_validator.py — NUMEROS pt-BR: ESCALAR x LOTE
+    python -m benchmarks.data_validator
+"""
+import random
+import time
+
+from services.data_validator import DataValidator, analisar_numero_br, np, pd
+
+
+def main(total: int = 1_000_000) -> None:
+    modelos = ["R$ {:,.2f}", "{:,.0f} ha", "{:.1f} mil hectares", "R$ {:.1f} milhões",
+               "{:.0f} alqueires", "{:,.0f} toneladas", "{:.1f} mi de sacas", "N/D"]
+    rng = random.Random(42)
+
+    def _texto(i: int) -> str:
+        modelo = modelos[i % len(modelos)]
+        bruto = modelo.format(rng.uniform(1, 5_000_000))
+        return bruto.replace(",", "X").replace(".", ",").replace("X", ".")  # pt-BR
+
+    distintos = [_texto(i) for i in range(5000)]
+    repetidos = [rng.choice(distintos) for _ in range(total)]
+
+    def _medir(rotulo: str, funcao, dados, n: int) -> None:
+        analisar_numero_br.cache_clear()
+        inicio = time.perf_counter()
+        funcao(dados)
+        duracao = time.perf_counter() - inicio
+        print(f"{rotulo:<44} {n / duracao / 1e6:6.2f} M valores/s ({duracao * 1000:7.1f} ms)")
+
+    print(f"backend: numpy={'sim' if np is not None else 'nao'} pandas={'sim' if pd is not None else 'nao'}")
+    _medir(f"lista, {total:,} textos (5 mil distintos)", DataValidator.to_float_lote, repetidos, total)
+    if pd is not None:
+        _medir(f"Series, {total:,} textos (5 mil distintos)", DataValidator.to_float_lote,
+               pd.Series(repetidos), total)
+    if np is not None:
+        numeros = np.random.default_rng(42).uniform(0, 1e6, total)
+        _medir(f"ndarray float64, {total:,} valores", DataValidator.to_float_lote, numeros, total)
+    unicos = [_texto(i) for i in range(100_000)]
+    _medir("lista, 100,000 textos todos distintos", DataValidator.to_float_lote, unicos, len(unicos))
+    _medir("escalar to_float, 100,000 textos distintos",
+           lambda dados: [DataValidator.to_float(v) for v in dados], unicos, len(unicos))
+
+
+if __name__ == "__main__":
+    main()
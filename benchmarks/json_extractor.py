@@ -0,0 +1,61 @@
+"""
+benchmarks/json_extractor.py — EXTRATOR LEGADO (REGEX GULOSA) x extrair_json
+    python -m benchmarks.json_extractor
+"""
+import json
+import logging
+import re
+import time
+from typing import Dict
+
+from utils.json_extractor import BACKEND, extrair_json, metricas
+
+
+def _extrator_legado(texto: str) -> Dict:
+    """O que a maioria das layers fazia antes."""
+    try:
+        clean = texto.replace("```json", "").replace("```", "").strip()
+        match = re.search(r'\{.*\}', clean, re.DOTALL)
+        if match:
+            return json.loads(match.group(0))
+    except Exception:
+        pass
+    return {}
+
+
+def _respostas_sinteticas() -> Dict[str, str]:
+    """Respostas no tamanho das reais (investigacoes com search grounding: 5-60 KB)."""
+    processos = [
+        {"numero": f"000{i:04d}-12.2023.8.11.0041", "tipo": "Trabalhista", "valor": f"R$ {i * 1000}",
+         "status": "Em andamento", "descricao": "Reclamacao com \"aspas\" e {chaves} no texto " * 3}
+        for i in range(120)
+    ]
+    dados = {"processos_judiciais": {"total": len(processos), "processos": processos},
+             "saude_financeira": {"rating": "B+", "observacoes": ["ok"] * 50}}
+    corpo = json.dumps(dados, ensure_ascii=False, indent=2)
+    prosa = "Segue a analise solicitada com base nas fontes consultadas. " * 40
+    return {
+        "cerca + prosa": f"{prosa}\n```json\n{corpo}\n```\nObservacao: valores em {{R$}} estimados.",
+        "sem cerca, prosa com chaves depois": f"{prosa}\n{corpo}\n\nNota: campos {{vazios}} = nao encontrado.",
+        "json puro": corpo,
+        "virgula sobrando + aspas simples": corpo.replace('"rating"', "'rating'").replace('"ok"\n', '"ok",\n'),
+        "truncado no max_output_tokens": f"```json\n{corpo[:len(corpo) * 2 // 3]}",
+    }
+
+
+def main(rodadas: int = 200) -> None:
+    logging.basicConfig(level=logging.ERROR)
+    for nome, resposta in _respostas_sinteticas().items():
+        linha = [f"{nome:<36} {len(resposta) / 1024:5.1f} KB"]
+        for rotulo, funcao in (("legado", _extrator_legado), ("novo", extrair_json)):
+            inicio = time.perf_counter()
+            for _ in range(rodadas):
+                resultado = funcao(resposta)
+            ms = (time.perf_counter() - inicio) / rodadas * 1000
+            linha.append(f"{rotulo}: {ms:7.3f} ms {'ok' if resultado else 'FALHOU'}")
+        print(" | ".join(linha))
+    print(f"backend: {BACKEND} | metricas: {metricas()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+benchmarks/result_models.py — MEMORIA: DICT x RESULTADOINVESTIGACAO
+    python -m benchmarks.result_models
+"""
+import gc
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from services.result_models import ResultadoInvestigacao
+
+
+def _investigacao_sintetica(i: int) -> Dict:
+    """Resultado no formato do orchestrator, com strings novas por investigacao (como vem do json.loads)."""
+    municipios = ["Sapezal-MT", "Sorriso-MT", "Rio Verde-GO", "Luis Eduardo Magalhaes-BA"]
+    results = {
+        "metadata": {"empresa": f"Grupo {i}", "cnpj": f"{i:014d}", "uf": "MT", "modo": "completo",
+                     "versao": "3.0-MODO-DEUS", "investigation_id": f"inv-{i:06d}",
+                     "timestamp_inicio": "2026-01-10T10:00:00", "duracao_segundos": 184.2},
+        "fases": {
+            "fase_-1_reputation": {"judicial": {"severidade_geral": "AMARELO"}, "flag_risco": "AMARELO"},
+            "fase_1_incentivos": {
+                "incentivos_estaduais": {
+                    "incentivos_encontrados": [
+                        {"nome": "PRODEIC", "tipo": "Estadual", "uf": "MT", "data_concessao": "2022-01-15",
+                         "vigencia": "2022-2032", "documento_prova": f"Resolucao IOMAT {i}/2022",
+                         "beneficio_estimado": "Reducao de 85% ICMS", "exigencias": "EFD ICMS correta"}
+                    ] * 3,
+                    "total_incentivos": "3", "valor_beneficio_anual_estimado": "R$ 12 milhoes",
+                    "risco_perda": "MEDIO", "oportunidade_senior": "Motor fiscal automatizado"},
+                "sancoes_multas": {"total_multas_quantidade": 2, "total_multas_valor": "R$ 350 mil"},
+            },
+            "fase_2_territorial": {
+                "dados_fundiarios": {
+                    "imoveis_rurais": [
+                        {"nome_fazenda": f"Fazenda {j}", "municipio": municipios[j % 4], "uf": "MT",
+                         "area_ha": "15000", "tipo_operacao": "Soja/Milho/Algodao", "data_registro": "2018-06-15",
+                         "georreferenciado": "true", "coordenadas_aprox": "-13.5, -58.7",
+                         "infraestrutura_visivel": "Silos, secadores, sede administrativa"}
+                        for j in range(8)
+                    ],
+                    "area_total_ha": 120000, "total_imoveis": 8, "estados_presenca": ["MT", "GO", "BA"],
+                    "municipios": municipios, "car_status": {"cadastrado": True, "app_regular": True}},
+                "licencas_ambientais": {
+                    "licencas_ativas": [
+                        {"tipo": "LO - Licenca de Operacao", "orgao": "SEMA-MT", "data_emissao": "2024-06-15",
+                         "validade": "2028-06-15", "atividade": "Algodoeira", "localizacao": "Sapezal-MT",
+                         "recente": True, "implicacao": "Nova algodoeira = WMS + rastreabilidade"}
+                    ] * 4,
+                    "total_licencas": 4, "licencas_recentes_6m": 1},
+            },
+            "fase_3_logistica": {
+                "armazenagem": {
+                    "unidades_armazenagem": [
+                        {"nome": f"Armazem {j}", "municipio": municipios[j % 4], "tipo": "Silo Metalico",
+                         "capacidade_toneladas": 50000, "proprietario": True, "status_conab": "Registrado"}
+                        for j in range(6)
+                    ],
+                    "capacidade_total_toneladas": 300000, "total_unidades": 6,
+                    "tipo_predominante": "Silo", "necessidade_wms": "ALTA"},
+                "frota_logistica": {"rntrc": {"ativo": True, "quantidade_veiculos": 45,
+                                              "tipos_veiculos": ["Bitrem", "Rodotrem"]},
+                                    "necessidade_tms": "ALTA"},
+            },
+            "fase_4_societario": {"estrutura": {"grupo_economico": {"holding_controladora": "Holding X",
+                                                                    "total_empresas_grupo": 5}},
+                                  "risco_societario": "VERDE"},
+            "fase_5_executivos": {"hierarquia": {
+                "executivos_identificados": [
+                    {"nome": f"Executivo {j}", "cargo": "CFO", "tipo_poder": "TOTAL",
+                     "eh_socio_fundador": False, "tempo_empresa": "5 anos"} for j in range(4)
+                ],
+                "tem_area_ti": True, "tipo_decisao": "COLEGIADA", "vagas_ti_abertas": ["Gerente de TI"]}},
+            "fase_6_triggers": {"triggers": [{"tipo": "LICENCA_RECENTE", "severidade": "CRITICA",
+                                              "descricao": "1 licença(s) recente(s)"}],
+                                "total_triggers": 1, "urgencia_geral": "CRITICA",
+                                "contexto_sazonal": {"periodo": "Normal", "abertura": "MEDIA"},
+                                "melhor_momento_contato": "PRÓXIMOS 30 DIAS"},
+            "fase_7_psicologia": {"storytelling_abertura": f"Pesquisei o Grupo {i}...",
+                                  "gatilho_psicologico": "ROI + Compliance", "canal_preferido": "LinkedIn"},
+        },
+        "matriz_priorizacao": {"score_final": 90, "status": "STRIKE", "classificacao": "🔥 STRIKE",
+                               "area_total_ha": 120000},
+        "recomendacoes": {"acao_recomendada": "AÇÃO IMEDIATA", "status": "STRIKE", "score": 90,
+                          "proximos_passos": ["1. Contatar nas próximas 24-48h", "2. Agendar call"]},
+    }
+    return json.loads(json.dumps(results, ensure_ascii=False))
+
+
+def main(total: int = 1000) -> None:
+    textos = [json.dumps(_investigacao_sintetica(i), ensure_ascii=False) for i in range(total)]
+
+    def _medir(rotulo: str, construir: Callable[[str], Any]) -> None:
+        gc.collect()
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        guardadas = [construir(t) for t in textos]
+        duracao = time.perf_counter() - inicio
+        memoria, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{rotulo:<24} {memoria / 1024 / 1024:7.2f} MB | {memoria / total / 1024:6.1f} KB/investigacao"
+              f" | {duracao / total * 1e6:7.1f} us/investigacao")
+        del guardadas
+
+    print(f"{total} investigacoes armazenadas:")
+    _medir("dict (json.loads)", json.loads)
+    _medir("ResultadoInvestigacao", lambda t: ResultadoInvestigacao.from_dict(json.loads(t)))
+
+    modelo = ResultadoInvestigacao.from_dict(json.loads(textos[0]))
+    rodadas = 2000
+    inicio = time.perf_counter()
+    for _ in range(rodadas):
+        modelo.to_dict()
+    print(f"to_dict: {(time.perf_counter() - inicio) / rodadas * 1e6:.1f} us/investigacao")
+
+
+if __name__ == "__main__":
+    main()
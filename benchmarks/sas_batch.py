@@ -0,0 +1,57 @@
+"""
+benchmarks/sas_batch.py — LOTE VETORIAL x calcular_sas_v2
+    python -m benchmarks.sas_batch
+"""
+import time
+
+import numpy as np
+
+from benchmarks.dados import tabela_sintetica
+from scout_types import (
+    CadeiaValor, DadosCNPJ, DadosFinanceiros, DadosOperacionais, DossieCompleto, Verticalizacao,
+)
+from utils.sas_batch import calcular_sas_lote, tabela_features
+from utils.sas_scoring_v2 import calcular_sas_v2
+
+
+def main(total: int = 100_000, amostra: int = 2_000) -> None:
+    tabela = tabela_sintetica(total)
+    calcular_sas_lote(tabela.head(10))
+    inicio = time.perf_counter()
+    resultado = calcular_sas_lote(tabela)
+    duracao = time.perf_counter() - inicio
+    print(f"lote vetorial, {total:,} linhas: {duracao * 1000:7.1f} ms "
+          f"({total / duracao / 1e6:.2f} M linhas/s)")
+    print("  tiers:", resultado['tier'].value_counts().to_dict())
+
+    rng = np.random.default_rng(7)
+    dossies = [
+        DossieCompleto(
+            dados_cnpj=DadosCNPJ(natureza_juridica=str(rng.choice(['S.A.', 'LTDA', 'COOPERATIVA', ''])),
+                                 razao_social=str(rng.choice(['Agro X Ltda', 'Fulano ME ', ''])),
+                                 qsa=[{}] * int(rng.integers(0, 5))),
+            dados_operacionais=DadosOperacionais(
+                hectares_total=int(rng.integers(0, 150_000)), confianca=float(rng.random()),
+                verticalizacao=Verticalizacao(silos=bool(rng.random() < 0.4),
+                                              algodoeira=bool(rng.random() < 0.2))),
+            dados_financeiros=DadosFinanceiros(capital_social_estimado=float(rng.lognormal(16, 2)),
+                                               funcionarios_estimados=int(rng.integers(0, 1_500)),
+                                               confianca=float(rng.random())),
+            cadeia_valor=CadeiaValor(confianca=float(rng.random())),
+        )
+        for _ in range(amostra)
+    ]
+    inicio = time.perf_counter()
+    for d in dossies:
+        calcular_sas_v2(d)
+    escalar = (time.perf_counter() - inicio) / amostra
+    print(f"escalar calcular_sas_v2: {escalar * 1e6:7.1f} us/dossie "
+          f"(~{escalar * total:.1f} s para {total:,}) -> lote {escalar * total / duracao:,.0f}x")
+
+    inicio = time.perf_counter()
+    tabela_features(dossies)
+    print(f"extração de features: {(time.perf_counter() - inicio) / amostra * 1e6:7.1f} us/dossie (1x por carteira)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+benchmarks/sas_calibracao.py — CONFIGURAÇÕES AVALIADAS POR MINUTO
+    python -m benchmarks.sas_calibracao
+"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.dados import tabela_sintetica
+from services.sas_calibracao import calibrar, espaco_padrao, preparar_base
+from utils.sas_regras import REGRAS_V2, compilar_regras
+
+
+def main(total: int = 10_000, configuracoes: int = 5_000) -> None:
+    tabela = tabela_sintetica(total)
+    score = compilar_regras(REGRAS_V2).avaliar(tabela)["score"].to_numpy()
+    rng = np.random.default_rng(1)
+    ganhou = pd.Series(rng.random(total) < 1 / (1 + np.exp(-(score - 500) / 80)), index=tabela.index)
+    inicio = time.perf_counter()
+    base = preparar_base(tabela, REGRAS_V2, ganhou)
+    print(f"preparar_base, {total:,} dossiês: {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    espaco = espaco_padrao()
+    for processos in sorted({1, os.cpu_count() or 1}):
+        r = calibrar(base, espaco, amostras=configuracoes, processos=processos)
+        print(f"{len(r.tabela):,} configurações x {total:,} dossiês, {processos} processo(s): "
+              f"{r.duracao_segundos:.2f}s ({len(r.tabela) / r.duracao_segundos * 60:,.0f}/min)")
+    print(f"AUC atual {r.atual['auc']:.3f} | melhor {r.melhores(1)['auc'].iloc[0]:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+benchmarks/sas_regras.py — COMPILAÇÃO E WHAT-IF DAS REGRAS SAS
+    python -m benchmarks.sas_regras
+"""
+import time
+from dataclasses import replace
+
+from benchmarks.dados import tabela_sintetica
+from scout_types import PESOS_PILARES_V2, TIERS_V2
+from utils.sas_regras import ColunasSAS, REGRAS_V2, comparar_regras, compilar_regras
+
+
+def main(total: int = 100_000, rodadas: int = 20) -> None:
+    colunas = ColunasSAS(tabela_sintetica(total))
+    inicio = time.perf_counter()
+    avaliador = compilar_regras(REGRAS_V2)
+    print(f"compilação REGRAS_V2: {(time.perf_counter() - inicio) * 1e6:.0f} us")
+
+    inicio = time.perf_counter()
+    avaliador.avaliar(colunas)
+    print(f"1ª avaliação (converte colunas), {total:,} linhas: {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    alternativa = replace(REGRAS_V2, nome="tiers+50", tiers={k: v + 50 for k, v in TIERS_V2.items()},
+                          tetos={**PESOS_PILARES_V2, "momento": 220})
+    inicio = time.perf_counter()
+    for _ in range(rodadas):
+        diff = comparar_regras(colunas, alternativa, base=avaliador)
+    print(f"comparar_regras (base + alternativa), {total:,} linhas: "
+          f"{(time.perf_counter() - inicio) / rodadas * 1000:.1f} ms")
+    print(" ", diff.resumo())
+
+
+if __name__ == "__main__":
+    main()
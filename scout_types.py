@@ -3,9 +3,12 @@ scout_types.py — Contrato de Dados v3.1 (Full Agro Verticals)
 CORRIGIDO: SASBreakdown agora tem @property total()
 """
 from __future__ import annotations
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, make_dataclass
 from enum import Enum
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class Tier(str, Enum):
@@ -21,112 +24,233 @@ class QualityLevel(str, Enum):
     INSUFICIENTE = "INSUFICIENTE"
 
 
+# =============================================================================
+# SAS 4.0 v0.2 — CALIBRAÇÃO (usada por utils/sas_scoring_v2)
+# =============================================================================
+
+# Pontos de Complexidade pela vertical detectada (fora da tabela: 80)
+VERTICALS_CORE = {
+    'Algodão': 140,
+    'Bioenergia': 130,
+    'Sementes': 110,
+    'Grãos': 100,
+}
+
+# Teto de cada pilar (350 + 250 + 220 + 180 + bônus S.A. 30 = 1030, cap 1000)
+PESOS_PILARES_V2 = {
+    'musculo': 350,
+    'complexidade': 250,
+    'gente': 220,
+    'momento': 180,
+}
+
+# Score mínimo de cada tier (abaixo de PRATA = BRONZE)
+TIERS_V2 = {
+    'DIAMANTE': 820,
+    'OURO': 650,
+    'PRATA': 430,
+}
+
+# Prefixos de CNAE: cultivo de algodão herbáceo e fiação de algodão
+CNAE_ALGODAO = ('0112-1', '01121', '1311', '13111')
+
+KEYWORDS_ALGODAO = ('algodão', 'algodao', 'pluma', 'cotton')
+
+# Termos/prefixos das demais verticais (casados sem acento; ver utils/classificador_vertical)
+KEYWORDS_BIOENERGIA = ('cana', 'etanol', 'açúcar')
+CNAE_SEMENTES = ('0119',)
+KEYWORDS_SEMENTES = ('semente',)
+
+
 # =============================================================================
 # VERTICALIZAÇÃO — TODAS AS CADEIAS DO AGRO (40+ campos)
 # =============================================================================
 
-@dataclass
+# popcount nativo (3.10+); bin().count nas versões anteriores
+_popcount = getattr(int, "bit_count", None) or (lambda x: bin(x).count("1"))
+
+
+class _Flag:
+    """Campo booleano de Verticalizacao guardado num bit de `_bits`."""
+    __slots__ = ("mascara",)
+
+    def __init__(self, mascara: int):
+        self.mascara = mascara
+
+    def __get__(self, obj, tipo=None):
+        if obj is None:
+            return False        # Verticalizacao.silos -> default, como no dataclass
+        return bool(obj._bits & self.mascara)
+
+    def __set__(self, obj, valor) -> None:
+        if valor:
+            obj._bits |= self.mascara
+        else:
+            obj._bits &= ~self.mascara
+
+
 class Verticalizacao:
-    # Armazenagem & Logística
-    silos: bool = False
-    armazens_gerais: bool = False
-    terminal_portuario: bool = False
-    ferrovia_propria: bool = False
-    frota_propria: bool = False
-    # Beneficiamento Grãos/Fibras
-    algodoeira: bool = False
-    sementeira: bool = False
-    ubs: bool = False                    # Unidade Beneficiamento Sementes
-    secador: bool = False
-    # Agroindústria Vegetal
-    agroindustria: bool = False
-    usina_acucar_etanol: bool = False
-    destilaria: bool = False
-    esmagadora_soja: bool = False
-    refinaria_oleo: bool = False
-    fabrica_biodiesel: bool = False
-    torrefacao_cafe: bool = False
-    beneficiamento_arroz: bool = False
-    fabrica_sucos: bool = False
-    vinicultura: bool = False
-    # Proteína Animal
-    frigorifico_bovino: bool = False
-    frigorifico_aves: bool = False
-    frigorifico_suinos: bool = False
-    frigorifico_peixes: bool = False
-    laticinio: bool = False
-    fabrica_racao: bool = False
-    incubatorio: bool = False
-    # Insumos & Genética
-    fabrica_fertilizantes: bool = False
-    fabrica_defensivos: bool = False
-    laboratorio_genetica: bool = False
-    central_inseminacao: bool = False
-    viveiro_mudas: bool = False
-    # Energia & Sustentabilidade
-    cogeracao_energia: bool = False
-    usina_solar: bool = False
-    biodigestor: bool = False
-    planta_biogas: bool = False
-    creditos_carbono: bool = False
-    # Florestal & Celulose
-    florestal_eucalipto: bool = False
-    florestal_pinus: bool = False
-    fabrica_celulose: bool = False
-    serraria: bool = False
-    # Irrigação
-    pivos_centrais: bool = False
-    irrigacao_gotejamento: bool = False
-    barragem_propria: bool = False
-    # Tecnologia
-    agricultura_precisao: bool = False
-    drones_proprios: bool = False
-    estacoes_meteorologicas: bool = False
-    telemetria_frota: bool = False
-    erp_implantado: bool = False
-
-    _LABELS: dict = field(default_factory=lambda: {}, repr=False, init=False)
-
-    def __post_init__(self):
-        self._LABELS = {
-            'silos': '🏗️ Silos', 'armazens_gerais': '🏗️ Armazéns',
-            'terminal_portuario': '🚢 Terminal Portuário', 'ferrovia_propria': '🚂 Ferrovia',
-            'frota_propria': '🚛 Frota', 'algodoeira': '☁️ Algodoeira',
-            'sementeira': '🌱 Sementeira', 'ubs': '🌱 UBS',
-            'secador': '🔥 Secador', 'agroindustria': '🏭 Agroindústria',
-            'usina_acucar_etanol': '⚡ Usina Açúcar/Etanol', 'destilaria': '🧪 Destilaria',
-            'esmagadora_soja': '🫘 Esmagadora Soja', 'refinaria_oleo': '🛢️ Refinaria Óleo',
-            'fabrica_biodiesel': '⛽ Biodiesel', 'torrefacao_cafe': '☕ Torrefação Café',
-            'beneficiamento_arroz': '🍚 Benef. Arroz', 'fabrica_sucos': '🍊 Fábrica Sucos',
-            'vinicultura': '🍷 Vinicultura', 'frigorifico_bovino': '🥩 Frigorífico Bovino',
-            'frigorifico_aves': '🍗 Frigorífico Aves', 'frigorifico_suinos': '🐷 Frigorífico Suínos',
-            'frigorifico_peixes': '🐟 Frigorífico Peixes', 'laticinio': '🥛 Laticínio',
-            'fabrica_racao': '🌾 Fáb. Ração', 'incubatorio': '🥚 Incubatório',
-            'fabrica_fertilizantes': '🧫 Fáb. Fertilizantes', 'fabrica_defensivos': '🧴 Fáb. Defensivos',
-            'laboratorio_genetica': '🧬 Lab. Genética', 'central_inseminacao': '🧬 Central Inseminação',
-            'viveiro_mudas': '🌿 Viveiro Mudas', 'cogeracao_energia': '⚡ Cogeração',
-            'usina_solar': '☀️ Solar', 'biodigestor': '♻️ Biodigestor',
-            'planta_biogas': '💨 Biogás', 'creditos_carbono': '🌍 Créditos Carbono',
-            'florestal_eucalipto': '🌲 Eucalipto', 'florestal_pinus': '🌲 Pinus',
-            'fabrica_celulose': '📄 Celulose', 'serraria': '🪵 Serraria',
-            'pivos_centrais': '💧 Pivôs Centrais', 'irrigacao_gotejamento': '💧 Gotejamento',
-            'barragem_propria': '🌊 Barragem', 'agricultura_precisao': '📡 Agric. Precisão',
-            'drones_proprios': '🛸 Drones', 'estacoes_meteorologicas': '🌤️ Estações Meteo',
-            'telemetria_frota': '📍 Telemetria', 'erp_implantado': '💻 ERP',
-        }
+    """
+    Operações da empresa como bitmask: um int por instância e a tabela
+    campo/bit/label na classe. Mesma API do antigo dataclass de booleanos
+    (`v.silos`, `Verticalizacao(silos=True)`, `listar_ativos`, `count`,
+    `all_fields`), mais operações de conjunto (|, &, -, ^) e conversão em
+    lote para matriz NumPy.
+    """
+    __slots__ = ("_bits",)
+
+    # (campo, label) na ordem dos bits
+    _TABELA: tuple = (
+        # Armazenagem & Logística
+        ('silos', '🏗️ Silos'), ('armazens_gerais', '🏗️ Armazéns'),
+        ('terminal_portuario', '🚢 Terminal Portuário'), ('ferrovia_propria', '🚂 Ferrovia'),
+        ('frota_propria', '🚛 Frota'),
+        # Beneficiamento Grãos/Fibras
+        ('algodoeira', '☁️ Algodoeira'), ('sementeira', '🌱 Sementeira'),
+        ('ubs', '🌱 UBS'),                   # Unidade Beneficiamento Sementes
+        ('secador', '🔥 Secador'),
+        # Agroindústria Vegetal
+        ('agroindustria', '🏭 Agroindústria'), ('usina_acucar_etanol', '⚡ Usina Açúcar/Etanol'),
+        ('destilaria', '🧪 Destilaria'), ('esmagadora_soja', '🫘 Esmagadora Soja'),
+        ('refinaria_oleo', '🛢️ Refinaria Óleo'), ('fabrica_biodiesel', '⛽ Biodiesel'),
+        ('torrefacao_cafe', '☕ Torrefação Café'), ('beneficiamento_arroz', '🍚 Benef. Arroz'),
+        ('fabrica_sucos', '🍊 Fábrica Sucos'), ('vinicultura', '🍷 Vinicultura'),
+        # Proteína Animal
+        ('frigorifico_bovino', '🥩 Frigorífico Bovino'), ('frigorifico_aves', '🍗 Frigorífico Aves'),
+        ('frigorifico_suinos', '🐷 Frigorífico Suínos'), ('frigorifico_peixes', '🐟 Frigorífico Peixes'),
+        ('laticinio', '🥛 Laticínio'), ('fabrica_racao', '🌾 Fáb. Ração'),
+        ('incubatorio', '🥚 Incubatório'),
+        # Insumos & Genética
+        ('fabrica_fertilizantes', '🧫 Fáb. Fertilizantes'), ('fabrica_defensivos', '🧴 Fáb. Defensivos'),
+        ('laboratorio_genetica', '🧬 Lab. Genética'), ('central_inseminacao', '🧬 Central Inseminação'),
+        ('viveiro_mudas', '🌿 Viveiro Mudas'),
+        # Energia & Sustentabilidade
+        ('cogeracao_energia', '⚡ Cogeração'), ('usina_solar', '☀️ Solar'),
+        ('biodigestor', '♻️ Biodigestor'), ('planta_biogas', '💨 Biogás'),
+        ('creditos_carbono', '🌍 Créditos Carbono'),
+        # Florestal & Celulose
+        ('florestal_eucalipto', '🌲 Eucalipto'), ('florestal_pinus', '🌲 Pinus'),
+        ('fabrica_celulose', '📄 Celulose'), ('serraria', '🪵 Serraria'),
+        # Irrigação
+        ('pivos_centrais', '💧 Pivôs Centrais'), ('irrigacao_gotejamento', '💧 Gotejamento'),
+        ('barragem_propria', '🌊 Barragem'),
+        # Tecnologia
+        ('agricultura_precisao', '📡 Agric. Precisão'), ('drones_proprios', '🛸 Drones'),
+        ('estacoes_meteorologicas', '🌤️ Estações Meteo'), ('telemetria_frota', '📍 Telemetria'),
+        ('erp_implantado', '💻 ERP'),
+    )
+    _CAMPOS: tuple = tuple(c for c, _ in _TABELA)
+    _ROTULOS: tuple = tuple(r for _, r in _TABELA)
+    _BIT: dict = {c: i for i, c in enumerate(_CAMPOS)}
+    _LABELS: dict = dict(_TABELA)
+
+    def __init__(self, *args: bool, **kwargs: bool):
+        if len(args) > len(self._CAMPOS):
+            raise TypeError(f"Verticalizacao() recebe no máximo {len(self._CAMPOS)} argumentos posicionais")
+        self._bits = 0
+        for campo, valor in zip(self._CAMPOS, args):
+            setattr(self, campo, valor)
+        for campo, valor in kwargs.items():
+            if campo not in self._BIT:
+                raise TypeError(f"Verticalizacao() recebeu argumento inesperado '{campo}'")
+            setattr(self, campo, valor)
+
+    # -- representação compacta ------------------------------------------
+    @property
+    def bits(self) -> int:
+        return self._bits
 
+    @classmethod
+    def from_bits(cls, bits: int) -> "Verticalizacao":
+        v = cls.__new__(cls)
+        v._bits = int(bits) & ((1 << len(cls._CAMPOS)) - 1)
+        return v
+
+    @classmethod
+    def mascara(cls, *campos: str) -> int:
+        """Bits dos campos (ex.: para testar um grupo de uma vez: `v.bits & mascara`)."""
+        return sum(1 << cls._BIT[c] for c in campos)
+
+    # -- API original ------------------------------------------------------
     def listar_ativos(self) -> list[str]:
-        ativos = []
-        for campo, label in self._LABELS.items():
-            if getattr(self, campo, False):
-                ativos.append(label)
+        ativos, bits = [], self._bits
+        while bits:
+            menor = bits & -bits
+            ativos.append(self._ROTULOS[menor.bit_length() - 1])
+            bits ^= menor
         return ativos
 
     def count(self) -> int:
-        return len(self.listar_ativos())
+        return _popcount(self._bits)
 
     def all_fields(self) -> list[str]:
-        return [k for k in self._LABELS.keys()]
+        return list(self._CAMPOS)
+
+    def campos_ativos(self) -> list[str]:
+        return [c for i, c in enumerate(self._CAMPOS) if self._bits >> i & 1]
+
+    def to_dict(self) -> dict:
+        return {c: bool(self._bits >> i & 1) for i, c in enumerate(self._CAMPOS)}
+
+    # -- conjunto ----------------------------------------------------------
+    def __or__(self, outro: "Verticalizacao") -> "Verticalizacao":
+        return self.from_bits(self._bits | outro._bits)
+
+    def __and__(self, outro: "Verticalizacao") -> "Verticalizacao":
+        return self.from_bits(self._bits & outro._bits)
+
+    def __sub__(self, outro: "Verticalizacao") -> "Verticalizacao":
+        return self.from_bits(self._bits & ~outro._bits)
+
+    def __xor__(self, outro: "Verticalizacao") -> "Verticalizacao":
+        return self.from_bits(self._bits ^ outro._bits)
+
+    def __contains__(self, campo: str) -> bool:
+        return bool(self._bits >> self._BIT[campo] & 1)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __bool__(self) -> bool:
+        return True         # `if op.verticalizacao:` vale mesmo sem ativos, como no dataclass
+
+    def __eq__(self, outro) -> bool:
+        if not isinstance(outro, Verticalizacao):
+            return NotImplemented
+        return self._bits == outro._bits
+
+    __hash__ = None     # mutável, como o dataclass
+
+    def __repr__(self) -> str:
+        return f"Verticalizacao({', '.join(f'{c}=True' for c in self.campos_ativos())})"
+
+    def __reduce__(self):
+        return (self.__class__.from_bits, (self._bits,))
+
+    # -- lote --------------------------------------------------------------
+    @classmethod
+    def matriz(cls, itens) -> "np.ndarray":
+        """Matriz bool (N x campos, colunas na ordem de `all_fields`) de várias empresas."""
+        import numpy as np
+        bits = np.fromiter((v._bits for v in itens), dtype=np.uint64)
+        deslocamentos = np.arange(len(cls._CAMPOS), dtype=np.uint64)
+        return ((bits[:, None] >> deslocamentos) & np.uint64(1)).astype(bool)
+
+    @classmethod
+    def de_matriz(cls, matriz) -> list["Verticalizacao"]:
+        """Inverso de `matriz`."""
+        import numpy as np
+        pesos = np.left_shift(np.uint64(1), np.arange(len(cls._CAMPOS), dtype=np.uint64))
+        bits = np.asarray(matriz, dtype=bool).astype(np.uint64) @ pesos
+        return [cls.from_bits(int(b)) for b in bits]
+
+
+for _i, _campo in enumerate(Verticalizacao._CAMPOS):
+    setattr(Verticalizacao, _campo, _Flag(1 << _i))
+del _i, _campo
+# campos do antigo dataclass: asdict/astuple/fields/replace (ex.: asdict(DadosOperacionais)) seguem iguais
+Verticalizacao.__dataclass_fields__ = make_dataclass(
+    'Verticalizacao', [(c, bool, False) for c in Verticalizacao._CAMPOS]).__dataclass_fields__
 
 
 # =============================================================================
@@ -0,0 +1,88 @@
+"""
+services/async_runtime.py — EVENT LOOP PERSISTENTE EM THREAD DE FUNDO
+O script do Streamlit e sincrono e roda de novo a cada interacao. Em vez de
+`asyncio.run` por clique (loop novo, transports HTTP do `genai.Client.aio`
+recriados e descartados), um unico loop vive numa thread daemon e e dono dos
+clientes async; o script so submete coroutines de forma thread-safe.
+
+    runtime = obter_runtime()
+    resposta = runtime.executar(gemini.call_with_retry("..."), timeout=60)
+
+Overhead evitado: benchmarks/async_runtime.py.
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncRuntime:
+    """Um event loop rodando para sempre numa thread daemon."""
+
+    def __init__(self, nome: str = "bandeirante-async"):
+        self._loop = asyncio.new_event_loop()
+        self._pronto = threading.Event()
+        self._thread = threading.Thread(target=self._rodar, name=nome, daemon=True)
+        self._thread.start()
+        self._pronto.wait()
+        self._recursos: Dict[Any, Any] = {}
+        self._lock = threading.Lock()
+        self.submetidas = 0
+        logger.info(f"[ASYNC] Loop persistente no ar ({nome})")
+
+    def _rodar(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(self._pronto.set)
+        self._loop.run_forever()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def submeter(self, coro: Awaitable[T]) -> "Future[T]":
+        """Agenda a coroutine no loop de fundo; retorna um concurrent.futures.Future."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("submeter() bloquearia o proprio loop; use await direto")
+        self.submetidas += 1
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def executar(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Submete e espera o resultado (substitui `asyncio.run` no script)."""
+        futuro = self.submeter(coro)
+        try:
+            return futuro.result(timeout=timeout)
+        except TimeoutError:
+            futuro.cancel()
+            raise
+
+    def recurso(self, chave: Any, fabrica: Callable[[], T]) -> T:
+        """
+        Objeto de vida longa associado a este loop (ex.: GeminiService por API key).
+        Criado uma vez; reaproveita conexoes, sessoes TLS e estado do rate limiter.
+        """
+        with self._lock:
+            if chave not in self._recursos:
+                self._recursos[chave] = fabrica()
+            return self._recursos[chave]
+
+    def encerrar(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+_runtime: Optional[AsyncRuntime] = None
+_runtime_lock = threading.Lock()
+
+
+def obter_runtime() -> AsyncRuntime:
+    """Runtime unico do processo (criado na primeira chamada)."""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None or not _runtime._thread.is_alive():
+            _runtime = AsyncRuntime()
+        return _runtime
@@ -0,0 +1,223 @@
+"""
+services/batch_runner.py — INVESTIGACAO EM LOTE (HEADLESS)
+Le uma lista de prospects (CSV: empresa, cnpj, uf), roda o BandeiranteOrchestrator
+com limite global de concorrencia e rate limiter compartilhado, e grava cada
+resultado em NDJSON assim que termina. Reexecutar o mesmo comando retoma de onde
+parou: linhas ja gravadas como "ok" sao puladas e as demais reaproveitam seus checkpoints.
+Com outro --modo e outra investigacao: nada do modo anterior e pulado ou restaurado.
+
+Uso:
+    python -m services.batch_runner prospects.csv -o resultados.ndjson -c 4 --rpm 60
+"""
+import os
+import sys
+import csv
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import argparse
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from services.orchestrator import BandeiranteOrchestrator
+from services.checkpoint_store import CheckpointStore, DEFAULT_DB_PATH, STATUS_INCOMPLETO
+from services.execution_profiles import PERFIS, obter_perfil
+from services.gate_rules import carregar_regras
+
+logger = logging.getLogger(__name__)
+
+# Aliases aceitos no cabecalho do CSV
+_COLUNAS = {
+    "empresa": ("empresa", "nome", "razao_social", "grupo"),
+    "cnpj": ("cnpj",),
+    "uf": ("uf", "estado"),
+}
+
+
+@dataclass
+class Prospect:
+    linha: int
+    empresa: str
+    cnpj: str = ""
+    uf: str = ""
+
+    def investigation_id(self, modo: str = "completo") -> str:
+        """
+        Id deterministico por linha e modo: reexecutar o lote no mesmo modo cai
+        no mesmo checkpoint; outro modo e outra investigacao (nao pula nem
+        restaura o que foi feito com outro perfil).
+        """
+        base = f"{self.empresa.strip().lower()}|{self.cnpj}|{self.uf.upper()}"
+        modo = obter_perfil(modo).nome
+        if modo != "completo":  # ids do modo padrao ficam como antes: lotes em andamento seguem retomando
+            base += f"|{modo}"
+        return "lote-" + hashlib.sha1(base.encode("utf-8")).hexdigest()[:16]
+
+
+def ler_prospects(caminho: str) -> List[Prospect]:
+    """Le o CSV (separador ',' ou ';', cabecalho obrigatorio)."""
+    with open(caminho, newline="", encoding="utf-8-sig") as f:
+        amostra = f.read(4096)
+        f.seek(0)
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=",;\t")
+        except csv.Error:
+            dialeto = csv.excel
+        reader = csv.DictReader(f, dialect=dialeto)
+        cabecalho = {c.strip().lower(): c for c in (reader.fieldnames or [])}
+
+        mapa = {}
+        for campo, aliases in _COLUNAS.items():
+            mapa[campo] = next((cabecalho[a] for a in aliases if a in cabecalho), None)
+        if not mapa["empresa"]:
+            raise ValueError(f"CSV sem coluna de empresa (esperado um de {_COLUNAS['empresa']})")
+
+        prospects = []
+        for i, row in enumerate(reader, start=2):
+            empresa = (row.get(mapa["empresa"]) or "").strip()
+            if not empresa:
+                continue
+            prospects.append(Prospect(
+                linha=i,
+                empresa=empresa,
+                cnpj=(row.get(mapa["cnpj"]) or "").strip() if mapa["cnpj"] else "",
+                uf=(row.get(mapa["uf"]) or "").strip().upper() if mapa["uf"] else "",
+            ))
+    return prospects
+
+
+def ids_concluidos(caminho_saida: str) -> Set[str]:
+    """investigation_ids ja gravados com sucesso no NDJSON (para retomar)."""
+    concluidos = set()
+    if not os.path.exists(caminho_saida):
+        return concluidos
+    with open(caminho_saida, encoding="utf-8") as f:
+        for linha in f:
+            try:
+                registro = json.loads(linha)
+            except json.JSONDecodeError:
+                continue  # linha truncada por interrupcao
+            if registro.get("status") == "ok":
+                concluidos.add(registro.get("investigation_id"))
+    return concluidos
+
+
+def _fmt_duracao(segundos: float) -> str:
+    segundos = int(segundos)
+    h, resto = divmod(segundos, 3600)
+    m, s = divmod(resto, 60)
+    return f"{h}h{m:02d}m" if h else f"{m}m{s:02d}s"
+
+
+class BatchRunner:
+    """Executa investigacoes em lote com concorrencia limitada e saida incremental."""
+
+    def __init__(self, orchestrator: BandeiranteOrchestrator, concorrencia: int = 4, modo: str = "completo"):
+        self.orch = orchestrator
+        self.concorrencia = max(1, concorrencia)
+        self.modo = modo
+
+    async def executar(self, prospects: List[Prospect], caminho_saida: str) -> Dict:
+        ja_feitos = ids_concluidos(caminho_saida)
+        pendentes = [p for p in prospects if p.investigation_id(self.modo) not in ja_feitos]
+        total = len(pendentes)
+        print(f"[LOTE] {len(prospects)} prospects | {len(prospects) - total} já concluídos | "
+              f"{total} pendentes | concorrência {self.concorrencia}")
+        if not total:
+            return {"total": 0, "ok": 0, "incompletos": 0, "erros": 0}
+
+        semaforo = asyncio.Semaphore(self.concorrencia)
+        stats = {"total": total, "ok": 0, "incompletos": 0, "erros": 0}
+        inicio = time.time()
+
+        with open(caminho_saida, "a", encoding="utf-8") as saida:
+
+            async def _rodar(p: Prospect):
+                investigation_id = p.investigation_id(self.modo)
+                async with semaforo:
+                    t0 = time.time()
+                    try:
+                        results = await self.orch.investigacao_completa(
+                            p.empresa, cnpj=p.cnpj, uf=p.uf, modo=self.modo,
+                            investigation_id=investigation_id
+                        )
+                        erro = results.get("erro")
+                    except Exception as e:  # nunca derruba o lote
+                        logger.error(f"[LOTE] {p.empresa}: {e}", exc_info=True)
+                        results, erro = None, str(e)
+
+                status = "erro" if erro else "ok"
+                if not erro and self.orch.checkpoints and \
+                        self.orch.checkpoints.status(investigation_id) == STATUS_INCOMPLETO:
+                    status = "incompleto"  # alguma sub-consulta falhou: refeita na próxima execução
+
+                registro = {
+                    "linha": p.linha,
+                    "empresa": p.empresa,
+                    "cnpj": p.cnpj,
+                    "uf": p.uf,
+                    "investigation_id": investigation_id,
+                    "modo": self.modo,
+                    "status": status,
+                    "erro": erro,
+                    "duracao_segundos": round(time.time() - t0, 1),
+                    "score": (results or {}).get("matriz_priorizacao", {}).get("score_final"),
+                    "gate": ((results or {}).get("gate") or {}).get("regra"),
+                    "results": results,
+                }
+                saida.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+                saida.flush()
+
+                stats[{"ok": "ok", "erro": "erros"}.get(status, "incompletos")] += 1
+                feitos = stats["ok"] + stats["erros"] + stats["incompletos"]
+                decorrido = time.time() - inicio
+                por_min = feitos / decorrido * 60 if decorrido else 0.0
+                eta = (total - feitos) * decorrido / feitos
+                print(f"[LOTE] {feitos}/{total} | {p.empresa[:40]} → {registro['status']} | "
+                      f"{por_min:.1f} inv/min | ETA {_fmt_duracao(eta)}", flush=True)
+
+            await asyncio.gather(*(_rodar(p) for p in pendentes))
+
+        stats["duracao_segundos"] = round(time.time() - inicio, 1)
+        print(f"[LOTE] Fim: {stats['ok']} ok, {stats['incompletos']} incompleta(s), {stats['erros']} erro(s) em "
+              f"{_fmt_duracao(stats['duracao_segundos'])}")
+        return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bandeirante Digital — investigação em lote")
+    parser.add_argument("csv", help="CSV com colunas empresa[, cnpj, uf]")
+    parser.add_argument("-o", "--saida", default="resultados.ndjson", help="Arquivo NDJSON de saída (append)")
+    parser.add_argument("-c", "--concorrencia", type=int, default=4, help="Investigações simultâneas")
+    parser.add_argument("--rpm", type=int, default=60, help="Quota de requisições/minuto do Gemini")
+    parser.add_argument("--modo", default="completo", choices=sorted(PERFIS),
+                        help="Perfil de execução (fases, modelo, tokens e tempo por fase)")
+    parser.add_argument("--checkpoint-db", default=DEFAULT_DB_PATH)
+    parser.add_argument("--gates", default=None, help="JSON de regras de saída antecipada (padrão: config/gates.json)")
+    parser.add_argument("--sem-gates", action="store_true", help="Roda todas as fases mesmo com gate disparado")
+    parser.add_argument("--api-key", default=os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY"))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if not args.api_key:
+        parser.error("Informe --api-key ou defina GEMINI_API_KEY")
+
+    from services.gemini_service import GeminiService
+
+    # Um único GeminiService = um rate limiter compartilhado por todo o lote
+    gemini = GeminiService(api_key=args.api_key, requests_per_minute=args.rpm)
+    regras = [] if args.sem_gates else carregar_regras(args.gates)
+    orch = BandeiranteOrchestrator(gemini, CheckpointStore(args.checkpoint_db), regras_gate=regras)
+    runner = BatchRunner(orch, concorrencia=args.concorrencia, modo=args.modo)
+
+    stats = asyncio.run(runner.executar(ler_prospects(args.csv), args.saida))
+    return 1 if stats.get("erros") or stats.get("incompletos") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
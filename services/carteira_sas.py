@@ -0,0 +1,127 @@
+"""
+services/carteira_sas.py — CARTEIRA DE DOSSIES PARA RE-SCORING (SQLite local)
+Guarda as features SAS de cada dossie ja investigado (uma linha por empresa),
+para que qualquer conjunto de regras (utils/sas_regras) seja aplicado a
+carteira inteira sem refazer investigacoes nem reler os dossies.
+
+    carteira = CarteiraSAS()
+    carteira.salvar_lote(dossies)
+    diff = carteira.comparar(carregar_regras_sas("config/sas_regras_teste.json"))
+"""
+import os
+import re
+import json
+import sqlite3
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+import pandas as pd
+
+from scout_types import DossieCompleto
+from utils.classificador_vertical import CLASSIFICADOR_VERTICAL
+from utils.sas_batch import COLUNAS_FEATURES, features_dossie
+from utils.sas_regras import ColunasSAS, DiffTiers, RegrasSAS, REGRAS_V2, comparar_regras, compilar_regras
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(".bandeirante", "carteira.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS carteira (
+    chave TEXT PRIMARY KEY,
+    empresa TEXT NOT NULL,
+    cnpj TEXT NOT NULL DEFAULT '',
+    features_json TEXT NOT NULL,
+    atualizado_em TEXT NOT NULL
+);
+"""
+
+
+def chave_dossie(dossie: DossieCompleto) -> str:
+    """CNPJ (so digitos) quando houver; senao o nome normalizado."""
+    cnpj = re.sub(r"\D", "", dossie.cnpj or (dossie.dados_cnpj.cnpj if dossie.dados_cnpj else ""))
+    return cnpj or dossie.empresa_alvo.strip().lower()
+
+
+class CarteiraSAS:
+    """
+    Features por empresa + cache das colunas NumPy em memoria: a primeira
+    comparacao le o banco; as seguintes so avaliam regras (milissegundos).
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        pasta = os.path.dirname(db_path)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with self._conectar() as conn:
+            conn.executescript(_SCHEMA)
+        self._colunas: Optional[ColunasSAS] = None
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+        """Conexao curta: commit ao sair sem erro, sempre fechada."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def salvar_lote(self, dossies: Iterable[DossieCompleto]) -> int:
+        """Insere/atualiza as features dos dossies. Retorna quantos foram gravados."""
+        agora = datetime.now().isoformat()
+        dossies = list(dossies)
+        classes = CLASSIFICADOR_VERTICAL.classificar_lote(dossies)
+        linhas = [
+            (chave_dossie(d), d.empresa_alvo.strip(), re.sub(r"\D", "", d.cnpj or ""),
+             json.dumps(features_dossie(d, c.vertical), ensure_ascii=False), agora)
+            for d, c in zip(dossies, classes)
+        ]
+        with self._conectar() as conn:
+            conn.executemany("INSERT OR REPLACE INTO carteira VALUES (?, ?, ?, ?, ?)", linhas)
+        self._colunas = None
+        logger.info(f"[CARTEIRA] {len(linhas)} dossie(s) gravado(s)")
+        return len(linhas)
+
+    def salvar(self, dossie: DossieCompleto) -> None:
+        self.salvar_lote([dossie])
+
+    def remover(self, chave: str) -> None:
+        with self._conectar() as conn:
+            conn.execute("DELETE FROM carteira WHERE chave = ?", (chave,))
+        self._colunas = None
+
+    def __len__(self) -> int:
+        with self._conectar() as conn:
+            return conn.execute("SELECT COUNT(*) FROM carteira").fetchone()[0]
+
+    def tabela(self) -> pd.DataFrame:
+        """Tabela de features (indice = chave), no formato de `tabela_features`."""
+        with self._conectar() as conn:
+            rows = conn.execute("SELECT chave, features_json FROM carteira ORDER BY chave").fetchall()
+        tabela = pd.DataFrame(
+            [json.loads(f) for _, f in rows],
+            index=pd.Index([c for c, _ in rows], name="chave"),
+            columns=list(COLUNAS_FEATURES),
+        )
+        # linhas gravadas antes de uma feature existir ficam sem ela: sem dado = zero/falso
+        tabela = tabela.fillna({c: 0 for c, t in COLUNAS_FEATURES.items() if t != "object"})
+        return tabela.astype(COLUNAS_FEATURES)
+
+    def colunas(self) -> ColunasSAS:
+        if self._colunas is None:
+            self._colunas = ColunasSAS(self.tabela())
+        return self._colunas
+
+    def reavaliar(self, regras: Optional[RegrasSAS] = None) -> pd.DataFrame:
+        """Score/tier de toda a carteira pelas regras dadas (padrao REGRAS_V2)."""
+        return compilar_regras(regras or REGRAS_V2).avaliar(self.colunas())
+
+    def comparar(self, alternativa: RegrasSAS, base: Optional[RegrasSAS] = None) -> DiffTiers:
+        """Quem muda de tier se a carteira passar de `base` para `alternativa`."""
+        return comparar_regras(self.colunas(), alternativa, base=base)
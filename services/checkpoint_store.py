@@ -0,0 +1,245 @@
+"""
+services/checkpoint_store.py — CHECKPOINTS DE INVESTIGACAO (SQLite local)
+Persiste cada fase e cada sub-consulta Gemini assim que concluem, para que uma
+investigacao interrompida possa ser retomada sem gastar tokens de novo.
+"""
+import os
+import re
+import json
+import uuid
+import sqlite3
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(".bandeirante", "checkpoints.db")
+
+STATUS_EM_ANDAMENTO = "em_andamento"
+STATUS_COMPLETO = "completo"
+STATUS_INCOMPLETO = "incompleto"      # terminou, mas alguma fase teve sub-consulta falha
+STATUS_ERRO = "erro"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS investigacoes (
+    investigation_id TEXT PRIMARY KEY,
+    empresa TEXT NOT NULL,
+    cnpj TEXT NOT NULL DEFAULT '',
+    params_json TEXT NOT NULL,
+    status TEXT NOT NULL,
+    criado_em TEXT NOT NULL,
+    atualizado_em TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fases (
+    investigation_id TEXT NOT NULL,
+    fase TEXT NOT NULL,
+    dados_json TEXT NOT NULL,
+    concluido_em TEXT NOT NULL,
+    entrada TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (investigation_id, fase)
+);
+CREATE TABLE IF NOT EXISTS subconsultas (
+    investigation_id TEXT NOT NULL,
+    chave TEXT NOT NULL,
+    resposta TEXT NOT NULL,
+    concluido_em TEXT NOT NULL,
+    PRIMARY KEY (investigation_id, chave)
+);
+CREATE INDEX IF NOT EXISTS idx_investigacoes_empresa ON investigacoes (empresa, atualizado_em);
+CREATE INDEX IF NOT EXISTS idx_investigacoes_cnpj ON investigacoes (cnpj, atualizado_em);
+"""
+
+
+def _so_digitos(valor: str) -> str:
+    return re.sub(r"\D", "", valor or "")
+
+
+def novo_investigation_id() -> str:
+    """Gera um id curto e unico para uma investigacao."""
+    return uuid.uuid4().hex[:16]
+
+
+class CheckpointStore:
+    """
+    Armazena checkpoints por investigation_id.
+    Uma conexao por operacao: seguro entre threads e entre processos (WAL).
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        pasta = os.path.dirname(db_path)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with self._conectar() as conn:
+            conn.executescript(_SCHEMA)
+            # Bases criadas antes da coluna `entrada` (hash dos inputs da fase)
+            colunas = {r[1] for r in conn.execute("PRAGMA table_info(fases)")}
+            if "entrada" not in colunas:
+                conn.execute("ALTER TABLE fases ADD COLUMN entrada TEXT NOT NULL DEFAULT ''")
+        logger.info(f"[CHECKPOINT] Store em {db_path}")
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+        """Conexao curta: commit ao sair sem erro, sempre fechada."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Investigacoes
+    # ------------------------------------------------------------------
+    def criar(self, investigation_id: str, params: Dict) -> None:
+        """
+        Registra uma investigacao (idempotente). Repetir o id atualiza os params:
+        a retomada usa o modo da execucao mais recente, nao o da primeira.
+        """
+        agora = datetime.now().isoformat()
+        with self._conectar() as conn:
+            conn.execute(
+                "INSERT INTO investigacoes VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (investigation_id) DO UPDATE SET params_json = excluded.params_json",
+                (investigation_id, params.get("empresa", "").strip(), _so_digitos(params.get("cnpj", "")),
+                 json.dumps(params, ensure_ascii=False), STATUS_EM_ANDAMENTO, agora, agora),
+            )
+
+    def carregar(self, investigation_id: str) -> Optional[Dict]:
+        """Retorna params, status, fases e sub-consultas salvas (ou None)."""
+        with self._conectar() as conn:
+            row = conn.execute(
+                "SELECT params_json, status, criado_em, atualizado_em "
+                "FROM investigacoes WHERE investigation_id = ?",
+                (investigation_id,),
+            ).fetchone()
+            if not row:
+                return None
+            fases = conn.execute(
+                "SELECT fase, dados_json FROM fases WHERE investigation_id = ?",
+                (investigation_id,),
+            ).fetchall()
+            total_sub = conn.execute(
+                "SELECT COUNT(*) FROM subconsultas WHERE investigation_id = ?",
+                (investigation_id,),
+            ).fetchone()[0]
+
+        return {
+            "investigation_id": investigation_id,
+            "params": json.loads(row[0]),
+            "status": row[1],
+            "criado_em": row[2],
+            "atualizado_em": row[3],
+            "fases": {fase: json.loads(dados) for fase, dados in fases},
+            "total_subconsultas": total_sub,
+        }
+
+    def status(self, investigation_id: str) -> Optional[str]:
+        with self._conectar() as conn:
+            row = conn.execute(
+                "SELECT status FROM investigacoes WHERE investigation_id = ?", (investigation_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def marcar_status(self, investigation_id: str, status: str) -> None:
+        with self._conectar() as conn:
+            conn.execute(
+                "UPDATE investigacoes SET status = ?, atualizado_em = ? WHERE investigation_id = ?",
+                (status, datetime.now().isoformat(), investigation_id),
+            )
+
+    def listar(self, status: Optional[str] = None, limite: int = 50) -> List[Dict]:
+        """Lista investigacoes mais recentes (opcionalmente filtradas por status)."""
+        sql = "SELECT investigation_id, empresa, cnpj, status, atualizado_em FROM investigacoes"
+        args: tuple = ()
+        if status:
+            sql += " WHERE status = ?"
+            args = (status,)
+        sql += " ORDER BY atualizado_em DESC LIMIT ?"
+        with self._conectar() as conn:
+            rows = conn.execute(sql, args + (limite,)).fetchall()
+        return [
+            {"investigation_id": r[0], "empresa": r[1], "cnpj": r[2], "status": r[3], "atualizado_em": r[4]}
+            for r in rows
+        ]
+
+    def ultima_investigacao(self, empresa: str, cnpj: str = "", excluir: str = "") -> Optional[str]:
+        """
+        Id da investigacao terminada mais recente da mesma empresa
+        (por CNPJ quando informado, senao pelo nome).
+        """
+        cnpj = _so_digitos(cnpj)
+        filtro, valor = ("cnpj = ?", cnpj) if cnpj else ("empresa = ? COLLATE NOCASE", empresa.strip())
+        with self._conectar() as conn:
+            row = conn.execute(
+                f"SELECT investigation_id FROM investigacoes "
+                f"WHERE {filtro} AND investigation_id != ? AND status IN (?, ?) "
+                f"ORDER BY atualizado_em DESC LIMIT 1",
+                (valor, excluir, STATUS_COMPLETO, STATUS_INCOMPLETO),
+            ).fetchone()
+        return row[0] if row else None
+
+    def remover(self, investigation_id: str) -> None:
+        with self._conectar() as conn:
+            for tabela in ("subconsultas", "fases", "investigacoes"):
+                conn.execute(f"DELETE FROM {tabela} WHERE investigation_id = ?", (investigation_id,))
+
+    # ------------------------------------------------------------------
+    # Fases e sub-consultas
+    # ------------------------------------------------------------------
+    def salvar_fase(
+        self,
+        investigation_id: str,
+        fase: str,
+        dados: Dict,
+        entrada: str = "",
+        concluido_em: Optional[str] = None
+    ) -> None:
+        """
+        Salva o resultado de uma fase. `concluido_em` permite copiar uma fase
+        reaproveitada de outra investigacao sem renovar sua idade (TTL).
+        """
+        agora = datetime.now().isoformat()
+        with self._conectar() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO fases VALUES (?, ?, ?, ?, ?)",
+                (investigation_id, fase, json.dumps(dados, ensure_ascii=False, default=str),
+                 concluido_em or agora, entrada),
+            )
+            conn.execute(
+                "UPDATE investigacoes SET atualizado_em = ? WHERE investigation_id = ?",
+                (agora, investigation_id),
+            )
+
+    def fases_detalhadas(self, investigation_id: str) -> Dict[str, Dict]:
+        """{fase: {"dados", "concluido_em", "entrada"}} para decisoes de refresh."""
+        with self._conectar() as conn:
+            rows = conn.execute(
+                "SELECT fase, dados_json, concluido_em, entrada FROM fases WHERE investigation_id = ?",
+                (investigation_id,),
+            ).fetchall()
+        return {
+            fase: {"dados": json.loads(dados), "concluido_em": concluido_em, "entrada": entrada}
+            for fase, dados, concluido_em, entrada in rows
+        }
+
+    def salvar_subconsulta(self, investigation_id: str, chave: str, resposta: str) -> None:
+        with self._conectar() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO subconsultas VALUES (?, ?, ?, ?)",
+                (investigation_id, chave, resposta, datetime.now().isoformat()),
+            )
+
+    def obter_subconsulta(self, investigation_id: str, chave: str, desde: Optional[str] = None) -> Optional[str]:
+        """Resposta salva; com `desde` (ISO), so se concluida a partir dali."""
+        with self._conectar() as conn:
+            row = conn.execute(
+                "SELECT resposta FROM subconsultas WHERE investigation_id = ? AND chave = ? "
+                "AND concluido_em >= ?",
+                (investigation_id, chave, desde or ""),
+            ).fetchone()
+        return row[0] if row else None
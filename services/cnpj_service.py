@@ -1,29 +1,46 @@
 """
-services/cnpj_service.py — BrasilAPI + ReceitaWS com retry + Classe CNPJService
+services/cnpj_service.py — BrasilAPI x ReceitaWS em corrida (httpx async, pool keep-alive) com retry + Classe CNPJService
 """
 import sys, os
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
-import re, requests, time, json, logging
-from typing import Optional, Any, Dict, List
+import re, time, asyncio, logging, threading, weakref, unicodedata
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Optional, Any, Dict, Iterable, List, Tuple
+import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from scout_types import DadosCNPJ
+from utils.json_extractor import extrair_json
+from services.grupo_economico import obter_grafo
+from services.receita_index import obter_indice
+from services.ttl_cache import TTLCache, NEGATIVO, DEFAULT_CACHE_DB
 
 logger = logging.getLogger(__name__)
 
-# ========== CACHE SIMPLES INLINE ==========
-class SimpleCache:
-    def __init__(self):
-        self._cache = {}
-    
-    def get(self, namespace: str, key: dict) -> Optional[Any]:
-        cache_key = f"{namespace}:{json.dumps(key, sort_keys=True)}"
-        return self._cache.get(cache_key)
-    
-    def set(self, namespace: str, key: dict, value: Any, ttl: int = 3600):
-        cache_key = f"{namespace}:{json.dumps(key, sort_keys=True)}"
-        self._cache[cache_key] = value
+# ========== CACHE (TTL + LRU + SQLite compartilhado entre processos) ==========
+# Dado cadastral muda pouco: serve do cache por dias. CNPJ inexistente fica em
+# cache negativo por menos tempo (evita repetir a consulta numa lista com erro).
+TTL_CNPJ = 7 * 86400
+TTL_CNPJ_NEGATIVO = 86400
+
+_cache: Optional[TTLCache] = None
+_cache_lock = threading.Lock()
 
-cache = SimpleCache()
+
+def obter_cache() -> TTLCache:
+    """
+    Cache do processo, criado no primeiro uso: importar o modulo (orchestrator,
+    testes, ferramentas do SAS) nao abre nem poda o SQLite.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TTLCache(
+                max_itens=int(os.environ.get("BANDEIRANTE_CACHE_ITENS", "5000")),
+                db_path=os.environ.get("BANDEIRANTE_CACHE_DB", DEFAULT_CACHE_DB),  # "" desliga o disco
+                max_itens_disco=int(os.environ.get("BANDEIRANTE_CACHE_ITENS_DISCO", "100000")),
+            )
+        return _cache
 
 
 def limpar_cnpj(c: str) -> str:
@@ -33,42 +50,143 @@ def formatar_cnpj(c: str) -> str:
     c = limpar_cnpj(c)
     return f"{c[:2]}.{c[2:5]}.{c[5:8]}/{c[8:12]}-{c[12:]}" if len(c) == 14 else c
 
+def _digito_verificador(base: str) -> str:
+    # Pesos 2..9 ciclicos da direita para a esquerda (modulo 11)
+    pesos = [2 + i % 8 for i in range(len(base))][::-1]
+    resto = sum(int(d) * p for d, p in zip(base, pesos)) % 11
+    return "0" if resto < 2 else str(11 - resto)
+
+
 def validar_cnpj(c: str) -> bool:
+    """Formato + digitos verificadores: CNPJ com erro de digitacao nem chega na rede."""
     c = limpar_cnpj(c)
-    return len(c) == 14 and c != c[0] * 14
+    if len(c) != 14 or c == c[0] * 14:
+        return False
+    dv1 = _digito_verificador(c[:12])
+    return c[12:] == dv1 + _digito_verificador(c[:12] + dv1)
 
 
 class CNPJError(Exception):
     pass
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=10),
-       retry=retry_if_exception_type((requests.ConnectionError, requests.Timeout)))
-def _brasilapi(cnpj: str) -> dict:
-    r = requests.get(f"https://brasilapi.com.br/api/cnpj/v1/{cnpj}", timeout=15)
+class CNPJNaoEncontrado(CNPJError):
+    """Resposta definitiva do provedor: o CNPJ nao existe (vai para o cache negativo)."""
+
+
+class _RateLimited(Exception):
+    """HTTP 429: tratado como transitorio (backoff async, sem bloquear o loop)."""
+
+
+# Timeouts por provedor: a BrasilAPI costuma responder rapido; a ReceitaWS e mais lenta
+TIMEOUTS = {
+    "brasilapi": httpx.Timeout(8.0, connect=3.0),
+    "receitaws": httpx.Timeout(12.0, connect=3.0),
+}
+_ERROS_TRANSITORIOS = (httpx.TransportError, _RateLimited)
+
+
+@dataclass
+class LimiteProvedor:
+    """Conexoes simultaneas + requisicoes/minuto de um provedor (quota gratuita)."""
+    concorrencia: int
+    rpm: int
+    _proximo_slot: float = field(default=0.0, init=False, repr=False)
+    _semaforos: Any = field(default_factory=weakref.WeakKeyDictionary, init=False, repr=False)
+
+    def _semaforo(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaforos:
+            self._semaforos[loop] = asyncio.Semaphore(self.concorrencia)
+        return self._semaforos[loop]
+
+    def espera_estimada(self) -> float:
+        """Segundos ate o proximo slot livre (0 = pode chamar ja)."""
+        return max(0.0, self._proximo_slot - time.time())
+
+    async def _aguardar_slot(self) -> None:
+        # Reserva so depois de dormir (checar e reservar sem await no meio): a
+        # chamada secundaria cancelada na corrida nao gasta quota (ReceitaWS: 3 rpm)
+        while True:
+            espera = self._proximo_slot - time.time()
+            if espera <= 0:
+                self._proximo_slot = time.time() + 60.0 / self.rpm
+                return
+            await asyncio.sleep(espera)
+
+
+LIMITES = {
+    "brasilapi": LimiteProvedor(concorrencia=8, rpm=180),
+    "receitaws": LimiteProvedor(concorrencia=2, rpm=3),
+}
+
+
+async def _get_limitado(provedor: str, url: str) -> httpx.Response:
+    limite = LIMITES[provedor]
+    async with limite._semaforo():
+        await limite._aguardar_slot()
+        return await _cliente_http().get(url, timeout=TIMEOUTS[provedor])
+
+
+# Um AsyncClient (pool keep-alive) por event loop: transports httpx nao podem cruzar loops
+_clientes: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _cliente_http() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    cliente = _clientes.get(loop)
+    if cliente is None or cliente.is_closed:
+        cliente = httpx.AsyncClient(
+            headers={"Accept": "application/json", "User-Agent": "bandeirante-digital/3.0"},
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60),
+            follow_redirects=True,
+        )
+        _clientes[loop] = cliente
+    return cliente
+
+
+async def fechar_clientes_http() -> None:
+    """Fecha o pool do loop atual (chamar antes de encerrar o loop)."""
+    cliente = _clientes.pop(asyncio.get_running_loop(), None)
+    if cliente is not None:
+        await cliente.aclose()
+
+
+# Retries curtos: a corrida entre provedores (abaixo) cobre a lentidao de um deles
+@retry(stop=stop_after_attempt(2), wait=wait_exponential(min=0.5, max=2),
+       retry=retry_if_exception_type(_ERROS_TRANSITORIOS), reraise=True)
+async def _brasilapi(cnpj: str) -> dict:
+    r = await _get_limitado("brasilapi", f"https://brasilapi.com.br/api/cnpj/v1/{cnpj}")
     if r.status_code == 200:
         return r.json()
+    if r.status_code == 404:
+        raise CNPJNaoEncontrado("brasilapi: HTTP 404")
     if r.status_code == 429:
-        time.sleep(5)
-        raise requests.ConnectionError("rate limited")
+        raise _RateLimited("brasilapi")
     raise CNPJError(f"HTTP {r.status_code}")
 
 
-@retry(stop=stop_after_attempt(2), wait=wait_exponential(min=2, max=8),
-       retry=retry_if_exception_type((requests.ConnectionError, requests.Timeout)))
-def _receitaws(cnpj: str) -> dict:
-    r = requests.get(f"https://receitaws.com.br/v1/cnpj/{cnpj}", timeout=15, headers={"Accept": "application/json"})
+@retry(stop=stop_after_attempt(2), wait=wait_exponential(min=1, max=3),
+       retry=retry_if_exception_type(_ERROS_TRANSITORIOS), reraise=True)
+async def _receitaws(cnpj: str) -> dict:
+    r = await _get_limitado("receitaws", f"https://receitaws.com.br/v1/cnpj/{cnpj}")
     if r.status_code == 200:
         d = r.json()
         if d.get("status") == "ERROR":
-            raise CNPJError(d.get("message", ""))
+            mensagem = d.get("message", "")
+            if re.search(r"inv[aá]lido|n[aã]o encontrado|rejeitado", mensagem, re.IGNORECASE):
+                raise CNPJNaoEncontrado(f"receitaws: {mensagem}")
+            raise CNPJError(mensagem)
         return d
+    if r.status_code == 429:
+        raise _RateLimited("receitaws")
     raise CNPJError(f"HTTP {r.status_code}")
 
 
 def _parse_brasil(d: dict) -> DadosCNPJ:
-    qsa = [{"nome": s.get("nome_socio", ""), "qualificacao": s.get("qualificacao_socio", ""),
-             "data_entrada": s.get("data_entrada_sociedade", "")} for s in d.get("qsa", [])]
+    qsa = [{"nome": s.get("nome_socio", ""), "documento": s.get("cnpj_cpf_do_socio", ""),
+            "qualificacao": s.get("qualificacao_socio", ""),
+            "data_entrada": s.get("data_entrada_sociedade", "")} for s in d.get("qsa", [])]
     cnaes = [f"{c['codigo']} - {c.get('descricao', '')}" for c in d.get("cnaes_secundarios", []) if c.get("codigo")]
     return DadosCNPJ(
         cnpj=d.get("cnpj", ""), razao_social=d.get("razao_social", ""),
@@ -84,32 +202,319 @@ def _parse_brasil(d: dict) -> DadosCNPJ:
     )
 
 
-def consultar_cnpj(cnpj: str) -> Optional[DadosCNPJ]:
-    c = limpar_cnpj(cnpj)
-    if not validar_cnpj(c):
-        return None
-    cached = cache.get("cnpj", {"c": c})
-    if cached:
-        return cached
+def _parse_receitaws(c: str, raw: dict) -> DadosCNPJ:
+    return DadosCNPJ(cnpj=c, razao_social=raw.get("nome", ""), nome_fantasia=raw.get("fantasia", ""),
+                     situacao_cadastral=raw.get("situacao", ""),
+                     capital_social=float(str(raw.get("capital_social", "0")).replace(".", "").replace(",", ".")),
+                     cnae_principal=raw.get("atividade_principal", [{}])[0].get("code", ""),
+                     cnae_descricao=raw.get("atividade_principal", [{}])[0].get("text", ""),
+                     municipio=raw.get("municipio", ""), uf=raw.get("uf", ""),
+                     qsa=[{"nome": s.get("nome", ""), "qualificacao": s.get("qual", "")} for s in raw.get("qsa", [])],
+                     fonte="receitaws", timestamp=str(time.time()))
+
+
+# ==============================================================================
+# CORRIDA ENTRE PROVEDORES
+# ==============================================================================
+PRAZO_CONSULTA = 12.0             # teto de uma consulta, somando os dois provedores
+ATRASO_HEDGE = (0.4, 3.0)         # limites do atraso antes de disparar o secundario
+ATRASO_HEDGE_SEM_HISTORICO = 1.0
+
+
+@dataclass
+class SaudeProvedor:
+    """Janela das ultimas respostas de um provedor: alimenta a ordem e o atraso da corrida."""
+    janela: int = 50
+    recentes: int = 10  # saude = ultimas N respostas; latencia = janela toda
+    _amostras: Any = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self._amostras = deque(maxlen=self.janela)
+
+    def registrar(self, ok: bool, latencia: float) -> None:
+        self._amostras.append((ok, latencia))
+
+    @property
+    def taxa_sucesso(self) -> float:
+        ultimas = list(self._amostras)[-self.recentes:]
+        if not ultimas:
+            return 1.0
+        return sum(1 for ok, _ in ultimas if ok) / len(ultimas)
+
+    @property
+    def degradado(self) -> bool:
+        return len(self._amostras) >= 3 and self.taxa_sucesso < 0.5
+
+    def latencia_percentil(self, p: float = 0.9) -> Optional[float]:
+        latencias = sorted(lat for ok, lat in self._amostras if ok)
+        if not latencias:
+            return None
+        return latencias[min(len(latencias) - 1, int(p * len(latencias)))]
+
+    def atraso_hedge(self) -> float:
+        """
+        Quanto esperar pelo primario antes de disparar o secundario: ~p90 da sua
+        latencia recente; zero quando ele anda falhando (corrida imediata).
+        """
+        if self.degradado:
+            return 0.0
+        p90 = self.latencia_percentil(0.9)
+        if p90 is None:
+            return ATRASO_HEDGE_SEM_HISTORICO
+        return min(ATRASO_HEDGE[1], max(ATRASO_HEDGE[0], p90 * 1.2))
+
+    def to_dict(self) -> Dict[str, Any]:
+        p50, p90 = self.latencia_percentil(0.5), self.latencia_percentil(0.9)
+        return {
+            "amostras": len(self._amostras),
+            "taxa_sucesso": round(self.taxa_sucesso, 3),
+            "latencia_p50": round(p50, 3) if p50 is not None else None,
+            "latencia_p90": round(p90, 3) if p90 is not None else None,
+            "atraso_hedge": round(self.atraso_hedge(), 3),
+        }
+
+
+SAUDE = {provedor: SaudeProvedor() for provedor in LIMITES}
+
+_PROVEDORES = {
+    "brasilapi": (lambda c: _brasilapi(c), lambda c, d: _parse_brasil(d)),
+    "receitaws": (lambda c: _receitaws(c), _parse_receitaws),
+}
+
+
+def saude_provedores() -> Dict[str, Dict[str, Any]]:
+    return {provedor: saude.to_dict() for provedor, saude in SAUDE.items()}
+
+
+def _ordem_provedores() -> Tuple[str, Optional[str]]:
+    """(primario, secundario): a ordem de LIMITES, invertida so se o preferido estiver degradado."""
+    primario, secundario = list(LIMITES)[:2]
+    if SAUDE[primario].degradado and not SAUDE[secundario].degradado:
+        primario, secundario = secundario, primario
+    # Secundario com a quota esgotada so atrasaria: nao entra na corrida
+    if LIMITES[secundario].espera_estimada() > PRAZO_CONSULTA:
+        return primario, None
+    return primario, secundario
+
+
+async def _chamar_provedor(provedor: str, c: str) -> DadosCNPJ:
+    chamar, parse = _PROVEDORES[provedor]
+    inicio = time.perf_counter()
     try:
-        r = _parse_brasil(_brasilapi(c))
-        cache.set("cnpj", {"c": c}, r, ttl=86400)
-        return r
+        dados = parse(c, await chamar(c))
+    except CNPJNaoEncontrado:
+        SAUDE[provedor].registrar(True, time.perf_counter() - inicio)  # respondeu, so nao existe
+        raise
+    except asyncio.CancelledError:  # perdeu a corrida: nao conta contra o provedor
+        raise
     except Exception:
-        pass
+        SAUDE[provedor].registrar(False, time.perf_counter() - inicio)
+        raise
+    SAUDE[provedor].registrar(True, time.perf_counter() - inicio)
+    return dados
+
+
+async def _corrida(c: str) -> Tuple[Optional[DadosCNPJ], str]:
+    """
+    Dispara o primario; se ele nao responder em `atraso_hedge`, dispara tambem o
+    secundario. A primeira resposta definitiva (dados ou "nao existe") vence e a
+    outra chamada e cancelada. Nunca passa de PRAZO_CONSULTA.
+    """
+    loop = asyncio.get_running_loop()
+    primario, secundario = _ordem_provedores()
+    pendentes: Dict[asyncio.Task, str] = {asyncio.create_task(_chamar_provedor(primario, c)): primario}
+    lancar_em = loop.time() + SAUDE[primario].atraso_hedge() if secundario else None
+    prazo = loop.time() + PRAZO_CONSULTA
     try:
-        raw = _receitaws(c)
-        r = DadosCNPJ(cnpj=c, razao_social=raw.get("nome", ""), nome_fantasia=raw.get("fantasia", ""),
-                       situacao_cadastral=raw.get("situacao", ""),
-                       capital_social=float(str(raw.get("capital_social", "0")).replace(".", "").replace(",", ".")),
-                       cnae_principal=raw.get("atividade_principal", [{}])[0].get("code", ""),
-                       cnae_descricao=raw.get("atividade_principal", [{}])[0].get("text", ""),
-                       municipio=raw.get("municipio", ""), uf=raw.get("uf", ""),
-                       fonte="receitaws", timestamp=str(time.time()))
-        cache.set("cnpj", {"c": c}, r, ttl=86400)
-        return r
-    except Exception:
+        while pendentes or lancar_em is not None:
+            agora = loop.time()
+            if lancar_em is not None and (agora >= lancar_em or not pendentes):
+                pendentes[asyncio.create_task(_chamar_provedor(secundario, c))] = secundario
+                lancar_em = None
+                continue
+            limite = min(lancar_em, prazo) if lancar_em is not None else prazo
+            if limite <= agora:
+                logger.warning(f"[CNPJ] Prazo de {PRAZO_CONSULTA:g}s esgotado para {c}")
+                break
+            feitas, _ = await asyncio.wait(pendentes, timeout=limite - agora, return_when=asyncio.FIRST_COMPLETED)
+            for tarefa in feitas:
+                provedor = pendentes.pop(tarefa)
+                try:
+                    dados = tarefa.result()
+                except CNPJNaoEncontrado as e:
+                    logger.info(f"[CNPJ] {c} nao existe ({e})")
+                    obter_cache().set_negativo("cnpj", c, ttl=TTL_CNPJ_NEGATIVO)
+                    return None, "nao_encontrado"
+                except Exception as e:
+                    logger.info(f"[CNPJ] {provedor} falhou para {c}: {e}")
+                else:
+                    obter_cache().set("cnpj", c, dados, ttl=TTL_CNPJ)
+                    return dados, dados.fonte
+    finally:
+        for tarefa in pendentes:
+            tarefa.cancel()
+    # falha transitoria (timeout, 429, 5xx) nao entra no cache
+    return None, "falha"
+
+
+async def _consultar(c: str) -> Tuple[Optional[DadosCNPJ], str]:
+    """
+    (dados, origem) para um CNPJ ja limpo e validado. Origem: "cache",
+    "receita_offline", "brasilapi", "receitaws", "nao_encontrado" ou "falha".
+    """
+    cached = obter_cache().get("cnpj", c)
+    if cached is NEGATIVO:
+        return None, "nao_encontrado"
+    if cached:
+        return _alimentar_grafo(cached), "cache"
+    indice = obter_indice()
+    if indice is not None:  # base offline da Receita: sem rede nem rate limit
+        r = indice.consultar(c)
+        if r:
+            return _alimentar_grafo(r), r.fonte
+    dados, origem = await _corrida(c)
+    return (_alimentar_grafo(dados) if dados else None), origem
+
+
+def _alimentar_grafo(dados: DadosCNPJ) -> DadosCNPJ:
+    """Todo CNPJ consultado entra no grafo societario local (grupos economicos)."""
+    try:
+        obter_grafo().registrar(dados)
+    except Exception as e:  # o grafo e derivado: nunca derruba a consulta
+        logger.warning(f"[CNPJ] Falha ao registrar {dados.cnpj} no grafo societario: {e}")
+    return dados
+
+
+async def consultar_cnpj_async(cnpj: str) -> Optional[DadosCNPJ]:
+    """
+    Consulta nao bloqueante: cache, indice offline da Receita (se ingerido),
+    depois corrida BrasilAPI x ReceitaWS. Segura dentro do loop das investigacoes.
+    """
+    c = limpar_cnpj(cnpj)
+    if not validar_cnpj(c):
         return None
+    dados, _ = await _consultar(c)
+    return dados
+
+
+def consultar_cnpj(cnpj: str) -> Optional[DadosCNPJ]:
+    """
+    Versao sincrona: executa no loop persistente do processo (pool HTTP reaproveitado).
+    Dentro de codigo async use `consultar_cnpj_async`.
+    """
+    from services.async_runtime import obter_runtime
+    return obter_runtime().executar(consultar_cnpj_async(cnpj))
+
+
+# ==============================================================================
+# CONSULTA EM LOTE
+# ==============================================================================
+_ERROS_ITEM = {
+    "invalido": "CNPJ inválido (formato ou dígito verificador)",
+    "nao_encontrado": "CNPJ não encontrado nas bases públicas",
+    "falha": "Provedores indisponíveis (tente novamente)",
+}
+
+
+@dataclass
+class ItemLote:
+    entrada: str
+    cnpj: str
+    dados: Optional[DadosCNPJ] = None
+    origem: str = ""
+    erro: str = ""
+
+
+@dataclass
+class ResultadoLote:
+    itens: List[ItemLote]
+    unicos: int = 0
+    duracao_segundos: float = 0.0
+
+    @property
+    def distribuicao(self) -> Dict[str, int]:
+        """CNPJs unicos por origem (cache, brasilapi, receitaws, ...)."""
+        vistos: Dict[str, str] = {}
+        for item in self.itens:
+            vistos.setdefault(item.cnpj, item.origem)
+        return dict(Counter(vistos.values()))
+
+    @property
+    def vazao(self) -> float:
+        """CNPJs unicos resolvidos por segundo."""
+        return round(self.unicos / self.duracao_segundos, 1) if self.duracao_segundos else 0.0
+
+    def resumo(self) -> Dict[str, Any]:
+        return {
+            "entradas": len(self.itens),
+            "unicos": self.unicos,
+            "encontrados": sum(1 for i in self.itens if i.dados),
+            "erros": sum(1 for i in self.itens if i.erro),
+            "duracao_segundos": round(self.duracao_segundos, 2),
+            "cnpjs_por_segundo": self.vazao,
+            "origens": self.distribuicao,
+        }
+
+
+async def consultar_cnpjs_async(cnpjs: Iterable[str], concorrencia: int = 16) -> ResultadoLote:
+    """
+    Varios CNPJs de uma vez: normaliza, descarta DV invalido sem ir a rede,
+    deduplica e consulta o resto em paralelo (cada provedor limitado por LIMITES).
+    Os itens voltam na ordem da entrada; erro por item, nunca excecao do lote.
+    """
+    inicio = time.time()
+    entradas = list(cnpjs)
+    limpos = [limpar_cnpj(e or "") for e in entradas]
+    unicos = list(dict.fromkeys(c for c in limpos if validar_cnpj(c)))
+    semaforo = asyncio.Semaphore(max(1, concorrencia))
+
+    async def _um(c: str) -> Tuple[Optional[DadosCNPJ], str]:
+        async with semaforo:
+            try:
+                return await _consultar(c)
+            except Exception as e:
+                logger.warning(f"[CNPJ] Lote: erro em {c}: {e}")
+                return None, "falha"
+
+    respostas = dict(zip(unicos, await asyncio.gather(*(_um(c) for c in unicos))))
+
+    itens = []
+    for entrada, c in zip(entradas, limpos):
+        if c not in respostas:
+            itens.append(ItemLote(entrada, c, origem="invalido", erro=_ERROS_ITEM["invalido"]))
+            continue
+        dados, origem = respostas[c]
+        itens.append(ItemLote(entrada, c, dados, origem, "" if dados else _ERROS_ITEM[origem]))
+
+    resultado = ResultadoLote(itens, unicos=len(unicos), duracao_segundos=time.time() - inicio)
+    logger.info(f"[CNPJ] Lote: {resultado.resumo()}")
+    return resultado
+
+
+def consultar_cnpjs(cnpjs: Iterable[str], concorrencia: int = 16) -> ResultadoLote:
+    """Versao sincrona de `consultar_cnpjs_async` (loop persistente do processo)."""
+    from services.async_runtime import obter_runtime
+    return obter_runtime().executar(consultar_cnpjs_async(cnpjs, concorrencia))
+
+
+# ==============================================================================
+# CACHE DE CPF DE SOCIOS: chave (socio, CPF mascarado da Receita), sem a empresa:
+# o mesmo socio nas varias empresas do grupo e buscado uma vez so. O trecho do
+# CPF que a Receita publica ("***123456**") separa homonimos quando vem no QSA;
+# sem ele (ReceitaWS nao traz), a raiz do CNPJ entra na chave no lugar.
+# ==============================================================================
+TTL_CPF_SOCIO = 30 * 86400
+TTL_CPF_SOCIO_NEGATIVO = 7 * 86400
+
+
+def _normalizar_nome(nome: str) -> str:
+    sem_acento = unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode()
+    return re.sub(r"\s+", " ", sem_acento).strip().upper()
+
+
+def _chave_socio(nome: str, documento: str = "", cnpj: str = "") -> Tuple[str, str, str]:
+    documento = re.sub(r"\D", "", documento or "")
+    return (_normalizar_nome(nome), documento, "" if documento else limpar_cnpj(cnpj)[:8])
 
 
 # ==============================================================================
@@ -121,9 +526,10 @@ class CNPJService:
     Usa BrasilAPI/ReceitaWS + IA para extrair CPFs e enriquecer QSA.
     """
     
-    def __init__(self, gemini_service):
-        """Inicializa o serviço com o cliente Gemini."""
+    def __init__(self, gemini_service, em_lote: bool = True):
+        """Inicializa o serviço com o cliente Gemini (em_lote: CPFs dos sócios num prompt só)."""
         self.gemini = gemini_service
+        self.em_lote = em_lote
         logger.info("[CNPJService] Inicializado")
     
     async def obter_cnpj_e_qsa(self, cnpj: str) -> Dict:
@@ -138,8 +544,8 @@ class CNPJService:
         """
         logger.info(f"[CNPJService] Consultando CNPJ: {cnpj}")
         
-        # Consulta CNPJ usando funções existentes
-        dados = consultar_cnpj(cnpj)
+        # Consulta CNPJ sem bloquear o event loop
+        dados = await consultar_cnpj_async(cnpj)
         
         if not dados:
             logger.warning(f"[CNPJService] CNPJ {cnpj} não encontrado")
@@ -181,53 +587,109 @@ class CNPJService:
         # Enriquece QSA com busca de CPFs via Gemini
         if dados.qsa:
             logger.info(f"[CNPJService] Enriquecendo QSA com {len(dados.qsa)} sócios")
-            result["quadro_societario"] = await self._enriquecer_qsa(dados.qsa, dados.razao_social)
+            result["quadro_societario"] = await self._enriquecer_qsa(dados.qsa, dados.razao_social, dados.cnpj)
         
         return result
     
-    async def _enriquecer_qsa(self, qsa_raw: List[Dict], razao_social: str) -> List[Dict]:
+    async def _enriquecer_qsa(self, qsa_raw: List[Dict], razao_social: str, cnpj: str = "") -> List[Dict]:
         """
         Enriquece o QSA tentando encontrar CPFs via busca na web.
+        Administradores sem CPF em cache sao resolvidos num unico prompt em lote
+        (`self.em_lote`); quem faltar na resposta vai em chamadas paralelas.
         """
-        qsa_enriquecido = []
-        
-        for socio in qsa_raw[:5]:  # Limita a 5 para evitar muitas chamadas
-            nome = socio.get("nome", "")
-            qualificacao = socio.get("qualificacao", "")
-            
-            # Tenta buscar CPF via Gemini (se nome for de pessoa física)
-            cpf = None
-            if qualificacao and "administrador" in qualificacao.lower():
-                try:
-                    prompt = f"""Encontre o CPF (apenas números) do sócio/administrador:
+        socios = qsa_raw[:5]  # Limita a 5 para evitar muitas chamadas
+        cpfs: Dict[str, Optional[str]] = {}
+        chaves: Dict[str, Tuple[str, str, str]] = {}
+        pendentes = []
+        for socio in socios:
+            nome, qualificacao = socio.get("nome", ""), socio.get("qualificacao", "")
+            if not (nome and qualificacao and "administrador" in qualificacao.lower()):
+                continue
+            chaves[nome] = _chave_socio(nome, socio.get("documento", ""), cnpj)
+            cached = obter_cache().get("cpf_socio", chaves[nome])
+            if cached is None:
+                pendentes.append(nome)
+            else:
+                cpfs[nome] = None if cached is NEGATIVO else cached
+
+        pendentes = list(dict.fromkeys(pendentes))
+        if pendentes:
+            if self.em_lote and len(pendentes) > 1:
+                cpfs.update(await self._buscar_cpfs_lote(pendentes, razao_social, chaves))
+            faltando = [n for n in pendentes if n not in cpfs]
+            achados = await asyncio.gather(*(self._buscar_cpf(n, razao_social, chaves[n]) for n in faltando))
+            cpfs.update(zip(faltando, achados))
+
+        return [
+            {
+                "nome": socio.get("nome", ""),
+                "qualificacao": socio.get("qualificacao", ""),
+                "data_entrada": socio.get("data_entrada", ""),
+                "cpf": cpfs.get(socio.get("nome", "")),
+            }
+            for socio in socios
+        ]
+
+    async def _buscar_cpf(self, nome: str, razao_social: str,
+                          chave: Optional[Tuple[str, str, str]] = None) -> Optional[str]:
+        """Uma chamada por socio; o rate limiter do GeminiService e compartilhado."""
+        prompt = f"""Encontre o CPF (apenas números) do sócio/administrador:
 Nome: {nome}
 Empresa: {razao_social}
 
 Se não encontrar, retorne apenas: NAO_ENCONTRADO
 Se encontrar, retorne apenas os 11 dígitos do CPF."""
-                    
-                    response = await self.gemini.call_with_retry(
-                        prompt, 
-                        max_retries=1, 
-                        use_search=True,
-                        temperature=0.0
-                    )
-                    
-                    # Extrai CPF da resposta
-                    if response and "NAO_ENCONTRADO" not in response:
-                        match = re.search(r'\d{11}', response)
-                        if match:
-                            cpf = match.group(0)
-                            logger.info(f"[CNPJService] CPF encontrado para {nome}: {cpf[:3]}***")
-                
-                except Exception as e:
-                    logger.warning(f"[CNPJService] Erro ao buscar CPF de {nome}: {e}")
-            
-            qsa_enriquecido.append({
-                "nome": nome,
-                "qualificacao": qualificacao,
-                "data_entrada": socio.get("data_entrada", ""),
-                "cpf": cpf
-            })
-        
-        return qsa_enriquecido
+        try:
+            response = await self.gemini.call_with_retry(
+                prompt,
+                max_retries=1,
+                use_search=True,
+                temperature=0.0
+            )
+        except Exception as e:
+            logger.warning(f"[CNPJService] Erro ao buscar CPF de {nome}: {e}")
+            return None  # erro nao entra no cache
+
+        match = re.search(r'\d{11}', response or "") if "NAO_ENCONTRADO" not in (response or "") else None
+        return self._registrar_cpf(nome, chave or _chave_socio(nome), match.group(0) if match else None)
+
+    async def _buscar_cpfs_lote(self, nomes: List[str], razao_social: str,
+                                chaves: Optional[Dict[str, Tuple[str, str, str]]] = None) -> Dict[str, Optional[str]]:
+        """Todos os socios num prompt so. Retorna apenas os nomes que vieram na resposta."""
+        lista = "\n".join(f"- {n}" for n in nomes)
+        prompt = f"""Encontre o CPF (apenas números) de cada sócio/administrador da empresa {razao_social}:
+{lista}
+
+Retorne APENAS um JSON, usando exatamente os nomes acima como chaves:
+{{"NOME DO SÓCIO": "11 dígitos do CPF" ou "NAO_ENCONTRADO"}}"""
+        try:
+            response = await self.gemini.call_with_retry(
+                prompt,
+                max_retries=1,
+                use_search=True,
+                temperature=0.0
+            )
+            dados = extrair_json(response, origem="[CNPJService]")
+        except Exception as e:
+            logger.warning(f"[CNPJService] Busca de CPFs em lote falhou ({len(nomes)} sócios): {e}")
+            return {}
+
+        por_nome = {_normalizar_nome(k): v for k, v in dados.items()} if isinstance(dados, dict) else {}
+        resultado = {}
+        for nome in nomes:
+            valor = por_nome.get(_normalizar_nome(nome))
+            if valor is None:
+                continue
+            match = re.search(r'\d{11}', re.sub(r'\D', '', str(valor)))
+            resultado[nome] = self._registrar_cpf(nome, (chaves or {}).get(nome) or _chave_socio(nome),
+                                                  match.group(0) if match else None)
+        logger.info(f"[CNPJService] CPFs em lote: {len(resultado)}/{len(nomes)} sócios resolvidos em 1 chamada")
+        return resultado
+
+    def _registrar_cpf(self, nome: str, chave: Tuple[str, str, str], cpf: Optional[str]) -> Optional[str]:
+        if cpf:
+            logger.info(f"[CNPJService] CPF encontrado para {nome}: {cpf[:3]}***")
+            obter_cache().set("cpf_socio", chave, cpf, ttl=TTL_CPF_SOCIO)
+        else:
+            obter_cache().set_negativo("cpf_socio", chave, ttl=TTL_CPF_SOCIO_NEGATIVO)
+        return cpf
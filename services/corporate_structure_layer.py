@@ -3,9 +3,14 @@ services/corporate_structure_layer.py — FASE 4: ESTRUTURA SOCIETARIA & LABIRIN
 Bandeirante Digital v3.0 - Holdings, Laranjas, Sucessao, Conflitos Societarios.
 """
 import logging
-import re
-import json
-from typing import Dict, List
+from dataclasses import asdict
+from typing import Collection, Dict, List, Optional
+
+from scout_types import GrupoEconomico
+from services.execution_profiles import subconsulta_ativa
+from services.grupo_economico import obter_grafo
+
+from utils.json_extractor import extrair_json
 
 logger = logging.getLogger(__name__)
 
@@ -19,28 +24,37 @@ class CorporateStructureLayer:
     def __init__(self, gemini_service):
         self.gemini = gemini_service
 
-    async def mapeamento_societario_completo(self, empresa: str, cnpj: str = "", socios: List[Dict] = None) -> Dict:
+    async def mapeamento_societario_completo(self, empresa: str, cnpj: str = "", socios: List[Dict] = None, subconsultas: Optional[Collection[str]] = None) -> Dict:
         """Pipeline de mapeamento societario total."""
         logger.info(f"[SOCIETARIO] Iniciando mapeamento: {empresa}")
 
         results = {}
 
+        # Grupo ja conhecido pelo grafo local (QSA de CNPJs consultados): sem LLM, entra como fato no prompt
+        grupo_local = GrupoEconomico()
+        if cnpj:
+            try:
+                grupo_local = obter_grafo().grupo(cnpj)
+            except Exception as e:
+                logger.warning(f"[SOCIETARIO] Erro grafo local: {e}")
+        results["grupo_local"] = asdict(grupo_local)
+
         try:
-            estrutura = await self._estrutura_societaria(empresa, cnpj)
+            estrutura = await self._estrutura_societaria(empresa, cnpj, grupo_local) if subconsulta_ativa("estrutura", subconsultas) else {}
             results["estrutura"] = estrutura
         except Exception as e:
             logger.warning(f"[SOCIETARIO] Erro estrutura: {e}")
             results["estrutura"] = {}
 
         try:
-            holdings = await self._detectar_holdings(empresa, cnpj, socios or [])
+            holdings = await self._detectar_holdings(empresa, cnpj, socios or []) if subconsulta_ativa("holdings", subconsultas) else {}
             results["holdings"] = holdings
         except Exception as e:
             logger.warning(f"[SOCIETARIO] Erro holdings: {e}")
             results["holdings"] = {}
 
         try:
-            red_flags = await self._detectar_red_flags(empresa, cnpj, socios or [])
+            red_flags = await self._detectar_red_flags(empresa, cnpj, socios or []) if subconsulta_ativa("red_flags_societarias", subconsultas) else {}
             results["red_flags_societarias"] = red_flags
         except Exception as e:
             logger.warning(f"[SOCIETARIO] Erro red flags: {e}")
@@ -49,10 +63,18 @@ class CorporateStructureLayer:
         results["risco_societario"] = self._calcular_risco(results)
         return results
 
-    async def _estrutura_societaria(self, empresa: str, cnpj: str) -> Dict:
+    async def _estrutura_societaria(self, empresa: str, cnpj: str, grupo_local: Optional[GrupoEconomico] = None) -> Dict:
+        conhecido = ""
+        if grupo_local and grupo_local.total_empresas > 1:
+            conhecido = f"""
+JA CONFIRMADO NA BASE CADASTRAL (QSA), NAO PRECISA REBUSCAR:
+   - Empresas ligadas por socios em comum: {', '.join(grupo_local.cnpjs_coligadas[:20])}
+   - Socios: {', '.join(grupo_local.controladores[:10])}
+   Foque no que falta: participacoes, alteracoes recentes e empresas fora dessa lista.
+"""
         prompt = f"""ATUE COMO: Investigador Societario / Due Diligence.
 ALVO: {empresa} (CNPJ: {cnpj if cnpj else 'N/D'})
-
+{conhecido}
 MAPEIE A ESTRUTURA SOCIETARIA COMPLETA:
 
 1. VIA CNPJ RAIZ (site:cnpj.com.br "{empresa}"):
@@ -237,13 +259,4 @@ RETORNE JSON:
         return "VERDE"
 
     def _parse_json(self, response: str) -> Dict:
-        if not response:
-            return {}
-        try:
-            clean = response.replace("```json", "").replace("```", "").strip()
-            match = re.search(r'\{.*\}', clean, re.DOTALL)
-            if match:
-                return json.loads(match.group(0))
-        except Exception:
-            pass
-        return {}
+        return extrair_json(response, origem="[SOCIETARIO]")
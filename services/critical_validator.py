@@ -1,8 +1,10 @@
-import json
 import logging
 import math
 from typing import Dict, List
 
+from services.data_validator import DataValidator
+from utils.json_extractor import extrair_json
+
 logger = logging.getLogger(__name__)
 
 class CriticalValidator:
@@ -21,9 +23,9 @@ class CriticalValidator:
         """
         logger.info("[CRÍTICO] Iniciando validação adversária")
         
-        # Extrai dados estruturados
-        area_total = dossie_completo.get('dados_operacionais', {}).get('area_total', 0)
-        faturamento = dossie_completo.get('dados_financeiros', {}).get('faturamento_estimado', 0)
+        # Extrai dados estruturados ("230 mil ha", "R$ 1,7 bilhão" -> números)
+        area_total = DataValidator.to_hectares(dossie_completo.get('dados_operacionais', {}).get('area_total', 0))
+        faturamento = self._valor_reais(dossie_completo.get('dados_financeiros', {}).get('faturamento_estimado', 0))
         culturas = dossie_completo.get('dados_operacionais', {}).get('culturas', [])
         
         validacoes = {
@@ -32,10 +34,9 @@ class CriticalValidator:
         }
         
         # ======== VALIDAÇÃO 1: Produtividade ========
-        if area_total > 0 and isinstance(faturamento, (int, float)):
+        if area_total > 0 and faturamento > 0:
             try:
-                faturamento_limpo = float(str(faturamento).replace("R$", "").replace("B", "").strip())
-                produtividade = (faturamento_limpo * 1_000_000_000) / area_total  # converte B para valor
+                produtividade = faturamento / area_total
                 
                 # Benchmarks por cultura
                 benchmarks = {
@@ -72,15 +73,12 @@ class CriticalValidator:
                 pass
         
         # ======== VALIDAÇÃO 2: Consistência Dívida/EBITDA ========
-        divida = dossie_completo.get('dados_financeiros', {}).get('divida_total', 0)
-        ebitda = dossie_completo.get('dados_financeiros', {}).get('ebitda_ajustado', 0)
+        divida = DataValidator.to_float(dossie_completo.get('dados_financeiros', {}).get('divida_total', 0))
+        ebitda = DataValidator.to_float(dossie_completo.get('dados_financeiros', {}).get('ebitda_ajustado', 0))
         
         if divida > 0 and ebitda > 0:
             try:
-                divida_valor = float(str(divida).replace("R$", "").replace("B", "").strip()) if isinstance(divida, str) else divida
-                ebitda_valor = float(str(ebitda).replace("R$", "").replace("B", "").strip()) if isinstance(ebitda, str) else ebitda
-                
-                indice_dps = divida_valor / ebitda_valor
+                indice_dps = divida / ebitda
                 
                 if indice_dps > 3:
                     validacoes["alertas"].append({
@@ -98,7 +96,9 @@ class CriticalValidator:
                 pass
         
         # ======== VALIDAÇÃO 3: Coerência Operacional ========
-        processos_trabalhistas = dossie_completo.get('dados_financeiros', {}).get('total_processos_trabalhistas', 0)
+        processos_trabalhistas = DataValidator.to_int(
+            dossie_completo.get('dados_financeiros', {}).get('total_processos_trabalhistas', 0)
+        )
         if processos_trabalhistas > 100:
             validacoes["alertas"].append({
                 "tipo": "RISCO_TRABALHISTA_ELEVADO",
@@ -109,7 +109,9 @@ class CriticalValidator:
             })
         
         # ======== VALIDAÇÃO 4: Multas Ambientais ========
-        multas_ambientais = dossie_completo.get('dados_financeiros', {}).get('debitos_ambientais_total', 0)
+        multas_ambientais = DataValidator.to_float(
+            dossie_completo.get('dados_financeiros', {}).get('debitos_ambientais_total', 0)
+        )
         if multas_ambientais > 1_000_000:  # > R$ 1M
             validacoes["alertas"].append({
                 "tipo": "RISCO_AMBIENTAL",
@@ -121,6 +123,14 @@ class CriticalValidator:
         
         return validacoes
     
+    @staticmethod
+    def _valor_reais(valor) -> float:
+        """Faturamento em reais: texto no formato pt-BR ("R$ 1,7 bi"); número abaixo de 1.000 é o legado em bilhões (1.7 = R$ 1,7B)."""
+        reais = DataValidator.to_float(valor)
+        if isinstance(valor, (int, float)) and 0 < reais < 1000:
+            return reais * 1_000_000_000
+        return reais
+    
     async def extrair_pdfs_documentos(self, razao_social: str) -> Dict:
         """
         Busca e lê PDFs de:
@@ -203,9 +213,4 @@ RETORNE JSON COM:
             return {"documentos_encontrados": [], "status": "erro"}
     
     def _parse_json_response(self, response: str) -> Dict:
-        try:
-            clean = response.replace("```json", "").replace("```", "").strip()
-            return json.loads(clean)
-        except:
-            logger.warning("Falha ao parsear JSON crítico")
-            return {}
+        return extrair_json(response, origem="[VALIDADOR]")
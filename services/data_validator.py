@@ -1,10 +1,171 @@
 """
 services/data_validator.py — Sistema de Validação Defensiva de Dados
 Garante que NUNCA ocorram erros de conversão de tipo
+
+Números no formato brasileiro ("R$ 1.234.567,89", "R$ 2,8 bilhões",
+"15 mil ha", "120 alqueires", "3,5 mi de sacas") são interpretados com
+separadores pt-BR, palavras de magnitude, moeda e unidade. Texto repetido
+é memoizado; `to_float_lote` converte listas / arrays NumPy / Series pandas
+inteiras (cada valor distinto é analisado uma vez).
+
+Casos cobertos: tests/test_data_validator.py; tempos: benchmarks/data_validator.py.
 """
-from typing import Any, Optional, Union, List, Dict
+from functools import lru_cache
+from typing import Any, Optional, Union, List, Dict, Tuple
 import re
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover - depende do ambiente
+    pd = None
+
+# Textos que o LLM usa no lugar de "sem dado" (uma busca so, em vez de um `in` por termo)
+_AUSENCIA_TEXTO = re.compile('não encontrado|n/a|n/d|desconhecido|indisponível|sem informação')
+_AUSENCIA_NUMERO = re.compile(
+    'não encontrado|n/a|n/d|desconhecido|indisponível|necessita|sem informação|não informado|não disponível'
+)
+
+# =============================================================================
+# NÚMEROS pt-BR: separadores, magnitude, moeda e unidade
+# =============================================================================
+# Número: dígitos com separadores . , e espaço de milhar ("1 234 567")
+_NUMERO_BR = re.compile(r'(-\s*)?(\d+(?:(?:[.,]|[ \u00a0](?=\d{3}(?!\d)))\d+)*)')
+# Faixa "10 a 20 mil ha": vale o limite inferior, com a magnitude/unidade do fim
+_FAIXA = re.compile(r'\s*(?:a|até|e|-|–)\s*\d+(?:[.,]\d+)*', re.IGNORECASE)
+_MAGNITUDE = re.compile(
+    r'\s*(mil(?:h(?:ão|ao|ões|oes))?\b|bilh(?:ão|ao|ões|oes)\b|trilh(?:ão|ao|ões|oes)\b'
+    r'|thousand\b|million\b|billion\b|mi\b\.?|bi\b\.?|tri\b\.?|mm\b|bn\b|k\b|(?-i:M|B)\b)',
+    re.IGNORECASE,
+)
+_UNIDADE = re.compile(
+    r'\s*(?:de\s+)?(hectares?|ha\b|alqueires?(?:\s+(?:paulista|mineiro|goiano|baiano)s?)?'
+    r'|km²|km2\b|m²|m2\b|toneladas?|ton\b|t\b|kg\b|quilos?|sacas?|sc\b|arrobas?|@|%)',
+    re.IGNORECASE,
+)
+_MOEDA = re.compile(r'R\$|US\$|U\$|\bUSD\b|\bBRL\b|\bEUR\b|€', re.IGNORECASE)
+# Moeda logo antes do número (procurada só numa janela curta antes dele)
+_MOEDA_ANTES = re.compile(r'(?:R\$|US\$|U\$|\bUSD|\bBRL|\bEUR|€)\s*$', re.IGNORECASE)
+
+# unidade lida -> (unidade canônica, fator para a canônica)
+_UNIDADES = {
+    'ha': ('ha', 1.0), 'hectare': ('ha', 1.0), 'hectares': ('ha', 1.0),
+    'km²': ('ha', 100.0), 'km2': ('ha', 100.0), 'm²': ('ha', 1e-4), 'm2': ('ha', 1e-4),
+    # alqueire sem qualificação: goiano/mineiro (4,84 ha), o usual no Centro-Oeste
+    'alqueire': ('ha', 4.84), 'alqueire paulista': ('ha', 2.42), 'alqueire mineiro': ('ha', 4.84),
+    'alqueire goiano': ('ha', 4.84), 'alqueire baiano': ('ha', 9.68),
+    't': ('t', 1.0), 'ton': ('t', 1.0), 'tonelada': ('t', 1.0), 'kg': ('t', 1e-3), 'quilo': ('t', 1e-3),
+    'saca': ('t', 0.06), 'sc': ('t', 0.06),  # saca de 60 kg
+    'arroba': ('t', 0.015), '@': ('t', 0.015),
+    '%': ('%', 1.0),
+}
+_MOEDAS = {'r$': 'BRL', 'brl': 'BRL', 'us$': 'USD', 'u$': 'USD', 'usd': 'USD', 'eur': 'EUR', '€': 'EUR'}
+
+
+def _fator_magnitude(palavra: str) -> float:
+    p = palavra.lower().rstrip('.')
+    if p.startswith('tri'):
+        return 1e12
+    if p.startswith('b'):
+        return 1e9
+    if p in ('mil', 'k', 'thousand'):
+        return 1e3
+    return 1e6  # milhão, mi, mm, M
+
+
+def _numero_sem_separadores(token: str) -> float:
+    """Decide milhar x decimal: com . e , o último é o decimal; separador repetido
+    é milhar ("1.234.567", "1,234,567"); vírgula única é sempre decimal, como em
+    pt-BR ("2,8", "1,250 bilhão"); ponto único seguido de exatamente 3 dígitos é
+    milhar ("15.000"), senão decimal ("2.5")."""
+    token = token.replace(' ', '').replace('\u00a0', '')
+    pontos, virgulas = token.count('.'), token.count(',')
+    if pontos and virgulas:
+        decimal = '.' if token.rfind('.') > token.rfind(',') else ','
+        milhar = ',' if decimal == '.' else '.'
+        token = token.replace(milhar, '').replace(decimal, '.')
+    elif pontos or virgulas:
+        separador = '.' if pontos else ','
+        partes = token.split(separador)
+        if len(partes) > 2 or (separador == '.' and len(partes[1]) == 3 and partes[0].lstrip('-') != '0'):
+            token = token.replace(separador, '')
+        else:
+            token = token.replace(separador, '.')
+    return float(token)
+
+
+def _sufixos(texto: str, fim: int) -> Tuple[Optional[re.Match], Optional[re.Match]]:
+    """(magnitude, unidade) logo depois do número (pulando o fim de uma faixa)."""
+    faixa = _FAIXA.match(texto, fim)
+    if faixa:
+        fim = faixa.end()
+    mag = _MAGNITUDE.match(texto, fim)
+    if mag:
+        fim = mag.end()
+    return mag, _UNIDADE.match(texto, fim)
+
+
+@lru_cache(maxsize=65536)
+def analisar_numero_br(texto: str) -> Optional[Tuple[float, str, float]]:
+    """
+    (número já multiplicado pela magnitude, unidade canônica, fator da unidade)
+    ou None. Unidade canônica: 'ha', 't', '%', 'BRL', 'USD', 'EUR' ou ''.
+
+        "R$ 2,8 bilhões"  -> (2.8e9, 'BRL', 1.0)
+        "120 alqueires"   -> (120.0, 'ha', 4.84)
+        "3,5 mil sacas"   -> (3500.0, 't', 0.06)
+        "Em 2023 faturou R$ 5 bi" -> (5e9, 'BRL', 1.0)
+
+    Vale o primeiro número colado a moeda, magnitude ou unidade; sem nenhum
+    assim, o primeiro número do texto (ano solto não ganha do valor).
+    """
+    if _AUSENCIA_NUMERO.search(texto.lower()):
+        return None
+    escolhido = None
+    for m in _NUMERO_BR.finditer(texto):
+        mag, uni = _sufixos(texto, m.end())
+        ancorado = bool(mag or uni) or bool(_MOEDA_ANTES.search(texto, max(0, m.start() - 8), m.start()))
+        if escolhido is None or ancorado:
+            escolhido = (m, mag, uni)
+        if ancorado:
+            break
+    if escolhido is None:
+        return None
+    m, mag, uni = escolhido
+    try:
+        valor = _numero_sem_separadores(m.group(2))
+    except ValueError:
+        return None
+    if m.group(1):
+        valor = -valor
+    if mag:
+        valor *= _fator_magnitude(mag.group(1))
+
+    unidade, fator = '', 1.0
+    if uni:
+        lida = re.sub(r'\s+', ' ', uni.group(1).lower())
+        lida = lida if lida in _UNIDADES else lida.rstrip('s').replace('s ', ' ')
+        unidade, fator = _UNIDADES.get(lida, _UNIDADES.get(lida.split(' ')[0], ('', 1.0)))
+    if not unidade:
+        moeda = _MOEDA.search(texto)
+        if moeda:
+            unidade = _MOEDAS[moeda.group(0).lower()]
+    return valor, unidade, fator
+
+
+def _na_unidade(value: Any, unidade: str, default: float) -> float:
+    """Valor convertido para a unidade canônica; texto em outra unidade (ex.: R$ pedido como ha) -> default."""
+    if isinstance(value, str):
+        analise = analisar_numero_br(value)
+        if not analise or analise[1] not in ('', unidade):
+            return default
+        return analise[0] * analise[2]
+    return DataValidator.to_float(value, default)
+
 
 class DataValidator:
     """Validador defensivo que sempre retorna valores seguros."""
@@ -22,31 +183,56 @@ class DataValidator:
         if isinstance(value, (int, float)):
             return float(value)
         
-        # Se é string
+        # Se é string: formato pt-BR ("R$ 1.234.567,89", "2,8 bilhões")
         if isinstance(value, str):
-            # Remove textos descritivos comuns
-            if any(x in value.lower() for x in [
-                'não encontrado', 'n/a', 'n/d', 'desconhecido', 
-                'indisponível', 'necessita', 'sem informação',
-                'não informado', 'não disponível'
-            ]):
-                return default
-            
-            # Remove caracteres não numéricos (mantém dígitos, ponto, vírgula, sinal)
-            cleaned = re.sub(r'[^\d.,\-]', '', value)
-            if not cleaned or cleaned in ['-', '.', ',']:
-                return default
-                
-            # Substitui vírgula por ponto
-            cleaned = cleaned.replace(',', '.')
-            
-            try:
-                return float(cleaned)
-            except (ValueError, TypeError):
-                return default
+            analise = analisar_numero_br(value)
+            return analise[0] if analise else default
         
         return default
     
+    @staticmethod
+    def to_hectares(value: Any, default: float = 0.0) -> float:
+        """Área em hectares ("15 mil ha", "120 alqueires", "3,2 km²"); número puro já é ha."""
+        return _na_unidade(value, 'ha', default)
+    
+    @staticmethod
+    def to_toneladas(value: Any, default: float = 0.0) -> float:
+        """Massa em toneladas ("50 mil t", "2 mi de sacas", "800 arrobas"); número puro já é t."""
+        return _na_unidade(value, 't', default)
+    
+    @staticmethod
+    def to_float_lote(valores: Any, default: float = 0.0, unidade: Optional[str] = None) -> Any:
+        """
+        Versão em lote de `to_float` (ou de `to_hectares`/`to_toneladas` com
+        unidade='ha'/'t') para lista, array NumPy ou Series pandas.
+        Coluna numérica é convertida direto; texto é fatorado e cada valor
+        distinto é analisado uma vez. Retorna ndarray float64 (Series com o
+        mesmo índice, se a entrada for Series; lista, sem NumPy).
+        """
+        converter = (lambda v: _na_unidade(v, unidade, default)) if unidade else \
+            (lambda v: DataValidator.to_float(v, default))
+        if np is None:
+            return [converter(v) for v in valores]
+        
+        serie = valores if pd is not None and isinstance(valores, pd.Series) else None
+        arr = serie.to_numpy() if serie is not None else np.asarray(valores)
+        if arr.dtype.kind in 'iuf':
+            saida = arr.astype(np.float64)
+            saida[np.isnan(saida)] = default
+        elif arr.dtype.kind == 'b':
+            saida = arr.astype(np.float64)
+        else:
+            if pd is not None:
+                codigos, distintos = pd.factorize(arr.astype(object, copy=False))
+            else:
+                distintos, codigos = np.unique(arr.astype(str), return_inverse=True)
+            analisados = np.fromiter((converter(v) for v in distintos), np.float64, len(distintos))
+            # código -1 (None/NaN no factorize) vira o default
+            saida = np.append(analisados, default)[codigos]
+        if serie is not None:
+            return pd.Series(saida, index=serie.index, name=serie.name)
+        return saida
+    
     @staticmethod
     def to_int(value: Any, default: int = 0) -> int:
         """Converte para inteiro de forma segura."""
@@ -56,6 +242,23 @@ class DataValidator:
         except:
             return default
     
+    @staticmethod
+    def to_bool(value: Any, default: bool = False) -> bool:
+        """Converte para booleano ("sim", "true", 1...) de forma segura."""
+        if value is None:
+            return default
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)):
+            return value != 0
+        if isinstance(value, str):
+            texto = value.strip().lower()
+            if texto in ('sim', 's', 'true', 'verdadeiro', 'yes', 'ativo', '1'):
+                return True
+            if texto in ('não', 'nao', 'n', 'false', 'falso', 'no', 'inativo', '0', ''):
+                return False
+        return default
+
     @staticmethod
     def to_string(value: Any, default: str = "") -> str:
         """Converte para string, removendo valores inválidos."""
@@ -64,10 +267,7 @@ class DataValidator:
             
         if isinstance(value, str):
             # Remove strings que indicam ausência de dados
-            if any(x in value.lower() for x in [
-                'não encontrado', 'n/a', 'n/d', 'desconhecido',
-                'indisponível', 'sem informação'
-            ]):
+            if _AUSENCIA_TEXTO.search(value.lower()):
                 return default
             return value.strip()
         
@@ -103,24 +303,14 @@ class DataValidator:
     @staticmethod
     def extract_number_from_text(text: str, default: float = 0.0) -> float:
         """
-        Extrai o primeiro número encontrado em um texto.
-        Exemplo: "Empresa possui 5000 hectares" -> 5000.0
+        Extrai o primeiro número encontrado em um texto (com magnitude).
+        Exemplo: "Empresa possui 5.000 hectares" -> 5000.0
         """
         if not text or not isinstance(text, str):
             return default
-            
-        # Procura por padrões numéricos
-        patterns = [
-            r'(\d{1,3}(?:[.,]\d{3})*(?:[.,]\d+)?)',  # 1.000,50 ou 1,000.50
-            r'(\d+[.,]?\d*)'  # 1000 ou 1000.5
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                return DataValidator.to_float(matches[0], default)
         
-        return default
+        analise = analisar_numero_br(text)
+        return analise[0] if analise else default
     
     @staticmethod
     def validate_confidence(value: Any) -> float:
@@ -188,3 +378,8 @@ def safe_str(value: Any, default: str = "") -> str:
 def safe_list(value: Any, default: Optional[List] = None) -> List:
     """Wrapper rápido para conversão segura de lista."""
     return validator.to_list(value, default)
+
+
+def safe_bool(value: Any, default: bool = False) -> bool:
+    """Wrapper rápido para conversão segura de booleano."""
+    return validator.to_bool(value, default)
@@ -7,7 +7,9 @@ Bandeirante Digital - Sistema de Inteligência de Mercado.
 
 import logging
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Union
+
+from services.result_models import ResultadoInvestigacao
 
 logger = logging.getLogger(__name__)
 
@@ -15,269 +17,237 @@ logger = logging.getLogger(__name__)
 class DossieGenerator:
     """Gerador de dossiês Bandeirante Digital."""
     
-    def gerar_dossie_completo(self, results: Dict) -> str:
+    def gerar_dossie_completo(self, results: Union[Dict, ResultadoInvestigacao]) -> str:
         """
         Gera dossiê markdown completo a partir dos resultados da investigação.
         
         Args:
-            results: Dicionário com resultados completos da investigação
+            results: Resultados da investigação (dict do orchestrator ou
+                `ResultadoInvestigacao` já tipado)
             
         Returns:
             String com dossiê formatado em Markdown
         """
+        inv = ResultadoInvestigacao.from_dict(results)
         sections = []
         
         # Gera cada seção do dossiê
-        sections.append(self._gerar_header(results))
-        sections.append(self._gerar_executive_summary(results))
-        sections.append(self._gerar_matriz_priorizacao(results))
-        sections.append(self._gerar_recomendacoes(results))
-        sections.append(self._gerar_todas_fases(results))
-        sections.append(self._gerar_footer(results))
+        sections.append(self._gerar_header(inv))
+        sections.append(self._gerar_executive_summary(inv))
+        sections.append(self._gerar_matriz_priorizacao(inv))
+        sections.append(self._gerar_recomendacoes(inv))
+        sections.append(self._gerar_todas_fases(inv))
+        sections.append(self._gerar_footer(inv))
         
         # Junta todas as seções com dupla quebra de linha
         return "\n\n".join(sections)
     
-    def _gerar_header(self, results: Dict) -> str:
+    def _gerar_header(self, inv: ResultadoInvestigacao) -> str:
         """Gera cabeçalho do dossiê."""
-        metadata = results.get("metadata", {})
-        empresa = metadata.get("empresa", "N/D")
-        cnpj = metadata.get("cnpj", "N/D")
         data_atual = datetime.now().strftime("%d/%m/%Y %H:%M")
         
         return (
             "# 🎯 DOSSIÊ DE INTELIGÊNCIA COMERCIAL\n"
             "## BANDEIRANTE DIGITAL - MODO DEUS\n\n"
-            f"**📋 EMPRESA:** {empresa}  \n"
-            f"**🔢 CNPJ:** {cnpj}  \n"
+            f"**📋 EMPRESA:** {inv.metadata.empresa or 'N/D'}  \n"
+            f"**🔢 CNPJ:** {inv.metadata.cnpj or 'N/D'}  \n"
             f"**📅 DATA:** {data_atual}  \n"
             "**⚡ VERSÃO:** 3.0\n\n"
             "---"
         )
     
-    def _gerar_executive_summary(self, results: Dict) -> str:
+    def _gerar_executive_summary(self, inv: ResultadoInvestigacao) -> str:
         """Gera resumo executivo."""
-        matriz = results.get("matriz_priorizacao", {})
-        score = matriz.get("score_final", 0)
-        status = matriz.get("status", "N/D")
-        classificacao = matriz.get("classificacao", "N/D")
-        
-        rec = results.get("recomendacoes", {})
-        acao = rec.get("acao_recomendada", "N/D")
+        matriz = inv.matriz_priorizacao
         
         return (
             "## 📊 EXECUTIVE SUMMARY\n\n"
-            f"**🎯 SCORE FINAL:** {score}/100  \n"
-            f"**📌 STATUS:** {status}  \n"
-            f"**🏆 CLASSIFICAÇÃO:** {classificacao}  \n"
-            f"**⚡ AÇÃO RECOMENDADA:** {acao}\n\n"
+            f"**🎯 SCORE FINAL:** {matriz.score_final}/100  \n"
+            f"**📌 STATUS:** {matriz.status or 'N/D'}  \n"
+            f"**🏆 CLASSIFICAÇÃO:** {matriz.classificacao or 'N/D'}  \n"
+            f"**⚡ AÇÃO RECOMENDADA:** {inv.recomendacoes.acao_recomendada or 'N/D'}\n\n"
             "---"
         )
     
-    def _gerar_matriz_priorizacao(self, results: Dict) -> str:
+    def _gerar_matriz_priorizacao(self, inv: ResultadoInvestigacao) -> str:
         """Gera seção da matriz de priorização."""
-        matriz = results.get("matriz_priorizacao", {})
-        
-        area = matriz.get("area_total_ha", 0)
-        score = matriz.get("score_final", 0)
-        status = matriz.get("status", "N/D")
+        matriz = inv.matriz_priorizacao
         
         return (
             "## 🎯 MATRIZ DE PRIORIZAÇÃO\n\n"
             "### Indicadores Chave\n\n"
-            f"- **Área Total:** {area:,.0f} hectares\n"
-            f"- **Score Final:** {score}/100\n"
-            f"- **Status:** {status}\n\n"
+            f"- **Área Total:** {matriz.area_total_ha:,.0f} hectares\n"
+            f"- **Score Final:** {matriz.score_final}/100\n"
+            f"- **Status:** {matriz.status or 'N/D'}\n\n"
             "---"
         )
     
-    def _gerar_recomendacoes(self, results: Dict) -> str:
+    def _gerar_recomendacoes(self, inv: ResultadoInvestigacao) -> str:
         """Gera seção de recomendações."""
-        rec = results.get("recomendacoes", {})
-        
-        acao = rec.get("acao_recomendada", "N/D")
-        score = rec.get("score", 0)
-        status = rec.get("status", "N/D")
+        rec = inv.recomendacoes
         
         content = (
             "## 🚀 RECOMENDAÇÕES DE AÇÃO\n\n"
-            f"**STATUS:** {status}  \n"
-            f"**AÇÃO:** {acao}  \n"
-            f"**SCORE:** {score}/100\n\n"
+            f"**STATUS:** {rec.status or 'N/D'}  \n"
+            f"**AÇÃO:** {rec.acao_recomendada or 'N/D'}  \n"
+            f"**SCORE:** {rec.score}/100\n\n"
             "### Próximos Passos\n\n"
         )
         
         # Adiciona cada passo
-        for passo in rec.get("proximos_passos", []):
+        for passo in rec.proximos_passos:
             content += f"{passo}\n"
         
         # Adiciona estratégia de abordagem
-        decisor = rec.get('decisor_principal', 'CEO')
-        gatilho = rec.get('gatilho_usar', 'N/D')
-        canal = rec.get('canal_preferido', 'LinkedIn')
-        momento = rec.get('melhor_momento_contato', 'N/D')
-        
         content += (
             "\n### Estratégia de Abordagem\n\n"
-            f"- **Decisor Principal:** {decisor}\n"
-            f"- **Gatilho a Usar:** {gatilho}\n"
-            f"- **Canal Preferido:** {canal}\n"
-            f"- **Melhor Momento:** {momento}\n\n"
+            f"- **Decisor Principal:** {rec.decisor_principal or 'CEO'}\n"
+            f"- **Gatilho a Usar:** {rec.gatilho_usar or 'N/D'}\n"
+            f"- **Canal Preferido:** {rec.canal_preferido or 'LinkedIn'}\n"
+            f"- **Melhor Momento:** {rec.melhor_momento_contato or 'N/D'}\n\n"
             "---"
         )
         
         return content
     
-    def _gerar_todas_fases(self, results: Dict) -> str:
+    def _gerar_todas_fases(self, inv: ResultadoInvestigacao) -> str:
         """Gera resumo de todas as fases da investigação."""
         content = "## 📋 DETALHAMENTO DAS FASES\n\n"
         
-        fases = results.get("fases", {})
+        fases = inv.fases
         
         # FASE -1: REPUTATION
-        reputation = fases.get("fase_-1_reputation", {})
-        flag_risco = reputation.get("flag_risco", "N/D")
-        
         content += (
             "### 🔍 FASE -1: SHADOW REPUTATION\n\n"
-            f"**Flag de Risco:** {flag_risco}\n\n"
+            f"**Flag de Risco:** {fases.reputacao.flag_risco or 'N/D'}\n\n"
             "---\n\n"
         )
         
         # FASE 1: INCENTIVOS FISCAIS
-        incentivos = fases.get("fase_1_incentivos", {})
-        estaduais = incentivos.get("incentivos_estaduais", {})
-        multas = incentivos.get("sancoes_multas", {})
+        estaduais = fases.incentivos.incentivos_estaduais
+        multas = fases.incentivos.sancoes_multas
         
         content += (
             "### 💰 FASE 1: INCENTIVOS FISCAIS\n\n"
-            f"- **Total de Incentivos:** {estaduais.get('total_incentivos', 0)}\n"
-            f"- **Benefício Anual Estimado:** {estaduais.get('valor_beneficio_anual_estimado', 'N/D')}\n"
-            f"- **Multas Fiscais:** {multas.get('total_multas_quantidade', 0)}\n"
-            f"- **Valor Total Multas:** {multas.get('total_multas_valor', 'R$ 0')}\n\n"
+            f"- **Total de Incentivos:** {estaduais.total_incentivos}\n"
+            f"- **Benefício Anual Estimado:** {estaduais.valor_beneficio_anual_estimado or 'N/D'}\n"
+            f"- **Multas Fiscais:** {multas.total_multas_quantidade}\n"
+            f"- **Valor Total Multas:** {multas.total_multas_valor or 'R$ 0'}\n\n"
             "---\n\n"
         )
         
         # FASE 2: TERRITORIAL
-        territorial = fases.get("fase_2_territorial", {})
-        fundiario = territorial.get("dados_fundiarios", {})
-        licencas = territorial.get("licencas_ambientais", {})
+        fundiario = fases.territorial.dados_fundiarios
+        licencas = fases.territorial.licencas_ambientais
         
-        estados_str = ', '.join(fundiario.get('estados_presenca', ['N/D']))
-        car_regular = 'Sim' if fundiario.get('car_status', {}).get('cadastrado') else 'Não'
+        estados_str = ', '.join(fundiario.estados_presenca) or 'N/D'
+        car_regular = 'Sim' if fundiario.car_status.cadastrado else 'Não'
         
         content += (
             "### 🗺️ FASE 2: INTELIGÊNCIA TERRITORIAL\n\n"
             "**Dados Fundiários:**\n"
-            f"- **Área Total:** {fundiario.get('area_total_ha', 0):,.0f} hectares\n"
-            f"- **Total de Imóveis:** {fundiario.get('total_imoveis', 0)}\n"
+            f"- **Área Total:** {fundiario.area_total_ha:,.0f} hectares\n"
+            f"- **Total de Imóveis:** {fundiario.total_imoveis}\n"
             f"- **Estados:** {estados_str}\n"
             f"- **CAR Regular:** {car_regular}\n\n"
             "**Licenças Ambientais:**\n"
-            f"- **Licenças Ativas:** {licencas.get('total_licencas', 0)}\n"
-            f"- **Licenças Recentes (6m):** {licencas.get('licencas_recentes_6m', 0)}\n\n"
+            f"- **Licenças Ativas:** {licencas.total_licencas}\n"
+            f"- **Licenças Recentes (6m):** {licencas.licencas_recentes_6m}\n\n"
             "---\n\n"
         )
         
         # FASE 3: LOGÍSTICA
-        logistica = fases.get("fase_3_logistica", {})
-        armazenagem = logistica.get("armazenagem", {})
-        frota = logistica.get("frota_logistica", {})
-        
-        rntrc_ativo = 'Ativo' if frota.get('rntrc', {}).get('ativo') else 'Inativo'
+        armazenagem = fases.logistica.armazenagem
+        rntrc = fases.logistica.frota_logistica.rntrc
         
         content += (
             "### 🚛 FASE 3: LOGÍSTICA & SUPPLY CHAIN\n\n"
             "**Armazenagem:**\n"
-            f"- **Capacidade Total:** {armazenagem.get('capacidade_total_toneladas', 0):,.0f} toneladas\n"
-            f"- **Unidades:** {armazenagem.get('total_unidades', 0)}\n"
-            f"- **Necessidade WMS:** {armazenagem.get('necessidade_wms', 'N/D')}\n\n"
+            f"- **Capacidade Total:** {armazenagem.capacidade_total_toneladas:,.0f} toneladas\n"
+            f"- **Unidades:** {armazenagem.total_unidades}\n"
+            f"- **Necessidade WMS:** {armazenagem.necessidade_wms or 'N/D'}\n\n"
             "**Frota:**\n"
-            f"- **RNTRC:** {rntrc_ativo}\n"
-            f"- **Veículos:** {frota.get('rntrc', {}).get('quantidade_veiculos', 0)}\n\n"
+            f"- **RNTRC:** {'Ativo' if rntrc.ativo else 'Inativo'}\n"
+            f"- **Veículos:** {rntrc.quantidade_veiculos}\n\n"
             "---\n\n"
         )
         
         # FASE 4: SOCIETÁRIO
-        societario = fases.get("fase_4_societario", {})
-        estrutura = societario.get("estrutura", {})
-        grupo = estrutura.get("grupo_economico", {})
+        societario = fases.societario
+        estrutura = societario.estrutura
+        grupo = estrutura.grupo_economico
         
         content += (
             "### 🏢 FASE 4: ESTRUTURA SOCIETÁRIA\n\n"
             "**Grupo Econômico:**\n"
-            f"- **Holding Controladora:** {grupo.get('holding_controladora', 'N/D')}\n"
-            f"- **Total Empresas:** {grupo.get('total_empresas_grupo', 0)}\n"
-            f"- **Capital Social Total:** {grupo.get('capital_social_total_grupo', 'R$ 0')}\n\n"
-            f"**Risco Societário:** {societario.get('risco_societario', 'N/D')}\n\n"
+            f"- **Holding Controladora:** {grupo.holding_controladora or 'N/D'}\n"
+            f"- **Total Empresas:** {grupo.total_empresas_grupo}\n"
+            f"- **Capital Social Total:** {estrutura.capital_social_total_grupo or 'R$ 0'}\n\n"
+            f"**Risco Societário:** {societario.risco_societario or 'N/D'}\n\n"
             "---\n\n"
         )
         
         # FASE 5: EXECUTIVOS
-        executivos = fases.get("fase_5_executivos", {})
-        hierarquia = executivos.get("hierarquia", {})
-        
-        tem_ti = 'Sim' if hierarquia.get('tem_area_ti') else 'Não'
+        hierarquia = fases.executivos.hierarquia
         
         content += (
             "### 👔 FASE 5: PROFILING DE EXECUTIVOS\n\n"
             "**Hierarquia:**\n"
-            f"- **Tem Área TI:** {tem_ti}\n"
-            f"- **Tipo de Decisão:** {hierarquia.get('tipo_decisao', 'N/D')}\n"
-            f"- **Vagas TI Abertas:** {len(hierarquia.get('vagas_ti_abertas', []))}\n\n"
+            f"- **Tem Área TI:** {'Sim' if hierarquia.tem_area_ti else 'Não'}\n"
+            f"- **Tipo de Decisão:** {hierarquia.tipo_decisao or 'N/D'}\n"
+            f"- **Vagas TI Abertas:** {len(hierarquia.vagas_ti_abertas)}\n\n"
             "---\n\n"
         )
         
         # FASE 6: TRIGGERS
-        triggers = fases.get("fase_6_triggers", {})
-        contexto = triggers.get("contexto_sazonal", {})
+        triggers = fases.triggers
+        contexto = triggers.contexto_sazonal
         
         content += (
             "### ⏰ FASE 6: TRIGGER EVENTS\n\n"
-            f"**Urgência Geral:** {triggers.get('urgencia_geral', 'N/D')}  \n"
-            f"**Melhor Momento:** {triggers.get('melhor_momento_contato', 'N/D')}\n\n"
+            f"**Urgência Geral:** {triggers.urgencia_geral or 'N/D'}  \n"
+            f"**Melhor Momento:** {triggers.melhor_momento_contato or 'N/D'}\n\n"
             "**Contexto Sazonal:**\n"
-            f"- **Período:** {contexto.get('periodo', 'N/D')}\n"
-            f"- **Abertura:** {contexto.get('abertura', 'N/D')}\n\n"
-            f"**Triggers Identificados:** {triggers.get('total_triggers', 0)}\n\n"
+            f"- **Período:** {contexto.periodo or 'N/D'}\n"
+            f"- **Abertura:** {contexto.abertura or 'N/D'}\n\n"
+            f"**Triggers Identificados:** {triggers.total_triggers}\n\n"
         )
         
         # Lista cada trigger
-        for i, trigger in enumerate(triggers.get("triggers", []), 1):
+        for i, trigger in enumerate(triggers.triggers, 1):
             content += (
-                f"**Trigger {i}:** {trigger.get('tipo', 'N/D')}\n"
-                f"- **Severidade:** {trigger.get('severidade', 'N/D')}\n"
-                f"- **Descrição:** {trigger.get('descricao', 'N/D')}\n"
-                f"- **Implicação:** {trigger.get('implicacao', 'N/D')}\n\n"
+                f"**Trigger {i}:** {trigger.tipo or 'N/D'}\n"
+                f"- **Severidade:** {trigger.severidade or 'N/D'}\n"
+                f"- **Descrição:** {trigger.descricao or 'N/D'}\n"
+                f"- **Implicação:** {trigger.implicacao or 'N/D'}\n\n"
             )
         
         content += "---\n\n"
         
         # FASE 7: PSICOLOGIA
-        psicologia = fases.get("fase_7_psicologia", {})
-        storytelling = psicologia.get('storytelling_abertura', 'N/D')
+        psicologia = fases.psicologia
         
         content += (
             "### 🧠 FASE 7: PSICOLOGIA & GATILHOS\n\n"
-            f"**Gatilho Psicológico:** {psicologia.get('gatilho_psicologico', 'N/D')}  \n"
-            f"**Canal Preferido:** {psicologia.get('canal_preferido', 'N/D')}  \n"
-            f"**Tom Recomendado:** {psicologia.get('tom_recomendado', 'Consultivo')}\n\n"
+            f"**Gatilho Psicológico:** {psicologia.gatilho_psicologico or 'N/D'}  \n"
+            f"**Canal Preferido:** {psicologia.canal_preferido or 'N/D'}  \n"
+            f"**Tom Recomendado:** {psicologia.tom_recomendado or 'Consultivo'}\n\n"
             "**Storytelling de Abertura:**\n\n"
             "```\n"
-            f"{storytelling}\n"
+            f"{psicologia.storytelling_abertura or 'N/D'}\n"
             "```\n\n"
             "---\n\n"
         )
         
         return content
     
-    def _gerar_footer(self, results: Dict) -> str:
+    def _gerar_footer(self, inv: ResultadoInvestigacao) -> str:
         """Gera rodapé do dossiê."""
-        metadata = results.get("metadata", {})
-        duracao = metadata.get("duracao_segundos", 0)
-        timestamp_fim = metadata.get("timestamp_fim", "N/D")
-        versao = metadata.get("versao", "3.0")
-        modo = metadata.get('modo', 'completo')
+        metadata = inv.metadata
+        duracao = metadata.duracao_segundos
+        timestamp_fim = metadata.timestamp_fim or "N/D"
+        versao = metadata.versao or "3.0"
+        modo = metadata.modo or "completo"
         
         return (
             "## 📝 METADADOS DA INVESTIGAÇÃO\n\n"
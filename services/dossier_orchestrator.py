@@ -14,6 +14,7 @@ from services.territorial_layer import TerritorialLayer
 from services.logistics_layer import LogisticsLayer
 from services.corporate_structure_layer import CorporateStructureLayer
 from services.executive_profiler import ExecutiveProfiler
+from services.result_models import MatrizPriorizacao, ResultadoIncentivos, ResultadoTerritorial
 
 logger = logging.getLogger(__name__)
 
@@ -210,11 +211,12 @@ Como vocês fazem isso hoje?"""
     
     def _calcular_matriz_priorizacao(self, results: Dict) -> Dict:
         """FASE 10: Matriz de priorização."""
-        territorial = results.get("fases", {}).get("fase_2_territorial", {})
-        area_total = territorial.get("dados_fundiarios", {}).get("area_total_ha", 0)
+        fases = results.get("fases", {})
+        territorial = ResultadoTerritorial.from_dict(fases.get("fase_2_territorial"))
+        area_total = territorial.dados_fundiarios.area_total_ha
         
-        incentivos = results.get("fases", {}).get("fase_1_incentivos", {})
-        total_incentivos = incentivos.get("incentivos_estaduais", {}).get("total_incentivos", 0)
+        incentivos = ResultadoIncentivos.from_dict(fases.get("fase_1_incentivos"))
+        total_incentivos = incentivos.incentivos_estaduais.total_incentivos
         
         # Cálculo de score
         score_area = min(40, (area_total / 2500))  # Máximo 40 pontos
@@ -234,13 +236,13 @@ Como vocês fazem isso hoje?"""
             status = "MONITORAR"
             classificacao = "📊 MONITORAR"
         
-        return {
-            "score_final": score_final,
-            "classificacao": classificacao,
-            "status": status,
-            "area_total_ha": area_total,
-            "total_incentivos": total_incentivos
-        }
+        return MatrizPriorizacao(
+            score_final=score_final,
+            classificacao=classificacao,
+            status=status,
+            area_total_ha=area_total,
+            total_incentivos=total_incentivos
+        ).to_dict()
     
     def _gerar_recomendacoes(self, results: Dict) -> Dict:
         """Gera recomendações finais de ação."""
@@ -0,0 +1,130 @@
+"""
+services/execution_profiles.py — PERFIS DE EXECUCAO (modo rapido / completo / profundo)
+Cada perfil decide quais fases e sub-consultas rodam, o modelo, o teto de tokens,
+o orcamento de tempo por fase e quais fases fundem suas sub-consultas numa chamada. O orchestrator aplica o perfil escolhido em `modo`.
+"""
+import logging
+import unicodedata
+from dataclasses import dataclass
+from typing import Collection, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TODAS = None  # sub-consultas da fase: todas
+
+# Sub-consultas de cada fase remota (chaves do dict retornado pela layer)
+SUBCONSULTAS_FASES = {
+    "fase_-1_reputation": ("judicial", "reputacao_online", "saude_financeira", "presenca_digital"),
+    "fase_1_incentivos": ("incentivos_estaduais", "incentivos_federais", "sancoes_multas", "creditos_presumidos"),
+    "fase_2_territorial": ("dados_fundiarios", "licencas_ambientais", "adjacencias"),
+    "fase_3_logistica": ("armazenagem", "frota_logistica", "exportacao"),
+    "fase_4_societario": ("estrutura", "holdings", "red_flags_societarias"),
+    "fase_5_executivos": ("hierarquia", "perfis_decisores"),
+}
+
+
+def subconsulta_ativa(nome: str, subconsultas: Optional[Collection[str]]) -> bool:
+    """Usado pelas layers: None = roda tudo (comportamento padrao)."""
+    return subconsultas is None or nome in subconsultas
+
+
+@dataclass(frozen=True)
+class PerfilExecucao:
+    nome: str
+    descricao: str
+    # fase -> sub-consultas (TODAS = todas); fase fora do dict nao roda
+    fases: Dict[str, Optional[Tuple[str, ...]]]
+    modelos: Optional[Tuple[str, ...]] = None      # None = Pro com fallback Flash (padrao do GeminiService)
+    max_output_tokens: int = 8192
+    max_retries: int = 3
+    orcamento_fase_segundos: Optional[float] = None  # None = sem limite
+    # Fases cujas sub-consultas irmas vao numa unica chamada multi-secao (so layers que suportam)
+    fases_fundidas: Tuple[str, ...] = ()
+
+    def executa_fase(self, fase: str) -> bool:
+        return fase in self.fases
+
+    def subconsultas(self, fase: str) -> Optional[Tuple[str, ...]]:
+        return self.fases.get(fase)
+
+    def funde(self, fase: str) -> bool:
+        return fase in self.fases_fundidas
+
+    def kwargs_gemini(self) -> Dict:
+        """Parametros repassados ao GeminiService.call_with_retry."""
+        kwargs = {"max_output_tokens": self.max_output_tokens, "max_retries": self.max_retries}
+        if self.modelos:
+            kwargs["models"] = list(self.modelos)
+        return kwargs
+
+    def subconsultas_planejadas(self, fase: str) -> int:
+        """Quantas chamadas LLM a fase custa neste perfil (0 se nao roda)."""
+        if fase not in self.fases:
+            return 0
+        subs = self.fases[fase]
+        total = len(SUBCONSULTAS_FASES.get(fase, ()) if subs is None else subs)
+        return min(total, 1) if self.funde(fase) else total
+
+    def total_subconsultas(self) -> int:
+        return sum(self.subconsultas_planejadas(fase) for fase in self.fases)
+
+    def to_dict(self) -> Dict:
+        return {
+            "nome": self.nome,
+            "descricao": self.descricao,
+            "fases": {f: list(s) if s is not None else "todas" for f, s in self.fases.items()},
+            "modelos": list(self.modelos) if self.modelos else "padrao",
+            "max_output_tokens": self.max_output_tokens,
+            "max_retries": self.max_retries,
+            "orcamento_fase_segundos": self.orcamento_fase_segundos,
+            "fases_fundidas": list(self.fases_fundidas),
+            "subconsultas_planejadas": self.total_subconsultas(),
+        }
+
+
+PERFIS = {
+    "rapido": PerfilExecucao(
+        nome="rapido",
+        descricao="Score utilizável em menos de 1 minuto: só o que alimenta risco, área e triggers",
+        fases={
+            "fase_-1_reputation": ("judicial", "saude_financeira"),
+            "fase_1_incentivos": ("incentivos_estaduais", "sancoes_multas"),
+            "fase_2_territorial": ("dados_fundiarios", "licencas_ambientais"),
+        },
+        modelos=("gemini-2.5-flash",),
+        max_output_tokens=2048,
+        max_retries=1,
+        orcamento_fase_segundos=25,
+        fases_fundidas=("fase_-1_reputation", "fase_1_incentivos"),
+    ),
+    "completo": PerfilExecucao(
+        nome="completo",
+        descricao="Todas as fases e sub-consultas, Pro com fallback Flash",
+        fases={fase: TODAS for fase in SUBCONSULTAS_FASES},
+        max_output_tokens=8192,
+        max_retries=3,
+        orcamento_fase_segundos=300,
+    ),
+    "profundo": PerfilExecucao(
+        nome="profundo",
+        descricao="Tudo, com respostas longas, mais tentativas e sem limite de tempo",
+        fases={fase: TODAS for fase in SUBCONSULTAS_FASES},
+        max_output_tokens=16384,
+        max_retries=5,
+        orcamento_fase_segundos=None,
+    ),
+}
+
+
+def obter_perfil(modo: str) -> PerfilExecucao:
+    """
+    Resolve o `modo` ("rápido", "Completo", ...) para um perfil. Modo
+    desconhecido (job salvo antigo, linha de lote digitada errado) cai no
+    "completo" com aviso, como antes dos perfis: nunca derruba a investigação.
+    """
+    chave = unicodedata.normalize("NFKD", (modo or "completo").strip().lower())
+    chave = "".join(c for c in chave if not unicodedata.combining(c))
+    if chave not in PERFIS:
+        logger.warning(f"[PERFIL] Modo desconhecido: {modo!r} (use um de {', '.join(PERFIS)}); usando 'completo'")
+        return PERFIS["completo"]
+    return PERFIS[chave]
@@ -3,9 +3,11 @@ services/executive_profiler.py — FASE 5/7: PROFILING DE EXECUTIVOS & DECISION
 Bandeirante Digital v3.0 - Mapa Psicologico, Tech-Affinity, Vulnerabilidades.
 """
 import logging
-import re
-import json
-from typing import Dict, List
+from typing import Collection, Dict, List, Optional
+
+from services.execution_profiles import subconsulta_ativa
+
+from utils.json_extractor import extrair_json
 
 logger = logging.getLogger(__name__)
 
@@ -19,21 +21,21 @@ class ExecutiveProfiler:
     def __init__(self, gemini_service):
         self.gemini = gemini_service
 
-    async def profiling_completo(self, empresa: str) -> Dict:
+    async def profiling_completo(self, empresa: str, subconsultas: Optional[Collection[str]] = None) -> Dict:
         """Pipeline de profiling de decisores."""
         logger.info(f"[PROFILING] Iniciando profiling de executivos: {empresa}")
 
         results = {}
 
         try:
-            hierarquia = await self._mapear_hierarquia(empresa)
+            hierarquia = await self._mapear_hierarquia(empresa) if subconsulta_ativa("hierarquia", subconsultas) else {}
             results["hierarquia"] = hierarquia
         except Exception as e:
             logger.warning(f"[PROFILING] Erro hierarquia: {e}")
             results["hierarquia"] = {}
 
         try:
-            perfis = await self._profiling_decisores(empresa, hierarquia)
+            perfis = await self._profiling_decisores(empresa, hierarquia) if subconsulta_ativa("perfis_decisores", subconsultas) else {}
             results["perfis_decisores"] = perfis
         except Exception as e:
             logger.warning(f"[PROFILING] Erro perfis: {e}")
@@ -170,13 +172,4 @@ RETORNE JSON:
         return sorted(matriz, key=lambda x: x.get("score", 0), reverse=True)
 
     def _parse_json(self, response: str) -> Dict:
-        if not response:
-            return {}
-        try:
-            clean = response.replace("```json", "").replace("```", "").strip()
-            match = re.search(r'\{.*\}', clean, re.DOTALL)
-            if match:
-                return json.loads(match.group(0))
-        except Exception:
-            pass
-        return {}
+        return extrair_json(response, origem="[PROFILING]")
@@ -1,7 +1,8 @@
-import json
 import logging
 from typing import Dict, List
 
+from utils.json_extractor import extrair_json
+
 logger = logging.getLogger(__name__)
 
 class FamilyOfficeLayer:
@@ -95,9 +96,4 @@ RETORNE JSON:
             return {"socios_estrutura": [], "status": "erro"}
     
     def _parse_json_response(self, response: str) -> Dict:
-        try:
-            clean = response.replace("```json", "").replace("```", "").strip()
-            return json.loads(clean)
-        except:
-            logger.warning("Falha ao parsear JSON family office")
-            return {}
+        return extrair_json(response, origem="[FAMILY OFFICE]")
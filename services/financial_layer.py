@@ -3,11 +3,11 @@ services/financial_layer.py — VERSÃO BLINDADA
 Inclui extrator de JSON via Regex para evitar perda de dados quando a IA "fala demais".
 """
 import logging
-import re
-import json
 import asyncio
 from typing import Dict, Optional
 
+from utils.json_extractor import extrair_json
+
 logger = logging.getLogger(__name__)
 
 class FinancialLayer:
@@ -15,23 +15,8 @@ class FinancialLayer:
         self.gemini = gemini_service
 
     def _extrair_json_seguro(self, texto: str) -> Dict:
-        """
-        Remove textos extras (ex: 'Aqui está o JSON') e extrai apenas o objeto.
-        """
-        try:
-            # Tenta limpar marcadores de código
-            clean = texto.replace("```json", "").replace("```", "").strip()
-            return json.loads(clean)
-        except json.JSONDecodeError:
-            # Se falhar, usa Regex para achar o primeiro '{' e o último '}'
-            try:
-                match = re.search(r'\{.*\}', texto, re.DOTALL)
-                if match:
-                    return json.loads(match.group(0))
-            except:
-                pass
-            return {}
-        return {}
+        """Remove textos extras (ex: 'Aqui está o JSON') e extrai apenas o objeto."""
+        return extrair_json(texto, origem="[FINANCEIRO]")
 
     async def mineracao_cra_debentures(self, empresa: str, cnpj: str) -> Dict:
         """
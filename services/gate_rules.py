@@ -0,0 +1,138 @@
+"""
+services/gate_rules.py — GATES DE SAIDA ANTECIPADA ENTRE FASES
+Regras declarativas (JSON) avaliadas apos as fases baratas. Se uma regra dispara,
+o orchestrator nao roda as fases caras restantes e marca o resultado como descartado.
+
+Formato de cada regra (config/gates.json):
+    {
+        "nome": "risco_vermelho",
+        "descricao": "Reputacao com flag VERMELHO",
+        "apos_fase": "fase_-1_reputation",
+        "campo": "flag_risco",              # caminho com pontos dentro do resultado da fase
+        "operador": "igual",
+        "valor": "VERMELHO",
+        "ativa": true
+    }
+Campo ausente nunca dispara a regra (sem dado, sem descarte).
+"""
+import os
+import json
+import logging
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GATES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "gates.json"
+)
+
+_AUSENTE = object()
+
+
+def _normalizar(valor: Any) -> Any:
+    return valor.strip().upper() if isinstance(valor, str) else valor
+
+
+def _numero(valor: Any) -> Optional[float]:
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def _comparar(observado: Any, limite: Any, teste) -> bool:
+    a, b = _numero(observado), _numero(limite)
+    return a is not None and b is not None and teste(a, b)
+
+
+# operador -> f(valor_observado, valor_da_regra); strings comparadas sem caixa/espacos
+OPERADORES = {
+    "igual": lambda v, r: _normalizar(v) == _normalizar(r),
+    "diferente": lambda v, r: _normalizar(v) != _normalizar(r),
+    "em": lambda v, r: _normalizar(v) in {_normalizar(x) for x in r},
+    "nao_em": lambda v, r: _normalizar(v) not in {_normalizar(x) for x in r},
+    "contem": lambda v, r: _normalizar(r) in (_normalizar(v) if isinstance(v, str) else v or []),
+    "verdadeiro": lambda v, r: bool(v),
+    "maior": lambda v, r: _comparar(v, r, lambda a, b: a > b),
+    "maior_igual": lambda v, r: _comparar(v, r, lambda a, b: a >= b),
+    "menor": lambda v, r: _comparar(v, r, lambda a, b: a < b),
+    "menor_igual": lambda v, r: _comparar(v, r, lambda a, b: a <= b),
+}
+
+
+@dataclass
+class RegraGate:
+    nome: str
+    apos_fase: str
+    campo: str
+    operador: str
+    valor: Any = None
+    descricao: str = ""
+    ativa: bool = True
+
+    def __post_init__(self):
+        if self.operador not in OPERADORES:
+            raise ValueError(
+                f"Gate '{self.nome}': operador '{self.operador}' invalido (use um de {', '.join(OPERADORES)})"
+            )
+
+    def valor_observado(self, dados_fase: Dict) -> Any:
+        atual: Any = dados_fase
+        for parte in self.campo.split("."):
+            if not isinstance(atual, dict) or parte not in atual:
+                return _AUSENTE
+            atual = atual[parte]
+        return atual
+
+    def avaliar(self, dados_fase: Dict) -> Optional[Dict]:
+        """Retorna o disparo ({regra, descricao, fase, campo, valor_observado}) ou None."""
+        if not self.ativa:
+            return None
+        observado = self.valor_observado(dados_fase or {})
+        if observado is _AUSENTE or observado is None:
+            return None
+        try:
+            disparou = OPERADORES[self.operador](observado, self.valor)
+        except TypeError:
+            return None
+        if not disparou:
+            return None
+        return {
+            "regra": self.nome,
+            "descricao": self.descricao,
+            "fase": self.apos_fase,
+            "campo": self.campo,
+            "valor_observado": observado,
+        }
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def carregar_regras(caminho: Optional[str] = None) -> List[RegraGate]:
+    """
+    Le as regras do JSON (lista de regras ou {"regras": [...]}).
+    Sem arquivo, nenhuma regra: a investigacao roda inteira.
+    """
+    caminho = caminho or os.environ.get("BANDEIRANTE_GATES") or DEFAULT_GATES_PATH
+    if not os.path.exists(caminho):
+        logger.info(f"[GATES] {caminho} nao encontrado; sem gates")
+        return []
+    with open(caminho, encoding="utf-8") as f:
+        bruto = json.load(f)
+    if isinstance(bruto, dict):
+        bruto = bruto.get("regras", [])
+    regras = [RegraGate(**r) for r in bruto]
+    logger.info(f"[GATES] {sum(r.ativa for r in regras)} regra(s) ativa(s) de {caminho}")
+    return regras
+
+
+def avaliar_gates(regras: List[RegraGate], fase: str, dados_fase: Dict) -> Optional[Dict]:
+    """Primeira regra da fase que dispara (na ordem do arquivo), ou None."""
+    for regra in regras:
+        if regra.apos_fase == fase:
+            disparo = regra.avaliar(dados_fase)
+            if disparo:
+                return disparo
+    return None
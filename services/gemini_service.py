@@ -7,7 +7,7 @@ from google.genai import types
 import logging
 import time
 import asyncio
-from typing import Optional
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -20,9 +20,11 @@ class GeminiService:
     - Retry automático com troca de modelo
     """
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, requests_per_minute: int = 60):
         """
         Inicializa o Gemini com configuração de alta precisão.
+        Uma instância = um rate limiter: compartilhe-a entre investigações
+        concorrentes para respeitar a quota global.
         """
         if not api_key:
             logger.error("API Key não fornecida para GeminiService")
@@ -38,9 +40,10 @@ class GeminiService:
         self.fallback_model = "gemini-2.5-flash"
         
         # Rate limiting otimizado (60 req/min para Paid Tier)
-        self.requests_per_minute = 60
+        self.requests_per_minute = requests_per_minute
         self.request_interval = 60.0 / self.requests_per_minute
         self.last_request_time = 0
+        self._proximo_slot = 0.0
         
         logger.info(f"[GeminiService] Inicializado. Principal: {self.primary_model} | Fallback: {self.fallback_model}")
 
@@ -56,13 +59,16 @@ class GeminiService:
         prompt: str, 
         max_retries: int = 3,
         use_search: bool = True,
-        temperature: float = 0.2
+        temperature: float = 0.2,
+        max_output_tokens: int = 8192,
+        models: Optional[List[str]] = None
     ) -> str:
         """
         Chama Gemini com retry automático e FALLBACK de modelo.
+        `models` permite restringir/reordenar os modelos (ex.: só o Flash no modo rápido).
         """
         # Lista de modelos para tentar em ordem: Principal -> Fallback
-        models_to_try = [self.primary_model, self.fallback_model]
+        models_to_try = models or [self.primary_model, self.fallback_model]
         
         last_error = None
 
@@ -77,7 +83,7 @@ class GeminiService:
                     # Configuração da chamada
                     config = types.GenerateContentConfig(
                         temperature=temperature,
-                        max_output_tokens=8192,
+                        max_output_tokens=max_output_tokens,
                         # Habilita o SEARCH tool corretamente no novo SDK
                         tools=[types.Tool(google_search=types.GoogleSearch())] if use_search else None
                     )
@@ -101,7 +107,7 @@ class GeminiService:
                     last_error = e
                     # Se for erro 404 (Modelo não encontrado) ou 429 (Quota), o loop continua para o próximo modelo (Fallback)
                     # Se o modelo principal falhar, o loop interno pega o fallback_model imediatamente
-                    if model_name == self.primary_model:
+                    if model_name != models_to_try[-1]:
                         logger.info(f"[GeminiService] Alternando para fallback: {self.fallback_model}")
                         continue
             
@@ -121,12 +127,15 @@ class GeminiService:
     async def _rate_limit(self):
         """
         Rate limiting assíncrono para não bloquear o Streamlit.
+        Reserva o slot só DEPOIS de dormir (checar e reservar sem await no meio):
+        coroutines que acordam juntas voltam a dormir até o próximo slot, e uma
+        espera cancelada (orçamento da fase no `wait_for`) não gasta slot.
         """
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.request_interval:
-            sleep_time = self.request_interval - time_since_last
-            await asyncio.sleep(sleep_time) # Async sleep é crucial
+        while True:
+            espera = self._proximo_slot - time.time()
+            if espera <= 0:
+                break
+            await asyncio.sleep(espera) # Async sleep é crucial
         
         self.last_request_time = time.time()
+        self._proximo_slot = self.last_request_time + self.request_interval
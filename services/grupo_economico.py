@@ -0,0 +1,267 @@
+"""
+services/grupo_economico.py — GRAFO SOCIETARIO LOCAL (CNPJ RAIZ x SOCIOS)
+Cada consulta de CNPJ (APIs ou indice offline) alimenta o grafo: a raiz do CNPJ
+liga-se aos seus estabelecimentos e aos socios do QSA. Socio PJ e a propria
+empresa (raiz do CNPJ dele); socio PF e identificado por nome normalizado + os
+digitos visiveis do CPF mascarado. Empresas que compartilham socios caem no
+mesmo componente: `grupo(cnpj)` devolve o `GrupoEconomico` por BFS, em
+milissegundos, sem chamada ao Gemini.
+
+Persistencia em SQLite (append-only): varios processos alimentam o mesmo
+arquivo e cada um sincroniza so as linhas novas antes de consultar.
+"""
+import os
+import re
+import sqlite3
+import logging
+import threading
+import unicodedata
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from scout_types import DadosCNPJ, GrupoEconomico
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(".bandeirante", "grupos.db")
+
+MAX_SALTOS = 3          # empresas a no maximo N socios de distancia do alvo
+MAX_GRAU_SOCIO = 100    # socio em mais empresas que isso (fundo, cooperativa) nao liga grupos
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS estabelecimentos (
+    cnpj TEXT PRIMARY KEY,
+    raiz TEXT NOT NULL,
+    razao_social TEXT
+);
+CREATE TABLE IF NOT EXISTS vinculos (
+    raiz TEXT NOT NULL,
+    socio TEXT NOT NULL,
+    nome_socio TEXT,
+    qualificacao TEXT,
+    PRIMARY KEY (raiz, socio)
+);
+"""
+
+_QUALIFICACOES_CONTROLE = ("administrador", "presidente", "diretor", "controlador", "titular")
+
+
+def _normalizar(nome: str) -> str:
+    sem_acento = unicodedata.normalize("NFKD", nome or "").encode("ascii", "ignore").decode()
+    return re.sub(r"\s+", " ", sem_acento).strip().upper()
+
+
+def _no_empresa(raiz: str) -> str:
+    return f"E:{raiz}"
+
+
+def _no_socio(socio: Dict) -> Optional[str]:
+    """Identidade do socio no grafo: PJ -> no da empresa; PF -> nome + digitos visiveis do CPF."""
+    documento = re.sub(r"\D", "", socio.get("documento", "") or "")
+    if len(documento) == 14:
+        return _no_empresa(documento[:8])
+    nome = _normalizar(socio.get("nome", ""))
+    if not nome:
+        return None
+    return f"P:{nome}|{documento}" if documento else f"P:{nome}"
+
+
+class GrafoSocietario:
+    """
+    Listas de adjacencia em memoria (no -> vizinhos) sobre um log SQLite.
+    Nos: "E:<raiz>" (empresa) e "P:<nome>|<cpf parcial>" (pessoa fisica).
+    """
+
+    def __init__(self, db_path: Optional[str] = DEFAULT_DB_PATH):
+        self.db_path = db_path or None
+        self._adj: Dict[str, Set[str]] = {}
+        self._estabelecimentos: Dict[str, Set[str]] = {}
+        self._nomes: Dict[str, str] = {}
+        self._qualificacoes: Dict[Tuple[str, str], str] = {}
+        self._ultimo = {"estabelecimentos": 0, "vinculos": 0}
+        self._lock = threading.RLock()
+        if self.db_path:
+            pasta = os.path.dirname(self.db_path)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+            with self._conectar() as conn:
+                conn.executescript(_SCHEMA)
+            self.sincronizar()
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+    def registrar(self, dados: DadosCNPJ) -> int:
+        """Adiciona o estabelecimento e o QSA. Retorna quantas arestas novas entraram."""
+        cnpj = re.sub(r"\D", "", dados.cnpj or "")
+        if len(cnpj) != 14:
+            return 0
+        raiz = cnpj[:8]
+        vinculos = []
+        for socio in dados.qsa or []:
+            no = _no_socio(socio)
+            if no and no != _no_empresa(raiz):
+                vinculos.append((raiz, no, socio.get("nome", ""), socio.get("qualificacao", "")))
+
+        with self._lock:
+            novo_estab = cnpj not in self._estabelecimentos.get(raiz, ())
+            novos = [v for v in vinculos if v[1] not in self._adj.get(_no_empresa(raiz), ())]
+            self._adicionar_estabelecimento(cnpj, raiz, dados.razao_social)
+            for v in novos:
+                self._adicionar_vinculo(*v)
+
+        if self.db_path and (novo_estab or novos):
+            with self._conectar() as conn:
+                conn.execute("INSERT OR IGNORE INTO estabelecimentos VALUES (?, ?, ?)",
+                             (cnpj, raiz, dados.razao_social))
+                conn.executemany("INSERT OR IGNORE INTO vinculos VALUES (?, ?, ?, ?)", novos)
+        return len(novos)
+
+    def _adicionar_estabelecimento(self, cnpj: str, raiz: str, razao_social: str) -> None:
+        self._estabelecimentos.setdefault(raiz, set()).add(cnpj)
+        self._adj.setdefault(_no_empresa(raiz), set())
+        if razao_social:
+            self._nomes[_no_empresa(raiz)] = razao_social
+
+    def _adicionar_vinculo(self, raiz: str, no: str, nome: str, qualificacao: str) -> None:
+        empresa = _no_empresa(raiz)
+        self._adj.setdefault(empresa, set()).add(no)
+        self._adj.setdefault(no, set()).add(empresa)
+        self._nomes.setdefault(no, nome)
+        self._qualificacoes[(empresa, no)] = qualificacao
+
+    def sincronizar(self) -> None:
+        """Carrega as linhas gravadas (por este ou outros processos) desde a ultima leitura."""
+        if not self.db_path:
+            return
+        with self._conectar() as conn:
+            estabs = conn.execute(
+                "SELECT rowid, cnpj, raiz, razao_social FROM estabelecimentos WHERE rowid > ? ORDER BY rowid",
+                (self._ultimo["estabelecimentos"],),
+            ).fetchall()
+            vinculos = conn.execute(
+                "SELECT rowid, raiz, socio, nome_socio, qualificacao FROM vinculos WHERE rowid > ? ORDER BY rowid",
+                (self._ultimo["vinculos"],),
+            ).fetchall()
+        with self._lock:
+            for rowid, cnpj, raiz, razao in estabs:
+                self._adicionar_estabelecimento(cnpj, raiz, razao)
+                self._ultimo["estabelecimentos"] = rowid
+            for rowid, raiz, no, nome, qualificacao in vinculos:
+                self._adicionar_vinculo(raiz, no, nome, qualificacao)
+                self._ultimo["vinculos"] = rowid
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    def componente(self, raiz: str, max_saltos: int = MAX_SALTOS) -> Dict[str, int]:
+        """BFS a partir da empresa: {raiz: distancia em socios}. Socios-hub nao propagam."""
+        inicio = _no_empresa(raiz)
+        if inicio not in self._adj:
+            return {}
+        distancias = {inicio: 0}
+        fila = deque([inicio])
+        while fila:
+            empresa = fila.popleft()
+            if distancias[empresa] >= max_saltos:
+                continue
+            for vizinho in self._adj[empresa]:
+                if vizinho.startswith("E:"):  # socio PJ: empresa ligada diretamente
+                    alcancadas = (vizinho,)
+                elif len(self._adj[vizinho]) > MAX_GRAU_SOCIO:
+                    continue
+                else:
+                    alcancadas = self._adj[vizinho]
+                for outra in alcancadas:
+                    if outra not in distancias:
+                        distancias[outra] = distancias[empresa] + 1
+                        fila.append(outra)
+        return {no[2:]: d for no, d in distancias.items()}
+
+    def componentes(self, min_empresas: int = 2) -> List[Set[str]]:
+        """Todos os grupos conhecidos (componentes conexos sem limite de saltos)."""
+        with self._lock:
+            vistos: Set[str] = set()
+            grupos = []
+            for no in self._adj:
+                if not no.startswith("E:") or no[2:] in vistos:
+                    continue
+                grupo = set(self.componente(no[2:], max_saltos=len(self._adj)))
+                vistos |= grupo
+                if len(grupo) >= min_empresas:
+                    grupos.append(grupo)
+            return grupos
+
+    def _cnpj_referencia(self, raiz: str) -> str:
+        estabs = sorted(self._estabelecimentos.get(raiz, ()))
+        matrizes = [c for c in estabs if c[8:12] == "0001"]
+        return (matrizes or estabs or [raiz])[0]
+
+    def grupo(self, cnpj: str, max_saltos: int = MAX_SALTOS) -> GrupoEconomico:
+        """GrupoEconomico do CNPJ a partir do que ja foi consultado (vazio se desconhecido)."""
+        self.sincronizar()
+        cnpj = re.sub(r"\D", "", cnpj or "")
+        raiz = cnpj[:8]
+        with self._lock:
+            distancias = self.componente(raiz, max_saltos)
+            if not distancias:
+                return GrupoEconomico()
+            empresa = _no_empresa(raiz)
+            matriz = self._cnpj_referencia(raiz)
+            filiais = sorted(c for c in self._estabelecimentos.get(raiz, ()) if c != matriz)
+            coligadas = [self._cnpj_referencia(r) for r, _ in
+                         sorted(distancias.items(), key=lambda item: (item[1], item[0])) if r != raiz]
+
+            # Controladores: socios do alvo, primeiro quem administra e quem aparece em mais empresas do grupo
+            def _peso(no: str) -> Tuple:
+                qualificacao = self._qualificacoes.get((empresa, no), "").lower()
+                controle = any(q in qualificacao for q in _QUALIFICACOES_CONTROLE)
+                no_grupo = sum(1 for e in self._adj[no] if e[2:] in distancias) if not no.startswith("E:") else 1
+                return (not controle, -no_grupo, self._nomes.get(no, no))
+
+            socios = sorted(self._adj[empresa], key=_peso)
+            holdings = [no for no in socios if no.startswith("E:")]
+            return GrupoEconomico(
+                cnpj_matriz=matriz,
+                cnpjs_filiais=filiais,
+                cnpjs_coligadas=coligadas,
+                total_empresas=len(distancias),
+                controladores=[self._nomes.get(no, no[2:]) for no in socios],
+                holding_controladora=self._nomes.get(holdings[0], holdings[0][2:]) if holdings else "",
+                confianca=0.9 if socios else 0.3,  # fato cadastral; sem QSA so conhecemos a raiz
+            )
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "empresas": sum(1 for no in self._adj if no.startswith("E:")),
+                "pessoas": sum(1 for no in self._adj if no.startswith("P:")),
+                "estabelecimentos": sum(len(v) for v in self._estabelecimentos.values()),
+                "vinculos": len(self._qualificacoes),
+            }
+
+
+_grafo: Optional[GrafoSocietario] = None
+_grafo_lock = threading.Lock()
+
+
+def obter_grafo() -> GrafoSocietario:
+    """Grafo do processo (BANDEIRANTE_GRUPOS_DB; "" = so em memoria)."""
+    global _grafo
+    with _grafo_lock:
+        if _grafo is None:
+            _grafo = GrafoSocietario(os.environ.get("BANDEIRANTE_GRUPOS_DB", DEFAULT_DB_PATH))
+        return _grafo
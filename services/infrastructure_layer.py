@@ -4,10 +4,11 @@ Foca em Licenças Ambientais, Relatórios GRI e Ativos Logísticos para detalhar
 """
 import logging
 import re
-import json
 import asyncio
 from typing import Dict, List, Optional
 
+from utils.json_extractor import extrair_json
+
 logger = logging.getLogger(__name__)
 
 class InfrastructureLayer:
@@ -88,11 +89,9 @@ class InfrastructureLayer:
             # Temperatura 0.1 para buscar fatos, não inventar
             response = await self.gemini.call_with_retry(prompt, use_search=True, temperature=0.1)
             
-            clean = response.replace("```json", "").replace("```", "").strip()
-            match = re.search(r'\{.*\}', clean, re.DOTALL)
+            dados = extrair_json(response, origem="[INFRA]")
             
-            if match:
-                dados = json.loads(match.group(0))
+            if dados:
                 
                 # Tratamento de erro para área total se vier zerada
                 if dados.get("resumo_territorial", {}).get("area_total_ha") == 0:
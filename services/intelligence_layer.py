@@ -4,11 +4,11 @@ Camada de Inteligência Expandida para Auditoria Forense.
 Inclui: Decisores, Investimentos, Tech Stack e Concorrentes.
 """
 import logging
-import re
-import json
 import asyncio
 from typing import Dict, List, Optional
 
+from utils.json_extractor import extrair_json
+
 logger = logging.getLogger(__name__)
 
 class IntelligenceLayer:
@@ -46,9 +46,7 @@ class IntelligenceLayer:
         try:
             # Temperatura baixa para evitar alucinação de softwares que não existem
             response = await self.gemini.call_with_retry(prompt, use_search=True, temperature=0.1)
-            clean = response.replace("```json", "").replace("```", "").strip()
-            match = re.search(r'\{.*\}', clean, re.DOTALL)
-            return json.loads(match.group(0)) if match else {}
+            return extrair_json(response, origem="[TECH STACK]")
         except Exception as e:
             logger.warning(f"Erro Tech Stack: {e}")
             return {}
@@ -77,9 +75,7 @@ class IntelligenceLayer:
         """
         try:
             response = await self.gemini.call_with_retry(prompt, use_search=True, temperature=0.1)
-            clean = response.replace("```json", "").replace("```", "").strip()
-            match = re.search(r'\{.*\}', clean, re.DOTALL)
-            return json.loads(match.group(0)) if match else {}
+            return extrair_json(response, origem="[PEOPLE]")
         except Exception as e:
             logger.warning(f"Erro Mapeamento Decisores: {e}")
             return {}
@@ -104,9 +100,7 @@ class IntelligenceLayer:
         """
         try:
             response = await self.gemini.call_with_retry(prompt, use_search=True, temperature=0.1)
-            clean = response.replace("```json", "").replace("```", "").strip()
-            match = re.search(r'\[.*\]', clean, re.DOTALL)
-            return json.loads(match.group(0)) if match else []
+            return extrair_json(response, list, origem="[CAPEX]")
         except Exception as e:
             logger.warning(f"Erro CAPEX: {e}")
             return []
@@ -126,9 +120,7 @@ class IntelligenceLayer:
         """
         try:
             response = await self.gemini.call_with_retry(prompt, use_search=True, temperature=0.2)
-            clean = response.replace("```json", "").replace("```", "").strip()
-            match = re.search(r'\{.*\}', clean, re.DOTALL)
-            return json.loads(match.group(0)) if match else {}
+            return extrair_json(response, origem="[CONCORRENTES]")
         except Exception as e:
             logger.warning(f"Erro Concorrentes: {e}")
             return {}
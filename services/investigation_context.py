@@ -0,0 +1,213 @@
+"""
+services/investigation_context.py — CONTEXTO POR INVESTIGACAO
+Proxy do GeminiService que conhece a investigacao em andamento (via ContextVar),
+permitindo checkpoint de cada sub-consulta sem alterar as layers.
+Respostas JSON truncadas (max_output_tokens) sao completadas com um pedido so
+dos campos que faltaram, em vez de a layer receber {} e a consulta ser refeita.
+"""
+import json
+import time
+import hashlib
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from services.checkpoint_store import CheckpointStore
+from services.execution_profiles import PerfilExecucao
+from services.investigation_events import EventoInvestigacao, TipoEvento
+from services.prompt_fusion import secoes_do_prompt
+from utils.json_extractor import analisar_json, extrair_json
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ContextoInvestigacao:
+    """Estado de uma investigacao visivel para todas as layers da mesma task."""
+    investigation_id: str
+    store: Optional[CheckpointStore] = None
+    ao_evento: Optional[Callable[[EventoInvestigacao], None]] = None
+    perfil: Optional[PerfilExecucao] = None
+    fase_atual: Optional[str] = None
+    # sub-consultas salvas antes disto (ISO) nao sao restauradas: fase vencida e refeita de verdade
+    subconsultas_desde: Optional[str] = None
+    subconsultas_restauradas: int = 0
+    subconsultas_executadas: int = 0
+    falhas_fase: int = 0
+    caracteres_prompt: int = 0
+    caracteres_resposta: int = 0
+    reparos_json: int = 0
+    completacoes_json: int = 0
+
+    def emitir(self, tipo: TipoEvento, fase: Optional[str] = None, **dados) -> None:
+        """Publica um evento para quem estiver ouvindo (stream); sem ouvinte, nada acontece."""
+        if self.ao_evento is not None:
+            self.ao_evento(EventoInvestigacao(tipo, self.investigation_id, fase or self.fase_atual, dados))
+
+    def custo(self) -> Dict:
+        """Chamadas feitas nesta execucao e tokens estimados (~4 caracteres por token)."""
+        return {
+            "chamadas_llm": self.subconsultas_executadas,
+            "subconsultas_restauradas": self.subconsultas_restauradas,
+            "json_reparados": self.reparos_json,
+            "json_completados": self.completacoes_json,
+            # cada JSON salvo localmente (ou com um pedido curto) e uma consulta que nao foi refeita
+            "reexecucoes_evitadas": self.reparos_json + self.completacoes_json,
+            "tokens_entrada_estimados": self.caracteres_prompt // 4,
+            "tokens_saida_estimados": self.caracteres_resposta // 4,
+        }
+
+
+_contexto_atual: ContextVar[Optional[ContextoInvestigacao]] = ContextVar(
+    "contexto_investigacao", default=None
+)
+
+
+def contexto_atual() -> Optional[ContextoInvestigacao]:
+    return _contexto_atual.get()
+
+
+def ativar_contexto(ctx: ContextoInvestigacao):
+    """Ativa o contexto na task atual. Retorna token para `desativar_contexto`."""
+    return _contexto_atual.set(ctx)
+
+
+def desativar_contexto(token) -> None:
+    _contexto_atual.reset(token)
+
+
+def chave_subconsulta(prompt: str, use_search: bool, temperature: float, modo: str = "") -> str:
+    """
+    Chave deterministica de uma sub-consulta (mesmo prompt = mesma resposta).
+    `modo` separa perfis: a resposta curta do "rapido" nao serve ao "profundo".
+    """
+    base = f"{int(use_search)}|{temperature}|{prompt}"
+    if modo:
+        base = f"{modo}|{base}"
+    return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+
+def esquema_json(prompt: str) -> Tuple[type, List[str]]:
+    """
+    Tipo (dict/list) e campos de topo do modelo de JSON que o prompt pede.
+    Prompt fundido: os campos de topo sao as secoes (o primeiro modelo no texto
+    e o da primeira secao, nao o da resposta composta).
+    """
+    secoes = secoes_do_prompt(prompt)
+    if secoes:
+        return dict, secoes
+    objeto, _ = analisar_json(prompt, dict)
+    lista, _ = analisar_json(prompt, list)
+    if len(json.dumps(lista)) > len(json.dumps(objeto)):
+        return list, []
+    return dict, list(objeto)
+
+
+class GeminiInvestigacao:
+    """
+    Envolve o GeminiService e, quando ha investigacao ativa:
+    - serve sub-consultas ja concluidas a partir do checkpoint;
+    - persiste cada resposta assim que chega;
+    - conta falhas da fase corrente (fase com falha nao e checkpointada);
+    - publica eventos de sub-consulta para o stream de progresso;
+    - aplica modelo, teto de tokens e retries do perfil de execucao;
+    - completa JSON truncado pedindo so os campos que faltaram.
+    Sem contexto ativo, e transparente.
+    """
+
+    def __init__(self, gemini_service):
+        self._gemini = gemini_service
+
+    def __getattr__(self, nome):
+        return getattr(self._gemini, nome)
+
+    async def generate_content(self, prompt: str) -> str:
+        return await self.call_with_retry(prompt)
+
+    async def call_with_retry(
+        self,
+        prompt: str,
+        max_retries: int = 3,
+        use_search: bool = True,
+        temperature: float = 0.2
+    ) -> str:
+        ctx = contexto_atual()
+        if ctx is None:
+            return await self._gemini.call_with_retry(
+                prompt, max_retries=max_retries, use_search=use_search, temperature=temperature
+            )
+
+        chave = chave_subconsulta(prompt, use_search, temperature, ctx.perfil.nome if ctx.perfil else "")
+        if ctx.store is not None:
+            salva = ctx.store.obter_subconsulta(ctx.investigation_id, chave, desde=ctx.subconsultas_desde)
+            if salva is not None:
+                ctx.subconsultas_restauradas += 1
+                logger.info(f"[CHECKPOINT] Sub-consulta restaurada ({chave[:8]})")
+                ctx.emitir(TipoEvento.SUBCONSULTA_CONCLUIDA, restaurada=True,
+                           duracao_segundos=0.0, caracteres=len(salva))
+                return salva
+
+        kwargs = {"max_retries": max_retries}
+        if ctx.perfil is not None:
+            kwargs.update(ctx.perfil.kwargs_gemini())
+
+        inicio = time.time()
+        ctx.caracteres_prompt += len(prompt)
+        try:
+            resposta = await self._gemini.call_with_retry(
+                prompt, use_search=use_search, temperature=temperature, **kwargs
+            )
+        except Exception as e:
+            ctx.falhas_fase += 1
+            ctx.emitir(TipoEvento.ERRO, mensagem=str(e))
+            raise
+
+        ctx.subconsultas_executadas += 1
+        ctx.caracteres_resposta += len(resposta or "")
+        if resposta and "JSON" in prompt:
+            resposta = await self._salvar_json(ctx, prompt, resposta, use_search, temperature, kwargs)
+        if resposta:
+            if ctx.store is not None:
+                ctx.store.salvar_subconsulta(ctx.investigation_id, chave, resposta)
+        else:
+            ctx.falhas_fase += 1
+        ctx.emitir(TipoEvento.SUBCONSULTA_CONCLUIDA, restaurada=False,
+                   duracao_segundos=round(time.time() - inicio, 2), caracteres=len(resposta or ""))
+        return resposta
+
+    async def _salvar_json(self, ctx: ContextoInvestigacao, prompt: str, resposta: str,
+                           use_search: bool, temperature: float, kwargs: Dict) -> str:
+        """
+        JSON quase valido: a layer ja o repara (so conta). Truncado com campos de
+        topo faltando: um pedido curto so desses campos, mesclado na resposta.
+        """
+        tipo, campos = esquema_json(prompt)
+        valor, estado = analisar_json(resposta, tipo)
+        if estado in ("ok", "falha"):
+            return resposta
+        faltando = [c for c in campos if c not in valor]
+        if estado == "reparado" or not faltando:
+            ctx.reparos_json += 1
+            return resposta
+
+        logger.info(f"[JSON] Resposta truncada; pedindo so {len(faltando)} campo(s): {', '.join(faltando)}")
+        complemento_prompt = (
+            f"{prompt}\n\nATENCAO: uma resposta anterior ja trouxe os campos {', '.join(valor)}. "
+            f"Retorne APENAS um JSON com os campos que faltaram: {', '.join(faltando)}."
+        )
+        ctx.caracteres_prompt += len(complemento_prompt)
+        try:
+            complemento = await self._gemini.call_with_retry(
+                complemento_prompt, use_search=use_search, temperature=temperature, **kwargs
+            )
+        except Exception as e:
+            logger.warning(f"[JSON] Falha ao completar campos ({e}); seguindo com o que foi salvo")
+            ctx.reparos_json += 1
+            return resposta
+        ctx.subconsultas_executadas += 1
+        ctx.caracteres_resposta += len(complemento or "")
+        extra = extrair_json(complemento, origem="[JSON]")
+        valor.update({c: extra[c] for c in faltando if c in extra})
+        ctx.completacoes_json += 1
+        return json.dumps(valor, ensure_ascii=False)
@@ -0,0 +1,57 @@
+"""
+services/investigation_events.py — EVENTOS DE PROGRESSO DA INVESTIGACAO
+Contrato unico consumido pela UI (Streamlit), CLI e qualquer servidor de API.
+"""
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Optional
+
+
+class TipoEvento(str, Enum):
+    FASE_INICIADA = "fase_iniciada"
+    SUBCONSULTA_CONCLUIDA = "subconsulta_concluida"
+    RESULTADO_PARCIAL = "resultado_parcial"
+    FASE_CONCLUIDA = "fase_concluida"
+    GATE_ACIONADO = "gate_acionado"
+    ERRO = "erro"
+    INVESTIGACAO_CONCLUIDA = "investigacao_concluida"
+
+
+@dataclass
+class EventoInvestigacao:
+    """
+    Um acontecimento da investigacao. `dados` depende do tipo:
+    - FASE_INICIADA: {"rotulo"}
+    - SUBCONSULTA_CONCLUIDA: {"restaurada", "duracao_segundos", "caracteres"}
+    - RESULTADO_PARCIAL: {"matriz_priorizacao"} calculada com as fases ate aqui
+    - FASE_CONCLUIDA: {"resultado", "origem"} (origem: executada/checkpoint/refresh/cadastro/local)
+    - GATE_ACIONADO: {"regra", "descricao", "fases_puladas", "chamadas_economizadas"}
+    - ERRO: {"mensagem"}
+    - INVESTIGACAO_CONCLUIDA: {"results"} completo
+    """
+    tipo: TipoEvento
+    investigation_id: str
+    fase: Optional[str] = None
+    dados: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_dict(cls, dados: Dict[str, Any]) -> "EventoInvestigacao":
+        """Inverso de `to_dict` (eventos gravados na fila de jobs)."""
+        return cls(
+            tipo=TipoEvento(dados["tipo"]),
+            investigation_id=dados["investigation_id"],
+            fase=dados.get("fase"),
+            dados=dados.get("dados") or {},
+            timestamp=dados.get("timestamp", 0.0),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tipo": self.tipo.value,
+            "investigation_id": self.investigation_id,
+            "fase": self.fase,
+            "dados": self.dados,
+            "timestamp": self.timestamp,
+        }
@@ -0,0 +1,242 @@
+"""
+services/job_queue.py — FILA DE JOBS DE INVESTIGACAO (SQLite local)
+A UI so enfileira e acompanha; quem executa sao os workers (services/job_worker.py).
+Cada job guarda seus eventos de progresso em ordem, entao qualquer sessao
+(ou a mesma pagina apos um reload) pode reconstruir o andamento pelo job_id.
+"""
+import os
+import json
+import sqlite3
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from services.checkpoint_store import novo_investigation_id
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(".bandeirante", "jobs.db")
+
+JOB_PENDENTE = "pendente"
+JOB_EXECUTANDO = "executando"
+JOB_CONCLUIDO = "concluido"
+JOB_ERRO = "erro"
+JOB_CANCELADO = "cancelado"
+STATUS_FINAIS = (JOB_CONCLUIDO, JOB_ERRO, JOB_CANCELADO)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    empresa TEXT NOT NULL,
+    params_json TEXT NOT NULL,
+    status TEXT NOT NULL,
+    worker TEXT,
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    criado_em TEXT NOT NULL,
+    iniciado_em TEXT,
+    concluido_em TEXT,
+    heartbeat_em TEXT,
+    erro TEXT,
+    results_json TEXT
+);
+CREATE TABLE IF NOT EXISTS job_eventos (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    evento_json TEXT NOT NULL,
+    PRIMARY KEY (job_id, seq)
+);
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    pid INTEGER NOT NULL,
+    heartbeat_em TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, criado_em);
+"""
+
+
+def _agora() -> str:
+    return datetime.now().isoformat()
+
+
+class JobQueue:
+    """
+    Fila persistente. Uma conexao por operacao (WAL): segura entre a thread do
+    Streamlit e varios processos worker.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        pasta = os.path.dirname(db_path)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with self._conectar() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Lado da UI
+    # ------------------------------------------------------------------
+    def enfileirar(self, empresa: str, cnpj: str = "", uf: str = "", modo: str = "completo",
+                   refresh: bool = False, socios: Optional[List[Dict]] = None) -> str:
+        """Cria o job e retorna o job_id (tambem usado como investigation_id do checkpoint)."""
+        job_id = novo_investigation_id()
+        params = {"empresa": empresa, "cnpj": cnpj, "uf": uf, "modo": modo,
+                  "refresh": refresh, "socios": socios or []}
+        with self._conectar() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, empresa, params_json, status, criado_em) VALUES (?, ?, ?, ?, ?)",
+                (job_id, empresa.strip(), json.dumps(params, ensure_ascii=False), JOB_PENDENTE, _agora()),
+            )
+        logger.info(f"[JOBS] Enfileirado {job_id}: {empresa}")
+        return job_id
+
+    def obter(self, job_id: str) -> Optional[Dict]:
+        with self._conectar() as conn:
+            row = conn.execute(
+                "SELECT job_id, empresa, params_json, status, worker, tentativas, criado_em, "
+                "iniciado_em, concluido_em, erro, results_json FROM jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "job_id": row[0], "empresa": row[1], "params": json.loads(row[2]), "status": row[3],
+            "worker": row[4], "tentativas": row[5], "criado_em": row[6], "iniciado_em": row[7],
+            "concluido_em": row[8], "erro": row[9],
+            "results": json.loads(row[10]) if row[10] else None,
+        }
+
+    def status(self, job_id: str) -> Optional[str]:
+        with self._conectar() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def listar(self, limite: int = 20, status: Optional[str] = None) -> List[Dict]:
+        sql = "SELECT job_id, empresa, status, criado_em, concluido_em FROM jobs"
+        args: tuple = ()
+        if status:
+            sql += " WHERE status = ?"
+            args = (status,)
+        sql += " ORDER BY criado_em DESC LIMIT ?"
+        with self._conectar() as conn:
+            rows = conn.execute(sql, args + (limite,)).fetchall()
+        return [
+            {"job_id": r[0], "empresa": r[1], "status": r[2], "criado_em": r[3], "concluido_em": r[4]}
+            for r in rows
+        ]
+
+    def eventos(self, job_id: str, desde_seq: int = 0) -> List[Dict]:
+        """Eventos com seq > desde_seq, em ordem (cada um com a chave "seq")."""
+        with self._conectar() as conn:
+            rows = conn.execute(
+                "SELECT seq, evento_json FROM job_eventos WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, desde_seq),
+            ).fetchall()
+        return [dict(json.loads(evento), seq=seq) for seq, evento in rows]
+
+    def cancelar(self, job_id: str) -> None:
+        """Pendente sai da fila; em execucao, o worker interrompe no proximo evento."""
+        with self._conectar() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, concluido_em = ? WHERE job_id = ? AND status IN (?, ?)",
+                (JOB_CANCELADO, _agora(), job_id, JOB_PENDENTE, JOB_EXECUTANDO),
+            )
+
+    def workers_ativos(self, janela_segundos: int = 30) -> int:
+        limite = (datetime.now() - timedelta(seconds=janela_segundos)).isoformat()
+        with self._conectar() as conn:
+            return conn.execute("SELECT COUNT(*) FROM workers WHERE heartbeat_em >= ?", (limite,)).fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Lado do worker
+    # ------------------------------------------------------------------
+    def reservar(self, worker_id: str) -> Optional[Dict]:
+        """Pega o job pendente mais antigo (compare-and-set: dois workers nunca pegam o mesmo)."""
+        while True:
+            with self._conectar() as conn:
+                row = conn.execute(
+                    "SELECT job_id FROM jobs WHERE status = ? ORDER BY criado_em LIMIT 1", (JOB_PENDENTE,)
+                ).fetchone()
+                if not row:
+                    return None
+                agora = _agora()
+                cursor = conn.execute(
+                    "UPDATE jobs SET status = ?, worker = ?, tentativas = tentativas + 1, "
+                    "iniciado_em = COALESCE(iniciado_em, ?), heartbeat_em = ? "
+                    "WHERE job_id = ? AND status = ?",
+                    (JOB_EXECUTANDO, worker_id, agora, agora, row[0], JOB_PENDENTE),
+                )
+            if cursor.rowcount == 1:
+                return self.obter(row[0])
+            # outro worker levou esse; tenta o proximo
+
+    def registrar_evento(self, job_id: str, evento: Dict) -> None:
+        with self._conectar() as conn:
+            seq = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM job_eventos WHERE job_id = ?", (job_id,)
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO job_eventos VALUES (?, ?, ?)",
+                (job_id, seq, json.dumps(evento, ensure_ascii=False, default=str)),
+            )
+            conn.execute("UPDATE jobs SET heartbeat_em = ? WHERE job_id = ?", (_agora(), job_id))
+
+    def concluir(self, job_id: str, results: Dict) -> None:
+        status = JOB_ERRO if results.get("erro") else JOB_CONCLUIDO
+        with self._conectar() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, concluido_em = ?, erro = ?, results_json = ? "
+                "WHERE job_id = ? AND status = ?",
+                (status, _agora(), results.get("erro"), json.dumps(results, ensure_ascii=False, default=str),
+                 job_id, JOB_EXECUTANDO),
+            )
+
+    def falhar(self, job_id: str, erro: str) -> None:
+        with self._conectar() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, concluido_em = ?, erro = ? WHERE job_id = ? AND status = ?",
+                (JOB_ERRO, _agora(), erro, job_id, JOB_EXECUTANDO),
+            )
+
+    def heartbeat_job(self, job_id: str) -> None:
+        with self._conectar() as conn:
+            conn.execute("UPDATE jobs SET heartbeat_em = ? WHERE job_id = ?", (_agora(), job_id))
+
+    def heartbeat_worker(self, worker_id: str, pid: int) -> None:
+        with self._conectar() as conn:
+            conn.execute("INSERT OR REPLACE INTO workers VALUES (?, ?, ?)", (worker_id, pid, _agora()))
+
+    def remover_worker(self, worker_id: str) -> None:
+        with self._conectar() as conn:
+            conn.execute("DELETE FROM workers WHERE worker_id = ?", (worker_id,))
+
+    def recuperar_orfaos(self, timeout_segundos: int = 180, max_tentativas: int = 3) -> int:
+        """
+        Jobs 'executando' sem heartbeat (worker morreu) voltam para a fila; o
+        checkpoint da investigacao faz a nova tentativa continuar de onde parou.
+        """
+        limite = (datetime.now() - timedelta(seconds=timeout_segundos)).isoformat()
+        with self._conectar() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, erro = 'worker interrompido' "
+                "WHERE status = ? AND heartbeat_em < ? AND tentativas >= ?",
+                (JOB_ERRO, JOB_EXECUTANDO, limite, max_tentativas),
+            )
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL WHERE status = ? AND heartbeat_em < ?",
+                (JOB_PENDENTE, JOB_EXECUTANDO, limite),
+            )
+        if cursor.rowcount:
+            logger.warning(f"[JOBS] {cursor.rowcount} job(s) órfão(s) devolvidos à fila")
+        return cursor.rowcount
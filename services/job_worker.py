@@ -0,0 +1,164 @@
+"""
+services/job_worker.py — POOL DE WORKERS DA FILA DE JOBS
+Processos que consomem services/job_queue.py: cada um reserva um job, roda
+`investigacao_stream` e grava cada evento na fila, que a UI le pelo job_id.
+Derrubar um worker no meio nao perde trabalho: o job volta para a fila e a
+nova tentativa retoma do checkpoint (job_id == investigation_id).
+
+Uso:
+    GEMINI_API_KEY=... python -m services.job_worker -w 2 --rpm 60
+"""
+import os
+import sys
+import time
+import uuid
+import signal
+import asyncio
+import logging
+import argparse
+import multiprocessing
+from typing import Any, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from services.job_queue import JobQueue, DEFAULT_DB_PATH, JOB_CANCELADO
+from services.checkpoint_store import DEFAULT_DB_PATH as DEFAULT_CHECKPOINT_DB
+from services.investigation_events import TipoEvento
+
+logger = logging.getLogger(__name__)
+
+INTERVALO_POLL = 1.0        # segundos entre consultas a fila vazia
+INTERVALO_HEARTBEAT = 10.0  # job e worker "vivos" mesmo durante uma chamada longa
+
+
+async def _executar_job(fila: JobQueue, orch, job: dict, worker_id: str) -> None:
+    job_id, params = job["job_id"], job["params"]
+
+    async def _pulsar():
+        # sem o pulso do worker, um job de varios minutos o tira de `workers_ativos`
+        # e a UI sobe um segundo pool
+        while True:
+            await asyncio.sleep(INTERVALO_HEARTBEAT)
+            fila.heartbeat_job(job_id)
+            fila.heartbeat_worker(worker_id, os.getpid())
+
+    pulso = asyncio.create_task(_pulsar())
+    stream = orch.investigacao_stream(
+        params["empresa"], cnpj=params.get("cnpj", ""), uf=params.get("uf", ""),
+        socios=params.get("socios") or None, modo=params.get("modo", "completo"),
+        investigation_id=job_id, refresh=params.get("refresh", False)
+    )
+    results = None
+    try:
+        async for evento in stream:
+            fila.registrar_evento(job_id, evento.to_dict())
+            if evento.tipo == TipoEvento.INVESTIGACAO_CONCLUIDA:
+                results = evento.dados["results"]
+            elif fila.status(job_id) == JOB_CANCELADO:
+                logger.info(f"[WORKER] Job {job_id} cancelado")
+                break
+    finally:
+        await stream.aclose()  # cancela a investigacao se saimos antes do fim
+        pulso.cancel()
+
+    if results is not None:
+        fila.concluir(job_id, results)
+    elif fila.status(job_id) != JOB_CANCELADO:
+        fila.falhar(job_id, "Investigação terminou sem resultado")
+
+
+async def _loop_worker(db_path: str, checkpoint_db: str, api_key: str, rpm: int, parar) -> None:
+    from services.gemini_service import GeminiService
+    from services.orchestrator import BandeiranteOrchestrator
+    from services.checkpoint_store import CheckpointStore
+
+    worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    fila = JobQueue(db_path)
+    orch = BandeiranteOrchestrator(GeminiService(api_key=api_key, requests_per_minute=rpm),
+                                   CheckpointStore(checkpoint_db))
+    logger.info(f"[WORKER] {worker_id} pronto ({rpm} rpm)")
+
+    ultimo_pulso = 0.0
+    try:
+        while not parar.is_set():
+            if time.time() - ultimo_pulso > INTERVALO_HEARTBEAT:
+                fila.heartbeat_worker(worker_id, os.getpid())
+                fila.recuperar_orfaos()
+                ultimo_pulso = time.time()
+
+            job = fila.reservar(worker_id)
+            if not job:
+                await asyncio.sleep(INTERVALO_POLL)
+                continue
+
+            logger.info(f"[WORKER] {worker_id} executando {job['job_id']} ({job['empresa']})")
+            try:
+                await _executar_job(fila, orch, job, worker_id)
+            except Exception as e:  # um job ruim nao derruba o worker
+                logger.error(f"[WORKER] Job {job['job_id']}: {e}", exc_info=True)
+                fila.falhar(job["job_id"], str(e))
+    finally:
+        fila.remover_worker(worker_id)
+
+
+def _processo_worker(db_path: str, checkpoint_db: str, api_key: str, rpm: int, parar) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # quem coordena o encerramento e o processo pai
+    asyncio.run(_loop_worker(db_path, checkpoint_db, api_key, rpm, parar))
+
+
+def iniciar_pool(
+    api_key: str,
+    workers: int = 2,
+    rpm: int = 60,
+    db_path: str = DEFAULT_DB_PATH,
+    checkpoint_db: str = DEFAULT_CHECKPOINT_DB
+) -> Tuple[List[multiprocessing.Process], Any]:
+    """
+    Sobe `workers` processos; a quota de rpm e dividida entre eles.
+    Retorna (processos, evento_parar): `evento_parar.set()` encerra apos o job corrente.
+    """
+    parar = multiprocessing.Event()
+    rpm_por_worker = max(1, rpm // max(1, workers))
+    processos = []
+    for _ in range(max(1, workers)):
+        p = multiprocessing.Process(
+            target=_processo_worker,
+            args=(db_path, checkpoint_db, api_key, rpm_por_worker, parar),
+            daemon=True,
+        )
+        p.start()
+        processos.append(p)
+    return processos, parar
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bandeirante Digital — workers da fila de investigações")
+    parser.add_argument("-w", "--workers", type=int, default=2, help="Processos worker")
+    parser.add_argument("--rpm", type=int, default=60, help="Quota de requisições/minuto do Gemini (total)")
+    parser.add_argument("--jobs-db", default=DEFAULT_DB_PATH)
+    parser.add_argument("--checkpoint-db", default=DEFAULT_CHECKPOINT_DB)
+    parser.add_argument("--api-key", default=os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY"))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if not args.api_key:
+        parser.error("Informe --api-key ou defina GEMINI_API_KEY")
+
+    processos, parar = iniciar_pool(args.api_key, args.workers, args.rpm, args.jobs_db, args.checkpoint_db)
+    print(f"[WORKER] {len(processos)} worker(s) no ar — Ctrl+C para parar")
+    try:
+        for p in processos:
+            p.join()
+    except KeyboardInterrupt:
+        print("[WORKER] Encerrando (jobs interrompidos voltam para a fila quando o heartbeat expirar)...")
+        parar.set()
+        for p in processos:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
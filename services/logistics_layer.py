@@ -3,9 +3,11 @@ services/logistics_layer.py — FASE 3/5: LOGISTICA & SUPPLY CHAIN COMPLETO
 Bandeirante Digital v3.0 - ANTT/RNTRC, Frota, CTe/MDFe, CONAB, Comexstat.
 """
 import logging
-import re
-import json
-from typing import Dict, List
+from typing import Collection, Dict, List, Optional
+
+from services.execution_profiles import subconsulta_ativa
+
+from utils.json_extractor import extrair_json
 
 logger = logging.getLogger(__name__)
 
@@ -19,28 +21,28 @@ class LogisticsLayer:
     def __init__(self, gemini_service):
         self.gemini = gemini_service
 
-    async def mapeamento_logistico_completo(self, empresa: str, cnpj: str = "") -> Dict:
+    async def mapeamento_logistico_completo(self, empresa: str, cnpj: str = "", subconsultas: Optional[Collection[str]] = None) -> Dict:
         """Pipeline completo de logistica e supply chain."""
         logger.info(f"[LOGISTICA] Iniciando mapeamento: {empresa}")
 
         results = {}
 
         try:
-            armazenagem = await self._armazenagem_conab(empresa)
+            armazenagem = await self._armazenagem_conab(empresa) if subconsulta_ativa("armazenagem", subconsultas) else {}
             results["armazenagem"] = armazenagem
         except Exception as e:
             logger.warning(f"[LOGISTICA] Erro armazenagem: {e}")
             results["armazenagem"] = {}
 
         try:
-            frota = await self._frota_rntrc(empresa)
+            frota = await self._frota_rntrc(empresa) if subconsulta_ativa("frota_logistica", subconsultas) else {}
             results["frota_logistica"] = frota
         except Exception as e:
             logger.warning(f"[LOGISTICA] Erro frota: {e}")
             results["frota_logistica"] = {}
 
         try:
-            exportacao = await self._exportacao_comexstat(empresa, cnpj)
+            exportacao = await self._exportacao_comexstat(empresa, cnpj) if subconsulta_ativa("exportacao", subconsultas) else {}
             results["exportacao"] = exportacao
         except Exception as e:
             logger.warning(f"[LOGISTICA] Erro exportacao: {e}")
@@ -256,13 +258,4 @@ RETORNE JSON:
         return modulos
 
     def _parse_json(self, response: str) -> Dict:
-        if not response:
-            return {}
-        try:
-            clean = response.replace("```json", "").replace("```", "").strip()
-            match = re.search(r'\{.*\}', clean, re.DOTALL)
-            if match:
-                return json.loads(match.group(0))
-        except Exception:
-            pass
-        return {}
+        return extrair_json(response, origem="[LOGISTICA]")
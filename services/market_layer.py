@@ -4,8 +4,8 @@ Análise profunda de mercado, concorrentes e posicionamento
 """
 import logging
 from typing import Dict, List, Optional
-import re
-import json
+
+from utils.json_extractor import extrair_json
 
 logger = logging.getLogger(__name__)
 
@@ -298,31 +298,4 @@ FONTES RECOMENDADAS:
             }
     
     def _parse_json(self, response: str) -> Dict:
-        """Parse defensivo de JSON."""
-        if not response:
-            return {}
-        
-        try:
-            # Remove markdown
-            clean = response.replace("```json", "").replace("```", "").strip()
-            
-            # Procura por { ... }
-            start = clean.find('{')
-            end = clean.rfind('}')
-            
-            if start >= 0 and end > start:
-                json_str = clean[start:end+1]
-                return json.loads(json_str)
-        except:
-            pass
-        
-        # Fallback: tenta regex
-        try:
-            match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', response, re.DOTALL)
-            if match:
-                return json.loads(match.group(0))
-        except:
-            pass
-        
-        logger.warning(f"[PARSE] Falha ao parsear JSON")
-        return {}
+        return extrair_json(response, origem="[MERCADO]")
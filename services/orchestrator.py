@@ -4,8 +4,13 @@ services/orchestrator.py — BANDEIRANTE DIGITAL ORCHESTRATOR
 
 import logging
 import asyncio
-from typing import Dict, List, Optional
-from datetime import datetime
+import time
+import hashlib
+import json
+import re
+from dataclasses import asdict
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
 
 from services.reputation_layer import ReputationLayer
 from services.tax_incentives_layer import TaxIncentivesLayer
@@ -13,20 +18,62 @@ from services.territorial_layer import TerritorialLayer
 from services.logistics_layer import LogisticsLayer
 from services.corporate_structure_layer import CorporateStructureLayer
 from services.executive_profiler import ExecutiveProfiler
+from services.checkpoint_store import (
+    CheckpointStore, novo_investigation_id, STATUS_COMPLETO, STATUS_INCOMPLETO, STATUS_ERRO
+)
+from services.investigation_events import EventoInvestigacao, TipoEvento
+from services.execution_profiles import PerfilExecucao, SUBCONSULTAS_FASES, obter_perfil
+from services.prompt_fusion import taxa_preenchimento
+from services.gate_rules import RegraGate, avaliar_gates, carregar_regras
+from services.cnpj_service import consultar_cnpj_async, limpar_cnpj, validar_cnpj
+from services.investigation_context import (
+    ContextoInvestigacao, GeminiInvestigacao, ativar_contexto, desativar_contexto
+)
+from services.result_models import MatrizPriorizacao, ResultadoTerritorial
 
 logger = logging.getLogger(__name__)
 
+# Validade de cada fase remota no modo refresh (quanto o dado costuma mudar)
+TTL_FASES = {
+    "fase_-1_reputation": timedelta(days=7),      # processos/reclamacoes: semanal
+    "fase_1_incentivos": timedelta(days=30),
+    "fase_2_territorial": timedelta(days=30),     # fundiario/licencas: mensal
+    "fase_3_logistica": timedelta(days=30),
+    "fase_4_societario": timedelta(days=180),     # estrutura societaria: raramente
+    "fase_5_executivos": timedelta(days=30),
+}
+
+
+def _hash_entrada(entradas: Dict) -> str:
+    """Impressao digital dos inputs de uma fase (mudou o input = refaz a fase)."""
+    base = json.dumps(entradas, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(base.encode("utf-8")).hexdigest()[:16]
+
+
 class BandeiranteOrchestrator:
     """Bandeirante Digital - Orchestrator Completo"""
     
-    def __init__(self, gemini_service):
+    def __init__(
+        self,
+        gemini_service,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        usar_checkpoint: bool = True,
+        regras_gate: Optional[List[RegraGate]] = None
+    ):
         self.gemini = gemini_service
-        self.reputation_layer = ReputationLayer(gemini_service)
-        self.tax_layer = TaxIncentivesLayer(gemini_service)
-        self.territorial_layer = TerritorialLayer(gemini_service)
-        self.logistics_layer = LogisticsLayer(gemini_service)
-        self.corporate_layer = CorporateStructureLayer(gemini_service)
-        self.executive_profiler = ExecutiveProfiler(gemini_service)
+        self.checkpoints = (checkpoint_store or CheckpointStore()) if usar_checkpoint else None
+        self.ttl_fases = dict(TTL_FASES)
+        # Gates de saída antecipada (config/gates.json); [] desliga
+        self.regras_gate = carregar_regras() if regras_gate is None else regras_gate
+        
+        # Layers usam o proxy: sub-consultas passam pelo checkpoint da investigação ativa
+        gemini_layers = GeminiInvestigacao(gemini_service)
+        self.reputation_layer = ReputationLayer(gemini_layers)
+        self.tax_layer = TaxIncentivesLayer(gemini_layers)
+        self.territorial_layer = TerritorialLayer(gemini_layers)
+        self.logistics_layer = LogisticsLayer(gemini_layers)
+        self.corporate_layer = CorporateStructureLayer(gemini_layers)
+        self.executive_profiler = ExecutiveProfiler(gemini_layers)
         
         logger.info("[BANDEIRANTE] Orchestrator inicializado")
     
@@ -36,10 +83,50 @@ class BandeiranteOrchestrator:
         cnpj: str = "",
         uf: str = "",
         socios: Optional[List[Dict]] = None,
-        modo: str = "completo"
+        modo: str = "completo",
+        investigation_id: Optional[str] = None,
+        refresh: bool = False,
+        ao_evento: Optional[Callable[[EventoInvestigacao], None]] = None
     ) -> Dict:
-        """Executa investigação completa."""
-        logger.info(f"[BANDEIRANTE] Iniciando: {empresa}")
+        """
+        Executa investigação completa.
+        Cada fase (e cada sub-consulta Gemini) é salva no checkpoint assim que
+        conclui; repetir com o mesmo `investigation_id` só refaz o que faltou.
+        
+        refresh=True: parte da última investigação da mesma empresa e só refaz
+        fases com TTL vencido (`TTL_FASES`) ou cujos inputs mudaram; as fases
+        locais (triggers, psicologia, matriz) são sempre recalculadas.
+        
+        ao_evento: callback síncrono que recebe cada `EventoInvestigacao`
+        (prefira `investigacao_stream`, que o expõe como async generator).
+        
+        modo: perfil de execução ("rapido", "completo", "profundo") — fases,
+        sub-consultas, modelo, teto de tokens e orçamento de tempo por fase
+        (ver `services/execution_profiles.py`).
+        
+        Gates (`self.regras_gate`) são avaliados após cada fase; se um dispara,
+        as fases remotas restantes não rodam e o resultado sai em `results["gate"]`.
+        """
+        perfil = obter_perfil(modo)
+        investigation_id = investigation_id or novo_investigation_id()
+        logger.info(f"[BANDEIRANTE] Iniciando: {empresa} ({investigation_id})")
+        
+        fases_salvas: Dict[str, Dict] = {}
+        if self.checkpoints:
+            self.checkpoints.criar(investigation_id, {
+                "empresa": empresa, "cnpj": cnpj, "uf": uf,
+                "socios": socios or [], "modo": modo
+            })
+            fases_salvas = self.checkpoints.fases_detalhadas(investigation_id)
+        
+        base_refresh, fases_base = None, {}
+        if refresh and self.checkpoints:
+            base_refresh = self.checkpoints.ultima_investigacao(empresa, cnpj, excluir=investigation_id)
+            if base_refresh:
+                fases_base = self.checkpoints.fases_detalhadas(base_refresh)
+                logger.info(f"[REFRESH] Base: investigação {base_refresh}")
+            else:
+                logger.info("[REFRESH] Nenhuma investigação anterior; execução completa")
         
         start_time = datetime.now()
         results = {
@@ -47,76 +134,319 @@ class BandeiranteOrchestrator:
                 "empresa": empresa,
                 "cnpj": cnpj,
                 "uf": uf,
-                "modo": modo,
+                "modo": perfil.nome,
+                "perfil": perfil.to_dict(),
+                "fases_puladas": [f for f in SUBCONSULTAS_FASES if not perfil.executa_fase(f)],
+                "metricas_fases": {},
+                "investigation_id": investigation_id,
                 "timestamp_inicio": start_time.isoformat(),
                 "versao": "3.0-MODO-DEUS"
             },
             "fases": {}
         }
         
+        ctx = ContextoInvestigacao(investigation_id, self.checkpoints, ao_evento=ao_evento, perfil=perfil)
+        token = ativar_contexto(ctx)
+        fases_pendentes, reaproveitadas = [], []
         try:
-            # FASE -1
-            logger.info("[FASE -1] Reputation...")
-            reputation = await self.reputation_layer.checagem_completa(empresa, cnpj)
-            results["fases"]["fase_-1_reputation"] = reputation
-            
-            # FASE 1
-            logger.info("[FASE 1] Incentivos...")
-            incentivos = await self.tax_layer.mapeamento_completo(empresa, cnpj, uf)
-            results["fases"]["fase_1_incentivos"] = incentivos
+            fases_remotas = self._fases_remotas(empresa, cnpj, uf, socios or [], perfil)
             
-            # FASE 2
-            logger.info("[FASE 2] Territorial...")
-            territorial = await self.territorial_layer.mapeamento_territorial_completo(empresa, cnpj)
-            results["fases"]["fase_2_territorial"] = territorial
+            # FASE 0 — cadastro na Receita (sem LLM): CNPJ inativo encerra antes de gastar tokens
+            if validar_cnpj(limpar_cnpj(cnpj)):
+                gate = await self._fase_cadastro(cnpj, results, ctx)
+                if gate:
+                    self._aplicar_gate(gate, fases_remotas, perfil, results, ctx)
+                    fases_remotas = []
             
-            # FASE 3
-            logger.info("[FASE 3] Logística...")
-            logistica = await self.logistics_layer.mapeamento_logistico_completo(empresa, cnpj)
-            results["fases"]["fase_3_logistica"] = logistica
-            
-            # FASE 4
-            logger.info("[FASE 4] Societário...")
-            societario = await self.corporate_layer.mapeamento_societario_completo(
-                empresa, cnpj, socios or []
-            )
-            results["fases"]["fase_4_societario"] = societario
+            # FASES -1 a 5 (Gemini + Search) — checkpointadas
+            for i, (fase, rotulo, entradas, executar) in enumerate(fases_remotas):
+                entrada = _hash_entrada(entradas)
+                ctx.fase_atual = fase
+                t0, chamadas_antes = time.perf_counter(), ctx.subconsultas_executadas
+                ctx.emitir(TipoEvento.FASE_INICIADA, rotulo=rotulo)
+                anterior, salva = fases_base.get(fase), fases_salvas.get(fase)
+                
+                # Mesmo id com outro modo/inputs, ou checkpoint mais velho que o TTL: refaz
+                if self._fase_fresca(fase, salva, entrada):
+                    logger.info(f"[CHECKPOINT] {fase} restaurada")
+                    dados, origem = salva["dados"], "checkpoint"
+                
+                elif self._fase_fresca(fase, anterior, entrada):
+                    logger.info(f"[REFRESH] {fase} ainda válida (de {anterior['concluido_em'][:10]})")
+                    dados, origem = anterior["dados"], "refresh"
+                    self.checkpoints.salvar_fase(
+                        investigation_id, fase, dados, entrada,
+                        concluido_em=anterior["concluido_em"]
+                    )
+                    reaproveitadas.append(fase)
+                
+                else:
+                    if salva:
+                        logger.info(f"[CHECKPOINT] {fase} salva com outros inputs ou vencida; refazendo")
+                    logger.info(rotulo)
+                    ctx.falhas_fase = 0
+                    ctx.subconsultas_desde = (datetime.now() - self.ttl_fases.get(fase, timedelta(0))).isoformat()
+                    dados, origem = await self._executar_com_orcamento(fase, executar, perfil, ctx), "executada"
+                    
+                    # Fase com sub-consulta falha fica de fora: retomada refaz só o que faltou
+                    if ctx.falhas_fase:
+                        fases_pendentes.append(fase)
+                    elif self.checkpoints:
+                        self.checkpoints.salvar_fase(investigation_id, fase, dados, entrada)
+                
+                results["fases"][fase] = dados
+                # Latência x completude por fase: base para comparar perfis (ex.: fundido x individual)
+                results["metadata"]["metricas_fases"][fase] = {
+                    "origem": origem,
+                    "duracao_segundos": round(time.perf_counter() - t0, 2),
+                    "chamadas_llm": ctx.subconsultas_executadas - chamadas_antes,
+                    "fundida": perfil.funde(fase),
+                    "preenchimento": taxa_preenchimento(dados),
+                }
+                ctx.emitir(TipoEvento.FASE_CONCLUIDA, resultado=dados, origem=origem)
+                ctx.emitir(TipoEvento.RESULTADO_PARCIAL,
+                           matriz_priorizacao=self._calcular_matriz_priorizacao(results))
+                
+                gate = avaliar_gates(self.regras_gate, fase, dados)
+                if gate:
+                    self._aplicar_gate(gate, fases_remotas[i + 1:], perfil, results, ctx)
+                    break
             
-            # FASE 5
-            logger.info("[FASE 5] Executivos...")
-            executivos = await self.executive_profiler.profiling_completo(empresa)
-            results["fases"]["fase_5_executivos"] = executivos
+            if refresh:
+                results["metadata"]["refresh"] = {
+                    "base_investigation_id": base_refresh,
+                    "fases_reaproveitadas": reaproveitadas,
+                    "fases_reexecutadas": [
+                        f for f in results["fases"] if f in SUBCONSULTAS_FASES and f not in reaproveitadas
+                    ],
+                }
             
             # FASE 6
             logger.info("[FASE 6] Triggers...")
+            ctx.fase_atual = "fase_6_triggers"
+            ctx.emitir(TipoEvento.FASE_INICIADA, rotulo="[FASE 6] Triggers...")
             triggers = await self._identificar_triggers(results)
             results["fases"]["fase_6_triggers"] = triggers
+            ctx.emitir(TipoEvento.FASE_CONCLUIDA, resultado=triggers, origem="local")
             
             # FASE 7
             logger.info("[FASE 7] Psicologia...")
+            ctx.fase_atual = "fase_7_psicologia"
+            ctx.emitir(TipoEvento.FASE_INICIADA, rotulo="[FASE 7] Psicologia...")
             psicologia = await self._mapear_psicologia(results)
             results["fases"]["fase_7_psicologia"] = psicologia
+            ctx.emitir(TipoEvento.FASE_CONCLUIDA, resultado=psicologia, origem="local")
             
             # FASE 10
             logger.info("[FASE 10] Matriz...")
+            ctx.fase_atual = "fase_10_matriz"
+            ctx.emitir(TipoEvento.FASE_INICIADA, rotulo="[FASE 10] Matriz...")
             matriz = self._calcular_matriz_priorizacao(results)
+            if results.get("gate"):
+                matriz["status"] = "DESCARTADO"
+                matriz["classificacao"] = f"⛔ DESCARTADO ({results['gate']['regra']})"
             results["matriz_priorizacao"] = matriz
             
             results["recomendacoes"] = self._gerar_recomendacoes(results)
+            ctx.emitir(TipoEvento.FASE_CONCLUIDA, resultado=matriz, origem="local")
             
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
             results["metadata"]["timestamp_fim"] = end_time.isoformat()
             results["metadata"]["duracao_segundos"] = duration
+            results["metadata"]["custo"] = ctx.custo()
             
-            logger.info(f"[BANDEIRANTE] Completo em {duration:.1f}s")
+            if self.checkpoints:
+                self.checkpoints.marcar_status(
+                    investigation_id, STATUS_INCOMPLETO if fases_pendentes else STATUS_COMPLETO
+                )
+            logger.info(
+                f"[BANDEIRANTE] Completo em {duration:.1f}s, modo {perfil.nome}: "
+                f"{ctx.subconsultas_executadas} chamadas LLM, "
+                f"{ctx.subconsultas_restauradas} sub-consultas restauradas do checkpoint"
+            )
             
+            ctx.emitir(TipoEvento.INVESTIGACAO_CONCLUIDA, fase=None, results=results)
             return results
             
         except Exception as e:
             logger.error(f"[BANDEIRANTE] Erro: {e}", exc_info=True)
             results["erro"] = str(e)
+            if self.checkpoints:
+                self.checkpoints.marcar_status(investigation_id, STATUS_ERRO)
+            ctx.emitir(TipoEvento.ERRO, mensagem=str(e))
+            ctx.emitir(TipoEvento.INVESTIGACAO_CONCLUIDA, fase=None, results=results)
             return results
+        finally:
+            desativar_contexto(token)
+    
+    async def investigacao_stream(
+        self,
+        empresa: str,
+        cnpj: str = "",
+        uf: str = "",
+        socios: Optional[List[Dict]] = None,
+        modo: str = "completo",
+        investigation_id: Optional[str] = None,
+        refresh: bool = False
+    ) -> AsyncIterator[EventoInvestigacao]:
+        """
+        Async generator com o progresso da investigação, evento a evento.
+        O último evento é sempre INVESTIGACAO_CONCLUIDA com o `results` completo
+        (o mesmo dict que `investigacao_completa` retornaria).
+        
+            async for evento in orch.investigacao_stream("Grupo X", uf="MT"):
+                ...
+        
+        Se o consumidor parar de iterar, a investigação é cancelada
+        (o que já concluiu fica no checkpoint).
+        """
+        fila: asyncio.Queue = asyncio.Queue()
+        tarefa = asyncio.create_task(self.investigacao_completa(
+            empresa, cnpj=cnpj, uf=uf, socios=socios, modo=modo,
+            investigation_id=investigation_id, refresh=refresh,
+            ao_evento=fila.put_nowait
+        ))
+        # Sentinela: se a task morrer antes do evento final, o loop não fica preso
+        tarefa.add_done_callback(lambda _: fila.put_nowait(None))
+        try:
+            while True:
+                evento = await fila.get()
+                if evento is None:
+                    break
+                yield evento
+                if evento.tipo == TipoEvento.INVESTIGACAO_CONCLUIDA:
+                    break
+            await tarefa
+        finally:
+            if not tarefa.done():
+                tarefa.cancel()
+    
+    async def retomar_investigacao(self, investigation_id: str) -> Dict:
+        """
+        Retoma uma investigação interrompida a partir do checkpoint.
+        Só re-executa fases/sub-consultas ausentes ou que falharam.
+        """
+        if not self.checkpoints:
+            raise ValueError("Checkpoints desabilitados neste orchestrator")
+        
+        checkpoint = self.checkpoints.carregar(investigation_id)
+        if not checkpoint:
+            raise KeyError(f"Investigação {investigation_id} não encontrada no checkpoint")
+        
+        params = checkpoint["params"]
+        logger.info(
+            f"[CHECKPOINT] Retomando {investigation_id}: {len(checkpoint['fases'])} fase(s) e "
+            f"{checkpoint['total_subconsultas']} sub-consulta(s) salvas"
+        )
+        return await self.investigacao_completa(
+            params["empresa"],
+            cnpj=params.get("cnpj", ""),
+            uf=params.get("uf", ""),
+            socios=params.get("socios") or None,
+            modo=params.get("modo", "completo"),
+            investigation_id=investigation_id
+        )
+    
+    def _fases_remotas(
+        self, empresa: str, cnpj: str, uf: str, socios: List[Dict], perfil: PerfilExecucao
+    ) -> List[Tuple]:
+        """
+        Fases que consultam o Gemini e que o perfil executa, na ordem:
+        (chave, log, inputs da fase, coroutine factory).
+        """
+        cnpj_id = re.sub(r"\D", "", cnpj or "")  # "12.345/0001-..." e "12345..." são o mesmo input
+        subs = perfil.subconsultas
+        fases = [
+            ("fase_-1_reputation", "[FASE -1] Reputation...",
+             {"empresa": empresa, "cnpj": cnpj_id},
+             lambda: self.reputation_layer.checagem_completa(
+                 empresa, cnpj, subconsultas=subs("fase_-1_reputation"), fundir=perfil.funde("fase_-1_reputation"))),
+            ("fase_1_incentivos", "[FASE 1] Incentivos...",
+             {"empresa": empresa, "cnpj": cnpj_id, "uf": uf},
+             lambda: self.tax_layer.mapeamento_completo(
+                 empresa, cnpj, uf, subconsultas=subs("fase_1_incentivos"), fundir=perfil.funde("fase_1_incentivos"))),
+            ("fase_2_territorial", "[FASE 2] Territorial...",
+             {"empresa": empresa, "cnpj": cnpj_id},
+             lambda: self.territorial_layer.mapeamento_territorial_completo(empresa, cnpj, subconsultas=subs("fase_2_territorial"))),
+            ("fase_3_logistica", "[FASE 3] Logística...",
+             {"empresa": empresa, "cnpj": cnpj_id},
+             lambda: self.logistics_layer.mapeamento_logistico_completo(empresa, cnpj, subconsultas=subs("fase_3_logistica"))),
+            ("fase_4_societario", "[FASE 4] Societário...",
+             {"empresa": empresa, "cnpj": cnpj_id, "socios": socios},
+             lambda: self.corporate_layer.mapeamento_societario_completo(empresa, cnpj, socios, subconsultas=subs("fase_4_societario"))),
+            ("fase_5_executivos", "[FASE 5] Executivos...",
+             {"empresa": empresa},
+             lambda: self.executive_profiler.profiling_completo(empresa, subconsultas=subs("fase_5_executivos"))),
+        ]
+        selecionadas = []
+        for fase, rotulo, entradas, executar in fases:
+            if not perfil.executa_fase(fase):
+                continue
+            if subs(fase) is not None:
+                # Fase parcial não pode ser reaproveitada por um perfil que pede mais sub-consultas
+                entradas = dict(entradas, subconsultas=sorted(subs(fase)))
+            if perfil.funde(fase):
+                entradas = dict(entradas, fusao=True)  # idem para a versão fundida (menos profunda)
+            # Modelo e teto de tokens também mudam a resposta: cada modo tem suas fases
+            entradas = dict(entradas, modo=perfil.nome)
+            selecionadas.append((fase, rotulo, entradas, executar))
+        return selecionadas
+    
+    async def _fase_cadastro(self, cnpj: str, results: Dict, ctx: ContextoInvestigacao) -> Optional[Dict]:
+        """FASE 0: situação cadastral (BrasilAPI/ReceitaWS, com cache). Retorna o gate disparado, se houver."""
+        fase = "fase_0_cadastro"
+        ctx.fase_atual = fase
+        ctx.emitir(TipoEvento.FASE_INICIADA, rotulo="[FASE 0] Cadastro...")
+        logger.info("[FASE 0] Cadastro...")
+        dados_cnpj = await consultar_cnpj_async(cnpj)
+        dados = asdict(dados_cnpj) if dados_cnpj else {}
+        results["fases"][fase] = dados
+        ctx.emitir(TipoEvento.FASE_CONCLUIDA, resultado=dados, origem="cadastro")
+        return avaliar_gates(self.regras_gate, fase, dados)
+    
+    def _aplicar_gate(
+        self, gate: Dict, restantes: List[Tuple], perfil: PerfilExecucao, results: Dict, ctx: ContextoInvestigacao
+    ) -> None:
+        """Marca o resultado como descartado e registra o que deixou de ser gasto."""
+        puladas = [fase for fase, *_ in restantes]
+        gate = dict(
+            gate,
+            fases_puladas=puladas,
+            chamadas_economizadas=sum(perfil.subconsultas_planejadas(f) for f in puladas),
+        )
+        results["gate"] = gate
+        logger.info(
+            f"[GATES] '{gate['regra']}' disparou após {gate['fase']}: "
+            f"{len(puladas)} fase(s) puladas, {gate['chamadas_economizadas']} chamadas LLM economizadas"
+        )
+        ctx.emitir(TipoEvento.GATE_ACIONADO, regra=gate["regra"], descricao=gate["descricao"],
+                   fases_puladas=puladas, chamadas_economizadas=gate["chamadas_economizadas"])
+    
+    async def _executar_com_orcamento(
+        self, fase: str, executar: Callable, perfil: PerfilExecucao, ctx: ContextoInvestigacao
+    ) -> Dict:
+        """
+        Roda a fase dentro do orçamento de tempo do perfil. Estourou: a fase fica
+        pendente (vazia) e as sub-consultas já concluídas continuam no checkpoint.
+        """
+        if not perfil.orcamento_fase_segundos:
+            return await executar()
+        try:
+            return await asyncio.wait_for(executar(), timeout=perfil.orcamento_fase_segundos)
+        except asyncio.TimeoutError:
+            mensagem = f"Orçamento de {perfil.orcamento_fase_segundos:g}s esgotado"
+            logger.warning(f"[BANDEIRANTE] {fase}: {mensagem}")
+            ctx.falhas_fase += 1
+            ctx.emitir(TipoEvento.ERRO, mensagem=mensagem)
+            return {}
+    
+    def _fase_fresca(self, fase: str, anterior: Optional[Dict], entrada: str) -> bool:
+        """Fase salva (checkpoint ou base do refresh) reaproveitável: mesmos inputs e dentro do TTL."""
+        if not anterior or anterior.get("entrada") != entrada:
+            return False
+        idade = datetime.now() - datetime.fromisoformat(anterior["concluido_em"])
+        return idade <= self.ttl_fases.get(fase, timedelta(0))
     
     async def _identificar_triggers(self, results: Dict) -> Dict:
         """FASE 6."""
@@ -170,8 +500,8 @@ class BandeiranteOrchestrator:
     
     def _calcular_matriz_priorizacao(self, results: Dict) -> Dict:
         """FASE 10."""
-        territorial = results.get("fases", {}).get("fase_2_territorial", {})
-        area_total = territorial.get("dados_fundiarios", {}).get("area_total_ha", 0)
+        territorial = ResultadoTerritorial.from_dict(results.get("fases", {}).get("fase_2_territorial"))
+        area_total = territorial.dados_fundiarios.area_total_ha
         
         if area_total > 100000:
             score = 90
@@ -182,16 +512,29 @@ class BandeiranteOrchestrator:
         
         status = "STRIKE" if score >= 80 else "QUALIFICAR"
         
-        return {
-            "score_final": score,
-            "status": status,
-            "classificacao": f"🔥 {status}",
-            "area_total_ha": area_total
-        }
+        return MatrizPriorizacao(
+            score_final=score,
+            status=status,
+            classificacao=f"🔥 {status}",
+            area_total_ha=area_total
+        ).to_dict()
     
     def _gerar_recomendacoes(self, results: Dict) -> Dict:
         """Gera recomendações."""
         matriz = results.get("matriz_priorizacao", {})
+        gate = results.get("gate")
+        
+        if gate:
+            return {
+                "acao_recomendada": "NÃO PERSEGUIR",
+                "status": matriz.get("status"),
+                "score": matriz.get("score_final"),
+                "motivo": gate.get("descricao") or gate["regra"],
+                "proximos_passos": [
+                    f"1. Arquivar conta: {gate.get('descricao') or gate['regra']}",
+                    "2. Reavaliar apenas se a situação mudar (refresh)"
+                ]
+            }
         
         return {
             "acao_recomendada": "AÇÃO IMEDIATA",
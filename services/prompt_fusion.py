@@ -0,0 +1,102 @@
+"""
+services/prompt_fusion.py — FUSAO DE SUB-CONSULTAS IRMAS
+Junta os prompts de uma layer num unico prompt multi-secao (schema composto
+{secao: schema da secao}) e separa a resposta de volta nas mesmas chaves.
+Menos round trips com search grounding, em troca de um pouco de profundidade.
+"""
+import re
+import logging
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+_MARCA_SECAO = re.compile(r'^=== SECAO "([^"]+)" ===$', re.MULTILINE)
+
+
+def montar_prompt_fundido(secoes: Dict[str, str]) -> str:
+    """Prompt unico com cada sub-consulta numa secao nomeada pela sua chave de resultado."""
+    blocos = [
+        f"VOCE VAI EXECUTAR {len(secoes)} INVESTIGACOES SOBRE O MESMO ALVO NUMA UNICA RESPOSTA.",
+        "Faca as buscas de TODAS as secoes antes de responder. Cada secao tem seu proprio schema.",
+        "",
+    ]
+    for chave, prompt in secoes.items():
+        blocos += [f'=== SECAO "{chave}" ===', prompt.strip(), f'=== FIM DA SECAO "{chave}" ===', ""]
+
+    composto = ", ".join(f'"{chave}": {{ ...JSON da secao {chave}... }}' for chave in secoes)
+    blocos += [
+        "RETORNE UM UNICO JSON ESTRITO, sem texto fora dele, no formato:",
+        f"{{{composto}}}",
+        "Secao sem dados encontrados: objeto com os campos vazios/zerados. NAO INVENTE dados.",
+    ]
+    return "\n".join(blocos)
+
+
+def secoes_do_prompt(prompt: str) -> List[str]:
+    """Chaves das secoes de um prompt de `montar_prompt_fundido` ([] se nao for fundido)."""
+    return _MARCA_SECAO.findall(prompt or "")
+
+
+def separar_resposta(dados: Dict, secoes: Dict[str, str]) -> Dict[str, Dict]:
+    """Só as secoes que voltaram como objeto; as ausentes ficam para consulta individual."""
+    if not isinstance(dados, dict):
+        return {}
+    return {chave: dados[chave] for chave in secoes if isinstance(dados.get(chave), dict)}
+
+
+async def consulta_fundida(
+    gemini,
+    secoes: Dict[str, str],
+    parse: Callable[[str], Any],
+    temperature: float = 0.1,
+    tag: str = "[FUSAO]"
+) -> Dict[str, Dict]:
+    """
+    Executa as secoes numa unica chamada. Retorna {chave: resultado} das secoes
+    que vieram na resposta; em erro retorna {} (a layer cai para as chamadas individuais).
+    A chamada fundida nao conta como falha da fase: o que ela nao trouxe e
+    consultado sozinho, e so essas consultas decidem se a fase fica pendente.
+    """
+    from services.investigation_context import contexto_atual  # o contexto importa este modulo
+
+    ctx = contexto_atual()
+    falhas = ctx.falhas_fase if ctx is not None else 0
+    try:
+        response = await gemini.call_with_retry(
+            montar_prompt_fundido(secoes), use_search=True, temperature=temperature
+        )
+        separadas = separar_resposta(parse(response), secoes)
+    except Exception as e:
+        logger.error(f"{tag} Erro na consulta fundida: {e}")
+        return {}
+    finally:
+        if ctx is not None:
+            ctx.falhas_fase = falhas
+
+    faltando = [chave for chave in secoes if chave not in separadas]
+    logger.info(
+        f"{tag} Consulta fundida: {len(separadas)}/{len(secoes)} secoes"
+        + (f" (individuais para: {', '.join(faltando)})" if faltando else "")
+    )
+    return separadas
+
+
+def taxa_preenchimento(dados: Any) -> float:
+    """
+    Fracao de campos-folha com valor (nao vazio/zero/False). Proxy barato de
+    completude para comparar execucao fundida x individual.
+    """
+    folhas = []
+
+    def _visitar(valor):
+        if isinstance(valor, dict) and valor:
+            for v in valor.values():
+                _visitar(v)
+        else:
+            folhas.append(valor)
+
+    _visitar(dados)
+    if not folhas:
+        return 0.0
+    vazios = (None, "", 0, False, [], {}, "R$ 0", "0%")
+    return round(sum(1 for v in folhas if v not in vazios) / len(folhas), 3)
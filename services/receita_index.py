@@ -0,0 +1,388 @@
+"""
+services/receita_index.py — INDICE OFFLINE DA BASE CNPJ (DADOS ABERTOS DA RECEITA FEDERAL)
+Ingere os dumps mensais (Empresas*, Estabelecimentos*, Socios* e as tabelas de
+codigos Cnaes/Municipios/Naturezas/Qualificacoes; .zip ou .csv, ';', latin-1, sem
+cabecalho) num SQLite local, lendo em streaming e gravando em lotes: memoria
+constante mesmo com dezenas de milhoes de linhas. Os indices sao criados so no
+fim da carga e o arquivo novo substitui o antigo atomicamente.
+
+A consulta devolve o mesmo `DadosCNPJ` das APIs (fonte="receita_offline"), sem
+rede nem rate limit. `consultar_cnpj_async` usa o indice automaticamente quando
+ele existe (BANDEIRANTE_RECEITA_DB ou .bandeirante/receita.db).
+
+Uso:
+    python -m services.receita_index ingerir /dados/cnpj_2026_10/
+    python -m services.receita_index consultar 11.222.333/0001-81
+"""
+import io
+import os
+import re
+import csv
+import sys
+import time
+import sqlite3
+import logging
+import zipfile
+import argparse
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from scout_types import DadosCNPJ
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(".bandeirante", "receita.db")
+TAMANHO_LOTE = 50_000
+
+# Campos longos (ex.: lista de CNAEs secundarios) passam do limite padrao do csv
+csv.field_size_limit(2 ** 24)
+
+SITUACOES = {"01": "NULA", "02": "ATIVA", "03": "SUSPENSA", "04": "INAPTA", "08": "BAIXADA"}
+PORTES = {"00": "NAO INFORMADO", "01": "MICRO EMPRESA", "03": "EMPRESA DE PEQUENO PORTE", "05": "DEMAIS"}
+
+# Prefixo do nome do arquivo -> tabela de codigos
+TABELAS_CODIGO = {"cnaes": "cnae", "municipios": "municipio", "naturezas": "natureza", "qualificacoes": "qualificacao"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS empresas (
+    cnpj_basico TEXT NOT NULL,
+    razao_social TEXT,
+    natureza_juridica TEXT,
+    capital_social REAL,
+    porte TEXT
+);
+CREATE TABLE IF NOT EXISTS estabelecimentos (
+    cnpj TEXT NOT NULL,
+    nome_fantasia TEXT,
+    situacao TEXT,
+    data_inicio TEXT,
+    cnae_principal TEXT,
+    cnaes_secundarios TEXT,
+    logradouro TEXT,
+    numero TEXT,
+    complemento TEXT,
+    bairro TEXT,
+    cep TEXT,
+    uf TEXT,
+    municipio TEXT,
+    telefone TEXT,
+    email TEXT
+);
+CREATE TABLE IF NOT EXISTS socios (
+    cnpj_basico TEXT NOT NULL,
+    nome TEXT,
+    documento TEXT,
+    qualificacao TEXT,
+    data_entrada TEXT
+);
+CREATE TABLE IF NOT EXISTS codigos (
+    tabela TEXT NOT NULL,
+    codigo TEXT NOT NULL,
+    descricao TEXT,
+    PRIMARY KEY (tabela, codigo)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    chave TEXT PRIMARY KEY,
+    valor TEXT
+);
+"""
+
+# Dump com linha repetida (arquivo reenviado, pastas de meses misturadas) faria o
+# UNIQUE abaixo falhar no fim de horas de carga, a consulta pegar uma empresa
+# qualquer e o QSA vir duplicado: fica a ultima linha de cada chave.
+_CHAVES_DEDUP = {
+    "estabelecimentos": "cnpj",
+    "empresas": "cnpj_basico",
+    "socios": "cnpj_basico, documento, nome",
+}
+_DEDUP = "DELETE FROM {tabela} WHERE rowid NOT IN (SELECT MAX(rowid) FROM {tabela} GROUP BY {chave})"
+
+_INDICES = """
+CREATE UNIQUE INDEX IF NOT EXISTS idx_estab_cnpj ON estabelecimentos (cnpj);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_empresas_basico ON empresas (cnpj_basico);
+CREATE INDEX IF NOT EXISTS idx_socios_basico ON socios (cnpj_basico);
+"""
+
+
+# ==============================================================================
+# INGESTAO
+# ==============================================================================
+# Marcadores no nome do arquivo: nomes atuais (Empresas0.zip) e antigos (*.EMPRECSV)
+_MARCADORES = (
+    ("estabelecimentos", ("estabelecimentos", "estabele")),
+    ("empresas", ("empresas", "emprecsv")),
+    ("socios", ("socios", "sociocsv")),
+    ("cnaes", ("cnaes", "cnaecsv")),
+    ("municipios", ("municipios", "municcsv")),
+    ("naturezas", ("naturezas", "natjucsv")),
+    ("qualificacoes", ("qualificacoes", "qualscsv")),
+)
+
+
+def _tipo_arquivo(nome: str) -> Optional[str]:
+    base = os.path.basename(nome).lower()
+    for tipo, marcadores in _MARCADORES:
+        if any(m in base for m in marcadores):
+            return tipo
+    return None
+
+
+def _linhas(caminho: str) -> Iterator[List[str]]:
+    """Linhas do dump (dentro do .zip ou .csv solto), sem carregar o arquivo em memoria."""
+    if zipfile.is_zipfile(caminho):
+        with zipfile.ZipFile(caminho) as z:
+            for membro in z.namelist():
+                with z.open(membro) as bruto:
+                    texto = io.TextIOWrapper(bruto, encoding="latin-1", newline="")
+                    yield from csv.reader(texto, delimiter=";", quotechar='"')
+    else:
+        with open(caminho, encoding="latin-1", newline="") as f:
+            yield from csv.reader(f, delimiter=";", quotechar='"')
+
+
+def _data_iso(aaaammdd: str) -> str:
+    d = aaaammdd.strip()
+    return f"{d[:4]}-{d[4:6]}-{d[6:]}" if len(d) == 8 and d != "00000000" else ""
+
+
+def _capital(valor: str) -> float:
+    try:
+        return float(valor.replace(".", "").replace(",", "."))
+    except ValueError:
+        return 0.0
+
+
+def _empresa(r: List[str]) -> Tuple:
+    return (r[0], r[1].strip(), r[2], _capital(r[4]), r[5])
+
+
+def _estabelecimento(r: List[str]) -> Tuple:
+    telefone = f"{r[21].strip()}{r[22].strip()}" if r[22].strip() else ""
+    logradouro = " ".join(p for p in (r[13].strip(), r[14].strip()) if p)
+    return (r[0] + r[1] + r[2], r[4].strip(), r[5], _data_iso(r[10]), r[11], r[12],
+            logradouro, r[15].strip(), r[16].strip(), r[17].strip(), r[18], r[19], r[20],
+            telefone, r[27].strip().lower())
+
+
+def _socio(r: List[str]) -> Tuple:
+    return (r[0], r[2].strip(), r[3].strip(), r[4], _data_iso(r[5]))
+
+
+_CONVERSORES = {
+    "empresas": ("INSERT INTO empresas VALUES (?, ?, ?, ?, ?)", _empresa, 7),
+    "estabelecimentos": ("INSERT INTO estabelecimentos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                         _estabelecimento, 28),
+    "socios": ("INSERT INTO socios VALUES (?, ?, ?, ?, ?)", _socio, 6),
+}
+
+
+def _em_lotes(linhas: Iterable[Tuple], tamanho: int) -> Iterator[List[Tuple]]:
+    lote: List[Tuple] = []
+    for linha in linhas:
+        lote.append(linha)
+        if len(lote) >= tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def ingerir(pasta_ou_arquivos, db_path: str = DEFAULT_DB_PATH, ufs: Optional[Iterable[str]] = None,
+            tamanho_lote: int = TAMANHO_LOTE) -> Dict[str, int]:
+    """
+    Carrega os dumps num banco novo (`db_path`.tmp) e o troca pelo atual no fim.
+    `ufs` restringe estabelecimentos a esses estados (empresas/socios vem completos).
+    Retorna linhas gravadas por tipo de arquivo.
+    """
+    if isinstance(pasta_ou_arquivos, str) and os.path.isdir(pasta_ou_arquivos):
+        arquivos = sorted(os.path.join(pasta_ou_arquivos, n) for n in os.listdir(pasta_ou_arquivos))
+    elif isinstance(pasta_ou_arquivos, str):
+        arquivos = [pasta_ou_arquivos]
+    else:
+        arquivos = list(pasta_ou_arquivos)
+
+    filtro_uf = {u.upper() for u in ufs} if ufs else None
+    pasta = os.path.dirname(db_path)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    tmp = db_path + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+
+    contagem: Dict[str, int] = {}
+    inicio = time.time()
+    conn = sqlite3.connect(tmp)
+    try:
+        # Carga descartavel ate o rename: sem journal nem fsync
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA cache_size=-200000")
+        conn.executescript(_SCHEMA)
+
+        for caminho in arquivos:
+            tipo = _tipo_arquivo(caminho)
+            if tipo is None:
+                logger.info(f"[RECEITA] Ignorando {os.path.basename(caminho)}")
+                continue
+            logger.info(f"[RECEITA] Ingerindo {os.path.basename(caminho)} ({tipo})")
+
+            if tipo in TABELAS_CODIGO:
+                tabela = TABELAS_CODIGO[tipo]
+                linhas = ((tabela, r[0], r[1].strip()) for r in _linhas(caminho) if len(r) >= 2)
+                sql = "INSERT OR REPLACE INTO codigos VALUES (?, ?, ?)"
+            else:
+                sql, conversor, min_colunas = _CONVERSORES[tipo]
+                linhas = (conversor(r) for r in _linhas(caminho) if len(r) >= min_colunas)
+                if tipo == "estabelecimentos" and filtro_uf:
+                    linhas = (l for l in linhas if l[11] in filtro_uf)
+
+            for lote in _em_lotes(linhas, tamanho_lote):
+                conn.executemany(sql, lote)
+                conn.commit()
+                contagem[tipo] = contagem.get(tipo, 0) + len(lote)
+
+        for tabela, chave in _CHAVES_DEDUP.items():
+            duplicados = conn.execute(_DEDUP.format(tabela=tabela, chave=chave)).rowcount
+            if duplicados:
+                logger.warning(f"[RECEITA] {duplicados} linha(s) repetida(s) em {tabela} descartada(s)")
+                contagem[tabela] -= duplicados
+        conn.commit()
+        logger.info("[RECEITA] Criando indices...")
+        conn.executescript(_INDICES)
+        conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+            ("ingerido_em", time.strftime("%Y-%m-%dT%H:%M:%S")),
+            ("arquivos", str(len(arquivos))),
+            ("ufs", ",".join(sorted(filtro_uf)) if filtro_uf else ""),
+        ])
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    os.replace(tmp, db_path)
+    logger.info(f"[RECEITA] Indice pronto em {time.time() - inicio:.0f}s: {contagem}")
+    return contagem
+
+
+# ==============================================================================
+# CONSULTA
+# ==============================================================================
+class ReceitaIndex:
+    """
+    Leitura do indice: conexao somente-leitura por thread (mmap) e tabelas de
+    codigos em memoria. Uma consulta = um lookup por indice + socios da raiz.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(db_path)
+        self.db_path = db_path
+        self._local = threading.local()
+        self._codigos: Dict[str, Dict[str, str]] = {t: {} for t in TABELAS_CODIGO.values()}
+        for tabela, codigo, descricao in self._conn().execute("SELECT tabela, codigo, descricao FROM codigos"):
+            self._codigos.setdefault(tabela, {})[codigo] = descricao
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+            conn.execute("PRAGMA mmap_size=1073741824")
+            self._local.conn = conn
+        return conn
+
+    def _descricao(self, tabela: str, codigo: str) -> str:
+        return self._codigos.get(tabela, {}).get(codigo, "")
+
+    def consultar(self, cnpj: str) -> Optional[DadosCNPJ]:
+        c = re.sub(r"\D", "", cnpj)
+        conn = self._conn()
+        e = conn.execute(
+            "SELECT e.cnpj, e.nome_fantasia, e.situacao, e.data_inicio, e.cnae_principal, e.cnaes_secundarios, "
+            "e.logradouro, e.numero, e.complemento, e.bairro, e.cep, e.uf, e.municipio, e.telefone, e.email, "
+            "m.razao_social, m.natureza_juridica, m.capital_social, m.porte "
+            "FROM estabelecimentos e LEFT JOIN empresas m ON m.cnpj_basico = substr(e.cnpj, 1, 8) "
+            "WHERE e.cnpj = ?", (c,)
+        ).fetchone()
+        if not e:
+            return None
+        socios = conn.execute(
+            "SELECT nome, documento, qualificacao, data_entrada FROM socios WHERE cnpj_basico = ?", (c[:8],)
+        ).fetchall()
+
+        cnaes_sec = [s for s in (e[5] or "").split(",") if s]
+        return DadosCNPJ(
+            cnpj=c, razao_social=e[15] or "", nome_fantasia=e[1] or "",
+            situacao_cadastral=SITUACOES.get(e[2], e[2] or ""), data_abertura=e[3] or "",
+            natureza_juridica=self._descricao("natureza", e[16] or ""), capital_social=e[17] or 0.0,
+            porte=PORTES.get(e[18], ""), cnae_principal=e[4] or "",
+            cnae_descricao=self._descricao("cnae", e[4] or ""),
+            cnaes_secundarios=[f"{s} - {self._descricao('cnae', s)}".rstrip(" -") for s in cnaes_sec],
+            municipio=self._descricao("municipio", e[12] or "") or (e[12] or ""), uf=e[11] or "",
+            cep=e[10] or "", logradouro=e[6] or "", numero=e[7] or "", complemento=e[8] or "",
+            bairro=e[9] or "", telefone=e[13] or "", email=e[14] or "",
+            qsa=[{"nome": n, "documento": doc, "qualificacao": self._descricao("qualificacao", q), "data_entrada": d}
+                 for n, doc, q, d in socios],
+            fonte="receita_offline", timestamp=str(time.time()),
+        )
+
+    def meta(self) -> Dict[str, str]:
+        return dict(self._conn().execute("SELECT chave, valor FROM meta").fetchall())
+
+
+_indice: Optional[ReceitaIndex] = None
+_indice_lock = threading.Lock()
+
+
+def obter_indice(db_path: Optional[str] = None) -> Optional[ReceitaIndex]:
+    """Indice do processo, ou None se nao houver base offline ingerida."""
+    global _indice
+    caminho = db_path or os.environ.get("BANDEIRANTE_RECEITA_DB", DEFAULT_DB_PATH)
+    with _indice_lock:
+        if _indice is not None and _indice.db_path == caminho:
+            return _indice
+        if not caminho or not os.path.exists(caminho):
+            return None
+        try:
+            _indice = ReceitaIndex(caminho)
+        except sqlite3.Error as e:
+            logger.warning(f"[RECEITA] Indice offline indisponivel ({caminho}): {e}")
+            return None
+        return _indice
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bandeirante Digital — índice offline da base CNPJ da Receita")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p_ing = sub.add_parser("ingerir", help="Carrega os dumps (.zip/.csv) da Receita Federal")
+    p_ing.add_argument("origem", nargs="+", help="Pasta com os dumps ou arquivos avulsos")
+    p_ing.add_argument("--db", default=DEFAULT_DB_PATH)
+    p_ing.add_argument("--uf", action="append", help="Restringe estabelecimentos à UF (repetível)")
+    p_ing.add_argument("--lote", type=int, default=TAMANHO_LOTE, help="Linhas por transação")
+    p_con = sub.add_parser("consultar", help="Consulta um CNPJ no índice")
+    p_con.add_argument("cnpj")
+    p_con.add_argument("--db", default=DEFAULT_DB_PATH)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if args.comando == "ingerir":
+        origem = args.origem[0] if len(args.origem) == 1 else args.origem
+        contagem = ingerir(origem, args.db, ufs=args.uf, tamanho_lote=args.lote)
+        print(f"[RECEITA] {sum(contagem.values())} linhas: {contagem}")
+        return 0
+
+    indice = ReceitaIndex(args.db)
+    inicio = time.perf_counter()
+    dados = indice.consultar(args.cnpj)
+    duracao_us = (time.perf_counter() - inicio) * 1e6
+    if not dados:
+        print(f"[RECEITA] CNPJ {args.cnpj} não está no índice")
+        return 1
+    print(f"[RECEITA] {dados.razao_social} — {dados.situacao_cadastral} — {dados.municipio}/{dados.uf} "
+          f"({len(dados.qsa)} sócios, {duracao_us:.0f} µs)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,9 +5,12 @@ Bandeirante Digital v3.0 - Checagem de Reputacao, Judicial, Financeira e Redes S
 Fontes: JusBrasil, Reclame Aqui, Glassdoor, PGFN, MPT, IBAMA
 """
 import logging
-import re
-import json
-from typing import Dict, List
+from typing import Collection, Dict, List, Optional
+
+from services.execution_profiles import subconsulta_ativa
+from services.prompt_fusion import consulta_fundida
+
+from utils.json_extractor import extrair_json
 
 logger = logging.getLogger(__name__)
 
@@ -21,40 +24,51 @@ class ReputationLayer:
     def __init__(self, gemini_service):
         self.gemini = gemini_service
 
-    async def checagem_completa(self, empresa: str, cnpj: str = "") -> Dict:
+    async def checagem_completa(self, empresa: str, cnpj: str = "", subconsultas: Optional[Collection[str]] = None, fundir: bool = False) -> Dict:
         """
         Executa checagem de reputacao em 4 dimensoes:
         1. Historico Judicial & Moral
         2. Reputacao Online (Reclame Aqui, Glassdoor)
         3. Saude Financeira Shadow (Serasa, PGFN)
         4. Presenca Digital (Site, Redes Sociais)
+
+        fundir=True: as dimensoes ativas vao numa unica consulta multi-secao
+        (menos round trips); secao ausente na resposta e consultada sozinha.
         """
         logger.info(f"[REPUTACAO] Iniciando checagem shadow: {empresa}")
 
         results = {}
+        if fundir:
+            results.update(await self._checagem_fundida(empresa, cnpj, subconsultas))
+            # O que nao veio na resposta fundida roda individualmente
+            subconsultas = [
+                k for k in ("judicial", "reputacao_online", "saude_financeira", "presenca_digital")
+                if subconsulta_ativa(k, subconsultas) and k not in results
+            ]
+
         try:
-            judicial = await self._checagem_judicial(empresa, cnpj)
+            judicial = await self._checagem_judicial(empresa, cnpj) if subconsulta_ativa("judicial", subconsultas) else results.get("judicial", {})
             results["judicial"] = judicial
         except Exception as e:
             logger.warning(f"[REPUTACAO] Erro judicial: {e}")
             results["judicial"] = {}
 
         try:
-            online = await self._checagem_reputacao_online(empresa)
+            online = await self._checagem_reputacao_online(empresa) if subconsulta_ativa("reputacao_online", subconsultas) else results.get("reputacao_online", {})
             results["reputacao_online"] = online
         except Exception as e:
             logger.warning(f"[REPUTACAO] Erro reputacao online: {e}")
             results["reputacao_online"] = {}
 
         try:
-            financeira = await self._checagem_saude_financeira(empresa, cnpj)
+            financeira = await self._checagem_saude_financeira(empresa, cnpj) if subconsulta_ativa("saude_financeira", subconsultas) else results.get("saude_financeira", {})
             results["saude_financeira"] = financeira
         except Exception as e:
             logger.warning(f"[REPUTACAO] Erro saude financeira: {e}")
             results["saude_financeira"] = {}
 
         try:
-            digital = await self._checagem_presenca_digital(empresa)
+            digital = await self._checagem_presenca_digital(empresa) if subconsulta_ativa("presenca_digital", subconsultas) else results.get("presenca_digital", {})
             results["presenca_digital"] = digital
         except Exception as e:
             logger.warning(f"[REPUTACAO] Erro presenca digital: {e}")
@@ -65,8 +79,20 @@ class ReputationLayer:
         logger.info(f"[REPUTACAO] Flag de risco: {results['flag_risco']}")
         return results
 
-    async def _checagem_judicial(self, empresa: str, cnpj: str) -> Dict:
-        prompt = f"""ATUE COMO: Investigador Judicial Forense.
+    async def _checagem_fundida(self, empresa: str, cnpj: str, subconsultas: Optional[Collection[str]]) -> Dict:
+        secoes = {
+            "judicial": self._prompt_judicial(empresa, cnpj),
+            "reputacao_online": self._prompt_reputacao_online(empresa),
+            "saude_financeira": self._prompt_saude_financeira(empresa, cnpj),
+            "presenca_digital": self._prompt_presenca_digital(empresa),
+        }
+        secoes = {k: p for k, p in secoes.items() if subconsulta_ativa(k, subconsultas)}
+        if len(secoes) < 2:
+            return {}
+        return await consulta_fundida(self.gemini, secoes, self._parse_json, temperature=0.1, tag="[REPUTACAO]")
+
+    def _prompt_judicial(self, empresa: str, cnpj: str) -> str:
+        return f"""ATUE COMO: Investigador Judicial Forense.
 ALVO: {empresa} (CNPJ: {cnpj if cnpj else 'N/D'})
 
 BUSQUE INFORMACOES PUBLICAS SOBRE:
@@ -121,6 +147,9 @@ RETORNE JSON ESTRITO:
 
 NAO INVENTE dados. Se nao encontrar, retorne campos vazios/zerados."""
 
+    async def _checagem_judicial(self, empresa: str, cnpj: str) -> Dict:
+        prompt = self._prompt_judicial(empresa, cnpj)
+
         try:
             response = await self.gemini.call_with_retry(prompt, use_search=True, temperature=0.1)
             return self._parse_json(response)
@@ -128,8 +157,8 @@ NAO INVENTE dados. Se nao encontrar, retorne campos vazios/zerados."""
             logger.error(f"[JUDICIAL] Erro: {e}")
             return {}
 
-    async def _checagem_reputacao_online(self, empresa: str) -> Dict:
-        prompt = f"""ATUE COMO: Analista de Reputacao Digital.
+    def _prompt_reputacao_online(self, empresa: str) -> str:
+        return f"""ATUE COMO: Analista de Reputacao Digital.
 ALVO: {empresa}
 
 BUSQUE EM:
@@ -187,6 +216,9 @@ RETORNE JSON:
     "osint_score": 0
 }}"""
 
+    async def _checagem_reputacao_online(self, empresa: str) -> Dict:
+        prompt = self._prompt_reputacao_online(empresa)
+
         try:
             response = await self.gemini.call_with_retry(prompt, use_search=True, temperature=0.1)
             return self._parse_json(response)
@@ -194,8 +226,8 @@ RETORNE JSON:
             logger.error(f"[REPUTACAO ONLINE] Erro: {e}")
             return {}
 
-    async def _checagem_saude_financeira(self, empresa: str, cnpj: str) -> Dict:
-        prompt = f"""ATUE COMO: Auditor de Credito.
+    def _prompt_saude_financeira(self, empresa: str, cnpj: str) -> str:
+        return f"""ATUE COMO: Auditor de Credito.
 ALVO: {empresa} (CNPJ: {cnpj if cnpj else 'N/D'})
 
 BUSQUE:
@@ -226,6 +258,9 @@ RETORNE JSON:
     "capacidade_investimento": "ALTA/MEDIA/BAIXA/NULA"
 }}"""
 
+    async def _checagem_saude_financeira(self, empresa: str, cnpj: str) -> Dict:
+        prompt = self._prompt_saude_financeira(empresa, cnpj)
+
         try:
             response = await self.gemini.call_with_retry(prompt, use_search=True, temperature=0.1)
             return self._parse_json(response)
@@ -233,8 +268,8 @@ RETORNE JSON:
             logger.error(f"[SAUDE FINANCEIRA] Erro: {e}")
             return {}
 
-    async def _checagem_presenca_digital(self, empresa: str) -> Dict:
-        prompt = f"""ATUE COMO: Analista de Presenca Digital.
+    def _prompt_presenca_digital(self, empresa: str) -> str:
+        return f"""ATUE COMO: Analista de Presenca Digital.
 ALVO: {empresa}
 
 VERIFIQUE:
@@ -279,6 +314,9 @@ RETORNE JSON:
     "maturidade_digital_score": 0
 }}"""
 
+    async def _checagem_presenca_digital(self, empresa: str) -> Dict:
+        prompt = self._prompt_presenca_digital(empresa)
+
         try:
             response = await self.gemini.call_with_retry(prompt, use_search=True, temperature=0.1)
             return self._parse_json(response)
@@ -311,13 +349,4 @@ RETORNE JSON:
         return "VERDE"
 
     def _parse_json(self, response: str) -> Dict:
-        if not response:
-            return {}
-        try:
-            clean = response.replace("```json", "").replace("```", "").strip()
-            match = re.search(r'\{.*\}', clean, re.DOTALL)
-            if match:
-                return json.loads(match.group(0))
-        except Exception:
-            pass
-        return {}
+        return extrair_json(response, origem="[REPUTACAO]")
@@ -0,0 +1,497 @@
+"""
+services/result_models.py — MODELOS TIPADOS DOS RESULTADOS DAS FASES
+As layers devolvem dicts aninhados vindos do JSON do Gemini; aqui cada fase vira
+uma dataclass com __slots__ e campos ja coeridos pelo `DataValidator`
+(numeros como int/float, listas como tupla, textos curtos internados).
+Quem consome (DossieGenerator, matriz de priorizacao) le atributos direto, sem
+cadeias de `.get(...).get(...)`.
+
+    inv = ResultadoInvestigacao.from_dict(results)
+    inv.fases.territorial.dados_fundiarios.area_total_ha   # float
+    inv.to_dict()                                          # mesmo formato de `results`
+
+Ida e volta: o `to_dict` devolve so as chaves que vieram no dict de origem.
+Chaves que o modelo nao conhece, e valores que nao cabem no tipo do campo (texto
+onde se esperava objeto ou lista de objetos), ficam em `extras` como vieram.
+
+Memoria por investigacao guardada: benchmarks/result_models.py.
+"""
+import sys
+import json
+import typing
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, ClassVar, Dict, Optional, Tuple
+
+from services.data_validator import DataValidator
+
+_MAX_INTERNAR = 40  # status, UF, municipio, cargo: repetem entre investigacoes
+
+
+def _texto(valor: Any) -> str:
+    texto = DataValidator.to_string(valor)
+    return sys.intern(texto) if len(texto) <= _MAX_INTERNAR else texto
+
+
+def _textos(valor: Any) -> Tuple[str, ...]:
+    return tuple(_texto(v) for v in DataValidator.to_list(valor))
+
+
+# Valor que nao cabe no campo (estrutura diferente): vai inteiro para `extras`
+_INCONVERSIVEL = object()
+
+
+def _dict(valor: Any) -> Dict:
+    return valor if isinstance(valor, dict) else _INCONVERSIVEL
+
+
+def _so_dicts(valor: Any) -> bool:
+    return isinstance(valor, list) and all(isinstance(v, dict) for v in valor)
+
+
+def _dicts(valor: Any) -> Tuple[Dict, ...]:
+    return tuple(valor) if _so_dicts(valor) else _INCONVERSIVEL
+
+
+_CONVERSORES_SIMPLES: Dict[Any, Callable[[Any], Any]] = {
+    int: DataValidator.to_int,
+    float: DataValidator.to_float,
+    bool: DataValidator.to_bool,
+    str: _texto,
+    Dict: _dict,
+    Tuple[str, ...]: _textos,
+    Tuple[Dict, ...]: _dicts,
+}
+
+# por classe: chave JSON -> (atributo, conversor); montado na primeira conversao
+_ESQUEMAS: Dict[type, Dict[str, Tuple[str, Callable[[Any], Any]]]] = {}
+# conjuntos de chaves presentes se repetem entre investigacoes: uma tupla so por conjunto
+_PRESENCAS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _conversor(tipo: Any) -> Callable[[Any], Any]:
+    if tipo in _CONVERSORES_SIMPLES:
+        return _CONVERSORES_SIMPLES[tipo]
+    if isinstance(tipo, type) and issubclass(tipo, ModeloResultado):
+        return lambda valor: tipo.from_dict(valor) if isinstance(valor, (dict, tipo)) else _INCONVERSIVEL
+    args = typing.get_args(tipo)
+    if typing.get_origin(tipo) is tuple and args[-1] is Ellipsis and issubclass(args[0], ModeloResultado):
+        modelo = args[0]
+        return lambda valor: tuple(modelo.from_dict(v) for v in valor) if _so_dicts(valor) else _INCONVERSIVEL
+    return lambda valor: valor
+
+
+def _esquema(cls: type) -> Dict[str, Tuple[str, Callable[[Any], Any]]]:
+    esquema = _ESQUEMAS.get(cls)
+    if esquema is None:
+        dicas = typing.get_type_hints(cls)
+        chaves = {atributo: chave for chave, atributo in cls._CHAVES.items()}
+        esquema = {
+            chaves.get(f.name, f.name): (f.name, _conversor(dicas[f.name]))
+            for f in fields(cls) if f.name not in ("extras", "presentes")
+        }
+        _ESQUEMAS[cls] = esquema
+    return esquema
+
+
+def _para_json(valor: Any) -> Any:
+    if isinstance(valor, ModeloResultado):
+        return valor.to_dict()
+    if isinstance(valor, tuple):
+        return [_para_json(v) for v in valor]
+    return valor
+
+
+@dataclass(slots=True)
+class ModeloResultado:
+    """
+    Base: conversao dict <-> modelo. `_CHAVES` mapeia chave JSON -> atributo quando diferem.
+    `presentes`: chaves que vieram no `from_dict` (None = modelo montado em codigo: todas).
+    """
+    _CHAVES: ClassVar[Dict[str, str]] = {}
+
+    extras: Optional[Dict] = field(default=None, repr=False)
+    presentes: Optional[Tuple[str, ...]] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_dict(cls, dados: Any) -> "ModeloResultado":
+        if isinstance(dados, cls):
+            return dados
+        if not isinstance(dados, dict):
+            return cls()
+        esquema = _esquema(cls)
+        valores, extras, presentes = {}, None, []
+        for chave, valor in dados.items():
+            campo = esquema.get(chave)
+            convertido = _INCONVERSIVEL if campo is None else campo[1](valor)
+            if convertido is _INCONVERSIVEL:
+                if extras is None:
+                    extras = {}
+                extras[chave] = valor
+            else:
+                valores[campo[0]] = convertido
+                presentes.append(chave)
+        presentes = tuple(presentes)
+        return cls(extras=extras, presentes=_PRESENCAS.setdefault(presentes, presentes), **valores)
+
+    def to_dict(self) -> Dict:
+        esquema = _esquema(type(self))
+        chaves = esquema if self.presentes is None else self.presentes
+        saida = {chave: _para_json(getattr(self, esquema[chave][0])) for chave in chaves}
+        if self.extras:
+            saida.update(self.extras)
+        return saida
+
+    @classmethod
+    def from_json(cls, texto: str) -> "ModeloResultado":
+        return cls.from_dict(json.loads(texto))
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, **kwargs)
+
+
+# ==============================================================================
+# FASE -1: REPUTACAO
+# ==============================================================================
+@dataclass(slots=True)
+class ResultadoReputacao(ModeloResultado):
+    judicial: Dict = field(default_factory=dict)
+    reputacao_online: Dict = field(default_factory=dict)
+    saude_financeira: Dict = field(default_factory=dict)
+    presenca_digital: Dict = field(default_factory=dict)
+    flag_risco: str = ""
+
+
+# ==============================================================================
+# FASE 1: INCENTIVOS FISCAIS
+# ==============================================================================
+@dataclass(slots=True)
+class Incentivo(ModeloResultado):
+    nome: str = ""
+    tipo: str = ""
+    uf: str = ""
+    data_concessao: str = ""
+    vigencia: str = ""
+    documento_prova: str = ""
+    beneficio_estimado: str = ""
+    exigencias: str = ""
+
+
+@dataclass(slots=True)
+class IncentivosEstaduais(ModeloResultado):
+    incentivos_encontrados: Tuple[Incentivo, ...] = ()
+    total_incentivos: int = 0
+    valor_beneficio_anual_estimado: str = ""
+    risco_perda: str = ""
+    oportunidade_senior: str = ""
+
+
+@dataclass(slots=True)
+class SancoesMultas(ModeloResultado):
+    multas_fiscais: Tuple[Dict, ...] = ()
+    multas_ambientais: Tuple[Dict, ...] = ()
+    multas_trabalhistas: Tuple[Dict, ...] = ()
+    total_multas_valor: str = ""
+    total_multas_quantidade: int = 0
+    padrao_infracoes: str = ""
+    argumento_venda: str = ""
+
+
+@dataclass(slots=True)
+class ResultadoIncentivos(ModeloResultado):
+    incentivos_estaduais: IncentivosEstaduais = field(default_factory=IncentivosEstaduais)
+    incentivos_federais: Dict = field(default_factory=dict)
+    sancoes_multas: SancoesMultas = field(default_factory=SancoesMultas)
+    creditos_presumidos: Dict = field(default_factory=dict)
+    analise_fiscal: Dict = field(default_factory=dict)
+
+
+# ==============================================================================
+# FASE 2: TERRITORIAL
+# ==============================================================================
+@dataclass(slots=True)
+class ImovelRural(ModeloResultado):
+    nome_fazenda: str = ""
+    municipio: str = ""
+    uf: str = ""
+    area_ha: float = 0.0
+    tipo_operacao: str = ""
+    data_registro: str = ""
+    georreferenciado: bool = False
+    coordenadas_aprox: str = ""
+    infraestrutura_visivel: str = ""
+
+
+@dataclass(slots=True)
+class StatusCAR(ModeloResultado):
+    cadastrado: bool = False
+    app_regular: bool = False
+    reserva_legal_ok: bool = False
+    sobreposicoes: bool = False
+
+
+@dataclass(slots=True)
+class DadosFundiarios(ModeloResultado):
+    imoveis_rurais: Tuple[ImovelRural, ...] = ()
+    area_total_ha: float = 0.0
+    total_imoveis: int = 0
+    estados_presenca: Tuple[str, ...] = ()
+    municipios: Tuple[str, ...] = ()
+    expansao_recente: Dict = field(default_factory=dict)
+    car_status: StatusCAR = field(default_factory=StatusCAR)
+
+
+@dataclass(slots=True)
+class LicencaAmbiental(ModeloResultado):
+    tipo: str = ""
+    orgao: str = ""
+    data_emissao: str = ""
+    validade: str = ""
+    atividade: str = ""
+    localizacao: str = ""
+    recente: bool = False
+    implicacao: str = ""
+
+
+@dataclass(slots=True)
+class LicencasAmbientais(ModeloResultado):
+    licencas_ativas: Tuple[LicencaAmbiental, ...] = ()
+    total_licencas: int = 0
+    licencas_recentes_6m: int = 0
+    condicionantes_sistema: str = ""
+
+
+@dataclass(slots=True)
+class ResultadoTerritorial(ModeloResultado):
+    dados_fundiarios: DadosFundiarios = field(default_factory=DadosFundiarios)
+    licencas_ambientais: LicencasAmbientais = field(default_factory=LicencasAmbientais)
+    adjacencias: Dict = field(default_factory=dict)
+    resumo_territorial: Dict = field(default_factory=dict)
+
+
+# ==============================================================================
+# FASE 3: LOGISTICA
+# ==============================================================================
+@dataclass(slots=True)
+class UnidadeArmazenagem(ModeloResultado):
+    nome: str = ""
+    municipio: str = ""
+    tipo: str = ""
+    capacidade_toneladas: float = 0.0
+    proprietario: bool = False
+    status_conab: str = ""
+
+
+@dataclass(slots=True)
+class Armazenagem(ModeloResultado):
+    unidades_armazenagem: Tuple[UnidadeArmazenagem, ...] = ()
+    capacidade_total_toneladas: float = 0.0
+    total_unidades: int = 0
+    tipo_predominante: str = ""
+    necessidade_wms: str = ""
+    argumento_venda: str = ""
+
+
+@dataclass(slots=True)
+class RegistroRNTRC(ModeloResultado):
+    ativo: bool = False
+    numero: str = ""
+    desde: str = ""
+    quantidade_veiculos: int = 0
+    tipos_veiculos: Tuple[str, ...] = ()
+
+
+@dataclass(slots=True)
+class FrotaLogistica(ModeloResultado):
+    rntrc: RegistroRNTRC = field(default_factory=RegistroRNTRC)
+    obrigacoes_fiscais: Dict = field(default_factory=dict)
+    frota_propria: Dict = field(default_factory=dict)
+    logistica_terceirizada: Dict = field(default_factory=dict)
+    necessidade_tms: str = ""
+    argumento_venda: str = ""
+
+
+@dataclass(slots=True)
+class ResultadoLogistica(ModeloResultado):
+    armazenagem: Armazenagem = field(default_factory=Armazenagem)
+    frota_logistica: FrotaLogistica = field(default_factory=FrotaLogistica)
+    exportacao: Dict = field(default_factory=dict)
+    cadeia_valor_resumo: Dict = field(default_factory=dict)
+
+
+# ==============================================================================
+# FASE 4: SOCIETARIO
+# ==============================================================================
+@dataclass(slots=True)
+class GrupoSocietario(ModeloResultado):
+    holding_controladora: str = ""
+    total_empresas_grupo: int = 0
+    empresas_relacionadas: Tuple[Dict, ...] = ()
+
+
+@dataclass(slots=True)
+class EstruturaSocietaria(ModeloResultado):
+    cnpj_matriz: str = ""
+    razao_social: str = ""
+    grupo_economico: GrupoSocietario = field(default_factory=GrupoSocietario)
+    socios_principais: Tuple[Dict, ...] = ()
+    alteracoes_recentes: Tuple[Dict, ...] = ()
+    capital_social_total_grupo: str = ""
+
+
+@dataclass(slots=True)
+class ResultadoSocietario(ModeloResultado):
+    grupo_local: Dict = field(default_factory=dict)
+    estrutura: EstruturaSocietaria = field(default_factory=EstruturaSocietaria)
+    holdings: Dict = field(default_factory=dict)
+    red_flags_societarias: Dict = field(default_factory=dict)
+    risco_societario: str = ""
+
+
+# ==============================================================================
+# FASE 5: EXECUTIVOS
+# ==============================================================================
+@dataclass(slots=True)
+class Executivo(ModeloResultado):
+    nome: str = ""
+    cargo: str = ""
+    linkedin: str = ""
+    tipo_poder: str = ""
+    eh_socio_fundador: bool = False
+    tempo_empresa: str = ""
+    formacao: str = ""
+    sinais_engajamento: str = ""
+
+
+@dataclass(slots=True)
+class Hierarquia(ModeloResultado):
+    executivos_identificados: Tuple[Executivo, ...] = ()
+    tem_area_ti: bool = False
+    tipo_decisao: str = ""
+    vagas_ti_abertas: Tuple[str, ...] = ()
+    sinal_mudanca_sistema: bool = False
+
+
+@dataclass(slots=True)
+class ResultadoExecutivos(ModeloResultado):
+    hierarquia: Hierarquia = field(default_factory=Hierarquia)
+    perfis_decisores: Dict = field(default_factory=dict)
+    matriz_receptividade: Tuple[Dict, ...] = ()
+
+
+# ==============================================================================
+# FASES LOCAIS: 6 (TRIGGERS), 7 (PSICOLOGIA), 10 (MATRIZ) E RECOMENDACOES
+# ==============================================================================
+@dataclass(slots=True)
+class Trigger(ModeloResultado):
+    tipo: str = ""
+    severidade: str = ""
+    descricao: str = ""
+    implicacao: str = ""
+
+
+@dataclass(slots=True)
+class ContextoSazonal(ModeloResultado):
+    periodo: str = ""
+    abertura: str = ""
+
+
+@dataclass(slots=True)
+class ResultadoTriggers(ModeloResultado):
+    triggers: Tuple[Trigger, ...] = ()
+    total_triggers: int = 0
+    urgencia_geral: str = ""
+    contexto_sazonal: ContextoSazonal = field(default_factory=ContextoSazonal)
+    melhor_momento_contato: str = ""
+
+
+@dataclass(slots=True)
+class ResultadoPsicologia(ModeloResultado):
+    storytelling_abertura: str = ""
+    gatilho_psicologico: str = ""
+    canal_preferido: str = ""
+    tom_recomendado: str = ""
+
+
+@dataclass(slots=True)
+class MatrizPriorizacao(ModeloResultado):
+    score_final: int = 0
+    status: str = ""
+    classificacao: str = ""
+    area_total_ha: float = 0.0
+    total_incentivos: int = 0
+
+
+@dataclass(slots=True)
+class Recomendacoes(ModeloResultado):
+    acao_recomendada: str = ""
+    status: str = ""
+    score: int = 0
+    motivo: str = ""
+    proximos_passos: Tuple[str, ...] = ()
+    decisor_principal: str = ""
+    gatilho_usar: str = ""
+    canal_preferido: str = ""
+    melhor_momento_contato: str = ""
+
+
+# ==============================================================================
+# INVESTIGACAO
+# ==============================================================================
+@dataclass(slots=True)
+class FasesInvestigacao(ModeloResultado):
+    _CHAVES: ClassVar[Dict[str, str]] = {
+        "fase_0_cadastro": "cadastro",
+        "fase_-1_reputation": "reputacao",
+        "fase_1_incentivos": "incentivos",
+        "fase_2_territorial": "territorial",
+        "fase_3_logistica": "logistica",
+        "fase_4_societario": "societario",
+        "fase_5_executivos": "executivos",
+        "fase_6_triggers": "triggers",
+        "fase_7_psicologia": "psicologia",
+    }
+
+    cadastro: Dict = field(default_factory=dict)
+    reputacao: ResultadoReputacao = field(default_factory=ResultadoReputacao)
+    incentivos: ResultadoIncentivos = field(default_factory=ResultadoIncentivos)
+    territorial: ResultadoTerritorial = field(default_factory=ResultadoTerritorial)
+    logistica: ResultadoLogistica = field(default_factory=ResultadoLogistica)
+    societario: ResultadoSocietario = field(default_factory=ResultadoSocietario)
+    executivos: ResultadoExecutivos = field(default_factory=ResultadoExecutivos)
+    triggers: ResultadoTriggers = field(default_factory=ResultadoTriggers)
+    psicologia: ResultadoPsicologia = field(default_factory=ResultadoPsicologia)
+
+    def to_dict(self) -> Dict:
+        """So as fases que rodaram (fase pulada pelo perfil/gate nao aparece vazia)."""
+        if self.presentes is not None:
+            return ModeloResultado.to_dict(self)
+        saida = {}
+        for chave, (atributo, _) in _esquema(type(self)).items():
+            valor = getattr(self, atributo)
+            if valor and valor != type(valor)():
+                saida[chave] = _para_json(valor)
+        if self.extras:
+            saida.update(self.extras)
+        return saida
+
+
+@dataclass(slots=True)
+class Metadados(ModeloResultado):
+    empresa: str = ""
+    cnpj: str = ""
+    uf: str = ""
+    modo: str = ""
+    versao: str = ""
+    investigation_id: str = ""
+    timestamp_inicio: str = ""
+    timestamp_fim: str = ""
+    duracao_segundos: float = 0.0
+
+
+@dataclass(slots=True)
+class ResultadoInvestigacao(ModeloResultado):
+    metadata: Metadados = field(default_factory=Metadados)
+    fases: FasesInvestigacao = field(default_factory=FasesInvestigacao)
+    matriz_priorizacao: MatrizPriorizacao = field(default_factory=MatrizPriorizacao)
+    recomendacoes: Recomendacoes = field(default_factory=Recomendacoes)
+    gate: Dict = field(default_factory=dict)
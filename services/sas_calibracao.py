@@ -0,0 +1,512 @@
+"""
+services/sas_calibracao.py — CALIBRACAO E SENSIBILIDADE DO SAS (OFFLINE)
+Varre grades ou amostras aleatorias de tetos/pesos dos pilares e cortes de tier
+sobre a carteira historica (services/carteira_sas), sem nenhuma chamada de rede.
+Para cada configuracao: distribuicao de tiers, taxa de ganho por tier, AUC do
+score contra negocios ganhos/perdidos, acuracia do corte e quantos mudam de tier.
+
+Os pilares brutos (antes do teto) nao dependem desses parametros: sao calculados
+uma vez e cada bloco de configuracoes vira poucas operacoes NumPy (K x N);
+blocos sao distribuidos entre processos (multiprocessing).
+
+Parametros (nomes):
+    teto.<pilar>   teto do pilar (PESOS_PILARES_V2)
+    peso.<pilar>   multiplicador do pilar ja com teto (1 = atual)
+    tier.<TIER>    score minimo do tier (TIERS_V2)
+
+Uso:
+    python -m services.sas_calibracao --resultados negocios.csv --amostras 5000 -p 4 -o calibracao.csv
+    (CSV de negocios: cnpj ou empresa + resultado ganho/perdido)
+
+Equivalencia com o avaliador compilado: tests/test_sas_calibracao.py;
+tempos: python -m benchmarks.sas_calibracao
+"""
+import os
+import re
+import sys
+import csv
+import time
+import logging
+import argparse
+import itertools
+import multiprocessing
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils.sas_regras import (
+    AvaliadorSAS, RegrasSAS, REGRAS_V2, TIERS_LOTE,
+    carregar_regras_sas, compilar_regras, salvar_regras_sas,
+)
+
+logger = logging.getLogger(__name__)
+
+NOMES_TIER = [t.name for t in TIERS_LOTE]
+METRICAS = (
+    [f"n_{t}" for t in NOMES_TIER]
+    + [f"ganho_{t}" for t in NOMES_TIER]
+    + ["auc", "acuracia", "score_medio", "mudaram_tier"]
+)
+OBJETIVOS = ("auc", "acuracia")
+
+ELEMENTOS_POR_BLOCO = 4_000_000   # K x N por bloco (~32 MB por matriz float64)
+
+_GANHO = {"ganho", "ganha", "won", "win", "1", "sim", "true", "fechado"}
+_PERDA = {"perdido", "perdida", "lost", "loss", "0", "nao", "não", "false"}
+
+
+# =============================================================================
+# BASE (o que nao muda entre configuracoes)
+# =============================================================================
+@dataclass
+class BaseCalibracao:
+    regras: RegrasSAS
+    pilares: List[str]
+    brutos: np.ndarray            # (P, N) pontos por pilar antes do teto
+    multiplicador: np.ndarray     # (N,) fator de confianca
+    big_fish: np.ndarray          # (N,) elegivel ao override
+    promove: np.ndarray           # (4,) tiers que o override sobe
+    tier_referencia: np.ndarray   # (N,) tier pelas regras atuais
+    ganhou: np.ndarray            # (N,) 1 ganho, 0 perdido, NaN sem desfecho
+    indice: pd.Index
+
+    @property
+    def total(self) -> int:
+        return self.brutos.shape[1]
+
+    @property
+    def rotulados(self) -> int:
+        return int((~np.isnan(self.ganhou)).sum())
+
+
+def preparar_base(
+    tabela: pd.DataFrame,
+    regras: RegrasSAS = REGRAS_V2,
+    resultados: Optional[pd.Series] = None,
+) -> BaseCalibracao:
+    """
+    Avalia a carteira uma vez pelas regras atuais e guarda o necessario para
+    re-pontuar com outros tetos/pesos/tiers. `resultados`: Series bool/0-1
+    indexada como a tabela (linhas sem desfecho ficam de fora das metricas).
+    """
+    avaliador = compilar_regras(regras)
+    colunas = AvaliadorSAS.colunas(tabela)
+    brutos = avaliador.pilares_brutos(colunas)
+    atual = avaliador.calcular(colunas)
+    ganhou = np.full(len(colunas), np.nan)
+    if resultados is not None:
+        alinhado = pd.Series(resultados).reindex(tabela.index)
+        ganhou = alinhado.astype("float64").to_numpy()
+    return BaseCalibracao(
+        regras=regras,
+        pilares=list(brutos),
+        brutos=np.vstack([np.asarray(v, dtype=np.float64) for v in brutos.values()]),
+        multiplicador=atual["multiplicador_conf"],
+        big_fish=avaliador.elegivel_big_fish(colunas),
+        promove=np.isin(NOMES_TIER, regras.big_fish_promove),
+        tier_referencia=atual["tier"],
+        ganhou=ganhou,
+        indice=tabela.index,
+    )
+
+
+# =============================================================================
+# ESPACO DE BUSCA
+# =============================================================================
+def _validar_parametro(nome: str, pilares: Sequence[str]) -> None:
+    tipo, _, alvo = nome.partition(".")
+    validos = {"teto": pilares, "peso": pilares, "tier": NOMES_TIER[1:]}
+    if tipo not in validos or alvo not in validos[tipo]:
+        raise ValueError(
+            f"Parametro '{nome}' invalido (use teto.<pilar>, peso.<pilar> ou tier.<TIER>; "
+            f"pilares: {', '.join(pilares)}; tiers: {', '.join(NOMES_TIER[1:])})"
+        )
+
+
+def valores_atuais(regras: RegrasSAS, parametros: Sequence[str]) -> np.ndarray:
+    """Configuracao equivalente as regras atuais, na ordem de `parametros`."""
+    valores = []
+    for nome in parametros:
+        tipo, _, alvo = nome.partition(".")
+        if tipo == "teto":
+            valores.append(regras.tetos.get(alvo, np.inf))
+        elif tipo == "peso":
+            valores.append(1.0)
+        else:
+            valores.append(regras.tiers.get(alvo, np.inf))
+    return np.asarray(valores, dtype=np.float64)
+
+
+@dataclass
+class EspacoCalibracao:
+    """Valores candidatos (grade) ou intervalo [min, max] (amostragem) por parametro."""
+    parametros: Dict[str, List[float]]
+
+    @property
+    def nomes(self) -> List[str]:
+        return list(self.parametros)
+
+    def grade(self) -> np.ndarray:
+        return np.asarray(list(itertools.product(*self.parametros.values())), dtype=np.float64)
+
+    def amostrar(self, total: int, semente: int = 42) -> np.ndarray:
+        """Uniforme em [min, max] de cada parametro; tetos e tiers inteiros, pesos com 2 casas."""
+        rng = np.random.default_rng(semente)
+        colunas = []
+        for nome, valores in self.parametros.items():
+            coluna = rng.uniform(min(valores), max(valores), total)
+            colunas.append(np.round(coluna, 2) if nome.startswith("peso.") else np.round(coluna))
+        return np.column_stack(colunas)
+
+
+def espaco_padrao(regras: RegrasSAS = REGRAS_V2) -> EspacoCalibracao:
+    """Tetos +-30%, pesos 0.5-1.5 e cortes de tier +-100 em torno das regras atuais."""
+    parametros: Dict[str, List[float]] = {}
+    for pilar, teto in regras.tetos.items():
+        parametros[f"teto.{pilar}"] = [round(teto * f) for f in (0.7, 0.85, 1.0, 1.15, 1.3)]
+    for pilar in regras.tetos:
+        parametros[f"peso.{pilar}"] = [0.5, 0.75, 1.0, 1.25, 1.5]
+    for tier, minimo in regras.tiers.items():
+        parametros[f"tier.{tier}"] = [minimo + d for d in (-100, -50, 0, 50, 100)]
+    return EspacoCalibracao(parametros)
+
+
+def _configs_validas(nomes: Sequence[str], configs: np.ndarray, regras: RegrasSAS) -> np.ndarray:
+    """Descarta pesos/tetos negativos e cortes de tier fora de ordem."""
+    configs = np.atleast_2d(np.asarray(configs, dtype=np.float64))
+    ok = np.ones(len(configs), dtype=bool)
+    for d, nome in enumerate(nomes):
+        if not nome.startswith("tier."):
+            ok &= configs[:, d] >= 0
+    cortes = np.column_stack([
+        configs[:, nomes.index(f"tier.{t}")] if f"tier.{t}" in nomes
+        else np.full(len(configs), regras.tiers.get(t, np.inf))
+        for t in NOMES_TIER[1:]
+    ])
+    ok &= np.all(np.diff(cortes, axis=1) >= 0, axis=1)
+    return configs[ok]
+
+
+# =============================================================================
+# NUCLEO VETORIAL
+# =============================================================================
+def _auc(scores: np.ndarray, ganhou: np.ndarray, maximo: int) -> np.ndarray:
+    """
+    AUC (Mann-Whitney, empates valem 1/2) de cada linha de `scores` (K x N
+    inteiros 0..maximo) via histogramas: sem ordenar nada.
+    """
+    k = scores.shape[0]
+    bins = maximo + 1
+    deslocamento = (np.arange(k) * bins)[:, None]
+    ganhos = np.bincount((scores[:, ganhou] + deslocamento).ravel(), minlength=k * bins).reshape(k, bins)
+    perdas = np.bincount((scores[:, ~ganhou] + deslocamento).ravel(), minlength=k * bins).reshape(k, bins)
+    abaixo = np.cumsum(perdas, axis=1) - perdas
+    pares = ganhou.sum() * (~ganhou).sum()
+    if pares == 0:
+        return np.full(k, np.nan)
+    return (ganhos * (abaixo + 0.5 * perdas)).sum(axis=1) / pares
+
+
+def avaliar_configs(
+    base: BaseCalibracao,
+    nomes: Sequence[str],
+    configs: np.ndarray,
+    tier_corte: str = "OURO",
+) -> np.ndarray:
+    """Metricas (K x len(METRICAS)) de um bloco de configuracoes."""
+    configs = np.atleast_2d(configs)
+    k, n = len(configs), base.total
+    tetos = np.tile([base.regras.tetos.get(p, np.inf) for p in base.pilares], (k, 1)).astype(np.float64)
+    pesos = np.ones((k, len(base.pilares)))
+    cortes = np.tile([base.regras.tiers.get(t, np.inf) for t in NOMES_TIER[1:]], (k, 1)).astype(np.float64)
+    for d, nome in enumerate(nomes):
+        tipo, _, alvo = nome.partition(".")
+        if tipo == "tier":
+            cortes[:, NOMES_TIER.index(alvo) - 1] = configs[:, d]
+        else:
+            (tetos if tipo == "teto" else pesos)[:, base.pilares.index(alvo)] = configs[:, d]
+
+    total = np.zeros((k, n))
+    for i in range(len(base.pilares)):
+        total += pesos[:, i, None] * np.minimum(base.brutos[i], tetos[:, i, None])
+    maximo = int(base.regras.score_maximo)
+    score = np.clip(np.trunc(total * base.multiplicador), 0, maximo).astype(np.int64)
+
+    tier = np.zeros((k, n), dtype=np.intp)
+    for j in range(cortes.shape[1]):
+        tier += score >= cortes[:, j, None]
+    tier += base.big_fish & base.promove[tier]
+
+    rotulado = ~np.isnan(base.ganhou)
+    ganhou = base.ganhou[rotulado] == 1
+    tier_rot = tier[:, rotulado]
+    colunas = [(tier == j).sum(axis=1) for j in range(len(NOMES_TIER))]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for j in range(len(NOMES_TIER)):
+            no_tier = tier_rot == j
+            colunas.append((no_tier & ganhou).sum(axis=1) / no_tier.sum(axis=1))
+        acima = tier_rot >= NOMES_TIER.index(tier_corte)
+        colunas.append(_auc(score[:, rotulado], ganhou, maximo))
+        colunas.append((acima == ganhou).mean(axis=1) if rotulado.any() else np.full(k, np.nan))
+    colunas.append(score.mean(axis=1))
+    colunas.append((tier != base.tier_referencia).mean(axis=1))
+    return np.column_stack(colunas)
+
+
+# Estado dos processos worker (a base vai uma vez por processo, nao por bloco)
+_BASE_WORKER: Optional[BaseCalibracao] = None
+
+
+def _iniciar_worker(base: BaseCalibracao) -> None:
+    global _BASE_WORKER
+    _BASE_WORKER = base
+
+
+def _avaliar_no_worker(args) -> np.ndarray:
+    nomes, bloco, tier_corte = args
+    return avaliar_configs(_BASE_WORKER, nomes, bloco, tier_corte)
+
+
+def _avaliar_em_blocos(base: BaseCalibracao, nomes: Sequence[str], configs: np.ndarray,
+                       tier_corte: str, processos: int) -> np.ndarray:
+    por_bloco = max(1, ELEMENTOS_POR_BLOCO // max(1, base.total))
+    blocos = [configs[i:i + por_bloco] for i in range(0, len(configs), por_bloco)]
+    if processos <= 1 or len(blocos) == 1:
+        partes = [avaliar_configs(base, nomes, b, tier_corte) for b in blocos]
+    else:
+        with multiprocessing.Pool(processos, initializer=_iniciar_worker, initargs=(base,)) as pool:
+            partes = pool.map(_avaliar_no_worker, [(list(nomes), b, tier_corte) for b in blocos])
+    return np.vstack(partes) if partes else np.empty((0, len(METRICAS)))
+
+
+# =============================================================================
+# API
+# =============================================================================
+@dataclass
+class ResultadoCalibracao:
+    parametros: List[str]
+    tabela: pd.DataFrame          # uma linha por configuracao: parametros + METRICAS
+    atual: pd.Series              # metricas das regras atuais
+    objetivo: str
+    duracao_segundos: float
+
+    def melhores(self, n: int = 10) -> pd.DataFrame:
+        return self.tabela.sort_values(self.objetivo, ascending=False).head(n)
+
+    def correlacoes(self) -> pd.Series:
+        """Correlacao de cada parametro com o objetivo (sensibilidade global da busca)."""
+        dados = self.tabela[self.parametros + [self.objetivo]]
+        variaveis = [p for p in self.parametros if dados[p].nunique() > 1]
+        return dados[variaveis].corrwith(dados[self.objetivo]).sort_values(key=np.abs, ascending=False)
+
+
+def calibrar(
+    base: BaseCalibracao,
+    espaco: EspacoCalibracao,
+    amostras: Optional[int] = None,
+    processos: int = 1,
+    objetivo: str = "auc",
+    tier_corte: str = "OURO",
+    semente: int = 42,
+) -> ResultadoCalibracao:
+    """Grade completa do espaco (`amostras=None`) ou `amostras` configuracoes aleatorias."""
+    if objetivo not in OBJETIVOS:
+        raise ValueError(f"Objetivo '{objetivo}' invalido (use um de {', '.join(OBJETIVOS)})")
+    nomes = espaco.nomes
+    for nome in nomes:
+        _validar_parametro(nome, base.pilares)
+    bruto = espaco.grade() if amostras is None else espaco.amostrar(amostras, semente)
+    configs = _configs_validas(nomes, bruto, base.regras)
+    if len(configs) < len(bruto):
+        logger.info(f"[CALIBRACAO] {len(bruto) - len(configs)} configuracao(oes) descartada(s) (tiers fora de ordem)")
+
+    inicio = time.perf_counter()
+    metricas = _avaliar_em_blocos(base, nomes, configs, tier_corte, processos)
+    duracao = time.perf_counter() - inicio
+    atual = avaliar_configs(base, nomes, valores_atuais(base.regras, nomes)[None, :], tier_corte)[0]
+    logger.info(f"[CALIBRACAO] {len(configs)} configuracoes em {duracao:.1f}s "
+                f"({len(configs) / max(duracao, 1e-9) * 60:,.0f}/min)")
+    return ResultadoCalibracao(
+        parametros=nomes,
+        tabela=pd.DataFrame(np.hstack([configs, metricas]), columns=nomes + METRICAS),
+        atual=pd.Series(atual, index=METRICAS),
+        objetivo=objetivo,
+        duracao_segundos=duracao,
+    )
+
+
+def sensibilidade(
+    base: BaseCalibracao,
+    espaco: EspacoCalibracao,
+    pontos: int = 9,
+    tier_corte: str = "OURO",
+) -> pd.DataFrame:
+    """
+    Um parametro por vez (demais nos valores atuais), `pontos` valores entre o
+    min e o max do espaco: amplitude da AUC/acuracia e maior fracao da carteira
+    que muda de tier.
+    """
+    nomes = espaco.nomes
+    atual = valores_atuais(base.regras, nomes)
+    linhas = {}
+    for d, nome in enumerate(nomes):
+        _validar_parametro(nome, base.pilares)
+        valores = np.linspace(min(espaco.parametros[nome]), max(espaco.parametros[nome]), pontos)
+        configs = np.tile(atual, (pontos, 1))
+        configs[:, d] = valores
+        configs = _configs_validas(nomes, configs, base.regras)
+        if not len(configs):
+            continue
+        m = pd.DataFrame(avaliar_configs(base, nomes, configs, tier_corte), columns=METRICAS)
+        linhas[nome] = {
+            "min": configs[:, d].min(),
+            "max": configs[:, d].max(),
+            "auc_min": m["auc"].min(),
+            "auc_max": m["auc"].max(),
+            "amplitude_auc": m["auc"].max() - m["auc"].min(),
+            "amplitude_acuracia": m["acuracia"].max() - m["acuracia"].min(),
+            "max_mudaram_tier": m["mudaram_tier"].max(),
+        }
+    return pd.DataFrame.from_dict(linhas, orient="index").sort_values("max_mudaram_tier", ascending=False)
+
+
+def ablacao_pilares(base: BaseCalibracao, tier_corte: str = "OURO") -> pd.DataFrame:
+    """Zera um pilar por vez: quanto da carteira muda de tier e quanto a AUC cai."""
+    nomes = [f"peso.{p}" for p in base.pilares]
+    configs = np.ones((len(nomes) + 1, len(nomes)))
+    configs[np.arange(1, len(nomes) + 1), np.arange(len(nomes))] = 0.0
+    m = pd.DataFrame(avaliar_configs(base, nomes, configs, tier_corte), columns=METRICAS)
+    referencia = m.iloc[0]
+    return pd.DataFrame({
+        "mudaram_tier": m["mudaram_tier"].to_numpy()[1:],
+        "delta_auc": (m["auc"] - referencia["auc"]).to_numpy()[1:],
+        "delta_score_medio": (m["score_medio"] - referencia["score_medio"]).to_numpy()[1:],
+    }, index=pd.Index(base.pilares, name="pilar")).sort_values("mudaram_tier", ascending=False)
+
+
+def para_regras(base: BaseCalibracao, nomes: Sequence[str], config: Sequence[float], nome: str = "") -> RegrasSAS:
+    """
+    RegrasSAS equivalentes a uma configuracao: peso w de um pilar escala seus
+    pontos e seu teto (w * min(x, t) = min(w * x, w * t)); a menos de
+    arredondamento de ponto flutuante no truncamento do score.
+    """
+    regras = base.regras
+    tetos, tiers = dict(regras.tetos), dict(regras.tiers)
+    pesos: Dict[str, float] = {}
+    for parametro, valor in zip(nomes, config):
+        tipo, _, alvo = parametro.partition(".")
+        if tipo == "teto":
+            tetos[alvo] = float(valor)
+        elif tipo == "tier":
+            tiers[alvo] = float(valor)
+        else:
+            pesos[alvo] = float(valor)
+    # round(): o JSON salvo fica legível (195.04, não 195.04000000000002)
+    escala = lambda pilar, x: round(x * pesos.get(pilar, 1.0), 6)
+    tetos = {p: escala(p, t) for p, t in tetos.items()}
+    return replace(
+        regras,
+        nome=nome or f"{regras.nome}-calibrada",
+        tetos=tetos,
+        tiers=tiers,
+        faixas=[replace(f, pontos=[escala(f.pilar, x) for x in f.pontos]) for f in regras.faixas],
+        bonus=[replace(b, pontos=escala(b.pilar, b.pontos)) for b in regras.bonus],
+        escalas=[replace(e, pontos_por_passo=escala(e.pilar, e.pontos_por_passo), maximo=escala(e.pilar, e.maximo))
+                 for e in regras.escalas],
+        verticais={v: escala(regras.pilar_vertical, x) for v, x in regras.verticais.items()},
+        vertical_padrao=escala(regras.pilar_vertical, regras.vertical_padrao),
+    )
+
+
+def ler_resultados(caminho: str) -> pd.Series:
+    """
+    CSV de negocios (cnpj ou empresa + resultado ganho/perdido) -> Series bool
+    indexada pela chave da carteira (CNPJ so digitos, senao nome em minusculas).
+    """
+    with open(caminho, newline="", encoding="utf-8-sig") as f:
+        amostra = f.read(4096)
+        f.seek(0)
+        dialeto = csv.Sniffer().sniff(amostra, delimiters=",;\t")
+        linhas = list(csv.DictReader(f, dialect=dialeto))
+    resultados = {}
+    for linha in linhas:
+        campos = {k.strip().lower(): (v or "").strip() for k, v in linha.items() if k}
+        chave = re.sub(r"\D", "", campos.get("cnpj", "")) or campos.get("empresa", "").lower()
+        desfecho = campos.get("resultado", campos.get("status", "")).lower()
+        if chave and desfecho in _GANHO:
+            resultados[chave] = True
+        elif chave and desfecho in _PERDA:
+            resultados[chave] = False
+    return pd.Series(resultados, dtype=bool)
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+def _faixa_cli(texto: str):
+    nome, _, intervalo = texto.partition("=")
+    valores = [float(x) for x in re.split(r"[:,]", intervalo) if x]
+    if not nome or not valores:
+        raise argparse.ArgumentTypeError(f"Use parametro=min:max ou parametro=v1,v2,... (recebido '{texto}')")
+    return nome.strip(), valores
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from services.carteira_sas import CarteiraSAS, DEFAULT_DB_PATH
+
+    parser = argparse.ArgumentParser(description="Bandeirante Digital — calibração do SAS sobre a carteira")
+    parser.add_argument("--carteira", default=DEFAULT_DB_PATH, help="SQLite da carteira (services/carteira_sas)")
+    parser.add_argument("--resultados", help="CSV de negócios ganhos/perdidos (cnpj|empresa, resultado)")
+    parser.add_argument("--regras", default=None, help="JSON de regras base (padrão: config/sas_regras.json ou v0.2)")
+    parser.add_argument("--faixa", type=_faixa_cli, action="append", default=[],
+                        help="Espaço de busca, ex.: teto.musculo=250:450 ou tier.OURO=600,650,700 (repetível)")
+    parser.add_argument("-n", "--amostras", type=int, default=5000, help="Configurações aleatórias (0 = grade completa)")
+    parser.add_argument("-p", "--processos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--objetivo", default="auc", choices=OBJETIVOS)
+    parser.add_argument("--corte", default="OURO", choices=NOMES_TIER[1:], help="Tier a partir do qual se espera ganho")
+    parser.add_argument("-o", "--saida", help="CSV com todas as configurações avaliadas")
+    parser.add_argument("--salvar-melhor", help="Grava a melhor configuração como JSON de regras")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    regras = carregar_regras_sas(args.regras)
+    carteira = CarteiraSAS(args.carteira)
+    tabela = carteira.tabela()
+    if tabela.empty:
+        parser.error(f"Carteira vazia em {args.carteira}")
+    resultados = ler_resultados(args.resultados) if args.resultados else None
+    base = preparar_base(tabela, regras, resultados)
+    print(f"[CALIBRACAO] {base.total} dossiê(s), {base.rotulados} com desfecho")
+
+    espaco = EspacoCalibracao(dict(args.faixa)) if args.faixa else espaco_padrao(regras)
+    resultado = calibrar(base, espaco, amostras=args.amostras or None, processos=args.processos,
+                         objetivo=args.objetivo, tier_corte=args.corte)
+    total = len(resultado.tabela)
+    print(f"[CALIBRACAO] {total} configurações em {resultado.duracao_segundos:.1f}s "
+          f"({total / max(resultado.duracao_segundos, 1e-9) * 60:,.0f}/min)")
+
+    with pd.option_context("display.width", 200, "display.max_columns", 50):
+        print("\nRegras atuais:\n", resultado.atual.round(3).to_string())
+        print("\nMelhores configurações:\n", resultado.melhores(10).round(3).to_string())
+        print("\nSensibilidade (um parâmetro por vez):\n", sensibilidade(base, espaco).round(3).to_string())
+        print("\nAblação de pilares:\n", ablacao_pilares(base, args.corte).round(3).to_string())
+        if total > 1:
+            print("\nCorrelação parâmetro x objetivo:\n", resultado.correlacoes().round(3).to_string())
+
+    if args.saida:
+        resultado.tabela.to_csv(args.saida, index=False)
+        print(f"\n[CALIBRACAO] Tabela completa em {args.saida}")
+    if args.salvar_melhor and total:
+        melhor = resultado.melhores(1).iloc[0]
+        salvar_regras_sas(para_regras(base, resultado.parametros, melhor[resultado.parametros].to_numpy()),
+                          args.salvar_melhor)
+        print(f"[CALIBRACAO] Melhor configuração salva em {args.salvar_melhor}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
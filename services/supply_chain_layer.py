@@ -1,8 +1,9 @@
 import requests
-import json
 import logging
 from typing import Dict, List
 
+from utils.json_extractor import extrair_json
+
 logger = logging.getLogger(__name__)
 
 class SupplyChainLayer:
@@ -159,9 +160,4 @@ RETORNE JSON:
             return {"biofabricas": [], "total_biofabricas": 0, "status": "erro"}
     
     def _parse_json_response(self, response: str) -> Dict:
-        try:
-            clean = response.replace("```json", "").replace("```", "").strip()
-            return json.loads(clean)
-        except:
-            logger.warning("Falha ao parsear JSON supply chain")
-            return {}
+        return extrair_json(response, origem="[SUPPLY CHAIN]")
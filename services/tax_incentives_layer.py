@@ -4,9 +4,12 @@ Bandeirante Digital v3.0 - Mapeamento de PRODEIC, PRODUZA-MS, SUDENE, Drawback,
 Cruza incentivos encontrados vs multas sofridas.
 """
 import logging
-import re
-import json
-from typing import Dict, List
+from typing import Collection, Dict, List, Optional
+
+from services.execution_profiles import subconsulta_ativa
+from services.prompt_fusion import consulta_fundida
+
+from utils.json_extractor import extrair_json
 
 logger = logging.getLogger(__name__)
 
@@ -20,35 +23,45 @@ class TaxIncentivesLayer:
     def __init__(self, gemini_service):
         self.gemini = gemini_service
 
-    async def mapeamento_completo(self, empresa: str, cnpj: str = "", uf: str = "") -> Dict:
-        """Pipeline completo de incentivos fiscais."""
+    async def mapeamento_completo(self, empresa: str, cnpj: str = "", uf: str = "", subconsultas: Optional[Collection[str]] = None, fundir: bool = False) -> Dict:
+        """
+        Pipeline completo de incentivos fiscais.
+        fundir=True: sub-consultas ativas numa unica consulta multi-secao.
+        """
         logger.info(f"[INCENTIVOS] Iniciando mapeamento fiscal: {empresa} ({uf})")
 
         results = {}
+        if fundir:
+            results.update(await self._mapeamento_fundido(empresa, cnpj, uf, subconsultas))
+            # O que nao veio na resposta fundida roda individualmente
+            subconsultas = [
+                k for k in ("incentivos_estaduais", "incentivos_federais", "sancoes_multas", "creditos_presumidos")
+                if subconsulta_ativa(k, subconsultas) and k not in results
+            ]
 
         try:
-            estaduais = await self._incentivos_estaduais(empresa, cnpj, uf)
+            estaduais = await self._incentivos_estaduais(empresa, cnpj, uf) if subconsulta_ativa("incentivos_estaduais", subconsultas) else results.get("incentivos_estaduais", {})
             results["incentivos_estaduais"] = estaduais
         except Exception as e:
             logger.warning(f"[INCENTIVOS] Erro estaduais: {e}")
             results["incentivos_estaduais"] = {}
 
         try:
-            federais = await self._incentivos_federais(empresa, cnpj)
+            federais = await self._incentivos_federais(empresa, cnpj) if subconsulta_ativa("incentivos_federais", subconsultas) else results.get("incentivos_federais", {})
             results["incentivos_federais"] = federais
         except Exception as e:
             logger.warning(f"[INCENTIVOS] Erro federais: {e}")
             results["incentivos_federais"] = {}
 
         try:
-            sancoes = await self._sancoes_multas(empresa, cnpj, uf)
+            sancoes = await self._sancoes_multas(empresa, cnpj, uf) if subconsulta_ativa("sancoes_multas", subconsultas) else results.get("sancoes_multas", {})
             results["sancoes_multas"] = sancoes
         except Exception as e:
             logger.warning(f"[INCENTIVOS] Erro sancoes: {e}")
             results["sancoes_multas"] = {}
 
         try:
-            creditos = await self._creditos_presumidos(empresa, cnpj)
+            creditos = await self._creditos_presumidos(empresa, cnpj) if subconsulta_ativa("creditos_presumidos", subconsultas) else results.get("creditos_presumidos", {})
             results["creditos_presumidos"] = creditos
         except Exception as e:
             logger.warning(f"[INCENTIVOS] Erro creditos: {e}")
@@ -58,8 +71,20 @@ class TaxIncentivesLayer:
         results["analise_fiscal"] = self._analise_consolidada(results)
         return results
 
-    async def _incentivos_estaduais(self, empresa: str, cnpj: str, uf: str) -> Dict:
-        prompt = f"""ATUE COMO: Consultor Tributario Especializado em Agronegocio.
+    async def _mapeamento_fundido(self, empresa: str, cnpj: str, uf: str, subconsultas: Optional[Collection[str]]) -> Dict:
+        secoes = {
+            "incentivos_estaduais": self._prompt_incentivos_estaduais(empresa, cnpj, uf),
+            "incentivos_federais": self._prompt_incentivos_federais(empresa, cnpj),
+            "sancoes_multas": self._prompt_sancoes_multas(empresa, cnpj, uf),
+            "creditos_presumidos": self._prompt_creditos_presumidos(empresa, cnpj),
+        }
+        secoes = {k: p for k, p in secoes.items() if subconsulta_ativa(k, subconsultas)}
+        if len(secoes) < 2:
+            return {}
+        return await consulta_fundida(self.gemini, secoes, self._parse_json, temperature=0.1, tag="[INCENTIVOS]")
+
+    def _prompt_incentivos_estaduais(self, empresa: str, cnpj: str, uf: str) -> str:
+        return f"""ATUE COMO: Consultor Tributario Especializado em Agronegocio.
 ALVO: {empresa} (CNPJ: {cnpj if cnpj else 'N/D'}) - UF: {uf if uf else 'MT/MS/GO'}
 
 BUSQUE INCENTIVOS ESTADUAIS:
@@ -104,6 +129,9 @@ RETORNE JSON:
     "oportunidade_senior": "Motor fiscal automatizado garante zero risco de glosa"
 }}"""
 
+    async def _incentivos_estaduais(self, empresa: str, cnpj: str, uf: str) -> Dict:
+        prompt = self._prompt_incentivos_estaduais(empresa, cnpj, uf)
+
         try:
             response = await self.gemini.call_with_retry(prompt, use_search=True, temperature=0.1)
             return self._parse_json(response)
@@ -111,8 +139,8 @@ RETORNE JSON:
             logger.error(f"[INCENTIVOS ESTADUAIS] Erro: {e}")
             return {}
 
-    async def _incentivos_federais(self, empresa: str, cnpj: str) -> Dict:
-        prompt = f"""ATUE COMO: Consultor Tributario Federal.
+    def _prompt_incentivos_federais(self, empresa: str, cnpj: str) -> str:
+        return f"""ATUE COMO: Consultor Tributario Federal.
 ALVO: {empresa} (CNPJ: {cnpj if cnpj else 'N/D'})
 
 BUSQUE INCENTIVOS FEDERAIS:
@@ -159,6 +187,9 @@ RETORNE JSON:
     "potencial_economia_anual": "R$ 0"
 }}"""
 
+    async def _incentivos_federais(self, empresa: str, cnpj: str) -> Dict:
+        prompt = self._prompt_incentivos_federais(empresa, cnpj)
+
         try:
             response = await self.gemini.call_with_retry(prompt, use_search=True, temperature=0.1)
             return self._parse_json(response)
@@ -166,8 +197,8 @@ RETORNE JSON:
             logger.error(f"[INCENTIVOS FEDERAIS] Erro: {e}")
             return {}
 
-    async def _sancoes_multas(self, empresa: str, cnpj: str, uf: str) -> Dict:
-        prompt = f"""ATUE COMO: Auditor Fiscal.
+    def _prompt_sancoes_multas(self, empresa: str, cnpj: str, uf: str) -> str:
+        return f"""ATUE COMO: Auditor Fiscal.
 ALVO: {empresa} (CNPJ: {cnpj if cnpj else 'N/D'})
 
 BUSQUE SANCOES E MULTAS:
@@ -204,6 +235,9 @@ RETORNE JSON:
     "argumento_venda": "Se encontrou multas por EFD/ICMS: Motor fiscal Senior elimina 100% do risco"
 }}"""
 
+    async def _sancoes_multas(self, empresa: str, cnpj: str, uf: str) -> Dict:
+        prompt = self._prompt_sancoes_multas(empresa, cnpj, uf)
+
         try:
             response = await self.gemini.call_with_retry(prompt, use_search=True, temperature=0.1)
             return self._parse_json(response)
@@ -211,8 +245,8 @@ RETORNE JSON:
             logger.error(f"[SANCOES] Erro: {e}")
             return {}
 
-    async def _creditos_presumidos(self, empresa: str, cnpj: str) -> Dict:
-        prompt = f"""ATUE COMO: Especialista em Creditos Tributarios.
+    def _prompt_creditos_presumidos(self, empresa: str, cnpj: str) -> str:
+        return f"""ATUE COMO: Especialista em Creditos Tributarios.
 ALVO: {empresa}
 
 BUSQUE:
@@ -238,6 +272,9 @@ RETORNE JSON:
     "creditos_pis_cofins_recuperaveis": "R$ 0"
 }}"""
 
+    async def _creditos_presumidos(self, empresa: str, cnpj: str) -> Dict:
+        prompt = self._prompt_creditos_presumidos(empresa, cnpj)
+
         try:
             response = await self.gemini.call_with_retry(prompt, use_search=True, temperature=0.1)
             return self._parse_json(response)
@@ -276,13 +313,4 @@ RETORNE JSON:
         }
 
     def _parse_json(self, response: str) -> Dict:
-        if not response:
-            return {}
-        try:
-            clean = response.replace("```json", "").replace("```", "").strip()
-            match = re.search(r'\{.*\}', clean, re.DOTALL)
-            if match:
-                return json.loads(match.group(0))
-        except Exception:
-            pass
-        return {}
+        return extrair_json(response, origem="[INCENTIVOS]")
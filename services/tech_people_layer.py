@@ -1,9 +1,10 @@
 import requests
-import json
 import logging
 from typing import Dict, List
 import re
 
+from utils.json_extractor import extrair_json
+
 logger = logging.getLogger(__name__)
 
 class TechPeopleLayer:
@@ -254,9 +255,4 @@ RETORNE JSON:
             return {"total_funcionarios_estimado": 0, "status": "erro"}
     
     def _parse_json_response(self, response: str) -> Dict:
-        try:
-            clean = response.replace("```json", "").replace("```", "").strip()
-            return json.loads(clean)
-        except:
-            logger.warning("Falha ao parsear JSON tech/people")
-            return {}
+        return extrair_json(response, origem="[TECH/PEOPLE]")
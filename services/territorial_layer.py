@@ -4,9 +4,11 @@ Bandeirante Digital v3.0 - INCRA, SIGEF, SEMA, EIA/RIMA, CAR.
 Mapeamento fundiario completo com adjacencias e conflitos.
 """
 import logging
-import re
-import json
-from typing import Dict, List
+from typing import Collection, Dict, List, Optional
+
+from services.execution_profiles import subconsulta_ativa
+
+from utils.json_extractor import extrair_json
 
 logger = logging.getLogger(__name__)
 
@@ -20,28 +22,28 @@ class TerritorialLayer:
     def __init__(self, gemini_service):
         self.gemini = gemini_service
 
-    async def mapeamento_territorial_completo(self, empresa: str, cnpj: str = "") -> Dict:
+    async def mapeamento_territorial_completo(self, empresa: str, cnpj: str = "", subconsultas: Optional[Collection[str]] = None) -> Dict:
         """Pipeline completo de inteligencia territorial."""
         logger.info(f"[TERRITORIAL] Iniciando mapeamento fundiario: {empresa}")
 
         results = {}
 
         try:
-            fundiario = await self._busca_fundiaria(empresa, cnpj)
+            fundiario = await self._busca_fundiaria(empresa, cnpj) if subconsulta_ativa("dados_fundiarios", subconsultas) else {}
             results["dados_fundiarios"] = fundiario
         except Exception as e:
             logger.warning(f"[TERRITORIAL] Erro fundiario: {e}")
             results["dados_fundiarios"] = {}
 
         try:
-            ambiental = await self._licencas_ambientais(empresa)
+            ambiental = await self._licencas_ambientais(empresa) if subconsulta_ativa("licencas_ambientais", subconsultas) else {}
             results["licencas_ambientais"] = ambiental
         except Exception as e:
             logger.warning(f"[TERRITORIAL] Erro ambiental: {e}")
             results["licencas_ambientais"] = {}
 
         try:
-            adjacencias = await self._analise_adjacencias(empresa, fundiario)
+            adjacencias = await self._analise_adjacencias(empresa, fundiario) if subconsulta_ativa("adjacencias", subconsultas) else {}
             results["adjacencias"] = adjacencias
         except Exception as e:
             logger.warning(f"[TERRITORIAL] Erro adjacencias: {e}")
@@ -241,13 +243,4 @@ RETORNE JSON:
         }
 
     def _parse_json(self, response: str) -> Dict:
-        if not response:
-            return {}
-        try:
-            clean = response.replace("```json", "").replace("```", "").strip()
-            match = re.search(r'\{.*\}', clean, re.DOTALL)
-            if match:
-                return json.loads(match.group(0))
-        except Exception:
-            pass
-        return {}
+        return extrair_json(response, origem="[TERRITORIAL]")
@@ -0,0 +1,224 @@
+"""
+services/ttl_cache.py — CACHE COM TTL, LRU LIMITADO E PERSISTENCIA OPCIONAL (SQLite)
+Memoria: OrderedDict limitado (LRU). Disco (opcional): SQLite compartilhado entre
+processos (workers, app, lote) — um miss em memoria consulta o disco antes da rede.
+O disco tambem e limitado: vencidos saem e, acima de `max_itens_disco`, saem os
+que expiram primeiro (ao abrir e a cada PODA_A_CADA gravacoes).
+Suporta cache negativo (ex.: CNPJ inexistente) com TTL proprio.
+
+Os valores vao para o disco em pickle (objetos como DadosCNPJ): o arquivo so
+pode ser escrito por processos confiaveis — quem grava nele executa codigo em
+quem le. Nao aponte `db_path` para pasta compartilhada com terceiros.
+"""
+import os
+import time
+import pickle
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DB = os.path.join(".bandeirante", "cache.db")
+PODA_A_CADA = 1000  # gravacoes entre podas do disco (por processo)
+
+
+class _Negativo:
+    """Marcador de 'consultado e nao existe' (distinto de 'nao esta no cache')."""
+    _instancia = None
+
+    def __new__(cls):
+        if cls._instancia is None:
+            cls._instancia = super().__new__(cls)
+        return cls._instancia
+
+    def __repr__(self) -> str:
+        return "NEGATIVO"
+
+    def __reduce__(self):
+        return (_Negativo, ())
+
+
+NEGATIVO = _Negativo()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    namespace TEXT NOT NULL,
+    chave TEXT NOT NULL,
+    valor BLOB NOT NULL,
+    expira_em REAL NOT NULL,
+    PRIMARY KEY (namespace, chave)
+);
+CREATE INDEX IF NOT EXISTS idx_cache_expira ON cache (expira_em);
+"""
+
+
+def _chave(key: Any) -> Hashable:
+    """Chaves simples (str, tupla) passam direto; dict vira tupla ordenada (compat. com a API antiga)."""
+    if isinstance(key, dict):
+        return tuple(sorted(key.items()))
+    return key
+
+
+class TTLCache:
+    """
+    get/set por (namespace, chave). TTL em segundos por entrada.
+    Thread-safe; entre processos, via SQLite (WAL) quando `db_path` e informado.
+    """
+
+    def __init__(self, max_itens: int = 5000, db_path: Optional[str] = None,
+                 max_itens_disco: int = 100_000):
+        self.max_itens = max_itens
+        self.max_itens_disco = max_itens_disco
+        self.db_path = db_path or None
+        self._sets_desde_poda = 0
+        self._memoria: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "hits_disco": 0, "hits_negativos": 0, "misses": 0,
+                       "expirados": 0, "evictions": 0, "sets": 0}
+        if self.db_path:
+            pasta = os.path.dirname(self.db_path)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+            with self._conectar() as conn:
+                conn.executescript(_SCHEMA)
+                self._podar_disco(conn)
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    def get(self, namespace: str, key: Any) -> Optional[Any]:
+        """Valor, `NEGATIVO` (nao existe, ainda valido) ou None (miss/expirado)."""
+        k = (namespace, _chave(key))
+        agora = time.time()
+        with self._lock:
+            item = self._memoria.get(k)
+            if item is not None:
+                expira_em, valor = item
+                if expira_em > agora:
+                    self._memoria.move_to_end(k)
+                    self._contar_hit(valor)
+                    return valor
+                del self._memoria[k]
+                self._stats["expirados"] += 1
+
+        valor, expira_em = self._ler_disco(namespace, k[1], agora)
+        with self._lock:
+            if valor is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits_disco"] += 1
+            self._contar_hit(valor)
+            self._guardar_memoria(k, expira_em, valor)
+        return valor
+
+    def set(self, namespace: str, key: Any, value: Any, ttl: int = 3600) -> None:
+        k = (namespace, _chave(key))
+        expira_em = time.time() + ttl
+        with self._lock:
+            self._stats["sets"] += 1
+            self._guardar_memoria(k, expira_em, value)
+            self._sets_desde_poda += 1
+            podar = self._sets_desde_poda >= PODA_A_CADA
+            if podar:
+                self._sets_desde_poda = 0
+        if self.db_path:
+            try:
+                with self._conectar() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                        (namespace, repr(k[1]), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), expira_em),
+                    )
+                    if podar:
+                        self._podar_disco(conn)
+            except sqlite3.Error as e:  # disco e otimizacao: nunca derruba a consulta
+                logger.warning(f"[CACHE] Falha ao persistir {namespace}: {e}")
+
+    def set_negativo(self, namespace: str, key: Any, ttl: int = 3600) -> None:
+        """Registra que a chave nao existe na origem (evita repetir a consulta ate o TTL)."""
+        self.set(namespace, key, NEGATIVO, ttl)
+
+    def invalidar(self, namespace: str, key: Any) -> None:
+        k = (namespace, _chave(key))
+        with self._lock:
+            self._memoria.pop(k, None)
+        if self.db_path:
+            with self._conectar() as conn:
+                conn.execute("DELETE FROM cache WHERE namespace = ? AND chave = ?", (namespace, repr(k[1])))
+
+    def limpar_expirados(self) -> int:
+        agora = time.time()
+        with self._lock:
+            vencidas = [k for k, (expira_em, _) in self._memoria.items() if expira_em <= agora]
+            for k in vencidas:
+                del self._memoria[k]
+        removidas = len(vencidas)
+        if self.db_path:
+            with self._conectar() as conn:
+                removidas += self._podar_disco(conn)
+        return removidas
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self._stats, itens_memoria=len(self._memoria))
+        consultas = s["hits"] + s["misses"]
+        s["hit_rate"] = round(s["hits"] / consultas, 3) if consultas else 0.0
+        return s
+
+    # ------------------------------------------------------------------
+    def _contar_hit(self, valor: Any) -> None:
+        self._stats["hits"] += 1
+        if valor is NEGATIVO:
+            self._stats["hits_negativos"] += 1
+
+    def _guardar_memoria(self, k, expira_em: float, valor: Any) -> None:
+        self._memoria[k] = (expira_em, valor)
+        self._memoria.move_to_end(k)
+        while len(self._memoria) > self.max_itens:
+            self._memoria.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _podar_disco(self, conn: sqlite3.Connection) -> int:
+        """Remove vencidos e, acima do teto, os que expiram primeiro. Retorna quantos sairam."""
+        removidas = conn.execute("DELETE FROM cache WHERE expira_em <= ?", (time.time(),)).rowcount
+        excesso = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_itens_disco
+        if excesso > 0:
+            removidas += conn.execute(
+                "DELETE FROM cache WHERE rowid IN (SELECT rowid FROM cache ORDER BY expira_em LIMIT ?)",
+                (excesso,),
+            ).rowcount
+        if removidas:
+            logger.info(f"[CACHE] {removidas} entrada(s) removida(s) do disco")
+        return removidas
+
+    def _ler_disco(self, namespace: str, chave: Hashable, agora: float) -> Tuple[Optional[Any], float]:
+        if not self.db_path:
+            return None, 0.0
+        try:
+            with self._conectar() as conn:
+                row = conn.execute(
+                    "SELECT valor, expira_em FROM cache WHERE namespace = ? AND chave = ? AND expira_em > ?",
+                    (namespace, repr(chave), agora),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"[CACHE] Falha ao ler {namespace}: {e}")
+            return None, 0.0
+        if not row:
+            return None, 0.0
+        try:
+            return pickle.loads(row[0]), row[1]
+        except Exception:  # classe mudou entre versoes: trata como miss
+            return None, 0.0
@@ -0,0 +1,60 @@
+"""
+tests/conftest.py — DOSSIÊS ALEATÓRIOS PARA OS TESTES DE PARIDADE DO SAS
+Cobrem os limiares de cada faixa (hectares, capital, funcionários, confiança),
+naturezas jurídicas, razões sociais, CNAEs e culturas que mudam a vertical.
+"""
+import random
+from typing import List
+
+import pytest
+
+from scout_types import (
+    CadeiaValor, DadosCNPJ, DadosFinanceiros, DadosOperacionais, DossieCompleto, Verticalizacao,
+)
+
+_CAMPOS_VERTICALIZACAO = Verticalizacao().all_fields()
+
+
+def dossie_aleatorio(rng: random.Random) -> DossieCompleto:
+    vert = Verticalizacao(**{c: rng.random() < 0.15 for c in _CAMPOS_VERTICALIZACAO})
+    tech_stack = rng.choice([{}, {
+        'dominio_proprio': rng.random() < 0.5,
+        'vagas_ti_abertas': [1] * rng.randint(0, 6),
+        'erp_principal': {'sistema': rng.choice(['SAP', 'N/I', 'Não identificado', '', None])},
+    }])
+    cnpj = rng.choice([None, DadosCNPJ(
+        natureza_juridica=rng.choice(['S.A.', 'Sociedade Anonima Fechada', 'LTDA', 'Cooperativa', 'S/A', '']),
+        razao_social=rng.choice(['', 'Agro Ltda', 'Fulano ME ', 'Familia X', 'Grupo MEIRA']),
+        capital_social=rng.choice([0, 3e7, 6e7, 3e8]),
+        cnae_principal=rng.choice(['', '0112-1/01', '0119-9/01', '1311-1/00', '0115-6/00']),
+        qsa=[{}] * rng.randint(0, 5),
+    )])
+    return DossieCompleto(
+        dados_cnpj=cnpj,
+        dados_operacionais=DadosOperacionais(
+            hectares_total=rng.choice([0, 999, 1000, 5000, 19999, 20000, 70000, rng.randint(0, 200_000)]),
+            culturas=rng.choice([[], ['soja'], ['Algodão'], ['cana'], ['Cana-de-açúcar', 'milho'],
+                                 ['semente de soja'], ['Pluma', 'Sementes']]),
+            verticalizacao=vert,
+            area_irrigada_ha=rng.randint(-100, 9000),
+            tecnologias_identificadas=[1] * rng.randint(0, 3),
+            confianca=rng.choice([0.3, 0.5, 0.6, 0.7, rng.random()]),
+        ),
+        dados_financeiros=DadosFinanceiros(
+            capital_social_estimado=rng.choice([0, 5e6, 2e7, 5e7, 8e7, 2e8, rng.random() * 3e8]),
+            funcionarios_estimados=rng.choice([0, 50, 100, 200, 500, rng.randint(0, 900)]),
+            governanca_corporativa=rng.random() < 0.3,
+            auditorias=rng.choice([[], ['x']]),
+            movimentos_financeiros=rng.choice([[], ['a']]),
+            confianca=rng.choice([0.3, 0.6, rng.random()]),
+        ),
+        cadeia_valor=CadeiaValor(certificacoes=[1] * rng.randint(0, 3),
+                                 confianca=rng.choice([0.3, 0.9, rng.random()])),
+        tech_stack=tech_stack,
+    )
+
+
+@pytest.fixture(scope="session")
+def dossies() -> List[DossieCompleto]:
+    rng = random.Random(1)
+    return [dossie_aleatorio(rng) for _ in range(5_000)]
@@ -0,0 +1,47 @@
+"""Loop persistente (services/async_runtime): executar de código síncrono e de dentro de outro loop."""
+import asyncio
+import threading
+
+import pytest
+
+from services.async_runtime import obter_runtime
+
+
+async def _no_loop_de_fundo(valor):
+    await asyncio.sleep(0)
+    return valor, threading.current_thread().name, id(asyncio.get_running_loop())
+
+
+def test_executar_sincrono_reusa_o_mesmo_loop():
+    runtime = obter_runtime()
+    assert obter_runtime() is runtime
+    valor, thread, loop = runtime.executar(_no_loop_de_fundo(1), timeout=5)
+    assert (valor, thread, loop) == (1, "bandeirante-async", id(runtime.loop))
+    assert runtime.executar(_no_loop_de_fundo(2), timeout=5)[2] == loop
+
+
+def test_executar_de_dentro_de_outro_loop():
+    async def chamador():
+        # ex.: callback sync chamado por código async; bloqueia este loop, não o de fundo
+        return obter_runtime().executar(_no_loop_de_fundo("x"), timeout=5), id(asyncio.get_running_loop())
+
+    (valor, _, loop_fundo), loop_chamador = asyncio.run(chamador())
+    assert valor == "x" and loop_fundo == id(obter_runtime().loop) != loop_chamador
+
+
+def test_executar_no_proprio_loop_e_erro():
+    async def dentro():
+        coro = _no_loop_de_fundo(0)
+        try:
+            obter_runtime().executar(coro)
+        finally:
+            coro.close()
+
+    with pytest.raises(RuntimeError):
+        obter_runtime().executar(dentro(), timeout=5)
+
+
+def test_timeout_cancela():
+    with pytest.raises(TimeoutError):
+        obter_runtime().executar(asyncio.sleep(10), timeout=0.05)
+    assert obter_runtime().executar(_no_loop_de_fundo(3), timeout=5)[0] == 3
@@ -0,0 +1,57 @@
+"""Lote (services/batch_runner): retomada no mesmo modo; outro modo investiga de novo."""
+import asyncio
+import hashlib
+import json
+
+import pytest
+
+from services.batch_runner import BatchRunner, Prospect, ler_prospects
+from services.checkpoint_store import CheckpointStore
+from services.orchestrator import BandeiranteOrchestrator
+
+
+class GeminiFalso:
+    def __init__(self):
+        self.chamadas = 0
+
+    async def call_with_retry(self, prompt, **kwargs):
+        self.chamadas += 1
+        return "{}"
+
+
+@pytest.fixture
+def orch(tmp_path):
+    return BandeiranteOrchestrator(GeminiFalso(), CheckpointStore(str(tmp_path / "cp.db")), regras_gate=[])
+
+
+def _rodar(orch, prospects, saida, modo):
+    antes = orch.gemini.chamadas
+    stats = asyncio.run(BatchRunner(orch, concorrencia=2, modo=modo).executar(prospects, str(saida)))
+    return stats, orch.gemini.chamadas - antes
+
+
+def test_reexecucao_com_outro_modo(tmp_path, orch):
+    csv = tmp_path / "prospects.csv"
+    csv.write_text("empresa;uf\nAgro X;MT\nFazenda Y;GO\n", encoding="utf-8")
+    prospects, saida = ler_prospects(str(csv)), tmp_path / "saida.ndjson"
+
+    stats, chamadas = _rodar(orch, prospects, saida, "rapido")
+    assert stats["ok"] == 2 and chamadas > 0
+    stats, chamadas = _rodar(orch, prospects, saida, "rapido")
+    assert stats["total"] == 0 and chamadas == 0
+
+    stats, chamadas = _rodar(orch, prospects, saida, "completo")
+    assert stats["ok"] == 2 and chamadas > 0
+    registros = [json.loads(linha) for linha in saida.read_text(encoding="utf-8").splitlines()]
+    assert [r["modo"] for r in registros] == ["rapido", "rapido", "completo", "completo"]
+    assert len({r["investigation_id"] for r in registros}) == 4
+    for r in registros[2:]:
+        metricas = r["results"]["metadata"]["metricas_fases"]
+        assert {m["origem"] for m in metricas.values()} == {"executada"}
+
+
+def test_id_do_modo_completo_inalterado():
+    p = Prospect(linha=2, empresa="Agro X ", uf="mt")
+    assert p.investigation_id() == p.investigation_id("Completo") == \
+        "lote-" + hashlib.sha1(b"agro x||MT").hexdigest()[:16]
+    assert p.investigation_id("rápido") == p.investigation_id("rapido") != p.investigation_id()
@@ -0,0 +1,71 @@
+"""Classificador de vertical (utils/classificador_vertical) == varredura anterior de detectar_vertical."""
+import random
+
+from scout_types import (
+    CNAE_ALGODAO, KEYWORDS_ALGODAO, DadosCNPJ, DadosOperacionais, DossieCompleto, Verticalizacao,
+)
+from utils.classificador_vertical import CLASSIFICADOR_VERTICAL, MatcherPalavras, normalizar_texto
+from utils.sas_scoring_v2 import detectar_vertical
+
+
+def _vertical_anterior(dossie: DossieCompleto) -> str:
+    """detectar_vertical antes do classificador (substrings em texto minúsculo, sem tirar acento)."""
+    op, cnpj = dossie.dados_operacionais, dossie.dados_cnpj
+    cnae = cnpj.cnae_principal if cnpj else ""
+    culturas_str = " ".join(op.culturas).lower() if op.culturas else ""
+    if any(cnae.startswith(c) for c in CNAE_ALGODAO) or any(kw in culturas_str for kw in KEYWORDS_ALGODAO) \
+            or op.verticalizacao.algodoeira:
+        return 'Algodão'
+    if op.verticalizacao.usina_acucar_etanol or op.verticalizacao.destilaria \
+            or 'cana' in culturas_str or 'etanol' in culturas_str or 'acucar' in culturas_str:
+        return 'Bioenergia'
+    if (cnae and cnae.startswith('0119')) or op.verticalizacao.sementeira or op.verticalizacao.ubs \
+            or 'semente' in culturas_str:
+        return 'Sementes'
+    return 'Grãos'
+
+
+def test_mesma_vertical_que_a_varredura_anterior(dossies):
+    assert [detectar_vertical(d) for d in dossies] == [_vertical_anterior(d) for d in dossies]
+
+
+def test_lote_igual_ao_individual(dossies):
+    individual = [CLASSIFICADOR_VERTICAL.classificar_dossie(d) for d in dossies]
+    assert CLASSIFICADOR_VERTICAL.classificar_lote(dossies) == individual
+
+
+def test_evidencias_e_acentos():
+    c = CLASSIFICADOR_VERTICAL.classificar('0112-1/01', ['Sementes de ALGODÃO'],
+                                           Verticalizacao(algodoeira=True, ubs=True))
+    assert c.vertical == 'Algodão'
+    assert c.evidencias == {
+        'Algodão': ['cnae:0112-1', 'cultura:algodao', 'verticalizacao:algodoeira'],
+        'Sementes': ['cultura:semente', 'verticalizacao:ubs'],
+    }
+    # sem acento no texto da busca: 'Açúcar' casa com 'acucar' (antes caía em Grãos)
+    assert CLASSIFICADOR_VERTICAL.classificar(culturas=['Açúcar mascavo']).vertical == 'Bioenergia'
+    assert CLASSIFICADOR_VERTICAL.classificar().vertical == 'Grãos'
+    assert CLASSIFICADOR_VERTICAL.classificar().evidencias_vertical == []
+
+
+def test_lote_com_dossies_sem_cnpj_e_sem_culturas():
+    dossies = [DossieCompleto(), DossieCompleto(dados_cnpj=DadosCNPJ(cnae_principal='0119-9/01')),
+               DossieCompleto(dados_operacionais=DadosOperacionais(culturas=['Etanol']))]
+    assert [c.vertical for c in CLASSIFICADOR_VERTICAL.classificar_lote(dossies)] == \
+        ['Grãos', 'Sementes', 'Bioenergia']
+    assert CLASSIFICADOR_VERTICAL.classificar_lote([]) == []
+
+
+def test_matcher_igual_a_substring():
+    rng = random.Random(3)
+    letras = "abcdeéçã \x00"
+    termos = sorted({''.join(rng.choice(letras[:8]) for _ in range(rng.randint(1, 5))) for _ in range(60)})
+    matcher = MatcherPalavras({'x': termos[::2], 'y': termos[1::2]})
+    textos = [''.join(rng.choice(letras) for _ in range(rng.randint(0, 30))) for _ in range(2_000)] + [None]
+    lote = matcher.termos_lote(textos)
+    for texto, achados in zip(textos, lote):
+        normalizado = normalizar_texto(texto)
+        esperado = {normalizar_texto(t) for t in termos if normalizar_texto(t) in normalizado}
+        assert set(achados) == esperado, texto
+        assert matcher.termos(texto) == achados
+    assert MatcherPalavras({}).encontrar("qualquer") == {}
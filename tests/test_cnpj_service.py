@@ -0,0 +1,58 @@
+"""Consulta de CNPJ (services/cnpj_service): cache criado só no primeiro uso; chave do CPF de sócio."""
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+
+import services.cnpj_service as cnpj_service
+from services.ttl_cache import TTLCache
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importar_nao_cria_cache(tmp_path):
+    codigo = ("import os, services.orchestrator, services.cnpj_service as c\n"
+              "assert not os.path.exists('.bandeirante'), os.listdir('.bandeirante')\n"
+              "c.obter_cache().set('cnpj', '1', 'x')\n"
+              "assert c.obter_cache() is c.obter_cache()\n")
+    ambiente = {k: v for k, v in os.environ.items() if not k.startswith("BANDEIRANTE_")}
+    ambiente["PYTHONPATH"] = RAIZ
+    subprocess.run([sys.executable, "-c", codigo], cwd=tmp_path, env=ambiente, check=True)
+    assert os.listdir(tmp_path / ".bandeirante") == ["cache.db"]
+
+
+class GeminiCPF:
+    def __init__(self):
+        self.chamadas = 0
+
+    async def call_with_retry(self, prompt, **kwargs):
+        self.chamadas += 1
+        return f"123456789{self.chamadas:02d}"
+
+
+@pytest.fixture
+def servico(monkeypatch):
+    monkeypatch.setattr(cnpj_service, "_cache", TTLCache(db_path=""))  # só memória
+    return cnpj_service.CNPJService(GeminiCPF())
+
+
+def _qsa(documento=""):
+    return [{"nome": "José da Silva", "qualificacao": "Sócio-Administrador", "documento": documento}]
+
+
+def test_cpf_de_socio_com_documento_vale_para_o_grupo(servico):
+    a = asyncio.run(servico._enriquecer_qsa(_qsa("***123456**"), "Agro X", "11222333000181"))
+    b = asyncio.run(servico._enriquecer_qsa(_qsa("***123456**"), "Agro Y", "44555666000181"))
+    assert a[0]["cpf"] == b[0]["cpf"] == "12345678901"
+    assert servico.gemini.chamadas == 1
+
+
+def test_homonimo_sem_documento_nao_compartilha_cpf(servico):
+    a = asyncio.run(servico._enriquecer_qsa(_qsa(), "Agro X", "11.222.333/0001-81"))
+    filial = asyncio.run(servico._enriquecer_qsa(_qsa(), "Agro X", "11222333000262"))
+    b = asyncio.run(servico._enriquecer_qsa(_qsa(), "Outra Empresa", "44555666000181"))
+    assert a[0]["cpf"] == filial[0]["cpf"] == "12345678901"
+    assert b[0]["cpf"] == "12345678902"
+    assert servico.gemini.chamadas == 2
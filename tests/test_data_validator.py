@@ -0,0 +1,72 @@
+"""Números pt-BR (services/data_validator): separadores, magnitude, moeda, unidade e conversão em lote."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.data_validator import DataValidator, analisar_numero_br
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    # milhar x decimal
+    ("1.234", (1234.0, "", 1.0)),
+    ("1.234.567", (1234567.0, "", 1.0)),
+    ("12.345,67", (12345.67, "", 1.0)),
+    ("2.5", (2.5, "", 1.0)),
+    ("0.500", (0.5, "", 1.0)),
+    ("1,", (1.0, "", 1.0)),
+    # magnitude e moeda
+    ("1,5 mil", (1500.0, "", 1.0)),
+    ("R$ 2,3 milhões", (2.3e6, "BRL", 1.0)),
+    ("US$ 1,2 bilhão", (1.2e9, "USD", 1.0)),
+    # negativo
+    ("-1.234,5", (-1234.5, "", 1.0)),
+    ("- 3,5 mil ha", (-3500.0, "ha", 1.0)),
+    # percentual
+    ("15%", (15.0, "%", 1.0)),
+    ("12,5 %", (12.5, "%", 1.0)),
+    # unidade
+    ("120 alqueires", (120.0, "ha", 4.84)),
+    ("3,5 mil sacas", (3500.0, "t", 0.06)),
+    # vários números: vale o colado a moeda/magnitude/unidade; sem nenhum, o primeiro
+    ("Em 2023 faturou R$ 5 bi com 3 fazendas", (5e9, "BRL", 1.0)),
+    ("Safra 2023: 15 mil ha e 120 alqueires", (15000.0, "ha", 1.0)),
+    ("2 fazendas, 3 silos", (2.0, "", 1.0)),
+    # sem número
+    (",", None),
+    ("", None),
+    ("N/D", None),
+    ("Não encontrado", None),
+])
+def test_analisar_numero_br(texto, esperado):
+    resultado = analisar_numero_br(texto)
+    if esperado is None:
+        assert resultado is None
+    else:
+        assert resultado == pytest.approx(esperado)
+
+
+TEXTOS = ["1.234", ",", "1,5 mil", "R$ 2,3 milhões", "12.345,67", "-1.234,5", "15%", "N/D", None, "1.234"]
+ESPERADOS = [1234.0, -1.0, 1500.0, 2.3e6, 12345.67, -1234.5, 15.0, -1.0, -1.0, 1234.0]
+
+
+@pytest.mark.parametrize("entrada", [TEXTOS, np.array(TEXTOS, dtype=object)])
+def test_to_float_lote_igual_ao_escalar(entrada):
+    saida = DataValidator.to_float_lote(entrada, default=-1.0)
+    assert saida.tolist() == pytest.approx(ESPERADOS)
+    assert saida.tolist() == pytest.approx([DataValidator.to_float(v, -1.0) for v in TEXTOS])
+
+
+def test_to_float_lote_series_mantem_indice_e_nome():
+    serie = pd.Series(["1,5", np.nan, "R$ 2 mil"], index=[5, 6, 7], name="valor")
+    saida = DataValidator.to_float_lote(serie)
+    assert saida.index.tolist() == [5, 6, 7] and saida.name == "valor"
+    assert saida.tolist() == pytest.approx([1.5, 0.0, 2000.0])
+
+
+def test_to_float_lote_numerico_troca_nan_pelo_default():
+    assert DataValidator.to_float_lote([1, 2.5, np.nan], default=-1.0).tolist() == [1.0, 2.5, -1.0]
+
+
+def test_to_float_lote_na_unidade():
+    saida = DataValidator.to_float_lote(["15 mil ha", "R$ 3 mi", "120 alqueires", 10], unidade="ha")
+    assert saida.tolist() == pytest.approx([15000.0, 0.0, 580.8, 10.0])
@@ -0,0 +1,26 @@
+"""Rate limiter do GeminiService: chamadas espaçadas; espera cancelada não gasta slot."""
+import asyncio
+import time
+
+from services.gemini_service import GeminiService
+
+
+def test_espacamento_e_cancelamento():
+    gemini = GeminiService(api_key="teste", requests_per_minute=600)  # slot de 0,1 s
+
+    async def cenario():
+        inicio = time.time()
+        await asyncio.gather(*(gemini._rate_limit() for _ in range(3)))
+        assert time.time() - inicio >= 0.19  # 3 chamadas: 0, 0,1 e 0,2 s
+
+        for _ in range(5):  # orçamento estourado durante a espera
+            try:
+                await asyncio.wait_for(gemini._rate_limit(), timeout=0.01)
+            except asyncio.TimeoutError:
+                pass
+        await asyncio.sleep(0.1)
+        inicio = time.time()
+        await gemini._rate_limit()
+        return time.time() - inicio
+
+    assert asyncio.run(cenario()) < 0.05
@@ -0,0 +1,101 @@
+"""Proxy do Gemini por investigação (services/investigation_context): JSON ok, reparado, truncado e completado, fundido."""
+import asyncio
+import json
+
+import pytest
+
+from services.checkpoint_store import CheckpointStore
+from services.investigation_context import (
+    ContextoInvestigacao, GeminiInvestigacao, ativar_contexto, chave_subconsulta, desativar_contexto, esquema_json,
+)
+from services.prompt_fusion import montar_prompt_fundido
+
+PROMPT = 'Busque processos do alvo.\nRETORNE APENAS JSON:\n{"judicial": {"total": 0}, "score": 0, "fontes": []}'
+PROMPT_SAUDE = 'Busque a saude financeira.\nRETORNE APENAS JSON:\n{"rating": "A/B/C", "protestos": 0}'
+
+
+class GeminiRoteirizado:
+    """Devolve as respostas na ordem; guarda os prompts recebidos."""
+
+    def __init__(self, *respostas):
+        self.respostas, self.prompts = list(respostas), []
+
+    async def call_with_retry(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        resposta = self.respostas.pop(0)
+        if isinstance(resposta, Exception):
+            raise resposta
+        return resposta
+
+
+@pytest.fixture
+def ctx(tmp_path):
+    return ContextoInvestigacao("inv", store=CheckpointStore(str(tmp_path / "cp.db")))
+
+
+def _consultar(ctx, gemini, prompt):
+    async def rodar():
+        token = ativar_contexto(ctx)
+        try:
+            return await GeminiInvestigacao(gemini).call_with_retry(prompt)
+        finally:
+            desativar_contexto(token)
+    return asyncio.run(rodar())
+
+
+def test_esquema_json():
+    assert esquema_json(PROMPT) == (dict, ["judicial", "score", "fontes"])
+    assert esquema_json('Liste em JSON:\n[{"nome": "", "cargo": ""}, {"nome": "", "cargo": ""}]')[0] is list
+    fundido = montar_prompt_fundido({"judicial": PROMPT, "saude_financeira": PROMPT_SAUDE})
+    assert esquema_json(fundido) == (dict, ["judicial", "saude_financeira"])
+
+
+def test_json_ok(ctx):
+    resposta = '{"judicial": {"total": 2}, "score": 7, "fontes": ["a"]}'
+    gemini = GeminiRoteirizado(resposta)
+    assert _consultar(ctx, gemini, PROMPT) == resposta
+    assert (ctx.subconsultas_executadas, ctx.reparos_json, ctx.completacoes_json, ctx.falhas_fase) == (1, 0, 0, 0)
+
+
+def test_json_reparado_fica_para_a_layer(ctx):
+    resposta = "{'judicial': {'total': 2}, 'score': 7, 'fontes': [],}"
+    assert _consultar(ctx, GeminiRoteirizado(resposta), PROMPT) == resposta
+    assert (ctx.subconsultas_executadas, ctx.reparos_json, ctx.completacoes_json) == (1, 1, 0)
+
+
+def test_truncado_completado_so_com_o_que_faltou(ctx):
+    gemini = GeminiRoteirizado('{"judicial": {"total": 2}, "score": 7, "fon', '{"fontes": ["x"]}')
+    resposta = _consultar(ctx, gemini, PROMPT)
+    assert json.loads(resposta) == {"judicial": {"total": 2}, "score": 7, "fontes": ["x"]}
+    assert gemini.prompts[1].endswith("Retorne APENAS um JSON com os campos que faltaram: fontes.")
+    assert (ctx.subconsultas_executadas, ctx.reparos_json, ctx.completacoes_json) == (2, 0, 1)
+    # o checkpoint guarda a resposta completada
+    assert ctx.store.obter_subconsulta("inv", chave_subconsulta(PROMPT, True, 0.2)) == resposta
+
+
+def test_truncado_complemento_falha_segue_com_o_salvo(ctx):
+    truncada = '{"judicial": {"total": 2}, "sco'
+    assert _consultar(ctx, GeminiRoteirizado(truncada, RuntimeError("quota")), PROMPT) == truncada
+    assert (ctx.reparos_json, ctx.completacoes_json, ctx.falhas_fase) == (1, 0, 0)
+
+
+def test_fundido_truncado_completa_as_secoes(ctx):
+    prompt = montar_prompt_fundido({"judicial": PROMPT, "saude_financeira": PROMPT_SAUDE})
+    gemini = GeminiRoteirizado(
+        '{"judicial": {"judicial": {"total": 1}, "score": 3, "fontes": []}, "saude_financeira": {"rat',
+        '{"saude_financeira": {"rating": "B", "protestos": 0}}',
+    )
+    resposta = json.loads(_consultar(ctx, gemini, prompt))
+    assert resposta == {
+        "judicial": {"judicial": {"total": 1}, "score": 3, "fontes": []},
+        "saude_financeira": {"rating": "B", "protestos": 0},
+    }
+    assert "campos que faltaram: saude_financeira." in gemini.prompts[1]
+
+
+def test_fundido_completo_nao_pede_nada(ctx):
+    prompt = montar_prompt_fundido({"judicial": PROMPT, "saude_financeira": PROMPT_SAUDE})
+    resposta = '{"judicial": {"score": 1}, "saude_financeira": {"rating": "A"}}'
+    gemini = GeminiRoteirizado(resposta)
+    assert _consultar(ctx, gemini, prompt) == resposta
+    assert len(gemini.prompts) == 1
@@ -0,0 +1,63 @@
+"""Extração de JSON de respostas de LLM (utils/json_extractor): cercas, prosa, vários blocos, reparo e truncamento."""
+import pytest
+
+from utils.json_extractor import analisar_json, extrair_json, extrair_todos, metricas, reparar_json, resetar_metricas
+
+PROSA = "Segue a análise com base nas fontes consultadas."
+
+
+@pytest.mark.parametrize("texto, esperado, estado", [
+    ('{"a": 1, "b": [1, 2]}', {"a": 1, "b": [1, 2]}, "ok"),
+    (f'{PROSA}\n```json\n{{"a": 1}}\n```\nObs.: fim.', {"a": 1}, "ok"),
+    (f'{PROSA}\n```\n{{"a": "x"}}\n```', {"a": "x"}, "ok"),
+    # prosa com chaves depois do JSON (a regex gulosa juntava tudo e falhava)
+    (f'{PROSA}\n{{"a": 1}}\n\nNota: campos {{vazios}} = não encontrado; valores em {{R$}}.', {"a": 1}, "ok"),
+    ('{"a": "chave { dentro } da string", "b": 2} e depois {x}', {"a": "chave { dentro } da string", "b": 2}, "ok"),
+    # vários blocos: vence o maior
+    ('Exemplo: {"x": 1}. Resposta: {"processos": [1, 2, 3], "total": 3}. Outro: {"y": 2}',
+     {"processos": [1, 2, 3], "total": 3}, "ok"),
+    # defeitos de sintaxe
+    ('{"a": 1, "b": [1, 2,],}', {"a": 1, "b": [1, 2]}, "reparado"),
+    ("{'rating': 'B+', 'ok': True, 'n': None}", {"rating": "B+", "ok": True, "n": None}, "reparado"),
+    ('{nivel: "ALTO", risco: ALTO/MEDIO/BAIXO}', {"nivel": "ALTO", "risco": None}, "reparado"),
+    ('{"a": 1 "b": 2}', {"a": 1, "b": 2}, "reparado"),
+    # truncado no max_output_tokens: campos completos ficam, o cortado sai
+    ('```json\n{"a": 1, "b": {"c": [1, 2], "d": "texto cort', {"a": 1, "b": {"c": [1, 2]}}, "truncado"),
+    ('{"a": 1, "b": {"c', {"a": 1}, "truncado"),
+    ('{"a": 1, "n": 12', {"a": 1}, "truncado"),
+    # nada aproveitável
+    (PROSA, {}, "falha"),
+    ("", {}, "falha"),
+    (None, {}, "falha"),
+])
+def test_analisar_json(texto, esperado, estado):
+    assert analisar_json(texto, dict) == (esperado, estado)
+
+
+def test_tipo_lista():
+    assert analisar_json('Lista: [{"a": 1}, {"a": 2}] fim', list) == ([{"a": 1}, {"a": 2}], "ok")
+    assert analisar_json('{"so": "objeto"}', list) == ([], "falha")
+    assert analisar_json('[1, 2, 3', list) == ([1, 2], "truncado")
+
+
+def test_extrair_todos():
+    assert extrair_todos('a {"x": [1]} b [2, 3] c {"y": 1} {quebrado') == [{"x": [1]}, [2, 3], {"y": 1}]
+
+
+def test_reparar_json_consumidos():
+    texto = 'lixo {"a": 1,} resto'
+    valor, consumidos, truncado = reparar_json(texto, texto.index("{"))
+    assert (valor, truncado) == ({"a": 1}, False)
+    assert texto[texto.index("{"):texto.index("{") + consumidos] == '{"a": 1,}'
+
+
+def test_metricas_de_extrair_json():
+    resetar_metricas()
+    assert extrair_json('{"a": 1}') == {"a": 1}
+    assert extrair_json('{"a": 1,}') == {"a": 1}
+    assert extrair_json('{"a": 1, "b": "cor') == {"a": 1}
+    assert extrair_json("sem json") == {}
+    assert extrair_json("") == {}
+    m = metricas()
+    assert (m["chamadas"], m["validos"], m["reparados"], m["truncados"], m["falhas"]) == (4, 1, 2, 1, 1)
+    assert m["taxa_falha"] == 0.25
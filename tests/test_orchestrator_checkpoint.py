@@ -0,0 +1,57 @@
+"""Retomada por checkpoint (services/orchestrator): só restaura fase com os mesmos inputs, modo e dentro do TTL."""
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from services.checkpoint_store import CheckpointStore
+from services.orchestrator import BandeiranteOrchestrator
+
+
+class GeminiFalso:
+    """Responde JSON vazio e conta as chamadas."""
+
+    def __init__(self):
+        self.chamadas = 0
+
+    async def call_with_retry(self, prompt, **kwargs):
+        self.chamadas += 1
+        return "{}"
+
+
+@pytest.fixture
+def orch(tmp_path):
+    return BandeiranteOrchestrator(GeminiFalso(), CheckpointStore(str(tmp_path / "cp.db")), regras_gate=[])
+
+
+def _investigar(orch, modo, investigation_id="inv-1"):
+    antes = orch.gemini.chamadas
+    results = asyncio.run(orch.investigacao_completa("Agro X", uf="MT", modo=modo,
+                                                     investigation_id=investigation_id))
+    assert "erro" not in results
+    origens = {f: m["origem"] for f, m in results["metadata"]["metricas_fases"].items()}
+    return origens, orch.gemini.chamadas - antes
+
+
+def test_mesmo_modo_restaura_tudo(orch):
+    _, chamadas = _investigar(orch, "rapido")
+    assert chamadas > 0
+    origens, chamadas = _investigar(orch, "rapido")
+    assert chamadas == 0
+    assert set(origens.values()) == {"checkpoint"}
+
+
+def test_outro_modo_refaz_as_fases(orch):
+    _investigar(orch, "rapido")
+    origens, chamadas = _investigar(orch, "completo")
+    assert set(origens.values()) == {"executada"}
+    assert chamadas > 0
+    assert orch.checkpoints.carregar("inv-1")["params"]["modo"] == "completo"
+
+
+def test_checkpoint_vencido_refaz_sem_restaurar_subconsultas(orch):
+    _, chamadas_originais = _investigar(orch, "rapido")
+    orch.ttl_fases = {fase: timedelta(0) for fase in orch.ttl_fases}
+    origens, chamadas = _investigar(orch, "rapido")
+    assert set(origens.values()) == {"executada"}
+    assert chamadas == chamadas_originais
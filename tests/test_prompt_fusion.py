@@ -0,0 +1,51 @@
+"""Fusão de sub-consultas (services/prompt_fusion): falha da fundida coberta pelas individuais não deixa a fase pendente."""
+import asyncio
+
+import pytest
+
+from services.checkpoint_store import CheckpointStore, STATUS_COMPLETO, STATUS_INCOMPLETO
+from services.orchestrator import BandeiranteOrchestrator
+from services.prompt_fusion import montar_prompt_fundido, separar_resposta
+
+
+class GeminiFalso:
+    """A consulta fundida falha (ou vem vazia); as individuais respondem, salvo as de `falham`."""
+
+    def __init__(self, fundida="erro", falham=()):
+        self.fundida, self.falham = fundida, falham
+
+    async def call_with_retry(self, prompt, **kwargs):
+        if "INVESTIGACOES SOBRE O MESMO ALVO" in prompt:
+            if self.fundida == "erro":
+                raise RuntimeError("quota")
+            return self.fundida
+        if any(trecho in prompt for trecho in self.falham):
+            raise RuntimeError("quota")
+        return "{}"
+
+
+def _investigar(tmp_path, gemini):
+    orch = BandeiranteOrchestrator(gemini, CheckpointStore(str(tmp_path / "cp.db")), regras_gate=[])
+    results = asyncio.run(orch.investigacao_completa("Agro X", modo="rapido", investigation_id="inv"))
+    return orch.checkpoints.status("inv"), orch.checkpoints.carregar("inv")["fases"], results
+
+
+@pytest.mark.parametrize("fundida", ["erro", ""])
+def test_fundida_falha_individuais_cobrem(tmp_path, fundida):
+    status, fases, _ = _investigar(tmp_path, GeminiFalso(fundida=fundida))
+    assert status == STATUS_COMPLETO
+    assert {"fase_-1_reputation", "fase_1_incentivos"} <= set(fases)
+
+
+def test_individual_falha_fase_fica_pendente(tmp_path):
+    status, fases, _ = _investigar(tmp_path, GeminiFalso(falham=("Investigador Judicial",)))
+    assert status == STATUS_INCOMPLETO
+    assert "fase_-1_reputation" not in fases and "fase_1_incentivos" in fases
+
+
+def test_separar_resposta():
+    secoes = {"judicial": "p1", "saude_financeira": "p2"}
+    prompt = montar_prompt_fundido(secoes)
+    assert '=== SECAO "judicial" ===' in prompt and '"saude_financeira": {' in prompt
+    assert separar_resposta({"judicial": {"a": 1}, "saude_financeira": "nada"}, secoes) == {"judicial": {"a": 1}}
+    assert separar_resposta([], secoes) == {}
@@ -0,0 +1,55 @@
+"""Índice offline da Receita (services/receita_index): carga com arquivo reenviado não duplica nada."""
+import pytest
+
+from services.receita_index import ReceitaIndex, ingerir
+
+
+def _estabelecimento(basico, uf="MT", fantasia="FAZENDA"):
+    r = [""] * 28
+    r[:6] = [basico, "0001", "81", "1", fantasia, "02"]
+    r[10], r[11], r[19], r[20] = "20100101", "0115600", uf, "9067"
+    return r
+
+
+def _escrever(caminho, linhas):
+    caminho.write_text("\n".join(";".join(f'"{c}"' for c in r) for r in linhas) + "\n", encoding="latin-1")
+
+
+@pytest.fixture
+def dumps(tmp_path):
+    pasta = tmp_path / "dump"
+    pasta.mkdir()
+    empresas = [["11222333", "AGRO X LTDA", "2062", "49", "1000000,00", "05", ""],
+                ["44555666", "GRAOS Y SA", "2054", "49", "5000,00", "01", ""]]
+    estabelecimentos = [_estabelecimento("11222333"), _estabelecimento("44555666", uf="GO")]
+    socios = [["11222333", "2", "FULANO DE TAL", "***123456**", "49", "20100101"],
+              ["11222333", "2", "BELTRANO", "***654321**", "22", "20120101"],
+              ["44555666", "2", "FULANO DE TAL", "***123456**", "49", "20150101"]]
+    _escrever(pasta / "Empresas0.csv", empresas)
+    _escrever(pasta / "Estabelecimentos0.csv", estabelecimentos)
+    _escrever(pasta / "Socios0.csv", socios)
+    # mesmo mês reenviado e um mês seguinte com razão social nova
+    _escrever(pasta / "Empresas1.csv", empresas)
+    _escrever(pasta / "Estabelecimentos1.csv", estabelecimentos)
+    _escrever(pasta / "Socios1.csv", socios)
+    _escrever(pasta / "Empresas2.csv", [["11222333", "AGRO X S.A.", "2054", "49", "2000000,00", "05", ""]])
+    return pasta
+
+
+def test_ingestao_com_arquivo_duplicado(tmp_path, dumps):
+    db = str(tmp_path / "receita.db")
+    contagem = ingerir(str(dumps), db_path=db)
+    assert contagem == {"empresas": 2, "estabelecimentos": 2, "socios": 3}
+
+    indice = ReceitaIndex(db)
+    dados = indice.consultar("11.222.333/0001-81")
+    assert dados.razao_social == "AGRO X S.A." and dados.capital_social == 2_000_000.0
+    assert sorted(s["nome"] for s in dados.qsa) == ["BELTRANO", "FULANO DE TAL"]
+    assert [s["nome"] for s in indice.consultar("44555666000181").qsa] == ["FULANO DE TAL"]
+    assert indice.consultar("99999999000199") is None
+
+
+def test_filtro_uf(tmp_path, dumps):
+    db = str(tmp_path / "receita.db")
+    assert ingerir(str(dumps), db_path=db, ufs=["mt"])["estabelecimentos"] == 1
+    assert ReceitaIndex(db).consultar("44555666000181") is None
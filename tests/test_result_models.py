@@ -0,0 +1,56 @@
+"""Ida e volta dict -> modelo -> dict (services/result_models): só as chaves presentes, nada descartado."""
+import json
+
+import pytest
+
+from services.result_models import MatrizPriorizacao, ResultadoInvestigacao, ResultadoSocietario
+
+
+@pytest.mark.parametrize("dados", [
+    {},
+    {"metadata": {"empresa": "Agro X", "uf": "MT"}},
+    {"matriz_priorizacao": {"score_final": 90, "status": "STRIKE"}, "erro_fase": "timeout"},
+    # fase pulada pelo perfil não aparece; a que rodou volta só com o que veio
+    {"fases": {"fase_4_societario": {"risco_societario": "VERDE"}}},
+    {"fases": {"fase_3_logistica": {"armazenagem": {"unidades_armazenagem": [
+        {"nome": "Armazem 1", "capacidade_toneladas": 50000, "status_conab": "Registrado"}]}}}},
+    {"recomendacoes": {"proximos_passos": ["1. Contatar", "2. Agendar call"], "score": 70}},
+])
+def test_ida_e_volta_preserva_o_dict(dados):
+    assert ResultadoInvestigacao.from_dict(dados).to_dict() == dados
+    assert json.loads(ResultadoInvestigacao.from_json(json.dumps(dados)).to_json()) == dados
+
+
+@pytest.mark.parametrize("dados", [
+    # texto onde se esperava objeto
+    {"estrutura": {"grupo_economico": "nao sei"}},
+    {"estrutura": "Não encontrado"},
+    # None / texto em campo Dict
+    {"holdings": None, "grupo_local": "N/D"},
+    # lista com itens que não são objeto
+    {"estrutura": {"socios_principais": ["Fulano", {"nome": "Beltrano"}]}},
+    {"estrutura": {"grupo_economico": {"empresas_relacionadas": "várias"}}},
+])
+def test_valor_inconversivel_vai_para_extras(dados):
+    assert ResultadoSocietario.from_dict(dados).to_dict() == dados
+
+
+def test_inconversivel_fica_com_o_padrao_no_atributo():
+    modelo = ResultadoSocietario.from_dict({"estrutura": {"grupo_economico": "nao sei", "cnpj_matriz": "123"}})
+    assert modelo.estrutura.cnpj_matriz == "123"
+    assert modelo.estrutura.grupo_economico.total_empresas_grupo == 0
+    assert modelo.estrutura.extras == {"grupo_economico": "nao sei"}
+
+
+def test_listas_de_modelos_convertem_os_itens():
+    inv = ResultadoInvestigacao.from_dict({"fases": {"fase_3_logistica": {"armazenagem": {
+        "unidades_armazenagem": [{"nome": "A", "capacidade_toneladas": "50000"}]}}}})
+    unidade = inv.fases.logistica.armazenagem.unidades_armazenagem[0]
+    assert (unidade.nome, unidade.capacidade_toneladas) == ("A", 50000)
+
+
+def test_modelo_montado_em_codigo_emite_todos_os_campos():
+    saida = MatrizPriorizacao(score_final=80, status="QUENTE").to_dict()
+    assert saida["score_final"] == 80
+    assert set(saida) == {"score_final", "status", "classificacao", "area_total_ha", "total_incentivos"}
+    assert ResultadoInvestigacao().to_dict()["fases"] == {}
@@ -0,0 +1,29 @@
+"""Lote vetorial (utils/sas_batch) == calcular_sas_v2 dossiê a dossiê."""
+import pandas as pd
+
+from utils.sas_batch import COLUNAS_FEATURES, calcular_sas_lote, features_dossie, tabela_features
+from utils.sas_scoring_v2 import calcular_sas_v2
+
+
+def test_lote_igual_ao_escalar(dossies):
+    lote = calcular_sas_lote(tabela_features(dossies))
+    for i, (dossie, linha) in enumerate(zip(dossies, lote.itertuples())):
+        r = calcular_sas_v2(dossie)
+        b = r.breakdown
+        esperado = (r.score, r.tier.name, b.musculo, b.complexidade, b.gente, b.momento, r.dados_inferidos)
+        obtido = (linha.score, linha.tier, linha.musculo, linha.complexidade, linha.gente, linha.momento,
+                  linha.dados_inferidos)
+        assert obtido == esperado, f"dossiê {i}"
+
+
+def test_lote_aceita_dict_de_arrays(dossies):
+    tabela = tabela_features(dossies[:200])
+    colunas = {c: tabela[c].to_numpy() for c in COLUNAS_FEATURES}
+    pd.testing.assert_series_equal(calcular_sas_lote(colunas)['score'], calcular_sas_lote(tabela)['score'])
+
+
+def test_tabela_features_igual_a_features_dossie(dossies):
+    tabela = tabela_features(dossies[:200], com_evidencias=True)
+    assert list(tabela.columns) == list(COLUNAS_FEATURES) + ['evidencias_vertical']
+    for dossie, linha in zip(dossies, tabela.to_dict('records')):
+        assert {c: linha[c] for c in COLUNAS_FEATURES} == features_dossie(dossie)
@@ -0,0 +1,83 @@
+"""Calibração (services/sas_calibracao): núcleo K x N == avaliador compilado; AUC; paralelo == sequencial."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import services.sas_calibracao as calibracao
+from services.sas_calibracao import (
+    METRICAS, NOMES_TIER, EspacoCalibracao, avaliar_configs, calibrar, espaco_padrao, ler_resultados,
+    para_regras, preparar_base, valores_atuais,
+)
+from utils.sas_batch import tabela_features
+from utils.sas_regras import REGRAS_V2, compilar_regras
+
+
+@pytest.fixture(scope="module")
+def tabela(dossies):
+    return tabela_features(dossies)
+
+
+@pytest.fixture(scope="module")
+def base(tabela):
+    score = compilar_regras(REGRAS_V2).avaliar(tabela)["score"].to_numpy()
+    rng = np.random.default_rng(1)
+    ganhou = rng.random(len(score)) < 1 / (1 + np.exp(-(score - 500) / 80))
+    ganhou = pd.Series(ganhou.astype(np.float64), index=tabela.index)
+    ganhou.iloc[::7] = np.nan  # parte sem desfecho
+    return preparar_base(tabela, REGRAS_V2, ganhou)
+
+
+def _metricas_compiladas(regras, tabela, base):
+    """Tiers, score médio e AUC pelo avaliador escalar-equivalente, sem o núcleo K x N."""
+    resultado = compilar_regras(regras).avaliar(tabela)
+    score = resultado["score"].to_numpy()
+    rotulado = ~np.isnan(base.ganhou)
+    ganhos, perdas = score[rotulado & (base.ganhou == 1)], score[rotulado & (base.ganhou == 0)]
+    pares = ganhos[:, None] - perdas[None, :]
+    auc = ((pares > 0).sum() + 0.5 * (pares == 0).sum()) / pares.size
+    contagem = resultado["tier"].value_counts()
+    return [int(contagem.get(t, 0)) for t in NOMES_TIER], score.mean(), auc
+
+
+def test_configuracao_atual_reproduz_regras(tabela, base):
+    nomes = espaco_padrao().nomes
+    m = pd.Series(avaliar_configs(base, nomes, valores_atuais(REGRAS_V2, nomes)[None, :])[0], index=METRICAS)
+    tiers, score_medio, auc = _metricas_compiladas(REGRAS_V2, tabela, base)
+    assert [int(m[f"n_{t}"]) for t in NOMES_TIER] == tiers
+    assert m["score_medio"] == pytest.approx(score_medio)
+    assert m["auc"] == pytest.approx(auc)
+    assert m["mudaram_tier"] == 0
+
+
+@pytest.mark.parametrize("config", [
+    {"teto.musculo": 300, "tier.OURO": 600, "tier.DIAMANTE": 760},
+    {"peso.gente": 0.5, "peso.momento": 1.5, "teto.complexidade": 200, "tier.PRATA": 400},
+])
+def test_configuracao_igual_a_para_regras(tabela, base, config):
+    nomes, valores = list(config), list(config.values())
+    m = pd.Series(avaliar_configs(base, nomes, np.array([valores]))[0], index=METRICAS)
+    tiers, score_medio, auc = _metricas_compiladas(para_regras(base, nomes, valores), tabela, base)
+    assert [int(m[f"n_{t}"]) for t in NOMES_TIER] == tiers
+    assert m["score_medio"] == pytest.approx(score_medio)
+    assert m["auc"] == pytest.approx(auc)
+
+
+def test_paralelo_igual_a_sequencial(base, monkeypatch):
+    monkeypatch.setattr(calibracao, "ELEMENTOS_POR_BLOCO", 50 * base.total)  # vários blocos
+    espaco = espaco_padrao()
+    sequencial = calibrar(base, espaco, amostras=300, processos=1)
+    paralelo = calibrar(base, espaco, amostras=300, processos=2)
+    pd.testing.assert_frame_equal(sequencial.tabela, paralelo.tabela)
+
+
+def test_grade_descarta_tiers_fora_de_ordem(base):
+    espaco = EspacoCalibracao({"tier.PRATA": [400, 700], "tier.OURO": [650]})
+    resultado = calibrar(base, espaco)
+    assert resultado.tabela[["tier.PRATA", "tier.OURO"]].values.tolist() == [[400, 650]]
+
+
+def test_ler_resultados(tmp_path):
+    caminho = tmp_path / "negocios.csv"
+    caminho.write_text("CNPJ;Empresa;Resultado\n11.222.333/0001-81;;Ganho\n;Fazenda X;perdido\n;Y;talvez\n",
+                       encoding="utf-8")
+    assert ler_resultados(str(caminho)).to_dict() == {"11222333000181": True, "fazenda x": False}
@@ -0,0 +1,67 @@
+"""Regras como dados (utils/sas_regras) == calcular_sas_v2; JSON, what-if e carteira."""
+from dataclasses import replace
+
+import pytest
+
+from scout_types import TIERS_V2
+from services.carteira_sas import CarteiraSAS
+from utils.sas_batch import tabela_features
+from utils.sas_regras import (
+    ColunasSAS, REGRAS_V2, RegrasSAS, carregar_regras_sas, comparar_regras, compilar_regras, salvar_regras_sas,
+)
+from utils.sas_scoring_v2 import calcular_sas_v2
+
+ALTERNATIVA = replace(REGRAS_V2, nome="tiers+50", tiers={k: v + 50 for k, v in TIERS_V2.items()},
+                      tetos={**REGRAS_V2.tetos, "momento": 220})
+
+
+@pytest.fixture(scope="module")
+def tabela(dossies):
+    return tabela_features(dossies)
+
+
+def test_regras_v2_compiladas_iguais_ao_escalar(dossies, tabela):
+    resultado = compilar_regras(REGRAS_V2).avaliar(tabela)
+    esperado = [(r.score, r.tier.name) for r in map(calcular_sas_v2, dossies)]
+    assert list(zip(resultado['score'], resultado['tier'])) == esperado
+
+
+def test_json_ida_e_volta(tmp_path, tabela):
+    caminho = str(tmp_path / "regras.json")
+    salvar_regras_sas(ALTERNATIVA, caminho)
+    carregadas = carregar_regras_sas(caminho)
+    assert carregadas == ALTERNATIVA
+    assert compilar_regras(carregadas).avaliar(tabela).equals(compilar_regras(ALTERNATIVA).avaliar(tabela))
+
+
+def test_from_dict_herda_de_regras_v2():
+    regras = RegrasSAS.from_dict({"nome": "so_tiers", "tiers": {"PRATA": 400, "OURO": 600, "DIAMANTE": 800}})
+    assert regras.faixas == REGRAS_V2.faixas and regras.tetos == REGRAS_V2.tetos
+    with pytest.raises(ValueError):
+        RegrasSAS.from_dict({"tiers": {"PRATA": 700, "OURO": 600}})
+
+
+def test_comparar_regras(tabela):
+    assert comparar_regras(tabela, REGRAS_V2).mudaram == 0
+
+    colunas = ColunasSAS(tabela)
+    compilar_regras(REGRAS_V2).avaliar(colunas)  # aquece o memo de pilares
+    diff = comparar_regras(colunas, ALTERNATIVA)
+    antes = compilar_regras(REGRAS_V2).avaliar(tabela)
+    depois = compilar_regras(ALTERNATIVA).avaliar(tabela)
+    mudou = antes['tier'] != depois['tier']
+    assert diff.mudaram == int(mudou.sum())
+    assert list(diff.mudancas.index) == list(tabela.index[mudou])
+    assert (diff.mudancas['score_alternativa'] == depois['score'][mudou]).all()
+    assert int(diff.transicoes.to_numpy().sum()) == len(tabela)
+
+
+def test_carteira_reavalia_como_o_escalar(tmp_path, dossies):
+    amostra = [replace(d, empresa_alvo=f"Empresa {i}", cnpj="") for i, d in enumerate(dossies[:500])]
+    carteira = CarteiraSAS(str(tmp_path / "carteira.db"))
+    assert carteira.salvar_lote(amostra) == len(amostra) == len(carteira)
+    resultado = carteira.reavaliar()
+    for d in amostra:
+        r = calcular_sas_v2(d)
+        linha = resultado.loc[d.empresa_alvo.lower()]
+        assert (linha['score'], linha['tier']) == (r.score, r.tier.name)
@@ -0,0 +1,99 @@
+"""Verticalizacao em bitset (scout_types): mesma API do antigo dataclass de booleanos."""
+import copy
+import dataclasses
+import pickle
+
+import numpy as np
+import pytest
+
+from scout_types import DadosOperacionais, Verticalizacao
+
+CAMPOS = Verticalizacao().all_fields()
+
+
+def test_campos_na_ordem_do_dataclass():
+    assert len(CAMPOS) == 48
+    assert CAMPOS[:6] == ['silos', 'armazens_gerais', 'terminal_portuario', 'ferrovia_propria',
+                          'frota_propria', 'algodoeira']
+    assert CAMPOS[-3:] == ['estacoes_meteorologicas', 'telemetria_frota', 'erp_implantado']
+    assert [f.name for f in dataclasses.fields(Verticalizacao)] == CAMPOS
+
+
+def test_construcao_posicional_e_por_nome():
+    v = Verticalizacao(True, False, True)
+    assert v.silos and not v.armazens_gerais and v.terminal_portuario
+    assert v == Verticalizacao(silos=True, terminal_portuario=True)
+    assert Verticalizacao(*[True] * 48).count() == 48
+    with pytest.raises(TypeError):
+        Verticalizacao(*[False] * 49)
+    with pytest.raises(TypeError):
+        Verticalizacao(inexistente=True)
+
+
+def test_leitura_e_atribuicao():
+    v = Verticalizacao()
+    assert Verticalizacao.silos is False
+    v.erp_implantado = 1
+    assert v.erp_implantado is True
+    v.erp_implantado = False
+    assert v == Verticalizacao()
+
+
+def test_listar_ativos_na_ordem_dos_campos():
+    v = Verticalizacao(erp_implantado=True, ubs=True, silos=True)
+    assert v.listar_ativos() == ['🏗️ Silos', '🌱 UBS', '💻 ERP']
+    assert v.campos_ativos() == ['silos', 'ubs', 'erp_implantado']
+    assert v.count() == len(v) == 3
+    assert Verticalizacao().listar_ativos() == []
+
+
+def test_igualdade_e_hash_como_dataclass_mutavel():
+    assert Verticalizacao(silos=True) == Verticalizacao(silos=True)
+    assert Verticalizacao(silos=True) != Verticalizacao(ubs=True)
+    assert Verticalizacao() != "silos"
+    with pytest.raises(TypeError):
+        hash(Verticalizacao())
+    assert bool(Verticalizacao())
+
+
+def test_operacoes_de_conjunto():
+    a, b = Verticalizacao(silos=True, ubs=True), Verticalizacao(ubs=True, secador=True)
+    assert (a | b).campos_ativos() == ['silos', 'ubs', 'secador']
+    assert (a & b).campos_ativos() == ['ubs']
+    assert (a - b).campos_ativos() == ['silos']
+    assert (a ^ b).campos_ativos() == ['silos', 'secador']
+    assert 'ubs' in a and 'secador' not in a
+    assert a.bits & Verticalizacao.mascara('ubs', 'secador') == Verticalizacao.mascara('ubs')
+    assert Verticalizacao.from_bits(a.bits) == a
+
+
+def test_matriz_e_de_matriz():
+    itens = [Verticalizacao(), Verticalizacao(silos=True, erp_implantado=True), Verticalizacao(*[True] * 48)]
+    matriz = Verticalizacao.matriz(itens)
+    assert matriz.shape == (3, 48) and matriz.dtype == np.bool_
+    assert matriz[1].nonzero()[0].tolist() == [0, 47]
+    assert Verticalizacao.de_matriz(matriz) == itens
+
+
+@pytest.mark.parametrize("protocolo", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle(protocolo):
+    v = Verticalizacao(silos=True, erp_implantado=True)
+    assert pickle.loads(pickle.dumps(v, protocolo)) == v
+
+
+def test_copias_sao_independentes():
+    v = Verticalizacao(silos=True)
+    for copia in (copy.copy(v), copy.deepcopy(v), dataclasses.replace(v)):
+        copia.ubs = True
+        assert copia == Verticalizacao(silos=True, ubs=True)
+    assert v == Verticalizacao(silos=True)
+
+
+def test_chamadores_de_dataclasses():
+    v = Verticalizacao(silos=True, ubs=True)
+    assert dataclasses.is_dataclass(v)
+    assert dataclasses.asdict(v) == v.to_dict()
+    assert dataclasses.astuple(v) == tuple(v.to_dict().values())
+    assert dataclasses.replace(v, ubs=False, secador=True) == Verticalizacao(silos=True, secador=True)
+    op = dataclasses.asdict(DadosOperacionais(verticalizacao=v))
+    assert op['verticalizacao']['silos'] is True and op['verticalizacao']['secador'] is False
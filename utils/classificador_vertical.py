@@ -0,0 +1,214 @@
+"""
+utils/classificador_vertical.py — DETECÇÃO DE VERTICAL PRÉ-COMPILADA
+Palavras-chave de todas as verticais numa única regex (alternância) sobre texto
+minúsculo e sem acento, mais prefixos de CNAE e bits de verticalização.
+Devolve a vertical e as evidências que a decidiram, para um dossiê ou para a
+carteira inteira de uma vez (culturas normalizadas numa passada só).
+
+    classificacao = CLASSIFICADOR_VERTICAL.classificar_dossie(dossie)
+    classificacao.vertical             # 'Algodão'
+    classificacao.evidencias_vertical  # ['cultura:algodao', 'verticalizacao:algodoeira']
+
+`MatcherPalavras` serve a qualquer outra camada que precise de "algum destes
+termos aparece no texto?" por rótulo.
+
+Equivalência com a varredura anterior: tests/test_classificador_vertical.py;
+tempos: benchmarks/classificador_vertical.py.
+"""
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from scout_types import (
+    DossieCompleto, Verticalizacao,
+    CNAE_ALGODAO, KEYWORDS_ALGODAO, KEYWORDS_BIOENERGIA, CNAE_SEMENTES, KEYWORDS_SEMENTES,
+)
+
+_SEPARADOR = "\x00"
+_MARCAS_COMBINANTES = re.compile("[\u0300-\u036f]")
+
+
+def normalizar_texto(texto: Optional[str]) -> str:
+    """Minúsculas sem acento (NFKD sem marcas combinantes): 'Açúcar' -> 'acucar'."""
+    texto = (texto or "").lower()
+    if texto.isascii():
+        return texto
+    return _MARCAS_COMBINANTES.sub("", unicodedata.normalize("NFKD", texto))
+
+
+def _regex_trie(termos: Iterable[str]) -> str:
+    """
+    Alternância fatorada por prefixo comum ('alg(?:odao|...)'): o `re` escolhe
+    o ramo pelo próximo caractere em vez de testar termo a termo, e o `?`
+    guloso no fim de cada termo devolve o mais longo que casa na posição.
+    """
+    trie: Dict[str, dict] = {}
+    for termo in termos:
+        no = trie
+        for c in termo:
+            no = no.setdefault(c, {})
+        no[""] = {}
+
+    def montar(no: Dict[str, dict]) -> str:
+        ramos = [re.escape(c) + montar(filho) for c, filho in sorted(no.items()) if c]
+        if not ramos:
+            return ""
+        alternativa = ramos[0] if len(ramos) == 1 else "(?:" + "|".join(ramos) + ")"
+        return "(?:" + alternativa + ")?" if "" in no else alternativa
+
+    return montar(trie)
+
+
+class MatcherPalavras:
+    """
+    Listas de termos por rótulo compiladas numa única alternância regex (em
+    trie). Casa por substring (como o `termo in texto` que substitui) e acha
+    termos sobrepostos: o lookahead testa toda posição e os termos que são
+    prefixo do mais longo encontrado ali também contam.
+    """
+
+    def __init__(self, termos: Dict[str, Iterable[str]]):
+        self._rotulo: Dict[str, str] = {}
+        for rotulo, lista in termos.items():
+            for termo in lista:
+                termo = normalizar_texto(termo)
+                if termo:
+                    self._rotulo.setdefault(termo, rotulo)
+        ordenados = sorted(self._rotulo, key=len, reverse=True)
+        # termo mais longo casado numa posição -> ele e os demais termos que são seu prefixo
+        self._cobertos: Dict[str, Tuple[str, ...]] = {
+            t: tuple(p for p in ordenados if t.startswith(p)) for t in ordenados
+        }
+        self._regex = re.compile("(?=(" + _regex_trie(ordenados) + "))") if ordenados else None
+
+    def termos(self, texto: Optional[str]) -> Tuple[str, ...]:
+        """Termos encontrados (normalizados, sem repetição, na ordem do texto)."""
+        if self._regex is None:
+            return ()
+        achados = self._regex.findall(normalizar_texto(texto))
+        if not achados:
+            return ()
+        return tuple(dict.fromkeys(t for longo in achados for t in self._cobertos[longo]))
+
+    def termos_lote(self, textos: Sequence[Optional[str]]) -> List[Tuple[str, ...]]:
+        """`termos` de vários textos, normalizados de uma vez só."""
+        if self._regex is None or not textos:
+            return [() for _ in textos]
+        unido = _SEPARADOR.join(t or "" for t in textos)
+        if unido.count(_SEPARADOR) != len(textos) - 1:
+            unido = _SEPARADOR.join((t or "").replace(_SEPARADOR, " ") for t in textos)
+        # já normalizado: `termos` só repete o lower()/isascii() de cada pedaço
+        return [self.termos(parte) for parte in normalizar_texto(unido).split(_SEPARADOR)]
+
+    def agrupar(self, termos: Iterable[str]) -> Dict[str, List[str]]:
+        """Termos -> {rótulo: termos}."""
+        grupos: Dict[str, List[str]] = {}
+        for termo in termos:
+            grupos.setdefault(self._rotulo[termo], []).append(termo)
+        return grupos
+
+    def encontrar(self, texto: Optional[str]) -> Dict[str, List[str]]:
+        """Rótulo -> termos encontrados no texto."""
+        return self.agrupar(self.termos(texto))
+
+    def encontrar_lote(self, textos: Sequence[Optional[str]]) -> List[Dict[str, List[str]]]:
+        return [self.agrupar(t) for t in self.termos_lote(textos)]
+
+
+@dataclass(frozen=True)
+class RegraVertical:
+    """Sinais de uma vertical: qualquer um basta."""
+    vertical: str
+    cnae: Tuple[str, ...] = ()            # prefixos do CNAE principal
+    palavras: Tuple[str, ...] = ()        # termos nas culturas
+    verticalizacao: Tuple[str, ...] = ()  # campos de Verticalizacao
+
+
+# Em ordem de prioridade (a primeira com evidência vence), como em detectar_vertical
+REGRAS_VERTICAL: Tuple[RegraVertical, ...] = (
+    RegraVertical('Algodão', cnae=CNAE_ALGODAO, palavras=KEYWORDS_ALGODAO,
+                  verticalizacao=('algodoeira',)),
+    RegraVertical('Bioenergia', palavras=KEYWORDS_BIOENERGIA,
+                  verticalizacao=('usina_acucar_etanol', 'destilaria')),
+    RegraVertical('Sementes', cnae=CNAE_SEMENTES, palavras=KEYWORDS_SEMENTES,
+                  verticalizacao=('sementeira', 'ubs')),
+)
+VERTICAL_PADRAO = 'Grãos'
+
+
+@dataclass
+class ClassificacaoVertical:
+    vertical: str
+    # vertical -> evidências ('cnae:0112-1', 'cultura:cana', 'verticalizacao:ubs'),
+    # para toda vertical com algum sinal, em ordem de prioridade
+    evidencias: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def evidencias_vertical(self) -> List[str]:
+        return self.evidencias.get(self.vertical, [])
+
+
+class ClassificadorVertical:
+    """
+    Regras de vertical compiladas uma vez; reutilizável entre chamadas.
+    Combinações já vistas (CNAE, termos, bits relevantes) saem de um cache:
+    a mesma `ClassificacaoVertical` pode voltar para vários dossiês, então
+    trate-a como somente leitura.
+    """
+
+    MAX_CACHE = 50_000
+
+    def __init__(self, regras: Sequence[RegraVertical] = REGRAS_VERTICAL,
+                 padrao: str = VERTICAL_PADRAO):
+        self.regras = tuple(regras)
+        self.padrao = padrao
+        self._matcher = MatcherPalavras({r.vertical: r.palavras for r in self.regras})
+        self._campos = [[(c, Verticalizacao.mascara(c)) for c in r.verticalizacao] for r in self.regras]
+        self._mascara_total = Verticalizacao.mascara(*(c for r in self.regras for c in r.verticalizacao))
+        self._cache: Dict[Tuple[str, Tuple[str, ...], int], ClassificacaoVertical] = {}
+
+    def _combinar(self, cnae: str, termos: Tuple[str, ...], bits: int) -> ClassificacaoVertical:
+        chave = (cnae, termos, bits & self._mascara_total)
+        classificacao = self._cache.get(chave)
+        if classificacao is not None:
+            return classificacao
+        culturas = self._matcher.agrupar(termos)
+        evidencias: Dict[str, List[str]] = {}
+        for regra, campos in zip(self.regras, self._campos):
+            sinais = [f"cnae:{p}" for p in regra.cnae if cnae.startswith(p)] \
+                + [f"cultura:{t}" for t in culturas.get(regra.vertical, ())] \
+                + [f"verticalizacao:{c}" for c, mascara in campos if bits & mascara]
+            if sinais:
+                evidencias[regra.vertical] = sinais
+        classificacao = ClassificacaoVertical(vertical=next(iter(evidencias), self.padrao),
+                                              evidencias=evidencias)
+        if len(self._cache) >= self.MAX_CACHE:
+            self._cache.clear()
+        self._cache[chave] = classificacao
+        return classificacao
+
+    def classificar(self, cnae: Optional[str] = "", culturas: Optional[Iterable[str]] = None,
+                    verticalizacao: Optional[Verticalizacao] = None) -> ClassificacaoVertical:
+        texto = " ".join(culturas) if culturas else ""
+        bits = verticalizacao.bits if verticalizacao is not None else 0
+        return self._combinar(cnae or "", self._matcher.termos(texto), bits)
+
+    @staticmethod
+    def _sinais_dossie(dossie: DossieCompleto) -> Tuple[str, str, int]:
+        op = dossie.dados_operacionais
+        cnae = dossie.dados_cnpj.cnae_principal if dossie.dados_cnpj else ""
+        return cnae or "", " ".join(op.culturas) if op.culturas else "", op.verticalizacao.bits
+
+    def classificar_dossie(self, dossie: DossieCompleto) -> ClassificacaoVertical:
+        cnae, texto, bits = self._sinais_dossie(dossie)
+        return self._combinar(cnae, self._matcher.termos(texto), bits)
+
+    def classificar_lote(self, dossies: Iterable[DossieCompleto]) -> List[ClassificacaoVertical]:
+        """Uma classificação por dossiê; as culturas de todos são normalizadas de uma vez."""
+        sinais = [self._sinais_dossie(d) for d in dossies]
+        termos = self._matcher.termos_lote([texto for _, texto, _ in sinais])
+        return [self._combinar(cnae, t, bits) for (cnae, _, bits), t in zip(sinais, termos)]
+
+
+CLASSIFICADOR_VERTICAL = ClassificadorVertical()
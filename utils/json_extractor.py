@@ -0,0 +1,369 @@
+r"""
+utils/json_extractor.py — EXTRACAO DE JSON DE RESPOSTAS DE LLM
+Um unico parser para todas as layers. Em vez de `re.search(r'\{.*\}', DOTALL)`
+(guloso, backtracking em resposta grande, quebra com prosa contendo chaves depois
+do JSON), faz:
+  1. resposta que ja e JSON puro -> parse direto;
+  2. blocos ```json ... ``` -> parse de cada bloco;
+  3. varredura unica: em cada '{' de nivel zero o decoder consome o bloco inteiro
+     (raw_decode, em C); bloco invalido e pulado pela contagem de chaves/colchetes
+     (respeitando strings). Vence o maior JSON valido do tipo pedido.
+Sem bloco valido, o estagio de REPARO conserta defeitos comuns do Gemini
+(virgula sobrando, aspas simples, placeholder `ALTO/MEDIO/BAIXO` ecoado do schema)
+e fecha JSON truncado por max_output_tokens, salvando os campos completos.
+`analisar_json` devolve tambem o estado ("ok", "reparado", "truncado", "falha")
+para quem quiser pedir so os campos que faltaram.
+Usa orjson quando instalado. Falhas sao contadas e logadas com a origem.
+
+Casos cobertos: tests/test_json_extractor.py; tempos: benchmarks/json_extractor.py.
+"""
+import re
+import json
+import logging
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+    _loads = orjson.loads
+    BACKEND = "orjson"
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+    _loads = json.loads
+    BACKEND = "json"
+
+logger = logging.getLogger(__name__)
+
+_DECODER = json.JSONDecoder()
+_ESTRUTURAIS = re.compile(r'[{}\[\]"\\]')
+_FECHA = {"{": "}", "[": "]"}
+
+_metricas = {"chamadas": 0, "validos": 0, "reparados": 0, "truncados": 0, "falhas": 0, "caracteres": 0}
+_metricas_lock = threading.Lock()
+
+
+def _contar(chave: str, caracteres: int = 0) -> None:
+    with _metricas_lock:
+        _metricas[chave] += 1
+        _metricas["caracteres"] += caracteres
+
+
+def metricas() -> Dict[str, Any]:
+    """Contadores do processo: como cada resposta foi resolvida e quantas falharam."""
+    with _metricas_lock:
+        m = dict(_metricas)
+    m["taxa_falha"] = round(m["falhas"] / m["chamadas"], 3) if m["chamadas"] else 0.0
+    m["backend"] = BACKEND
+    return m
+
+
+def resetar_metricas() -> None:
+    with _metricas_lock:
+        for chave in _metricas:
+            _metricas[chave] = 0
+
+
+def _tentar(texto: str) -> Tuple[bool, Any]:
+    try:
+        return True, _loads(texto)
+    except (ValueError, TypeError):
+        return False, None
+
+
+def _fim_bloco(texto: str, inicio: int) -> Optional[int]:
+    """
+    Fim (exclusivo) do objeto/array que abre em `inicio`, contando chaves e
+    colchetes fora de strings. None se o bloco nao fecha (resposta truncada).
+    """
+    pilha: List[str] = []
+    em_string = False
+    ignorar_ate = -1
+    for m in _ESTRUTURAIS.finditer(texto, inicio):
+        pos = m.start()
+        if pos <= ignorar_ate:
+            continue
+        c = m.group()
+        if em_string:
+            if c == "\\":
+                ignorar_ate = pos + 1  # caractere escapado (inclusive \")
+            elif c == '"':
+                em_string = False
+        elif c == '"':
+            em_string = True
+        elif c in _FECHA:
+            pilha.append(_FECHA[c])
+        elif c in "}]":
+            if not pilha or c != pilha[-1]:
+                return None
+            pilha.pop()
+            if not pilha:
+                return pos + 1
+    return None
+
+
+def _candidatos(texto: str, abre: str, invalidos: Optional[List[int]] = None) -> Iterator[Tuple[int, int, Any]]:
+    """
+    (inicio, fim, valor) de cada JSON de nivel zero que comeca com `abre`, numa
+    passada: o decoder em C consome o bloco inteiro; bloco invalido e pulado pela
+    contagem de chaves (prosa como "{vazios}" nao gera retentativas aninhadas).
+    Posicoes dos blocos invalidos/truncados vao para `invalidos` (candidatos a reparo).
+    """
+    pos = texto.find(abre)
+    while pos != -1:
+        try:
+            valor, fim = _DECODER.raw_decode(texto, pos)
+        except ValueError:
+            fim_bloco = _fim_bloco(texto, pos)
+            if invalidos is not None:
+                invalidos.append(pos)
+            if fim_bloco is None:  # truncado: o resto do texto e este bloco
+                return
+            pos = texto.find(abre, fim_bloco)
+            continue
+        yield pos, fim, valor
+        pos = texto.find(abre, fim)
+
+
+def _cercas(texto: str) -> Iterator[str]:
+    """Conteudo de cada bloco ```...``` (rotulo json opcional)."""
+    ini = texto.find("```")
+    while ini != -1:
+        fim = texto.find("```", ini + 3)
+        if fim == -1:
+            return
+        bloco = texto[ini + 3:fim]
+        if bloco[:4].lower() == "json":
+            bloco = bloco[4:]
+        yield bloco.strip()
+        ini = texto.find("```", fim + 3)
+
+
+def extrair_todos(texto: str) -> List[Any]:
+    """Todos os objetos/arrays JSON validos da resposta, na ordem em que aparecem."""
+    texto = texto or ""
+    encontrados = list(_candidatos(texto, "{")) + list(_candidatos(texto, "["))
+    encontrados.sort(key=lambda c: c[0])
+    valores, fim_anterior = [], -1
+    for ini, fim, valor in encontrados:
+        if ini >= fim_anterior:  # array dentro de objeto ja contado nao entra de novo
+            valores.append(valor)
+            fim_anterior = fim
+    return valores
+
+
+def analisar_json(texto: Optional[str], tipo: type = dict) -> Tuple[Any, str]:
+    """
+    (valor, estado) sem log nem metricas. Estado: "ok", "reparado" (defeitos de
+    sintaxe corrigidos), "truncado" (estrutura fechada localmente; o ultimo campo
+    incompleto foi descartado) ou "falha".
+    """
+    if not texto:
+        return tipo(), "falha"
+    limpo = texto.strip()
+    if limpo[:1] in "{[":
+        ok, valor = _tentar(limpo)
+        if ok and isinstance(valor, tipo):
+            return valor, "ok"
+
+    if "```" in limpo:
+        for bloco in _cercas(limpo):
+            ok, valor = _tentar(bloco)
+            if ok and isinstance(valor, tipo):
+                return valor, "ok"
+
+    abre = "{" if tipo is dict else "["
+    melhor, tamanho, estado = None, -1, "falha"
+    invalidos: List[int] = []
+    for ini, fim, valor in _candidatos(limpo, abre, invalidos):
+        if fim - ini > tamanho and isinstance(valor, tipo):
+            melhor, tamanho, estado = valor, fim - ini, "ok"
+
+    # Bloco quebrado maior que o melhor valido (ou nenhum valido): tenta reparar
+    for pos in invalidos[:5]:
+        reparo = reparar_json(limpo, pos)
+        if reparo is None:
+            continue
+        valor, consumidos, truncado = reparo
+        if isinstance(valor, tipo) and consumidos > tamanho:
+            melhor, tamanho, estado = valor, consumidos, "truncado" if truncado else "reparado"
+    if melhor is None:
+        return tipo(), "falha"
+    return melhor, estado
+
+
+def extrair_json(texto: Optional[str], tipo: type = dict, origem: str = "") -> Any:
+    """
+    JSON do `tipo` pedido (dict ou list) na resposta; {} / [] se nao houver.
+    Varios blocos: vence o maior (o "de verdade"; exemplos na prosa costumam ser pequenos).
+    JSON quase valido (virgula sobrando, aspas simples, truncado no max_output_tokens)
+    e reparado localmente em vez de virar {}.
+    """
+    if not texto:
+        return tipo()
+    _contar("chamadas", len(texto))
+    valor, estado = analisar_json(texto, tipo)
+    if estado == "ok":
+        _contar("validos")
+    elif estado in ("reparado", "truncado"):
+        _contar("reparados")
+        if estado == "truncado":
+            _contar("truncados")
+        logger.info(f"{origem or '[JSON]'} JSON {estado} localmente ({len(texto)} caracteres)")
+    else:
+        _contar("falhas")
+        trecho = re.sub(r"\s+", " ", texto.strip()[:120])
+        logger.warning(f"{origem or '[JSON]'} Falha ao extrair JSON ({len(texto)} caracteres): {trecho}...")
+    return valor
+
+
+# ==============================================================================
+# REPARO: reescreve o bloco token a token (so no caminho de falha)
+# ==============================================================================
+_PALAVRA = re.compile(r"[A-Za-z_\u00C0-\u017F][\w\-./\u00C0-\u017F]*")
+_NUMERO = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_LITERAIS = {"true": "true", "false": "false", "null": "null", "True": "true", "False": "false",
+             "None": "null", "NaN": "null", "Infinity": "null", "undefined": "null"}
+_ASPAS_CURVAS = {"\u201c": '"', "\u201d": '"', "\u2018": "'", "\u2019": "'"}
+
+
+_ESPECIAIS_STRING = re.compile(r'[\\"\'\n\t\u201d]')
+
+
+def _ler_string(texto: str, i: int, aspa: str) -> Tuple[str, int, bool]:
+    """String que abre em texto[i]. Retorna (string em JSON valido, proximo indice, fechou)."""
+    partes = []
+    j, n = i + 1, len(texto)
+    while j < n:
+        m = _ESPECIAIS_STRING.search(texto, j)
+        if m is None:
+            break
+        partes.append(texto[j:m.start()])  # trecho sem nada a converter: copia em bloco
+        j = m.start()
+        c = texto[j]
+        if c == "\\" and j + 1 < n:
+            partes.append("'" if texto[j + 1] == "'" else texto[j:j + 2])  # \\' nao existe em JSON
+            j += 2
+            continue
+        if c == aspa or (aspa == '"' and c == "\u201d"):
+            return '"' + "".join(partes) + '"', j + 1, True
+        if c == '"':  # aspas duplas dentro de string com aspas simples
+            partes.append('\\"')
+        elif c in "\n\t":
+            partes.append("\\n" if c == "\n" else "\\t")
+        else:
+            partes.append(c)
+        j += 1
+    return "", n, False
+
+
+def reparar_json(texto: str, inicio: int = 0) -> Optional[Tuple[Any, int, bool]]:
+    """
+    Conserta o objeto/array que abre em `inicio`: virgulas sobrando ou faltando,
+    aspas simples/curvas, chaves sem aspas, literais Python, comentarios e
+    placeholders sem aspas (`true/false`, `ALTO/MEDIO/BAIXO` -> null). Truncado:
+    descarta o ultimo membro incompleto e fecha as estruturas abertas.
+    Retorna (valor, caracteres consumidos, truncado) ou None.
+    """
+    saida: List[str] = []
+    pilha: List[str] = []   # fechamentos pendentes
+    seguro: List[int] = []  # por nivel: len(saida) apos o ultimo membro completo
+    ultimo = ""             # ultimo token: "abre", "chave", ":", "valor", ","
+    i, n = inicio, len(texto)
+
+    def _emitir_valor(token: str, completo: bool = True) -> None:
+        nonlocal ultimo
+        if ultimo == "valor":  # valor colado no anterior ("a": 1 "b": 2): falta a virgula
+            saida.append(",")
+        saida.append(token)
+        ultimo = "valor"
+        if completo:
+            seguro[-1] = len(saida)
+
+    while i < n:
+        c = _ASPAS_CURVAS.get(texto[i], texto[i])
+        if c in " \t\r\n":
+            i += 1
+        elif texto.startswith("//", i):
+            fim = texto.find("\n", i)
+            i = n if fim == -1 else fim
+        elif texto.startswith("/*", i):
+            fim = texto.find("*/", i + 2)
+            i = n if fim == -1 else fim + 2
+        elif c in "{[":
+            if pilha:
+                _emitir_valor(c, completo=False)
+            else:
+                saida.append(c)
+            pilha.append("}" if c == "{" else "]")
+            seguro.append(len(saida))
+            ultimo = "abre"
+            i += 1
+        elif c in "}]":
+            while saida and saida[-1] == ",":  # virgula antes do fechamento
+                saida.pop()
+            saida.append(pilha.pop())
+            seguro.pop()
+            ultimo = "valor"
+            i += 1
+            if not pilha:
+                break
+            seguro[-1] = len(saida)
+        elif c == ",":
+            if ultimo == "valor":
+                saida.append(",")
+                ultimo = ","
+            i += 1
+        elif c == ":":
+            saida.append(":")
+            ultimo = ":"
+            i += 1
+        elif c in "\"'":
+            literal, i, fechou = _ler_string(texto, i, c)
+            if not fechou:
+                break  # cortado dentro da string
+            if pilha[-1] == "}" and ultimo != ":":
+                if ultimo == "valor":
+                    saida.append(",")
+                saida.append(literal)
+                ultimo = "chave"
+            else:
+                _emitir_valor(literal)
+        elif c.isdigit() or (c == "-" and i + 1 < n and texto[i + 1].isdigit()):
+            m = _NUMERO.match(texto, i)
+            if m.end() >= n:
+                break  # numero no fim do texto pode estar cortado
+            _emitir_valor(m.group())
+            i = m.end()
+        elif _PALAVRA.match(texto, i):
+            m = _PALAVRA.match(texto, i)
+            palavra = m.group()
+            if m.end() >= n:
+                break
+            if pilha[-1] == "}" and ultimo != ":" and texto[m.end():m.end() + 20].lstrip().startswith(":"):
+                if ultimo == "valor":
+                    saida.append(",")
+                saida.append(json.dumps(palavra, ensure_ascii=False))  # chave sem aspas
+                ultimo = "chave"
+            elif palavra in _LITERAIS:
+                _emitir_valor(_LITERAIS[palavra])
+            elif "/" in palavra:
+                _emitir_valor("null")  # placeholder do schema ecoado (true/false, ALTO/MEDIO/BAIXO)
+            else:
+                _emitir_valor(json.dumps(palavra, ensure_ascii=False))
+            i = m.end()
+        else:
+            i += 1  # caractere solto (reticencias, "R$" fora de aspas...): ignora
+
+    truncado = bool(pilha)
+    if truncado:
+        del saida[seguro[-1]:]
+        while len(pilha) > 1 and saida[-1] in "{[":  # filho cortado antes do 1o membro: descarta
+            pilha.pop()
+            seguro.pop()
+            del saida[seguro[-1]:]
+        saida.extend(reversed(pilha))
+
+    ok, valor = _tentar("".join(saida))
+    if not ok:
+        return None
+    return valor, i - inicio, truncado
@@ -0,0 +1,137 @@
+"""
+utils/sas_batch.py — SAS 4.0 v0.2 EM LOTE (CARTEIRA)
+Mesma regra de `calcular_sas_v2`, aplicada a uma tabela colunar de features
+(uma linha por dossiê) com operações vetoriais NumPy. Serve para re-pontuar a
+carteira inteira a cada ajuste de calibração sem percorrer os dossiês de novo.
+
+    tabela = tabela_features(dossies)      # extração (1x por carteira)
+    resultado = calcular_sas_lote(tabela)  # score/tier (barato, repetível)
+
+O lote não gera justificativas; para o detalhe de uma empresa use o escalar.
+As regras vêm de utils/sas_regras (REGRAS_V2 = tradução de calcular_sas_v2).
+Equivalência com o escalar: tests/test_sas_batch.py; tempos: benchmarks/sas_batch.py.
+"""
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+from scout_types import DossieCompleto, Verticalizacao
+from utils.classificador_vertical import CLASSIFICADOR_VERTICAL
+from utils.sas_regras import REGRAS_V2, RegrasSAS, compilar_regras
+
+# Grupos de verticalização que pontuam juntos (basta um campo ativo)
+GRUPOS_VERTICALIZACAO: Dict[str, tuple] = {
+    'vert_agroindustria': ('agroindustria', 'usina_acucar_etanol', 'algodoeira', 'esmagadora_soja'),
+    'vert_armazenagem': ('silos', 'armazens_gerais'),
+    'vert_logistica': ('frota_propria', 'ferrovia_propria', 'terminal_portuario'),
+    'vert_energia': ('cogeracao_energia', 'usina_solar', 'biodigestor'),
+    'vert_beneficiamento': ('fabrica_racao', 'torrefacao_cafe', 'fabrica_biodiesel'),
+    'vert_frigorifico': ('frigorifico_bovino', 'frigorifico_aves', 'frigorifico_suinos'),
+    'vert_irrigacao': ('pivos_centrais', 'irrigacao_gotejamento'),
+    'vert_conectividade': ('telemetria_frota', 'estacoes_meteorologicas', 'drones_proprios'),
+}
+_MASCARAS_GRUPO = {grupo: Verticalizacao.mascara(*campos) for grupo, campos in GRUPOS_VERTICALIZACAO.items()}
+
+# Colunas esperadas por `calcular_sas_lote` (e seus tipos)
+COLUNAS_FEATURES: Dict[str, str] = {
+    'capital': 'float64',
+    'hectares': 'float64',
+    'area_irrigada_ha': 'float64',
+    'vertical': 'object',
+    **{grupo: 'bool' for grupo in GRUPOS_VERTICALIZACAO},
+    'funcionarios': 'float64',
+    'sa': 'bool',              # 'S.A.' / 'S/A' na natureza jurídica
+    'sociedade_anonima': 'bool',  # 'SOCIEDADE ANONIMA' (conta só para Gente)
+    'ltda': 'bool',
+    'cooperativa': 'bool',
+    'razao_limpa': 'bool',
+    'razao_mei': 'bool',
+    'governanca': 'bool',
+    'qsa': 'int64',
+    'site_proprio': 'bool',
+    'vagas_ti': 'int64',
+    'erp_identificado': 'bool',
+    'tecnologias': 'int64',
+    'certificacoes': 'int64',
+    'movimentos_financeiros': 'int64',
+    'conf_operacional': 'float64',
+    'conf_financeiro': 'float64',
+    'conf_cadeia': 'float64',
+}
+
+# =============================================================================
+# EXTRAÇÃO DE FEATURES
+# =============================================================================
+def features_dossie(dossie: DossieCompleto, vertical: Optional[str] = None) -> Dict:
+    """
+    Uma linha da tabela: tudo o que `calcular_sas_v2` consulta no dossiê.
+    `vertical` já classificada (em lote) evita classificar de novo.
+    """
+    op = dossie.dados_operacionais
+    fi = dossie.dados_financeiros
+    cnpj_data = dossie.dados_cnpj
+    cv = dossie.cadeia_valor
+    ts = dossie.tech_stack or {}
+    vert = op.verticalizacao
+
+    nat_jur = cnpj_data.natureza_juridica if cnpj_data else ""
+    nat_upper = nat_jur.upper()
+    razao = (cnpj_data.razao_social if cnpj_data else "").lower()
+    erp = ts.get('erp_principal', {}) if ts else {}
+
+    linha = {
+        'capital': fi.capital_social_estimado or (cnpj_data.capital_social if cnpj_data else 0),
+        'hectares': op.hectares_total,
+        'area_irrigada_ha': op.area_irrigada_ha,
+        'vertical': vertical or CLASSIFICADOR_VERTICAL.classificar_dossie(dossie).vertical,
+        'funcionarios': fi.funcionarios_estimados,
+        'sa': 'S.A.' in nat_jur or 'S/A' in nat_jur,
+        'sociedade_anonima': 'SOCIEDADE ANONIMA' in nat_upper,
+        'ltda': 'LTDA' in nat_upper,
+        'cooperativa': 'COOPERATIVA' in nat_upper,
+        'razao_limpa': bool(razao) and not any(x in razao for x in ['familia', 'me ', 'mei', 'produtor rural']),
+        'razao_mei': bool(razao) and any(x in razao for x in ['mei', 'me ']),
+        'governanca': bool(fi.governanca_corporativa or fi.auditorias),
+        'qsa': len(cnpj_data.qsa) if cnpj_data else 0,
+        'site_proprio': bool(ts) and bool(ts.get('dominio_proprio') or ts.get('site_institucional')),
+        'vagas_ti': len(ts.get('vagas_ti_abertas', [])) if ts else 0,
+        'erp_identificado': bool(erp.get('sistema')) and erp['sistema'] not in ['Não identificado', 'N/I'],
+        'tecnologias': len(op.tecnologias_identificadas or []),
+        'certificacoes': len(cv.certificacoes or []),
+        'movimentos_financeiros': len(fi.movimentos_financeiros or []),
+        'conf_operacional': op.confianca,
+        'conf_financeiro': fi.confianca,
+        'conf_cadeia': cv.confianca,
+    }
+    for grupo, mascara in _MASCARAS_GRUPO.items():
+        linha[grupo] = bool(vert.bits & mascara)
+    return linha
+
+
+def tabela_features(dossies: Iterable[DossieCompleto], com_evidencias: bool = False) -> pd.DataFrame:
+    """
+    Tabela colunar (uma linha por dossiê) pronta para `calcular_sas_lote`.
+    Verticais classificadas de uma vez; `com_evidencias` acrescenta a coluna
+    'evidencias_vertical' (texto, fora de COLUNAS_FEATURES).
+    """
+    dossies = list(dossies)
+    classes = CLASSIFICADOR_VERTICAL.classificar_lote(dossies)
+    tabela = pd.DataFrame([features_dossie(d, c.vertical) for d, c in zip(dossies, classes)],
+                          columns=list(COLUNAS_FEATURES))
+    tabela = tabela.astype(COLUNAS_FEATURES)
+    if com_evidencias:
+        tabela['evidencias_vertical'] = ["; ".join(c.evidencias_vertical) for c in classes]
+    return tabela
+
+
+# =============================================================================
+# SCORE VETORIAL
+# =============================================================================
+def calcular_sas_lote(tabela, regras: Optional[RegrasSAS] = None) -> pd.DataFrame:
+    """
+    Score SAS de todas as linhas de uma vez. Aceita DataFrame ou dict de arrays
+    com as `COLUNAS_FEATURES`; devolve DataFrame (mesmo índice) com os pilares,
+    score, tier e flags. Com as regras padrão (REGRAS_V2) é idêntico a
+    `calcular_sas_v2` linha a linha; outra `RegrasSAS` serve para what-if.
+    """
+    return compilar_regras(regras or REGRAS_V2).avaliar(tabela)
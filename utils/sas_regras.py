@@ -0,0 +1,564 @@
+"""
+utils/sas_regras.py — REGRAS SAS COMO DADOS (WHAT-IF DE CALIBRAÇÃO)
+Limiares, pontos, bônus, tetos, tiers e override do SAS descritos em tabelas
+(dataclasses <-> JSON) e compilados num avaliador vetorial. A mesma carteira
+pode ser re-pontuada por qualquer conjunto de regras e os tiers comparados em
+milissegundos, sem mexer em código.
+
+    alternativa = replace(REGRAS_V2, nome="tiers+50", tiers={...})
+    diff = comparar_regras(tabela, alternativa)   # base: REGRAS_V2
+    print(diff.resumo())
+
+Tipos de regra (todas somam no `pilar` indicado; pilar fora de `tetos` não tem teto):
+    FaixaPontos   — cadeia if/elif "feature >= limite" (capital, hectares, ...)
+    BonusPontos   — pontos fixos se todas as condições valem; bônus com o mesmo
+                    `exclusivo` formam um if/elif (vale o primeiro que casar)
+    EscalaPontos  — min(floor(feature / passo) * pontos_por_passo, maximo)
+Arquivo JSON (config/sas_regras.json ou $BANDEIRANTE_SAS_REGRAS): chaves
+ausentes herdam de REGRAS_V2; `salvar_regras_sas(REGRAS_V2, ...)` gera o modelo.
+Equivalência com calcular_sas_v2: tests/test_sas_regras.py; tempos: benchmarks/sas_regras.py.
+"""
+import os
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from scout_types import Tier, VERTICALS_CORE, PESOS_PILARES_V2, TIERS_V2
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGRAS_SAS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "sas_regras.json"
+)
+
+# Ordem dos códigos de tier nos resultados (índice = código)
+TIERS_LOTE: List[Tier] = [Tier.BRONZE, Tier.PRATA, Tier.OURO, Tier.DIAMANTE]
+_CODIGO_TIER = {t.name: i for i, t in enumerate(TIERS_LOTE)}
+
+OPERADORES_SAS = ("verdadeiro", "falso", ">=", ">", "<=", "<", "==", "!=", "em")
+
+
+# =============================================================================
+# REGRAS (DADOS)
+# =============================================================================
+@dataclass
+class Condicao:
+    feature: str
+    operador: str = "verdadeiro"
+    valor: Any = None
+
+    def __post_init__(self):
+        if self.operador not in OPERADORES_SAS:
+            raise ValueError(
+                f"Condição em '{self.feature}': operador '{self.operador}' inválido "
+                f"(use um de {', '.join(OPERADORES_SAS)})"
+            )
+
+
+@dataclass
+class FaixaPontos:
+    pilar: str
+    feature: str
+    limites: List[float]
+    pontos: List[float]          # len(limites) + 1; pontos[0] = abaixo do 1º limite
+    nome: str = ""
+
+    def __post_init__(self):
+        if len(self.pontos) != len(self.limites) + 1:
+            raise ValueError(f"Faixa '{self.nome or self.feature}': pontos deve ter len(limites) + 1 itens")
+        if list(self.limites) != sorted(self.limites):
+            raise ValueError(f"Faixa '{self.nome or self.feature}': limites devem ser crescentes")
+
+
+@dataclass
+class BonusPontos:
+    pilar: str
+    pontos: float
+    se: List[Condicao]
+    exclusivo: str = ""
+    nome: str = ""
+
+
+@dataclass
+class EscalaPontos:
+    pilar: str
+    feature: str
+    passo: float
+    pontos_por_passo: float
+    maximo: float
+    se: List[Condicao] = field(default_factory=list)
+    nome: str = ""
+
+
+@dataclass
+class RegrasSAS:
+    nome: str
+    verticais: Dict[str, float]
+    faixas: List[FaixaPontos]
+    bonus: List[BonusPontos]
+    escalas: List[EscalaPontos]
+    tetos: Dict[str, float]
+    tiers: Dict[str, float]                       # nome do Tier -> score mínimo
+    big_fish: List[Condicao]                      # sobe um degrau se todas valem
+    big_fish_promove: List[str] = field(default_factory=lambda: ["BRONZE", "PRATA"])
+    vertical_padrao: float = 80
+    pilar_vertical: str = "complexidade"
+    confianca: List[str] = field(default_factory=lambda: ["conf_operacional", "conf_financeiro", "conf_cadeia"])
+    confianca_limites: List[float] = field(default_factory=lambda: [0.3, 0.5, 0.7])
+    confianca_fatores: List[float] = field(default_factory=lambda: [0.5, 0.7, 0.9, 1.0])
+    limite_dados_inferidos: float = 0.5
+    score_maximo: float = 1000
+
+    def __post_init__(self):
+        desconhecidos = [t for t in list(self.tiers) + list(self.big_fish_promove) if t not in _CODIGO_TIER]
+        if desconhecidos:
+            raise ValueError(f"Regras SAS '{self.nome}': tier(s) desconhecido(s): {', '.join(desconhecidos)}")
+        minimos = [self.tiers[t.name] for t in TIERS_LOTE[1:] if t.name in self.tiers]
+        if minimos != sorted(minimos):
+            raise ValueError(f"Regras SAS '{self.nome}': score mínimo dos tiers deve crescer de PRATA a DIAMANTE")
+        if len(self.confianca_fatores) != len(self.confianca_limites) + 1:
+            raise ValueError(f"Regras SAS '{self.nome}': confianca_fatores deve ter len(confianca_limites) + 1 itens")
+
+    @property
+    def pilares(self) -> List[str]:
+        """Pilares na ordem: os com teto, depois os demais (ex.: bônus global)."""
+        nomes = list(self.tetos)
+        for regra in [self.pilar_vertical] + [r.pilar for r in self.faixas + self.bonus + self.escalas]:
+            if regra not in nomes:
+                nomes.append(regra)
+        return nomes
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, dados: Dict, base: Optional["RegrasSAS"] = None) -> "RegrasSAS":
+        """Monta as regras do dict (JSON); chaves ausentes vêm de `base` (padrão: REGRAS_V2)."""
+        completo = (base or REGRAS_V2).to_dict()
+        completo.update(dados)
+        condicoes = lambda itens: [Condicao(**c) for c in itens]
+        completo["faixas"] = [FaixaPontos(**f) for f in completo["faixas"]]
+        completo["bonus"] = [BonusPontos(**{**b, "se": condicoes(b["se"])}) for b in completo["bonus"]]
+        completo["escalas"] = [EscalaPontos(**{**e, "se": condicoes(e.get("se", []))}) for e in completo["escalas"]]
+        completo["big_fish"] = condicoes(completo["big_fish"])
+        return cls(**completo)
+
+
+def _se(*termos) -> List[Condicao]:
+    """Atalho: 'flag' -> flag verdadeira; (feature, operador, valor) -> comparação."""
+    return [Condicao(t) if isinstance(t, str) else Condicao(*t) for t in termos]
+
+
+# Tradução fiel de utils.sas_scoring_v2.calcular_sas_v2
+REGRAS_V2 = RegrasSAS(
+    nome="v0.2",
+    verticais=dict(VERTICALS_CORE),
+    faixas=[
+        FaixaPontos("musculo", "capital", [5_000_000, 20_000_000, 80_000_000, 200_000_000],
+                    [0, 50, 110, 160, 200], nome="capital_social"),
+        FaixaPontos("musculo", "hectares", [1_000, 5_000, 20_000, 70_000], [0, 40, 80, 110, 150]),
+        FaixaPontos("gente", "funcionarios", [50, 100, 200, 500], [0, 25, 50, 75, 100]),
+        FaixaPontos("gente", "qsa", [3], [0, 10], nome="qsa_estruturado"),
+        FaixaPontos("momento", "vagas_ti", [1, 4], [0, 20, 40]),
+        FaixaPontos("momento", "tecnologias", [2], [0, 20]),
+        FaixaPontos("momento", "certificacoes", [2], [0, 20]),
+        FaixaPontos("momento", "movimentos_financeiros", [1], [0, 15]),
+    ],
+    bonus=[
+        BonusPontos("complexidade", 70, _se("vert_agroindustria"), nome="agroindustria"),
+        BonusPontos("complexidade", 40, _se("vert_armazenagem"), nome="armazenagem"),
+        BonusPontos("complexidade", 30, _se("vert_logistica"), nome="logistica_propria"),
+        BonusPontos("complexidade", 30, _se("vert_energia"), nome="energia"),
+        BonusPontos("complexidade", 25, _se("vert_beneficiamento"), nome="beneficiamento"),
+        BonusPontos("complexidade", 50, _se("vert_frigorifico"), nome="frigorifico"),
+        BonusPontos("complexidade", 25, _se(("vertical", "==", "Sementes")), nome="sementeiro"),
+        BonusPontos("gente", 40, _se("sa"), exclusivo="natureza_gente", nome="sa"),
+        BonusPontos("gente", 40, _se("sociedade_anonima"), exclusivo="natureza_gente", nome="sociedade_anonima"),
+        BonusPontos("gente", 30, _se("ltda", ("capital", ">=", 20_000_000)),
+                    exclusivo="natureza_gente", nome="ltda_grande"),
+        BonusPontos("gente", 35, _se("cooperativa", ("capital", ">=", 50_000_000)),
+                    exclusivo="natureza_gente", nome="cooperativa_grande"),
+        BonusPontos("gente", 20, _se("razao_limpa"), exclusivo="razao_social", nome="razao_limpa"),
+        BonusPontos("gente", -10, _se("razao_mei"), exclusivo="razao_social", nome="razao_mei"),
+        BonusPontos("gente", 30, _se("governanca"), nome="governanca_auditoria"),
+        BonusPontos("momento", 50, _se("sa"), exclusivo="natureza_momento", nome="sa"),
+        BonusPontos("momento", 20, _se("ltda"), exclusivo="natureza_momento", nome="ltda"),
+        BonusPontos("momento", 15, _se("cooperativa"), exclusivo="natureza_momento", nome="cooperativa"),
+        BonusPontos("momento", 25, _se("site_proprio"), nome="site_proprio"),
+        BonusPontos("momento", 15, _se("erp_identificado"), nome="erp_existente"),
+        BonusPontos("momento", 15, _se("vert_conectividade"), nome="conectividade"),
+        BonusPontos("bonus", 30, _se("sa"), nome="bonus_sa_global"),
+    ],
+    escalas=[
+        EscalaPontos("complexidade", "area_irrigada_ha", 1000, 5, 20, _se("vert_irrigacao"), nome="irrigacao"),
+    ],
+    tetos=dict(PESOS_PILARES_V2),
+    tiers=dict(TIERS_V2),
+    big_fish=_se(("capital", ">=", 50_000_000), ("hectares", ">=", 10_000), ("conf_media", ">=", 0.6)),
+)
+
+
+def carregar_regras_sas(caminho: Optional[str] = None) -> RegrasSAS:
+    """Regras do JSON (merge sobre REGRAS_V2). Sem arquivo, REGRAS_V2."""
+    caminho = caminho or os.environ.get("BANDEIRANTE_SAS_REGRAS") or DEFAULT_REGRAS_SAS_PATH
+    if not os.path.exists(caminho):
+        return REGRAS_V2
+    with open(caminho, encoding="utf-8") as f:
+        regras = RegrasSAS.from_dict(json.load(f))
+    logger.info(f"[SAS] Regras '{regras.nome}' carregadas de {caminho}")
+    return regras
+
+
+def salvar_regras_sas(regras: RegrasSAS, caminho: str) -> None:
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(regras.to_dict(), f, ensure_ascii=False, indent=4)
+
+
+# =============================================================================
+# COLUNAS DA CARTEIRA (convertidas 1x, reusadas por qualquer regra)
+# =============================================================================
+class ColunasSAS:
+    """
+    Visão NumPy de uma tabela de features (DataFrame ou dict de arrays).
+    Cada coluna é convertida na primeira leitura e guardada; texto vira
+    códigos (factorize), então "vertical == X" é comparação de inteiros.
+    Pilares já calculados ficam num LRU curto por assinatura de regra: um
+    what-if que só mexe em tetos/tiers não recalcula nenhum pilar.
+    """
+    MAX_MEMO = 32
+
+    def __init__(self, tabela):
+        self.tabela = tabela
+        self.indice = tabela.index if isinstance(tabela, pd.DataFrame) else None
+        self._cache: Dict[Tuple[str, str], Any] = {}
+        self._memo: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.total = len(tabela[next(iter(tabela.keys()))]) if not isinstance(tabela, pd.DataFrame) else len(tabela)
+
+    def __len__(self) -> int:
+        return self.total
+
+    def _bruta(self, nome: str):
+        try:
+            return self.tabela[nome]
+        except KeyError:
+            raise ValueError(f"Feature '{nome}' ausente da carteira") from None
+
+    def numerica(self, nome: str) -> np.ndarray:
+        chave = (nome, "f")
+        if chave not in self._cache:
+            self._cache[chave] = np.asarray(self._bruta(nome), dtype=np.float64)
+        return self._cache[chave]
+
+    def booleana(self, nome: str) -> np.ndarray:
+        chave = (nome, "b")
+        if chave not in self._cache:
+            self._cache[chave] = np.asarray(self._bruta(nome), dtype=bool)
+        return self._cache[chave]
+
+    def categorica(self, nome: str) -> Tuple[np.ndarray, List]:
+        """(códigos, valores distintos); código -1 = ausente."""
+        chave = (nome, "c")
+        if chave not in self._cache:
+            coluna = self._bruta(nome)
+            if not isinstance(coluna, pd.Series):
+                coluna = np.asarray(coluna, dtype=object)
+            codigos, valores = pd.factorize(coluna)
+            self._cache[chave] = (codigos, list(valores))
+        return self._cache[chave]
+
+    def memo(self, assinatura: str, calcular: Callable[[], np.ndarray]) -> np.ndarray:
+        if assinatura in self._memo:
+            self._memo.move_to_end(assinatura)
+            return self._memo[assinatura]
+        valor = self._memo[assinatura] = calcular()
+        if len(self._memo) > self.MAX_MEMO:
+            self._memo.popitem(last=False)
+        return valor
+
+    def definir(self, nome: str, valores: np.ndarray) -> None:
+        """Coluna derivada (ex.: conf_media) visível para as condições."""
+        self._cache[(nome, "f")] = valores
+        self._cache[(nome, "b")] = valores.astype(bool)
+
+    def e_texto(self, nome: str) -> bool:
+        if (nome, "f") in self._cache:
+            return False
+        coluna = self._bruta(nome)
+        dtype = getattr(coluna, "dtype", None)
+        if dtype is None:
+            dtype = np.asarray(coluna).dtype
+        return not (pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype))
+
+
+# =============================================================================
+# COMPILAÇÃO
+# =============================================================================
+_Avaliacao = Callable[[ColunasSAS], np.ndarray]
+
+_COMPARADORES = {
+    ">=": np.greater_equal, ">": np.greater, "<=": np.less_equal, "<": np.less,
+    "==": np.equal, "!=": np.not_equal,
+}
+
+
+def _compilar_condicao(cond: Condicao) -> _Avaliacao:
+    nome, operador, valor = cond.feature, cond.operador, cond.valor
+    if operador == "verdadeiro":
+        return lambda c: c.booleana(nome)
+    if operador == "falso":
+        return lambda c: ~c.booleana(nome)
+
+    def texto(c: ColunasSAS) -> np.ndarray:
+        codigos, valores = c.categorica(nome)
+        alvos = [valores.index(v) for v in (valor if operador == "em" else [valor]) if v in valores]
+        casou = np.isin(codigos, alvos)
+        return ~casou if operador == "!=" else casou
+
+    if operador == "em":
+        return lambda c: texto(c) if c.e_texto(nome) else np.isin(c.numerica(nome), valor)
+    comparar = _COMPARADORES[operador]
+    if operador in ("==", "!="):
+        return lambda c: texto(c) if c.e_texto(nome) else comparar(c.numerica(nome), valor)
+    return lambda c: comparar(c.numerica(nome), valor)
+
+
+def _compilar_todas(condicoes: List[Condicao]) -> _Avaliacao:
+    compiladas = [_compilar_condicao(c) for c in condicoes]
+
+    def todas(c: ColunasSAS) -> np.ndarray:
+        casou = np.ones(len(c), dtype=bool)
+        for avaliar in compiladas:
+            casou &= avaliar(c)
+        return casou
+    return todas
+
+
+def _indice_faixa(valores: np.ndarray, limites) -> np.ndarray:
+    """
+    Quantos limites (crescentes) o valor atinge — a faixa de uma cadeia if/elif
+    "valor >= limite". Com poucos limites, comparações somadas batem searchsorted;
+    NaN não atinge nenhum (faixa 0), como no escalar.
+    """
+    indice = np.zeros(len(valores), dtype=np.intp)
+    for limite in limites:
+        indice += valores >= limite
+    return indice
+
+
+def _compilar_faixa(faixa: FaixaPontos) -> _Avaliacao:
+    limites = [float(x) for x in faixa.limites]
+    pontos = np.asarray(faixa.pontos)
+    return lambda c: pontos[_indice_faixa(c.numerica(faixa.feature), limites)]
+
+
+def _compilar_escala(escala: EscalaPontos) -> _Avaliacao:
+    condicoes = _compilar_todas(escala.se)
+
+    def avaliar(c: ColunasSAS) -> np.ndarray:
+        valores = np.nan_to_num(c.numerica(escala.feature))
+        pontos = np.minimum(np.floor_divide(valores, escala.passo) * escala.pontos_por_passo, escala.maximo)
+        return np.where(condicoes(c) & (pontos > 0), pontos, 0)
+    return avaliar
+
+
+def _compilar_exclusivos(bonus: List[BonusPontos]) -> _Avaliacao:
+    """if/elif: np.select devolve os pontos do primeiro bônus que casar."""
+    condicoes = [_compilar_todas(b.se) for b in bonus]
+    pontos = [b.pontos for b in bonus]
+    return lambda c: np.select([avaliar(c) for avaliar in condicoes], pontos, 0)
+
+
+def _compilar_bonus(bonus: BonusPontos) -> _Avaliacao:
+    condicoes = _compilar_todas(bonus.se)
+    return lambda c: np.where(condicoes(c), bonus.pontos, 0)
+
+
+class AvaliadorSAS:
+    """Regras compiladas: avalia qualquer carteira (DataFrame, dict ou ColunasSAS)."""
+
+    def __init__(self, regras: RegrasSAS):
+        self.regras = regras
+        self.pilares = regras.pilares
+        self._termos: Dict[str, List[_Avaliacao]] = {p: [] for p in self.pilares}
+        for faixa in regras.faixas:
+            self._termos[faixa.pilar].append(_compilar_faixa(faixa))
+        for escala in regras.escalas:
+            self._termos[escala.pilar].append(_compilar_escala(escala))
+        grupos: Dict[Tuple[str, str], List[BonusPontos]] = {}
+        for bonus in regras.bonus:
+            if bonus.exclusivo:
+                grupos.setdefault((bonus.pilar, bonus.exclusivo), []).append(bonus)
+            else:
+                self._termos[bonus.pilar].append(_compilar_bonus(bonus))
+        for (pilar, _), membros in grupos.items():
+            self._termos[pilar].append(_compilar_exclusivos(membros))
+
+        # pilar reaproveitável entre regras iguais naquele pilar (mesmos termos, mesma confiança)
+        self._assinaturas = {
+            p: repr((p, regras.confianca, [r for r in regras.faixas + regras.bonus + regras.escalas if r.pilar == p],
+                     (regras.verticais, regras.vertical_padrao) if p == regras.pilar_vertical else None))
+            for p in self.pilares
+        }
+        self._verticais = regras.verticais
+        self._big_fish = _compilar_todas(regras.big_fish)
+        self._promove = np.zeros(len(TIERS_LOTE), dtype=bool)
+        self._promove[[_CODIGO_TIER[t] for t in regras.big_fish_promove]] = True
+        self._limites_tier = [regras.tiers.get(t.name, np.inf) for t in TIERS_LOTE[1:]]
+        self._limites_conf = [float(x) for x in regras.confianca_limites]
+        self._fatores_conf = np.asarray(regras.confianca_fatores, dtype=np.float64)
+
+    @staticmethod
+    def colunas(tabela) -> ColunasSAS:
+        return tabela if isinstance(tabela, ColunasSAS) else ColunasSAS(tabela)
+
+    def confianca_media(self, c: ColunasSAS) -> np.ndarray:
+        """Média das confianças, somadas na mesma ordem do escalar."""
+        soma = c.numerica(self.regras.confianca[0])
+        for nome in self.regras.confianca[1:]:
+            soma = soma + c.numerica(nome)
+        return soma / float(len(self.regras.confianca))
+
+    def _pilar(self, c: ColunasSAS, pilar: str) -> np.ndarray:
+        if pilar == self.regras.pilar_vertical:
+            codigos, valores = c.categorica("vertical")
+            pts_vertical = np.asarray([self._verticais.get(v, self.regras.vertical_padrao) for v in valores]
+                                      + [self.regras.vertical_padrao])
+            total = pts_vertical[codigos]
+        else:
+            total = np.zeros(len(c), dtype=np.int64)
+        for avaliar in self._termos[pilar]:
+            total = total + avaliar(c)
+        return total
+
+    def pilares_brutos(self, tabela) -> Dict[str, np.ndarray]:
+        """Pontos de cada pilar antes do teto."""
+        c = self.colunas(tabela)
+        c.definir("conf_media", self.confianca_media(c))
+        return {p: c.memo(self._assinaturas[p], lambda p=p: self._pilar(c, p)) for p in self.pilares}
+
+    def pilares_com_teto(self, tabela) -> Dict[str, np.ndarray]:
+        tetos = self.regras.tetos
+        return {
+            p: np.minimum(v, tetos[p]) if p in tetos else v
+            for p, v in self.pilares_brutos(tabela).items()
+        }
+
+    def elegivel_big_fish(self, tabela) -> np.ndarray:
+        """Linhas que atendem às condições do override (antes de olhar o tier)."""
+        c = self.colunas(tabela)
+        c.definir("conf_media", self.confianca_media(c))
+        return self._big_fish(c)
+
+    def calcular(self, tabela) -> Dict[str, np.ndarray]:
+        """Pilares (com teto), confiança, score, código do tier e big_fish, em arrays."""
+        c = self.colunas(tabela)
+        resultado = self.pilares_com_teto(c)
+        conf_media = c.numerica("conf_media")
+
+        # confiança: cadeia "conf < limite"; sem dado (NaN) cai no fator de cima, como no escalar
+        faixa_conf = np.zeros(len(c), dtype=np.intp)
+        for limite in self._limites_conf:
+            faixa_conf += ~(conf_media < limite)
+        multiplicador = self._fatores_conf[faixa_conf]
+        score_bruto = np.trunc(sum(resultado.values()) * multiplicador)
+        score = np.clip(score_bruto, 0, self.regras.score_maximo).astype(np.int64)
+
+        tier = _indice_faixa(score, self._limites_tier)
+        big_fish = self.elegivel_big_fish(c) & self._promove[tier]
+        resultado.update(
+            conf_media=conf_media,
+            multiplicador_conf=multiplicador,
+            score=score,
+            tier=tier + big_fish,
+            big_fish=big_fish,
+        )
+        return resultado
+
+    def avaliar(self, tabela) -> pd.DataFrame:
+        """Pilares, score, tier e flags de todas as linhas (mesmo índice da tabela)."""
+        c = self.colunas(tabela)
+        resultado = self.calcular(c)
+        resultado["tier"] = pd.Categorical.from_codes(resultado["tier"], [t.name for t in TIERS_LOTE])
+        resultado["dados_inferidos"] = resultado["conf_media"] < self.regras.limite_dados_inferidos
+        return pd.DataFrame(resultado, index=c.indice)
+
+
+def compilar_regras(regras: RegrasSAS) -> AvaliadorSAS:
+    return AvaliadorSAS(regras)
+
+
+# =============================================================================
+# WHAT-IF: DIFERENÇA DE TIERS ENTRE DOIS CONJUNTOS DE REGRAS
+# =============================================================================
+@dataclass
+class DiffTiers:
+    base: str
+    alternativa: str
+    total: int
+    subiram: int
+    desceram: int
+    transicoes: pd.DataFrame      # linhas: tier na base; colunas: tier na alternativa
+    mudancas: pd.DataFrame        # só quem mudou de tier (score e tier nas duas regras)
+
+    @property
+    def mudaram(self) -> int:
+        return self.subiram + self.desceram
+
+    def resumo(self) -> Dict:
+        return {
+            "base": self.base,
+            "alternativa": self.alternativa,
+            "total": self.total,
+            "mudaram": self.mudaram,
+            "subiram": self.subiram,
+            "desceram": self.desceram,
+            "tiers_base": self.transicoes.sum(axis=1).to_dict(),
+            "tiers_alternativa": self.transicoes.sum(axis=0).to_dict(),
+        }
+
+
+def comparar_regras(
+    tabela,
+    alternativa,
+    base=None,
+) -> DiffTiers:
+    """
+    Aplica duas regras (RegrasSAS ou AvaliadorSAS; base padrão REGRAS_V2) à
+    mesma carteira e resume quem muda de tier.
+    """
+    avaliadores = [
+        r if isinstance(r, AvaliadorSAS) else compilar_regras(r)
+        for r in (base or REGRAS_V2, alternativa)
+    ]
+    c = AvaliadorSAS.colunas(tabela)
+    antes, depois = (a.calcular(c) for a in avaliadores)
+    tier_antes, tier_depois = antes["tier"], depois["tier"]
+
+    nomes = [t.name for t in TIERS_LOTE]
+    n = len(nomes)
+    matriz = np.bincount(tier_antes * n + tier_depois, minlength=n * n).reshape(n, n)
+    mudou = np.flatnonzero(tier_antes != tier_depois)
+    indice = c.indice[mudou] if c.indice is not None else mudou
+    mudancas = pd.DataFrame({
+        "score_base": antes["score"][mudou],
+        "tier_base": pd.Categorical.from_codes(tier_antes[mudou], nomes),
+        "score_alternativa": depois["score"][mudou],
+        "tier_alternativa": pd.Categorical.from_codes(tier_depois[mudou], nomes),
+    }, index=indice)
+    return DiffTiers(
+        base=avaliadores[0].regras.nome,
+        alternativa=avaliadores[1].regras.nome,
+        total=len(c),
+        subiram=int((tier_depois > tier_antes).sum()),
+        desceram=int((tier_depois < tier_antes).sum()),
+        transicoes=pd.DataFrame(matriz, index=nomes, columns=nomes),
+        mudancas=mudancas,
+    )
@@ -13,8 +13,8 @@ Mudanças principais vs v0.1:
 from scout_types import (
     SASResult, SASBreakdown, Tier, DossieCompleto,
     VERTICALS_CORE, PESOS_PILARES_V2, TIERS_V2,
-    CNAE_ALGODAO, KEYWORDS_ALGODAO
 )
+from utils.classificador_vertical import CLASSIFICADOR_VERTICAL
 
 
 def detectar_vertical(dossie: DossieCompleto) -> str:
@@ -28,37 +28,11 @@ def detectar_vertical(dossie: DossieCompleto) -> str:
     4. Grãos (padrão)
 
     Pecuária foi REMOVIDA - não é core para ticket 500k+
-    """
-    op = dossie.dados_operacionais
-    cnpj_data = dossie.dados_cnpj
 
-    # 1. Algodão (complexidade industrial - nova categoria)
-    cnae = cnpj_data.cnae_principal if cnpj_data else ""
-    culturas_str = " ".join(op.culturas).lower() if op.culturas else ""
-
-    if any(cnae.startswith(c) for c in CNAE_ALGODAO):
-        return 'Algodão'
-    if any(kw in culturas_str for kw in KEYWORDS_ALGODAO):
-        return 'Algodão'
-    if op.verticalizacao.algodoeira:
-        return 'Algodão'
-
-    # 2. Bioenergia
-    if op.verticalizacao.usina_acucar_etanol or op.verticalizacao.destilaria:
-        return 'Bioenergia'
-    if 'cana' in culturas_str or 'etanol' in culturas_str or 'acucar' in culturas_str:
-        return 'Bioenergia'
-
-    # 3. Sementes
-    if cnae and cnae.startswith('0119'):
-        return 'Sementes'
-    if op.verticalizacao.sementeira or op.verticalizacao.ubs:
-        return 'Sementes'
-    if 'semente' in culturas_str:
-        return 'Sementes'
-
-    # 4. Grãos (padrão)
-    return 'Grãos'
+    Sinais (CNAE, culturas sem acento, verticalização) em
+    utils/classificador_vertical; lá também estão as evidências e o lote.
+    """
+    return CLASSIFICADOR_VERTICAL.classificar_dossie(dossie).vertical
 
 
 def calcular_sas_v2(dossie: DossieCompleto) -> SASResult: